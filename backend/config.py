@@ -78,6 +78,35 @@ class Settings(BaseSettings):
     # Streaming
     streaming_enabled: bool = True
     stream_reconnect_delay: int = 5
+    stream_max_symbols: int = 30  # Market-data subscription cap (Alpaca's IEX feed allows 30); open positions always stay subscribed
+    streaming_flush_interval_ms: int = 100  # WebSocket batch tick; quotes/trades conflate per symbol between ticks
+    streaming_client_buffer_frames: int = 50  # Unsent frames per client before it is dropped as too slow
+    streaming_max_pending_messages: int = 5000  # Unconflated messages (logs, bars) held per tick; oldest dropped
+    streaming_delta_history: int = 1000  # State deltas kept so reconnecting clients resume without a snapshot
+    streaming_snapshot_extras_ttl_seconds: float = 30.0  # Reuse snapshot logs/advisories for this long
+    
+    # Incremental bar store (rolling 1-min bars per symbol, replaces full-day refetch)
+    bar_store_max_bars: int = 500  # Max bars kept per symbol (~1 trading day + extended hours)
+    incremental_features_enabled: bool = True  # O(1)-per-bar indicator updates instead of full recompute
+    feature_cache_enabled: bool = True  # Reuse features computed on an unchanged bar set across loops
+    feature_cache_max_entries: int = 2000  # LRU bound on (kind, symbol, timeframe, last bar) entries
+    
+    # Local bar archive (columnar per symbol/day partitions, read before any bar download)
+    bar_archive_enabled: bool = True
+    bar_archive_dir: str = "bar_archive"  # Relative to the working directory
+    bar_archive_flush_bars: int = 30  # Streamed bars buffered per symbol before a partition write
+    
+    # Bulk bar fetching (chunked multi-symbol requests run concurrently)
+    bulk_fetch_chunk_size: int = 50  # Symbols per StockBarsRequest
+    bulk_fetch_max_concurrency: int = 4  # Chunks in flight at once
+    bulk_fetch_requests_per_minute: int = 180  # Stay under Alpaca's 200 req/min limit
+    
+    # Parameter optimization
+    optimizer_workers: int = 0  # Processes scoring each PSO/GA generation (0 = all cores, 1 = serial)
+    walk_forward_folds: int = 5  # Rolling train/test folds per walk-forward run
+    
+    # Async execution layer (blocking broker/DB calls run off the event loop)
+    io_thread_pool_size: int = 8  # Max concurrent blocking I/O calls
     
     # Phase 2: Opportunity Scanner
     use_dynamic_watchlist: bool = True  # Enable dynamic watchlist - FIXED: was False
@@ -260,6 +289,33 @@ class Settings(BaseSettings):
     entry_cutoff_time: str = "15:30"  # No new entries after 3:30 PM ET (30 min before close)
     entry_cutoff_enabled: bool = True  # Enforce entry cutoff strictly
     
+    # Market clock cache - answer market-hours checks locally
+    market_clock_refresh_seconds: int = 300  # Re-sync clock/calendar with broker every 5 min
+    
+    # Broker snapshot cache - account/positions/open orders shared within a tick
+    broker_snapshot_ttl_seconds: float = 2.0  # Invalidated early on submit/cancel/replace/fill
+    
+    # Order mirror - order state pushed by the trade-updates stream instead of polled
+    order_stream_enabled: bool = True  # Connect the trade-updates websocket on engine start
+    order_mirror_reconcile_seconds: float = 60.0  # REST reconciliation interval while the stream is live
+    order_mirror_fallback_poll_seconds: float = 0.5  # Poll interval for order waits while the stream is down
+    order_mirror_live_window_seconds: float = 15.0  # Stream counts as live this long after its last trade update
+    
+    # Position valuation - quote-driven marks and portfolio aggregates (no broker calls)
+    position_mark_max_age_seconds: float = 5.0  # Older marks fall back to a broker price
+    position_valuation_publish_seconds: float = 1.0  # Push live equity/daily P&L into metrics at most this often
+
+    # Stop-update batches (IntelligentStopManager.execute_batch_updates)
+    stop_update_max_concurrency: int = 5  # Default bound on concurrent per-symbol stop updates
+
+    # Protection pipeline - one snapshot/evaluate/resolve/execute pass per monitor tick
+    protection_pipeline_enabled: bool = True  # False restores the separate protection loops
+    
+    # Supabase write-behind queue (features, bars, logs, ML predictions)
+    supabase_flush_interval_seconds: float = 1.0  # Flush queued writes at least this often
+    supabase_batch_size: int = 500  # Rows per bulk request; reaching it triggers an early flush
+    supabase_max_pending_rows: int = 10000  # Buffered insert rows before the oldest are dropped
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
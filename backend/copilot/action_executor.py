@@ -702,8 +702,7 @@ class ActionExecutor:
             }
             
             # Update stop-loss
-            position.stop_loss = new_stop
-            trading_state.update_position(position)
+            trading_state.update_position_fields(symbol, stop_loss=new_stop)
             
             message = (
                 f"✅ Updated stop-loss for {symbol}\n"
@@ -791,8 +790,7 @@ class ActionExecutor:
             }
             
             # Update take-profit
-            position.take_profit = new_tp
-            trading_state.update_position(position)
+            trading_state.update_position_fields(symbol, take_profit=new_tp)
             
             message = (
                 f"✅ Updated take-profit for {symbol}\n"
@@ -10,6 +10,7 @@ from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from config import settings
 from copilot.config import CopilotConfig
 from core.alpaca_client import AlpacaClient
+from core.position_valuation import get_position_valuation
 from core.state import trading_state
 from core.supabase_client import SupabaseClient
 from data.market_data import MarketDataManager
@@ -147,12 +148,23 @@ class CopilotContextBuilder:
             "trading_enabled": trading_state.is_trading_allowed(),
             "last_update": trading_state.last_update.isoformat(),
         }
+
+        # Live marks move equity/daily P&L between account syncs
+        portfolio = get_position_valuation().portfolio()
+        if portfolio.equity is not None:
+            account_snapshot["equity"] = portfolio.equity
+            account_snapshot["daily_pl"] = portfolio.daily_pl
+            account_snapshot["daily_pl_pct"] = portfolio.daily_pl_pct
+        account_snapshot["gross_exposure"] = portfolio.gross_exposure
+        account_snapshot["net_exposure"] = portfolio.net_exposure
         return account_snapshot
 
     def _aggregate_positions(self, account: Dict[str, Any]) -> List[Dict[str, Any]]:
         equity = account.get("equity") or 0
+        valuation = get_position_valuation()
         positions = []
         for position in trading_state.get_all_positions():
+            mark = valuation.get_mark(position.symbol)
             exposure_pct = 0.0
             try:
                 exposure_pct = (position.market_value / equity) * 100 if equity else 0.0
@@ -172,6 +184,8 @@ class CopilotContextBuilder:
                     "stop_loss": position.stop_loss,
                     "take_profit": position.take_profit,
                     "exposure_pct": exposure_pct,
+                    "r_multiple": mark.r_multiple if mark else None,
+                    "mark_age_seconds": mark.age_seconds if mark else None,
                     "entry_time": position.entry_time.isoformat(),
                 }
             )
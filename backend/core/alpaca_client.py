@@ -2,6 +2,7 @@ from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import (
     MarketOrderRequest,
     LimitOrderRequest,
+    OrderRequest,
     GetOrdersRequest,
     GetPortfolioHistoryRequest,
     ReplaceOrderRequest,
@@ -14,6 +15,10 @@ from alpaca.data.enums import DataFeed
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 from config import settings
+from core.broker_snapshot import BrokerSnapshot
+from core.market_clock import MarketClock
+from core.order_mirror import OrderMirror
+from core.runtime_metrics import get_runtime_metrics
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -30,12 +35,20 @@ class AlpacaClient:
             api_key=settings.alpaca_api_key,
             secret_key=settings.alpaca_secret_key
         )
+        # Cached clock/calendar - market-hours checks don't hit the API each call
+        self.market_clock = MarketClock(self.trading_client)
+        # Short-TTL account/positions/open-orders cache shared by all components
+        self.broker_snapshot = BrokerSnapshot(self.trading_client)
+        # Order state pushed by the trade-updates stream (see streaming/trade_update_stream.py)
+        self.order_mirror = OrderMirror(self.trading_client, on_change=self._on_order_change)
+        # Record per-method call latency for /metrics/runtime
+        get_runtime_metrics().instrument(self, 'alpaca')
         logger.info("Alpaca client initialized (PAPER TRADING)")
     
     def get_account(self):
         """Get account information."""
         try:
-            return self.trading_client.get_account()
+            return self.broker_snapshot.get_account()
         except Exception as e:
             logger.error(f"Failed to get account: {e}")
             raise
@@ -43,7 +56,7 @@ class AlpacaClient:
     def get_positions(self):
         """Get all open positions."""
         try:
-            return self.trading_client.get_all_positions()
+            return self.broker_snapshot.get_positions()
         except Exception as e:
             logger.error(f"Failed to get positions: {e}")
             return []
@@ -51,14 +64,29 @@ class AlpacaClient:
     def get_position(self, symbol: str):
         """Get position for specific symbol."""
         try:
-            return self.trading_client.get_open_position(symbol)
+            return self.broker_snapshot.get_position(symbol)
         except Exception as e:
             logger.debug(f"No position for {symbol}: {e}")
             return None
     
-    def get_orders(self, status: Optional[str] = None, symbols: Optional[List[str]] = None):
-        """Get orders, optionally filtered by status and symbols."""
+    def get_orders(
+        self,
+        status: Optional[str] = None,
+        symbols: Optional[List[str]] = None,
+        symbol: Optional[str] = None
+    ):
+        """
+        Get orders, optionally filtered by status and symbols.
+        Open orders are served from the broker snapshot (indexed by symbol).
+        """
+        if symbol is not None:
+            symbols = [symbol]
         try:
+            if status and status.lower() == 'open':
+                return self.broker_snapshot.get_open_orders(symbols)
+            if status and status.lower() == 'all':
+                return self.order_mirror.get_orders(symbols)
+            
             if status:
                 # Map string status to QueryOrderStatus enum (used for filtering)
                 status_map = {
@@ -79,6 +107,33 @@ class AlpacaClient:
             logger.error(f"Failed to get orders: {e}")
             return []
     
+    def get_open_orders_for(self, symbol: str, order_type: Optional[str] = None):
+        """Open orders for a symbol, optionally of one type ('stop', 'limit', 'trailing_stop')."""
+        try:
+            return self.broker_snapshot.get_open_orders_for(symbol, order_type)
+        except Exception as e:
+            logger.error(f"Failed to get open orders for {symbol}: {e}")
+            return []
+    
+    def get_order(self, order_id: str):
+        """Get a single order by ID (from the order mirror while the trade-updates stream is live)."""
+        try:
+            return self.order_mirror.get_order(order_id)
+        except Exception as e:
+            logger.error(f"Failed to get order {order_id}: {e}")
+            return None
+    
+    def _on_order_change(self, order, event: str):
+        """Order mirror callback: fills move positions/account, everything else moves orders."""
+        if event in ('fill', 'partial_fill', 'filled', 'partially_filled'):
+            self.broker_snapshot.invalidate()
+        else:
+            self.broker_snapshot.invalidate('orders')
+    
+    def invalidate_snapshot(self):
+        """Force the next account/positions/orders read to hit the broker."""
+        self.broker_snapshot.invalidate()
+    
     def submit_market_order(
         self,
         symbol: str,
@@ -99,6 +154,7 @@ class AlpacaClient:
             )
             
             order = self.trading_client.submit_order(request)
+            self.broker_snapshot.invalidate()
             logger.info(f"Order submitted: {side} {qty} {symbol} (ID: {client_order_id})")
             return order
             
@@ -106,10 +162,11 @@ class AlpacaClient:
             logger.error(f"Failed to submit order: {e}")
             raise
 
-    def submit_order_request(self, request: BaseOrderRequest):
+    def submit_order_request(self, request: OrderRequest):
         """Submit a pre-built order request (e.g., bracket orders)."""
         try:
             order = self.trading_client.submit_order(request)
+            self.broker_snapshot.invalidate()
             side = getattr(request, "side", None)
             qty = getattr(request, "qty", None)
             symbol = getattr(request, "symbol", None)
@@ -129,6 +186,7 @@ class AlpacaClient:
         """Cancel an order."""
         try:
             self.trading_client.cancel_order_by_id(order_id)
+            self.broker_snapshot.invalidate('orders')
             logger.info(f"Order canceled: {order_id}")
             return True
         except Exception as e:
@@ -145,6 +203,7 @@ class AlpacaClient:
         """
         try:
             self.trading_client.cancel_order_by_id(order_id)
+            self.broker_snapshot.invalidate('orders')
             logger.info(f"Order canceled: {order_id}")
             return True, None
         except Exception as e:
@@ -186,6 +245,7 @@ class AlpacaClient:
                 order_id=order_id,
                 order_data=request
             )
+            self.broker_snapshot.invalidate('orders')
             
             logger.info(f"Order {order_id} replaced successfully")
             return order
@@ -198,6 +258,7 @@ class AlpacaClient:
         """Close position for symbol."""
         try:
             self.trading_client.close_position(symbol)
+            self.broker_snapshot.invalidate()
             logger.info(f"Position closed: {symbol}")
             return True
         except Exception as e:
@@ -213,6 +274,7 @@ class AlpacaClient:
         """Emergency: close all positions."""
         try:
             self.trading_client.close_all_positions(cancel_orders=True)
+            self.broker_snapshot.invalidate()
             logger.warning("ALL POSITIONS CLOSED (EMERGENCY)")
             return True
         except Exception as e:
@@ -374,18 +436,13 @@ class AlpacaClient:
             return None
     
     def is_market_open(self) -> bool:
-        """Check if market is currently open."""
-        try:
-            clock = self.trading_client.get_clock()
-            return clock.is_open
-        except Exception as e:
-            logger.error(f"Failed to check market status: {e}")
-            return False
+        """Check if market is currently open (answered from the cached market clock)."""
+        return self.market_clock.is_market_open()
     
     def get_clock(self):
-        """Get market clock information."""
+        """Get market clock information (answered from the cached market clock)."""
         try:
-            return self.trading_client.get_clock()
+            return self.market_clock.get_clock()
         except Exception as e:
             logger.error(f"Failed to get clock: {e}")
             raise
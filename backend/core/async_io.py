@@ -0,0 +1,96 @@
+"""
+Async Execution Layer
+
+AlpacaClient and SupabaseClient are synchronous HTTP clients. Calling them
+directly from the engine's async loops freezes the event loop (and with it
+every other loop, the websocket broadcaster and the API handlers) for the
+duration of each request.
+
+This module runs blocking calls on a bounded, shared thread pool:
+
+    from core.async_io import run_blocking, AsyncClientProxy
+
+    account = await run_blocking(alpaca.get_account)
+
+    alpaca_async = AsyncClientProxy(alpaca)
+    positions = await alpaca_async.get_positions()
+
+The pool size caps how many broker/database requests can be in flight at
+once (settings.io_thread_pool_size).
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get or create the shared I/O thread pool."""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            max_workers = max(1, settings.io_thread_pool_size)
+            _io_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='io')
+            logger.info(f"I/O thread pool started ({max_workers} workers)")
+        return _io_executor
+
+
+def shutdown_io_executor(wait: bool = False):
+    """Shut down the shared I/O thread pool (a new one is created on next use)."""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is not None:
+            _io_executor.shutdown(wait=wait)
+            _io_executor = None
+
+
+def io_queue_depth() -> int:
+    """Number of blocking calls waiting for a free I/O pool worker."""
+    executor = _io_executor
+    if executor is None:
+        return 0
+    return executor._work_queue.qsize()
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable on the I/O thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), functools.partial(func, *args, **kwargs))
+
+
+class AsyncClientProxy:
+    """
+    Awaitable view of a blocking client.
+
+    Every method call goes through run_blocking(); non-callable attributes
+    are returned as-is.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        """The wrapped blocking client."""
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await run_blocking(attr, *args, **kwargs)
+
+        return call
@@ -0,0 +1,148 @@
+"""
+Broker Snapshot Cache
+
+Account, positions and open orders are read by many components in the same
+tick (strategy remnant checks, RiskManager.check_order, stop/target checks,
+bracket verification, order sequencing). BrokerSnapshot serves those reads
+from one short-lived copy per kind:
+
+    snapshot = BrokerSnapshot(trading_client)
+    snapshot.get_positions()
+    snapshot.get_open_orders_for('AAPL', 'stop')   # O(1) index lookup
+
+Each kind expires after settings.broker_snapshot_ttl_seconds and is
+invalidated explicitly by AlpacaClient whenever an order is submitted,
+replaced or canceled, a position is closed, or a fill is observed.
+"""
+
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from alpaca.trading.enums import QueryOrderStatus
+from alpaca.trading.requests import GetOrdersRequest
+
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+KINDS = ('account', 'positions', 'orders')
+
+
+def order_type_key(order) -> str:
+    """Normalized order type ('market', 'limit', 'stop', 'stop_limit', 'trailing_stop')."""
+    order_type = getattr(order, 'order_type', None) or getattr(order, 'type', None)
+    return str(getattr(order_type, 'value', order_type) or '').lower()
+
+
+class BrokerSnapshot:
+    """Short-TTL cache of account, positions and open orders with symbol/type indexes."""
+
+    def __init__(self, trading_client, ttl_seconds: Optional[float] = None):
+        self.trading_client = trading_client
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.broker_snapshot_ttl_seconds
+        self._entries: Dict[str, Tuple[Any, Dict, float]] = {}
+        self._generation = {kind: 0 for kind in KINDS}
+        self._fetch_locks = {kind: Lock() for kind in KINDS}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_account(self):
+        return self._get('account', self.trading_client.get_account)[0]
+
+    def get_positions(self) -> List[Any]:
+        return list(self._get('positions', self.trading_client.get_all_positions)[0])
+
+    def get_position(self, symbol: str):
+        """Open position for symbol, or None."""
+        return self._get('positions', self.trading_client.get_all_positions)[1].get(symbol)
+
+    def get_open_orders(self, symbols: Optional[Iterable[str]] = None) -> List[Any]:
+        """All open orders, or only those for the given symbols."""
+        orders, index = self._get('orders', self._fetch_open_orders)
+        if symbols is None:
+            return list(orders)
+        return [order for symbol in dict.fromkeys(symbols) for order in index.get(symbol, ())]
+
+    def get_open_orders_for(self, symbol: str, order_type: Optional[str] = None) -> List[Any]:
+        """Open orders for one symbol, optionally of one type ('stop', 'limit', ...)."""
+        _, index = self._get('orders', self._fetch_open_orders)
+        key = symbol if order_type is None else (symbol, order_type.lower())
+        return list(index.get(key, ()))
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, *kinds: str):
+        """Drop cached kinds ('account', 'positions', 'orders'); all when none given."""
+        with self._lock:
+            for kind in kinds or KINDS:
+                self._generation[kind] += 1
+                self._entries.pop(kind, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'ttl_seconds': self.ttl_seconds,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _fetch_open_orders(self):
+        return self.trading_client.get_orders(filter=GetOrdersRequest(status=QueryOrderStatus.OPEN))
+
+    def _cached(self, kind: str):
+        entry = self._entries.get(kind)
+        if entry is not None and time.monotonic() - entry[2] < self.ttl_seconds:
+            return entry
+        return None
+
+    def _get(self, kind: str, fetch: Callable[[], Any]) -> Tuple[Any, Dict]:
+        """(value, index) for a kind, fetching it if missing or expired."""
+        entry = self._cached(kind)
+        if entry is not None:
+            self.hits += 1
+            return entry[0], entry[1]
+
+        # One fetch per kind at a time; concurrent readers wait and reuse it
+        with self._fetch_locks[kind]:
+            entry = self._cached(kind)
+            if entry is not None:
+                self.hits += 1
+                return entry[0], entry[1]
+
+            self.misses += 1
+            generation = self._generation[kind]
+            value = fetch()
+            index = self._index(kind, value)
+            with self._lock:
+                # Don't store a result that an invalidation raced past
+                if self._generation[kind] == generation:
+                    self._entries[kind] = (value, index, time.monotonic())
+            return value, index
+
+    @staticmethod
+    def _index(kind: str, value) -> Dict:
+        """Positions by symbol; orders by symbol and by (symbol, order type)."""
+        if kind == 'positions':
+            return {p.symbol: p for p in value or []}
+        if kind == 'orders':
+            index = defaultdict(list)
+            for order in value or []:
+                index[order.symbol].append(order)
+                index[(order.symbol, order_type_key(order))].append(order)
+            return dict(index)
+        return {}
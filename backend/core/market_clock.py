@@ -0,0 +1,200 @@
+"""
+Market Clock Service
+
+Caches Alpaca's market clock and the upcoming trading-session calendar so
+market-hours questions are answered locally instead of with a get_clock()
+round-trip on every call:
+
+    clock = MarketClock(trading_client)
+    clock.is_market_open()
+    clock.get_clock().next_close   # ET, like Alpaca's Clock
+
+Open/close state is derived from the cached calendar sessions, so crossing
+the open or close boundary needs no network call. The clock and calendar are
+re-fetched every settings.market_clock_refresh_seconds to stay in sync with
+the broker (halts, calendar changes), and immediately when the cached data
+no longer covers the current time.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Callable, List, Optional, Tuple
+
+import pytz
+from alpaca.trading.requests import GetCalendarRequest
+
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ET = pytz.timezone('America/New_York')
+
+# Seconds to wait before retrying after a failed refresh
+RETRY_SECONDS = 30.0
+
+
+@dataclass
+class ClockSnapshot:
+    """Same fields as alpaca.trading.models.Clock, with datetimes in ET like Alpaca's."""
+    timestamp: datetime
+    is_open: bool
+    next_open: datetime
+    next_close: datetime
+
+
+class MarketClock:
+    """Locally-evaluated market clock backed by a periodically refreshed cache."""
+
+    def __init__(
+        self,
+        trading_client,
+        refresh_seconds: Optional[float] = None,
+        calendar_days: int = 10,
+        now: Callable[[], datetime] = None,
+    ):
+        self.trading_client = trading_client
+        self.refresh_seconds = refresh_seconds if refresh_seconds is not None else settings.market_clock_refresh_seconds
+        self.calendar_days = calendar_days
+        self._now = now or (lambda: datetime.now(timezone.utc))
+        self._lock = Lock()
+        self._clock = None
+        self._sessions: List[Tuple[datetime, datetime]] = []
+        self._fetched_at: Optional[float] = None
+        self._next_attempt = 0.0
+        self.refresh_count = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_clock(self) -> ClockSnapshot:
+        """Current clock state. Raises if the clock has never been fetched."""
+        now = self._now()
+        self._ensure_fresh(now)
+        snapshot = self._evaluate(now)
+        if snapshot is None:
+            raise RuntimeError("Market clock unavailable")
+        return snapshot
+
+    def is_market_open(self) -> bool:
+        """Check if market is currently open (False if the clock is unavailable)."""
+        try:
+            return self.get_clock().is_open
+        except Exception as e:
+            logger.error(f"Failed to check market status: {e}")
+            return False
+
+    def refresh(self) -> bool:
+        """Fetch the broker clock and upcoming sessions. Returns success."""
+        with self._lock:
+            return self._refresh(self._now())
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ensure_fresh(self, now: datetime):
+        if not self._needs_refresh(now):
+            return
+        with self._lock:
+            if self._needs_refresh(now) and time.monotonic() >= self._next_attempt:
+                self._refresh(now)
+
+    def _needs_refresh(self, now: datetime) -> bool:
+        if self._fetched_at is None:
+            return True
+        if time.monotonic() - self._fetched_at >= self.refresh_seconds:
+            return True
+        # Cached data no longer says what happens next
+        return self._from_sessions(now) is None and not self._clock_covers(now)
+
+    def _clock_covers(self, now: datetime) -> bool:
+        clock = self._clock
+        if clock is None:
+            return False
+        return now < (clock.next_close if clock.is_open else clock.next_open)
+
+    def _refresh(self, now: datetime) -> bool:
+        try:
+            clock = self.trading_client.get_clock()
+        except Exception as e:
+            logger.error(f"Failed to refresh market clock: {e}")
+            self._next_attempt = time.monotonic() + RETRY_SECONDS
+            return False
+
+        sessions = self._sessions
+        try:
+            today = now.astimezone(ET).date()
+            calendar = self.trading_client.get_calendar(
+                GetCalendarRequest(start=today, end=today + timedelta(days=self.calendar_days))
+            )
+            sessions = [
+                (ET.localize(day.open).astimezone(timezone.utc), ET.localize(day.close).astimezone(timezone.utc))
+                for day in calendar or []
+            ]
+        except Exception as e:
+            logger.warning(f"Failed to fetch market calendar, using clock boundaries only: {e}")
+
+        self._clock = clock
+        self._sessions = sessions
+        self._fetched_at = time.monotonic()
+        self._next_attempt = 0.0
+        self.refresh_count += 1
+        logger.debug(
+            f"Market clock refreshed: open={clock.is_open}, next_open={clock.next_open}, "
+            f"next_close={clock.next_close}, {len(sessions)} sessions cached"
+        )
+        return True
+
+    def _evaluate(self, now: datetime) -> Optional[ClockSnapshot]:
+        """
+        Derive the clock at `now` from cached data, or None if it can't.
+        If a boundary was crossed and refresh failed, the cached clock is
+        flipped locally rather than reporting the stale state.
+
+        Datetimes are returned in ET: callers key per-day state on
+        `timestamp.date()`, which must not roll over at 00:00 UTC.
+        """
+        snapshot = self._from_sessions(now)
+        if snapshot is None:
+            snapshot = self._from_clock(now)
+        if snapshot is None:
+            return None
+        return ClockSnapshot(
+            snapshot.timestamp.astimezone(ET),
+            snapshot.is_open,
+            snapshot.next_open.astimezone(ET),
+            snapshot.next_close.astimezone(ET),
+        )
+
+    def _from_sessions(self, now: datetime) -> Optional[ClockSnapshot]:
+        sessions = self._sessions
+        for i, (open_at, close_at) in enumerate(sessions):
+            if now < open_at:
+                return ClockSnapshot(now, False, open_at, close_at)
+            if now < close_at:
+                if i + 1 >= len(sessions):
+                    return None  # next_open unknown
+                return ClockSnapshot(now, True, sessions[i + 1][0], close_at)
+        return None
+
+    def _from_clock(self, now: datetime) -> Optional[ClockSnapshot]:
+        clock = self._clock
+        if clock is None:
+            return None
+        if clock.is_open:
+            if now < clock.next_close:
+                return ClockSnapshot(now, True, clock.next_open, clock.next_close)
+            if now < clock.next_open:
+                # Crossed the close boundary without a refresh
+                return ClockSnapshot(now, False, clock.next_open, clock.next_close)
+            return None
+        if now < clock.next_open:
+            return ClockSnapshot(now, False, clock.next_open, clock.next_close)
+        if now < clock.next_close:
+            # Crossed the open boundary without a refresh
+            return ClockSnapshot(now, True, clock.next_open, clock.next_close)
+        return None
@@ -0,0 +1,386 @@
+"""
+Order State Mirror
+
+Local copy of broker order state fed by the Alpaca trade-updates websocket
+(fills, partial fills, cancels, replaces, rejects). Components that used to
+poll single orders in sleep loops wait on the mirror instead and wake up as
+soon as the matching event arrives:
+
+    mirror = OrderMirror(trading_client)
+    order = mirror.wait_for_status(order_id, TERMINAL_STATUSES, timeout=30)       # blocking
+    order = await mirror.wait_for_status_async(order_id, {'filled'}, timeout=30)  # asyncio
+
+While the stream is connected, get_order/get_orders are answered locally and
+a REST reconciliation runs only every settings.order_mirror_reconcile_seconds.
+While it is down or quiet (or no stream is attached) every read goes to REST
+and waits poll every settings.order_mirror_fallback_poll_seconds, as before.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from alpaca.trading.enums import QueryOrderStatus
+from alpaca.trading.requests import GetOrdersRequest
+
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+TERMINAL_STATUSES = frozenset({
+    'filled', 'canceled', 'cancelled', 'expired', 'rejected', 'replaced', 'done_for_day',
+})
+RECONCILE_LIMIT = 500
+LIVE_RECHECK_SECONDS = 1.0  # Event waits re-check stream liveness at least this often
+
+
+def order_status(order) -> str:
+    """Normalized lower-case status string ('' when unknown)."""
+    status = getattr(order, 'status', None)
+    return str(getattr(status, 'value', status) or '').lower()
+
+
+def _event_name(update) -> str:
+    event = getattr(update, 'event', None)
+    return str(getattr(event, 'value', event) or '').lower()
+
+
+class OrderMirror:
+    """Order book mirror with event-driven waits and a slow REST reconciliation."""
+
+    def __init__(
+        self,
+        trading_client,
+        reconcile_seconds: Optional[float] = None,
+        fallback_poll_seconds: Optional[float] = None,
+        on_change: Optional[Callable[[Any, str], None]] = None,
+        max_orders: int = 5000,
+    ):
+        self.trading_client = trading_client
+        self.reconcile_seconds = (
+            reconcile_seconds if reconcile_seconds is not None else settings.order_mirror_reconcile_seconds
+        )
+        self.fallback_poll_seconds = (
+            fallback_poll_seconds if fallback_poll_seconds is not None
+            else settings.order_mirror_fallback_poll_seconds
+        )
+        self.on_change = on_change
+        self.max_orders = max_orders
+
+        self._orders: Dict[str, Any] = {}
+        self._stored_at: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._async_waiters: List[tuple] = []
+        self._live_check: Optional[Callable[[], bool]] = None
+        self._was_live = False
+        self._live_since = 0.0
+        self._reconciled_at = 0.0
+        self.stats = {
+            'events': 0,
+            'stale_events': 0,
+            'local_reads': 0,
+            'rest_reads': 0,
+            'reconciles': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Stream side
+    # ------------------------------------------------------------------
+
+    def set_live_check(self, live_check: Optional[Callable[[], bool]]):
+        """Attach the stream's connectivity check (None detaches it)."""
+        self._live_check = live_check
+        self._was_live = False
+
+    def is_live(self) -> bool:
+        """True while the trade-updates stream is connected."""
+        try:
+            live = bool(self._live_check and self._live_check())
+        except Exception:
+            live = False
+        if live and not self._was_live:
+            # Events may have been missed while disconnected: everything
+            # stored before now must be re-read once
+            self._live_since = time.monotonic()
+        self._was_live = live
+        return live
+
+    def apply_update(self, update) -> Optional[Any]:
+        """Apply one trade update (event + order); returns the stored order."""
+        order = getattr(update, 'order', None)
+        if order is None:
+            return None
+        self.stats['events'] += 1
+        self.is_live()  # register a (re)connect before storing what it delivered
+        if not self._store(order, _event_name(update)):
+            self.stats['stale_events'] += 1
+        return self._orders.get(str(order.id))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_order(self, order_id: str):
+        """Order by id: local while live and fresh, otherwise fetched and stored."""
+        order_id = str(order_id)
+        if self.is_live():
+            order = self._orders.get(order_id)
+            if order is not None and self._is_fresh(order_id, order):
+                self.stats['local_reads'] += 1
+                return order
+        self.stats['rest_reads'] += 1
+        order = self.trading_client.get_order_by_id(order_id)
+        self._store(order, order_id=order_id)
+        return self._orders.get(order_id, order)
+
+    def get_orders(self, symbols: Optional[Iterable[str]] = None) -> List[Any]:
+        """
+        Recent orders of any status, newest first, optionally for some symbols.
+        Served locally while live; a REST call per read otherwise.
+        """
+        symbols = list(symbols) if symbols else None
+        if not self.is_live():
+            self.stats['rest_reads'] += 1
+            orders = self.trading_client.get_orders(
+                filter=GetOrdersRequest(status=QueryOrderStatus.ALL, symbols=symbols)
+            )
+            for order in orders or []:
+                self._store(order)
+            return orders
+
+        stale = time.monotonic() - self._reconciled_at >= self.reconcile_seconds
+        if stale or self._reconciled_at < self._live_since:
+            self.reconcile()
+        self.stats['local_reads'] += 1
+        with self._cond:
+            orders = list(self._orders.values())
+        if symbols is not None:
+            wanted = set(symbols)
+            orders = [o for o in orders if getattr(o, 'symbol', None) in wanted]
+        return sorted(orders, key=self._sort_key, reverse=True)
+
+    def reconcile(self) -> int:
+        """Re-read recent orders over REST and merge them; returns orders applied."""
+        try:
+            orders = self.trading_client.get_orders(
+                filter=GetOrdersRequest(status=QueryOrderStatus.ALL, limit=RECONCILE_LIMIT)
+            )
+        except Exception as e:
+            logger.error(f"Order mirror reconciliation failed: {e}")
+            return 0
+        self._reconciled_at = time.monotonic()
+        self.stats['reconciles'] += 1
+        return sum(1 for order in orders or [] if self._store(order))
+
+    # ------------------------------------------------------------------
+    # Waits
+    # ------------------------------------------------------------------
+
+    def wait_for_update(self, order_id: str, seen: Any, timeout: float):
+        """
+        Block until the stored order differs from `seen` (the object last
+        returned by get_order) or timeout; returns the current order. Without
+        a live stream nothing arrives, so this is a plain timed wait.
+        """
+        order_id = str(order_id)
+        deadline = time.monotonic() + max(timeout, 0.0)
+        with self._cond:
+            current = self._orders.get(order_id)
+            while current is None or current is seen:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+                current = self._orders.get(order_id)
+            return current
+
+    def wait_for_status(self, order_id: str, statuses: Iterable[str], timeout: float):
+        """Block until the order's status is one of `statuses`; returns the latest order."""
+        statuses = self._status_set(statuses)
+        deadline = time.monotonic() + max(timeout, 0.0)
+        order = self._current_or_fetch(order_id)
+        while order_status(order) not in statuses:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self.is_live():
+                order = self.wait_for_update(order_id, order, min(remaining, LIVE_RECHECK_SECONDS)) or order
+                continue
+            # Stream down: poll at the fallback interval
+            self.wait_for_update(order_id, order, min(remaining, self.fallback_poll_seconds))
+            order = self._current_or_fetch(order_id)
+        return order
+
+    async def wait_for_status_async(self, order_id: str, statuses: Iterable[str], timeout: float):
+        """Awaitable wait_for_status; resolved directly by stream events while live."""
+        statuses = self._status_set(statuses)
+        order_id = str(order_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(timeout, 0.0)
+        order = self._orders.get(order_id)
+        if order is None:
+            order = await loop.run_in_executor(None, self._current_or_fetch, order_id)
+
+        while order_status(order) not in statuses:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            future = loop.create_future()
+            waiter = (order_id, statuses, loop, future)
+            with self._cond:
+                self._async_waiters.append(waiter)
+                order = self._orders.get(order_id, order)
+            try:
+                if order_status(order) in statuses:
+                    break
+                live = self.is_live()
+                try:
+                    order = await asyncio.wait_for(
+                        future, min(remaining, LIVE_RECHECK_SECONDS if live else self.fallback_poll_seconds)
+                    )
+                except asyncio.TimeoutError:
+                    if not live:
+                        order = await loop.run_in_executor(None, self.get_order, order_id)
+            finally:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+        return order
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'live': self.is_live(),
+            'orders': len(self._orders),
+            'async_waiters': len(self._async_waiters),
+            'reconcile_seconds': self.reconcile_seconds,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _store(self, order, event: str = '', order_id: Optional[str] = None) -> bool:
+        """Store order unless an equal-or-newer copy is held; notifies waiters."""
+        order_id = str(order_id or order.id)
+        with self._cond:
+            previous = self._orders.get(order_id)
+            if previous is not None and self._is_older(order, previous):
+                return False
+            self._orders[order_id] = order
+            self._stored_at[order_id] = time.monotonic()
+            if len(self._orders) > self.max_orders:
+                self._prune()
+            status = order_status(order)
+            ready = [w for w in self._async_waiters if w[0] == order_id and status in w[1]]
+            for waiter in ready:
+                self._async_waiters.remove(waiter)
+            self._cond.notify_all()
+
+        for _, _, loop, future in ready:
+            loop.call_soon_threadsafe(self._resolve, future, order)
+        if self.on_change and (previous is None or order_status(previous) != status or event):
+            try:
+                self.on_change(order, event or status)
+            except Exception as e:
+                logger.error(f"Order mirror change callback failed: {e}")
+        return True
+
+    def _prune(self):
+        """Drop the oldest terminal orders once the mirror is over capacity."""
+        terminal = [oid for oid, o in self._orders.items() if order_status(o) in TERMINAL_STATUSES]
+        terminal.sort(key=lambda oid: self._stored_at.get(oid, 0.0))
+        for oid in terminal[:len(self._orders) - self.max_orders]:
+            self._orders.pop(oid, None)
+            self._stored_at.pop(oid, None)
+
+    def _is_fresh(self, order_id: str, order) -> bool:
+        stored_at = self._stored_at.get(order_id, 0.0)
+        if stored_at < self._live_since:
+            return False
+        if order_status(order) in TERMINAL_STATUSES:
+            return True
+        return time.monotonic() - stored_at < self.reconcile_seconds
+
+    def _current_or_fetch(self, order_id: str):
+        order = self._orders.get(str(order_id))
+        if order is not None and order_status(order) in TERMINAL_STATUSES:
+            return order
+        try:
+            return self.get_order(order_id)
+        except Exception as e:
+            logger.debug(f"Order mirror fetch failed for {order_id}: {e}")
+            return order
+
+    @staticmethod
+    def _status_set(statuses: Iterable[str]) -> Set[str]:
+        return {str(getattr(s, 'value', s)).lower() for s in statuses}
+
+    @staticmethod
+    def _is_older(order, previous) -> bool:
+        new_ts = getattr(order, 'updated_at', None)
+        old_ts = getattr(previous, 'updated_at', None)
+        if new_ts is None or old_ts is None:
+            return False
+        try:
+            return new_ts < old_ts
+        except TypeError:
+            return False
+
+    @staticmethod
+    def _sort_key(order):
+        ts = getattr(order, 'submitted_at', None) or getattr(order, 'created_at', None)
+        return ts.timestamp() if hasattr(ts, 'timestamp') else 0.0
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, order):
+        if not future.done():
+            future.set_result(order)
+
+
+def get_order_mirror(client) -> Optional[OrderMirror]:
+    """The OrderMirror behind an AlpacaClient, or None (e.g. test doubles)."""
+    mirror = getattr(client, 'order_mirror', None)
+    return mirror if isinstance(mirror, OrderMirror) else None
+
+
+def wait_for_order_update(client, order_id: str, seen: Any, timeout: float):
+    """Wait for the next update of an order through the client's mirror; polls the client without one."""
+    mirror = get_order_mirror(client)
+    if mirror is None:
+        seen_key = _poll_key(seen)
+        return _poll_order(client, order_id, timeout, lambda order: _poll_key(order) != seen_key)
+    return mirror.wait_for_update(order_id, seen, timeout)
+
+
+def wait_for_order_status(client, order_id: str, statuses: Iterable[str], timeout: float):
+    """Wait until an order reaches one of `statuses` via the client's mirror; polls the client without one."""
+    mirror = get_order_mirror(client)
+    if mirror is None:
+        wanted = OrderMirror._status_set(statuses)
+        return _poll_order(client, order_id, timeout, lambda order: order_status(order) in wanted)
+    return mirror.wait_for_status(order_id, statuses, timeout)
+
+
+def _poll_order(client, order_id: str, timeout: float, done: Callable[[Any], bool]):
+    """Re-read an order every fallback interval until done(order) or timeout; returns the last read."""
+    deadline = time.monotonic() + max(timeout, 0.0)
+    order = None
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return order
+        time.sleep(min(remaining, settings.order_mirror_fallback_poll_seconds))
+        try:
+            order = client.get_order(order_id)
+        except Exception as e:
+            logger.debug(f"Order poll failed for {order_id}: {e}")
+            continue
+        if order is not None and done(order):
+            return order
+
+
+def _poll_key(order) -> tuple:
+    return order_status(order), str(getattr(order, 'filled_qty', None))
@@ -0,0 +1,357 @@
+"""
+Position Valuation Engine
+
+Marks open positions to market from streamed trades/quotes in O(1) and keeps
+portfolio aggregates as running totals, so stop decisions, risk checks and
+the copilot read sub-second marks instead of minute-old bars or broker calls:
+
+    valuation = get_position_valuation()
+    valuation.mark('AAPL', 187.42)     # stream handler, O(1)
+    valuation.get_mark('AAPL')         # price, P&L, R-multiple, age
+    valuation.portfolio()              # gross/net exposure, unrealized and daily P&L
+
+Per-position entry, quantity, side, stop and initial risk live in numpy
+arrays indexed by a slot per symbol. They are reconciled from TradingState (a lock-free
+copy-on-write read) on every mark, so fills and partial exits are picked up
+without a separate sync. Daily P&L is anchored to the last broker account
+read (equity vs. last_equity) and moved only by price changes since then;
+opening, resizing or closing a position shifts the anchor instead, since
+that turns unrealized into realized P&L without changing equity.
+"""
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import settings
+from core.state import Position, TradingState, trading_state
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SHORT_SIDES = ('sell', 'short')
+
+
+@dataclass(frozen=True, slots=True)
+class PositionMark:
+    """One position valued at its latest streamed price."""
+    symbol: str
+    price: float
+    qty: float
+    side: str  # 'buy' or 'sell'
+    entry_price: float
+    stop_loss: float
+    unrealized_pl: float
+    unrealized_pl_pct: float
+    market_value: float  # Negative for shorts, like the broker reports it
+    r_multiple: float  # Against the initial risk, so trailed stops don't distort it
+    marked_at: float  # time.monotonic()
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.marked_at
+
+
+@dataclass(frozen=True, slots=True)
+class PortfolioMarks:
+    """Portfolio aggregates over all valued positions."""
+    positions: int
+    long_exposure: float
+    short_exposure: float
+    gross_exposure: float
+    net_exposure: float
+    unrealized_pl: float
+    equity: Optional[float]  # None until a broker account read anchors it
+    daily_pl: Optional[float]
+    daily_pl_pct: Optional[float]
+
+
+class PositionValuation:
+    """Array-backed mark-to-market for open positions with running portfolio totals."""
+
+    def __init__(
+        self,
+        state: TradingState = trading_state,
+        capacity: int = 64,
+        publish_interval: Optional[float] = None
+    ):
+        self.state = state
+        self.publish_interval = (
+            publish_interval if publish_interval is not None else settings.position_valuation_publish_seconds
+        )
+        self._lock = Lock()
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._allocate(max(1, capacity))
+
+        # Running totals over all slots
+        self._unrealized = 0.0
+        self._long = 0.0
+        self._short = 0.0
+
+        # Broker account anchor for equity / daily P&L
+        self._anchor_equity: Optional[float] = None
+        self._last_equity: Optional[float] = None
+        self._anchor_unrealized = 0.0
+        self._published_at = 0.0
+
+        self.marks = 0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def mark(self, symbol: str, price: float) -> Optional[PositionMark]:
+        """
+        Value a position at a streamed price (O(1)).
+
+        Returns:
+            The new mark, or None if the symbol has no open position
+        """
+        if price <= 0:
+            return None
+
+        position = self.state.get_position(symbol)
+        with self._lock:
+            if position is None or not position.qty:
+                if symbol in self._slots:
+                    self._release(symbol)
+                return None
+
+            slot = self._sync_slot(symbol, position)
+            self._set_mark(slot, price)
+            self.marks += 1
+            mark = self._snapshot(symbol, slot)
+
+        self._maybe_publish()
+        return mark
+
+    def reconcile(self):
+        """Bring tracked positions in line with TradingState (O(positions))."""
+        positions = self.state.positions
+        with self._lock:
+            for symbol in [s for s in self._slots if s not in positions]:
+                self._release(symbol)
+            for symbol, position in positions.items():
+                if position.qty:
+                    self._sync_slot(symbol, position)
+                elif symbol in self._slots:
+                    self._release(symbol)
+
+    def set_account(self, equity: float, last_equity: float):
+        """
+        Anchor equity and daily P&L to a broker account read.
+
+        Args:
+            equity: Current account equity
+            last_equity: Equity at the previous close (daily P&L baseline)
+        """
+        self.reconcile()
+        with self._lock:
+            self._anchor_equity = equity
+            self._last_equity = last_equity
+            self._anchor_unrealized = self._unrealized
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_mark(self, symbol: str, max_age: Optional[float] = None) -> Optional[PositionMark]:
+        """
+        Latest mark for a symbol.
+
+        Args:
+            symbol: Stock symbol
+            max_age: Only return marks at most this many seconds old
+        """
+        with self._lock:
+            slot = self._slots.get(symbol)
+            if slot is None or not self._marked_at[slot]:
+                return None
+            mark = self._snapshot(symbol, slot)
+        if max_age is not None and mark.age_seconds > max_age:
+            return None
+        return mark
+
+    def get_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Latest marked price for a symbol (fresh within max_age), or None."""
+        mark = self.get_mark(symbol, max_age)
+        return mark.price if mark else None
+
+    def portfolio(self) -> PortfolioMarks:
+        """Portfolio aggregates; membership is reconciled first if positions opened or closed."""
+        positions = self.state.positions
+        with self._lock:
+            stale = self._slots.keys() != positions.keys()
+        if stale:
+            self.reconcile()
+
+        with self._lock:
+            equity = daily_pl = daily_pl_pct = None
+            if self._anchor_equity is not None:
+                equity = self._anchor_equity + (self._unrealized - self._anchor_unrealized)
+                daily_pl = equity - self._last_equity
+                daily_pl_pct = (daily_pl / self._last_equity) * 100 if self._last_equity else 0.0
+
+            return PortfolioMarks(
+                positions=len(self._slots),
+                long_exposure=self._long,
+                short_exposure=self._short,
+                gross_exposure=self._long + self._short,
+                net_exposure=self._long - self._short,
+                unrealized_pl=self._unrealized,
+                equity=equity,
+                daily_pl=daily_pl,
+                daily_pl_pct=daily_pl_pct,
+            )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'positions': len(self._slots),
+                'capacity': len(self._entry),
+                'marks': self.marks,
+                'anchored': self._anchor_equity is not None,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+
+    def _allocate(self, capacity: int):
+        start = len(getattr(self, '_entry', ()))
+
+        def grow(name):
+            old = getattr(self, name, np.zeros(0))
+            new = np.zeros(capacity)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+        for name in ('_entry', '_qty', '_sign', '_stop', '_risk', '_mark', '_marked_at'):
+            grow(name)
+        self._free.extend(range(capacity - 1, start - 1, -1))
+
+    def _contribution(self, slot: int):
+        """(unrealized P&L, exposure) of one slot."""
+        qty = float(self._qty[slot])
+        mark = float(self._mark[slot])
+        return float(self._sign[slot]) * (mark - float(self._entry[slot])) * qty, mark * qty
+
+    def _add(self, slot: int, sign: float = 1.0) -> float:
+        unrealized, exposure = self._contribution(slot)
+        self._unrealized += sign * unrealized
+        if self._sign[slot] > 0:
+            self._long += sign * exposure
+        else:
+            self._short += sign * exposure
+        return unrealized
+
+    def _sync_slot(self, symbol: str, position: Position) -> int:
+        """Slot for a symbol with entry/qty/side/stop copied from the position."""
+        qty = float(abs(position.qty))
+        sign = -1.0 if position.side in SHORT_SIDES else 1.0
+        entry = float(position.avg_entry_price)
+        stop = float(position.stop_loss or 0)
+
+        slot = self._slots.get(symbol)
+        if slot is None:
+            if not self._free:
+                self._allocate(len(self._entry) * 2)
+            slot = self._free.pop()
+            self._slots[symbol] = slot
+            self._entry[slot], self._qty[slot], self._sign[slot], self._stop[slot] = entry, qty, sign, stop
+            self._risk[slot] = self._initial_risk(entry, sign, stop)
+            self._mark[slot] = float(position.current_price or entry)
+            self._marked_at[slot] = 0.0
+            # Already part of the anchored equity (or opened at ~zero P&L)
+            self._anchor_unrealized += self._add(slot)
+            return slot
+
+        if (self._entry[slot], self._qty[slot], self._sign[slot]) != (entry, qty, sign):
+            # Fills and partial exits realize P&L; equity, and so daily P&L, is unchanged
+            before = self._add(slot, -1.0)
+            self._entry[slot], self._qty[slot], self._sign[slot] = entry, qty, sign
+            self._anchor_unrealized += self._add(slot) - before
+        self._stop[slot] = stop
+        if not self._risk[slot]:
+            # First stop placed after the position opened
+            self._risk[slot] = self._initial_risk(entry, sign, stop)
+        return slot
+
+    @staticmethod
+    def _initial_risk(entry: float, sign: float, stop: float) -> float:
+        """Per-share risk to the original stop (0 if no stop on the risk side)."""
+        risk = sign * (entry - stop) if stop else 0.0
+        return risk if risk > 0 else 0.0
+
+    def _set_mark(self, slot: int, price: float):
+        self._add(slot, -1.0)
+        self._mark[slot] = price
+        self._marked_at[slot] = time.monotonic()
+        self._add(slot)
+
+    def _release(self, symbol: str):
+        slot = self._slots.pop(symbol)
+        # Closing turns the position's unrealized P&L into realized P&L
+        self._anchor_unrealized -= self._add(slot, -1.0)
+        self._qty[slot] = 0.0
+        self._free.append(slot)
+        if not self._slots:
+            # Drop accumulated float drift once flat
+            self._anchor_unrealized -= self._unrealized
+            self._unrealized = self._long = self._short = 0.0
+
+    def _snapshot(self, symbol: str, slot: int) -> PositionMark:
+        price = float(self._mark[slot])
+        entry = float(self._entry[slot])
+        qty = float(self._qty[slot])
+        sign = float(self._sign[slot])
+        stop = float(self._stop[slot])
+        risk = float(self._risk[slot])
+
+        unrealized = sign * (price - entry) * qty
+        cost_basis = entry * qty
+        return PositionMark(
+            symbol=symbol,
+            price=price,
+            qty=qty,
+            side='buy' if sign > 0 else 'sell',
+            entry_price=entry,
+            stop_loss=stop,
+            unrealized_pl=unrealized,
+            unrealized_pl_pct=(unrealized / cost_basis) * 100 if cost_basis else 0.0,
+            market_value=sign * price * qty,
+            r_multiple=sign * (price - entry) / risk if risk else 0.0,
+            marked_at=float(self._marked_at[slot]),
+        )
+
+    def _maybe_publish(self):
+        """Push live equity/daily P&L into TradingState metrics, throttled."""
+        if self._anchor_equity is None:
+            return
+        now = time.monotonic()
+        if now - self._published_at < self.publish_interval:
+            return
+        self._published_at = now
+
+        portfolio = self.portfolio()
+        self.state.update_metrics(
+            equity=portfolio.equity,
+            daily_pl=portfolio.daily_pl,
+            daily_pl_pct=portfolio.daily_pl_pct
+        )
+
+
+# Global instance
+_position_valuation: Optional[PositionValuation] = None
+
+
+def get_position_valuation() -> PositionValuation:
+    """Get or create the global position valuation engine."""
+    global _position_valuation
+    if _position_valuation is None:
+        _position_valuation = PositionValuation()
+    return _position_valuation
@@ -0,0 +1,219 @@
+"""
+Runtime Instrumentation
+
+Lightweight in-process measurements used to find what starves the engine
+loops (e.g. the 10-second position monitor) under load:
+
+- Event-loop lag: how late a short asyncio.sleep wakes up
+- Loop iterations: duration of each TradingEngine loop iteration (p50/p95/max)
+  and the time since each loop last completed an iteration
+- External calls: latency and error count per AlpacaClient method
+- Gauges: sampled depths such as StreamingBroadcaster's queue
+
+All recorders are cheap (a lock and a bounded deque append) and safe to call
+from the event loop and from I/O pool threads. Exposed on /metrics/runtime.
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class LatencyStats:
+    """Rolling window of durations with lifetime count, error count and max."""
+
+    def __init__(self, window: int = 500):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.max = 0.0
+        self.last = 0.0
+        self.last_at: Optional[float] = None
+
+    def record(self, seconds: float, error: bool = False):
+        self._samples.append(seconds)
+        self.count += 1
+        self.last = seconds
+        self.last_at = time.time()
+        if seconds > self.max:
+            self.max = seconds
+        if error:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Percentiles over the rolling window, max over the lifetime (milliseconds)."""
+        samples = sorted(self._samples)
+        n = len(samples)
+
+        def pct(q: float) -> float:
+            if not n:
+                return 0.0
+            return samples[min(n - 1, int(round(q * (n - 1))))] * 1000
+
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'p50_ms': round(pct(0.50), 2),
+            'p95_ms': round(pct(0.95), 2),
+            'max_ms': round(self.max * 1000, 2),
+            'window_max_ms': round(samples[-1] * 1000, 2) if n else 0.0,
+            'last_ms': round(self.last * 1000, 2),
+            'seconds_since_last': round(time.time() - self.last_at, 1) if self.last_at else None,
+        }
+
+
+class RuntimeMetrics:
+    """Collects event-loop lag, loop iteration times, call latencies and gauges."""
+
+    def __init__(self, window: int = 500, lag_interval: float = 0.5):
+        self.window = window
+        self.lag_interval = lag_interval
+        self.event_loop_lag = LatencyStats(window)
+        self._loops: Dict[str, LatencyStats] = {}
+        self._calls: Dict[str, LatencyStats] = {}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+        self._gauge_peaks: Dict[str, float] = {}
+        self._lock = Lock()
+        self._lag_task: Optional[asyncio.Task] = None
+        self.started_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Recorders
+    # ------------------------------------------------------------------
+
+    def record_loop_iteration(self, loop_name: str, seconds: float):
+        """Record the duration of one engine loop iteration."""
+        with self._lock:
+            stats = self._loops.get(loop_name)
+            if stats is None:
+                stats = self._loops[loop_name] = LatencyStats(self.window)
+            stats.record(seconds)
+
+    def record_call(self, name: str, seconds: float, error: bool = False):
+        """Record the latency of one external call."""
+        with self._lock:
+            stats = self._calls.get(name)
+            if stats is None:
+                stats = self._calls[name] = LatencyStats(self.window)
+            stats.record(seconds, error)
+
+    def record_event_loop_lag(self, seconds: float):
+        with self._lock:
+            self.event_loop_lag.record(max(seconds, 0.0))
+
+    def register_gauge(self, name: str, read: Callable[[], float]):
+        """Register a callable sampled on every lag tick and on each snapshot."""
+        with self._lock:
+            self._gauges[name] = read
+            self._gauge_peaks.setdefault(name, 0.0)
+
+    def sample_gauges(self) -> Dict[str, float]:
+        """Read all gauges and update their peaks."""
+        with self._lock:
+            gauges = dict(self._gauges)
+
+        values = {}
+        for name, read in gauges.items():
+            try:
+                values[name] = float(read())
+            except Exception as e:
+                logger.debug(f"Gauge {name} failed: {e}")
+                continue
+
+        with self._lock:
+            for name, value in values.items():
+                if value > self._gauge_peaks.get(name, 0.0):
+                    self._gauge_peaks[name] = value
+        return values
+
+    # ------------------------------------------------------------------
+    # Instrumentation helpers
+    # ------------------------------------------------------------------
+
+    def instrument(self, client: Any, prefix: str):
+        """
+        Wrap every public method of a client instance so each call records
+        its latency under '<prefix>.<method>'. Calls are not otherwise changed.
+        """
+        for name, _ in inspect.getmembers(type(client), inspect.isfunction):
+            if name.startswith('_'):
+                continue
+            method = getattr(client, name)
+            setattr(client, name, self._timed(method, f"{prefix}.{name}"))
+        return client
+
+    def _timed(self, method: Callable, name: str) -> Callable:
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            error = False
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                self.record_call(name, time.perf_counter() - started, error)
+        return timed
+
+    def start_lag_monitor(self) -> Optional[asyncio.Task]:
+        """Start the event-loop lag sampler on the running loop (idempotent)."""
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.get_running_loop().create_task(self._lag_monitor())
+            logger.info(f"Event-loop lag monitor started ({self.lag_interval}s interval)")
+        return self._lag_task
+
+    async def stop_lag_monitor(self):
+        if self._lag_task:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+            self._lag_task = None
+
+    async def _lag_monitor(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self.record_event_loop_lag(time.perf_counter() - started - self.lag_interval)
+            self.sample_gauges()
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as a JSON-serializable dict."""
+        gauges = self.sample_gauges()
+        with self._lock:
+            return {
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'event_loop_lag': self.event_loop_lag.summary(),
+                'loops': {name: stats.summary() for name, stats in sorted(self._loops.items())},
+                'calls': {name: stats.summary() for name, stats in sorted(self._calls.items())},
+                'gauges': {
+                    name: {'current': value, 'peak': self._gauge_peaks.get(name, value)}
+                    for name, value in sorted(gauges.items())
+                },
+            }
+
+
+# Global instance
+_runtime_metrics: Optional[RuntimeMetrics] = None
+
+
+def get_runtime_metrics() -> RuntimeMetrics:
+    """Get or create the global runtime metrics collector."""
+    global _runtime_metrics
+    if _runtime_metrics is None:
+        _runtime_metrics = RuntimeMetrics()
+    return _runtime_metrics
@@ -1,10 +1,12 @@
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from collections import deque
+from itertools import islice
+from dataclasses import dataclass, fields, replace
 from datetime import datetime
 from threading import Lock
+from typing import Deque, Dict, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Position:
     symbol: str
     qty: int
@@ -19,7 +21,7 @@ class Position:
     entry_time: datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Order:
     order_id: str
     client_order_id: str
@@ -33,7 +35,7 @@ class Order:
     submitted_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     timestamp: datetime
     level: str
@@ -59,18 +61,36 @@ class TradingMetrics:
     circuit_breaker_triggered: bool
 
 
+METRIC_FIELDS = frozenset(f.name for f in fields(TradingMetrics))
+
+
 class TradingState:
     """
     Thread-safe shared state for the trading system.
     All components read/write through this.
+
+    Copy-on-write: writers serialize on a lock and publish a new positions /
+    orders dict (plus a tuple view of it) and a new metrics object; published
+    collections and the frozen positions/orders in them are never mutated,
+    so readers take no lock and never contend with the quote handler.
+    Changing a position's fields goes through update_position_fields, which
+    applies them to the latest position under the lock so concurrent marks
+    are not lost. Logs live in a bounded deque with their own lock.
+
+    Each collection has its own version counter; `version` covers positions,
+    orders and metrics, so readers (the streaming state sync) can skip
+    unchanged state cheaply.
     """
     
     def __init__(self):
-        self._lock = Lock()
+        self._lock = Lock()  # Writers only
+        self._log_lock = Lock()
         self.positions: Dict[str, Position] = {}
         self.orders: Dict[str, Order] = {}
-        self.logs: List[LogEntry] = []
+        self._positions_view: Tuple[Position, ...] = ()
+        self._orders_view: Tuple[Order, ...] = ()
         self.max_logs = 1000  # Keep last 1000 logs
+        self.logs: Deque[LogEntry] = deque(maxlen=self.max_logs)
         self.metrics = TradingMetrics(
             equity=0,
             cash=0,
@@ -90,63 +110,163 @@ class TradingState:
         self.features: Dict[str, Dict] = {}  # symbol -> features
         self.is_trading_enabled = True
         self.last_update = datetime.utcnow()
+        self.positions_version = 0
+        self.orders_version = 0
+        self.metrics_version = 0
+        self.logs_version = 0
+    
+    @property
+    def version(self) -> int:
+        """Change counter for positions, orders and metrics together."""
+        return self.positions_version + self.orders_version + self.metrics_version
+    
+    def _publish_positions(self, positions: Dict[str, Position]):
+        """Swap in a new positions dict (caller holds the lock)."""
+        self.positions = positions
+        self._positions_view = tuple(positions.values())
+        self.positions_version += 1
+        if self.metrics.open_positions != len(positions):
+            self.metrics = replace(self.metrics, open_positions=len(positions))
+            self.metrics_version += 1
+    
+    def _publish_orders(self, orders: Dict[str, Order]):
+        """Swap in a new orders dict (caller holds the lock)."""
+        self.orders = orders
+        self._orders_view = tuple(orders.values())
+        self.orders_version += 1
     
     def update_position(self, position: Position):
         """Update or add position."""
         with self._lock:
-            self.positions[position.symbol] = position
-            self.metrics.open_positions = len(self.positions)
+            self._store_position(position)
+    
+    def update_position_price(self, symbol: str, price: float) -> Optional[Position]:
+        """
+        Mark a position to `price` (P&L, market value) as one atomic swap.
+        
+        The marked position is a new object, so readers holding the previous
+        snapshot never see a half-updated position.
+        
+        Returns:
+            The updated position, or None if there is no open position
+        """
+        if price <= 0:
+            return None
+        
+        with self._lock:
+            position = self.positions.get(symbol)
+            if not position or not position.qty or position.qty <= 0:
+                return None
+            
+            position = self._marked(position, price)
+            self._store_position(position)
+            return position
+    
+    def update_position_fields(self, symbol: str, **changes) -> Optional[Position]:
+        """
+        Apply field changes (stop, target, qty) to the current position as one atomic swap.
+        
+        Changes are applied to the latest published position under the lock,
+        so marks made after the caller read its copy are kept. A qty change
+        re-marks P&L and market value at the current price.
+        
+        Returns:
+            The updated position, or None if there is no open position
+        """
+        with self._lock:
+            position = self.positions.get(symbol)
+            if not position:
+                return None
+            
+            position = replace(position, **changes)
+            if 'qty' in changes and position.qty and position.current_price:
+                position = self._marked(position, position.current_price)
+            self._store_position(position)
+            return position
+    
+    def _store_position(self, position: Position):
+        """Publish one replaced position (caller holds the lock)."""
+        positions = dict(self.positions)
+        positions[position.symbol] = position
+        self._publish_positions(positions)
+    
+    @staticmethod
+    def _marked(position: Position, price: float) -> Position:
+        """Copy of a position valued at `price`."""
+        qty = position.qty
+        if position.side == "buy":
+            unrealized_pl = (price - position.avg_entry_price) * qty
+            market_value = price * qty
+        else:
+            unrealized_pl = (position.avg_entry_price - price) * qty
+            market_value = -price * qty
+        
+        cost_basis = position.avg_entry_price * qty
+        unrealized_pl_pct = (unrealized_pl / cost_basis) * 100 if cost_basis else position.unrealized_pl_pct
+        
+        return replace(
+            position,
+            current_price=price,
+            unrealized_pl=unrealized_pl,
+            unrealized_pl_pct=unrealized_pl_pct,
+            market_value=market_value
+        )
     
     def remove_position(self, symbol: str):
         """Remove position (when closed)."""
         with self._lock:
             if symbol in self.positions:
-                del self.positions[symbol]
-                self.metrics.open_positions = len(self.positions)
+                positions = dict(self.positions)
+                del positions[symbol]
+                self._publish_positions(positions)
+    
+    def clear_positions(self):
+        """Drop all positions."""
+        with self._lock:
+            self._publish_positions({})
     
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get position for symbol."""
-        with self._lock:
-            return self.positions.get(symbol)
+        return self.positions.get(symbol)
     
-    def get_all_positions(self) -> List[Position]:
-        """Get all positions."""
-        with self._lock:
-            return list(self.positions.values())
+    def get_all_positions(self) -> Tuple[Position, ...]:
+        """Get all positions (immutable snapshot, not copied per call)."""
+        return self._positions_view
     
     def update_order(self, order: Order):
         """Update or add order."""
         with self._lock:
-            self.orders[order.order_id] = order
+            orders = dict(self.orders)
+            orders[order.order_id] = order
+            self._publish_orders(orders)
     
     def remove_order(self, order_id: str):
         """Remove order."""
         with self._lock:
             if order_id in self.orders:
-                del self.orders[order_id]
+                orders = dict(self.orders)
+                del orders[order_id]
+                self._publish_orders(orders)
     
     def get_order(self, order_id: str) -> Optional[Order]:
         """Get order by ID."""
-        with self._lock:
-            return self.orders.get(order_id)
+        return self.orders.get(order_id)
     
-    def get_all_orders(self) -> List[Order]:
-        """Get all orders."""
-        with self._lock:
-            return list(self.orders.values())
+    def get_all_orders(self) -> Tuple[Order, ...]:
+        """Get all orders (immutable snapshot, not copied per call)."""
+        return self._orders_view
     
     def update_metrics(self, **kwargs):
         """Update metrics."""
         with self._lock:
-            for key, value in kwargs.items():
-                if hasattr(self.metrics, key):
-                    setattr(self.metrics, key, value)
+            changes = {key: value for key, value in kwargs.items() if key in METRIC_FIELDS}
+            self.metrics = replace(self.metrics, **changes)
             self.last_update = datetime.utcnow()
+            self.metrics_version += 1
     
     def get_metrics(self) -> TradingMetrics:
-        """Get current metrics."""
-        with self._lock:
-            return self.metrics
+        """Get current metrics (replaced, never mutated, on update)."""
+        return self.metrics
     
     def update_features(self, symbol: str, features: Dict):
         """Update features for symbol."""
@@ -155,8 +275,8 @@ class TradingState:
     
     def get_features(self, symbol: str) -> Optional[Dict]:
         """Get features for symbol."""
-        with self._lock:
-            return self.features.get(symbol)
+        # A single dict lookup is atomic; no lock needed
+        return self.features.get(symbol)
     
     def enable_trading(self):
         """Enable trading."""
@@ -170,28 +290,26 @@ class TradingState:
     
     def is_trading_allowed(self) -> bool:
         """Check if trading is allowed."""
-        with self._lock:
-            return self.is_trading_enabled and not self.metrics.circuit_breaker_triggered
+        return self.is_trading_enabled and not self.metrics.circuit_breaker_triggered
     
     def add_log(self, level: str, message: str, source: str = "system"):
-        """Add a log entry."""
-        with self._lock:
-            log = LogEntry(
-                timestamp=datetime.utcnow(),
-                level=level,
-                message=message,
-                source=source
-            )
+        """Add a log entry (the deque drops the oldest past max_logs)."""
+        log = LogEntry(
+            timestamp=datetime.utcnow(),
+            level=level,
+            message=message,
+            source=source
+        )
+        with self._log_lock:
             self.logs.append(log)
-            
-            # Keep only last max_logs entries
-            if len(self.logs) > self.max_logs:
-                self.logs = self.logs[-self.max_logs:]
+            self.logs_version += 1
     
     def get_logs(self, limit: int = 100) -> List[LogEntry]:
         """Get recent logs."""
-        with self._lock:
-            return self.logs[-limit:] if limit else self.logs
+        with self._log_lock:
+            if not limit or limit >= len(self.logs):
+                return list(self.logs)
+            return list(islice(self.logs, len(self.logs) - limit, None))
 
 
 # Global state instance
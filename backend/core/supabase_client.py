@@ -1,5 +1,7 @@
+import threading
+from collections import defaultdict, deque
 from supabase import create_client, Client
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from config import settings
 from utils.logger import setup_logger
@@ -7,14 +9,220 @@ from utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+class WriteBehindQueue:
+    """
+    Background writer for hot-path Supabase writes.
+    
+    - Upserts are coalesced by key: only the latest row per (table, key) is
+      written, so a symbol streaming 60 price updates a minute costs one
+      upsert per flush instead of 60.
+    - Inserts (bars, logs, ML predictions) are buffered per table and sent as
+      bulk requests.
+    - A flush happens every flush_interval seconds, or as soon as batch_size
+      rows are pending.
+    - Memory is bounded: once max_pending insert rows are buffered, the oldest
+      rows are dropped (and counted) rather than blocking the caller.
+    
+    Writes run on a daemon thread, so callers on the event loop, in the I/O
+    pool or in logging handlers never wait on the network.
+    """
+    
+    def __init__(
+        self,
+        client,
+        flush_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.client = client
+        self.flush_interval = flush_interval if flush_interval is not None else settings.supabase_flush_interval_seconds
+        self.batch_size = batch_size if batch_size is not None else settings.supabase_batch_size
+        self.max_pending = max_pending if max_pending is not None else settings.supabase_max_pending_rows
+        
+        self._upserts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._upsert_keys: Dict[Tuple[str, str], str] = {}
+        self._inserts: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._pending_inserts = 0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        
+        self.stats = {
+            'queued_upserts': 0,
+            'coalesced_upserts': 0,
+            'queued_inserts': 0,
+            'written_rows': 0,
+            'requests': 0,
+            'failed_rows': 0,
+            'dropped_rows': 0,
+        }
+    
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+    
+    def upsert(self, table: str, row: Dict[str, Any], on_conflict: str = "symbol"):
+        """Queue an upsert; fields merge into any pending row for the same key."""
+        key = (table, str(row.get(on_conflict)))
+        with self._cond:
+            pending = self._upserts.get(key)
+            if pending is None:
+                self._upserts[key] = dict(row)
+                self._upsert_keys[key] = on_conflict
+            else:
+                pending.update(row)
+                self.stats['coalesced_upserts'] += 1
+            self.stats['queued_upserts'] += 1
+            self._wake_if_full()
+        self._ensure_started()
+    
+    def insert(self, table: str, rows):
+        """Queue one row or a list of rows for a bulk insert."""
+        rows = [rows] if isinstance(rows, dict) else list(rows)
+        if not rows:
+            return
+        with self._cond:
+            buffer = self._inserts[table]
+            buffer.extend(rows)
+            self._pending_inserts += len(rows)
+            self.stats['queued_inserts'] += len(rows)
+            
+            # Bound memory: drop oldest rows from the largest buffer
+            while self._pending_inserts > self.max_pending:
+                largest = max(self._inserts.values(), key=len)
+                largest.popleft()
+                self._pending_inserts -= 1
+                self.stats['dropped_rows'] += 1
+            
+            self._wake_if_full()
+        self._ensure_started()
+    
+    def pending(self) -> int:
+        """Rows waiting to be written."""
+        with self._cond:
+            return len(self._upserts) + self._pending_inserts
+    
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+    
+    def flush(self) -> int:
+        """Write everything pending now. Returns rows written."""
+        with self._flush_lock:
+            with self._cond:
+                upserts, self._upserts = self._upserts, {}
+                upsert_keys, self._upsert_keys = self._upsert_keys, {}
+                inserts, self._inserts = self._inserts, defaultdict(deque)
+                self._pending_inserts = 0
+            
+            written = 0
+            # Upserts: one request per (table, conflict key, column set)
+            groups: Dict[Tuple[str, str, frozenset], List[Dict[str, Any]]] = defaultdict(list)
+            for key, row in upserts.items():
+                table = key[0]
+                groups[(table, upsert_keys[key], frozenset(row))].append(row)
+            for (table, on_conflict, _), rows in groups.items():
+                written += self._write(
+                    table, rows, lambda chunk, t=table, c=on_conflict: self.client.table(t).upsert(chunk, on_conflict=c)
+                )
+            
+            # Inserts: one request per table chunk
+            for table, rows in inserts.items():
+                written += self._write(
+                    table, list(rows), lambda chunk, t=table: self.client.table(t).insert(chunk)
+                )
+            return written
+    
+    def _write(self, table: str, rows: List[Dict[str, Any]], build) -> int:
+        written = 0
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            try:
+                build(chunk).execute()
+                written += len(chunk)
+                self.stats['written_rows'] += len(chunk)
+            except Exception as e:
+                self.stats['failed_rows'] += len(chunk)
+                logger.warning(f"Write-behind flush to {table} failed ({len(chunk)} rows): {e}")
+            finally:
+                self.stats['requests'] += 1
+        return written
+    
+    def _wake_if_full(self):
+        # Caller holds self._cond
+        if len(self._upserts) + self._pending_inserts >= self.batch_size:
+            self._cond.notify()
+    
+    def _ensure_started(self):
+        if self._thread is None and not self._stopped:
+            with self._cond:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='supabase-writer', daemon=True)
+                    self._thread.start()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopped:
+                    self._cond.wait(timeout=self.flush_interval)
+                stopped = self._stopped
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush error: {e}")
+            if stopped:
+                return
+    
+    def close(self, timeout: float = 5.0):
+        """Stop the writer thread after a final flush."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+        else:
+            self.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'pending': self.pending()}
+
+
 class SupabaseClient:
     def __init__(self):
         self.client: Client = create_client(
             settings.supabase_url,
             settings.supabase_service_key
         )
+        self.writer = WriteBehindQueue(self.client)
         logger.info("Supabase client initialized")
     
+    # Write-behind (hot path)
+    def queue_features(self, features_data: Dict[str, Any]):
+        """Queue a features upsert; coalesced to the latest row per symbol."""
+        self.writer.upsert("features", features_data, on_conflict="symbol")
+    
+    def queue_bars(self, bars_data: List[Dict[str, Any]]):
+        """Queue market data bars for a bulk insert."""
+        self.writer.insert("market_data", bars_data)
+    
+    def queue_log(self, log_data: Dict[str, Any]):
+        """Queue a system log row for a bulk insert."""
+        self.writer.insert("logs", log_data)
+    
+    def queue_insert(self, table: str, rows):
+        """Queue rows for any insert-only table (e.g. ml_predictions)."""
+        self.writer.insert(table, rows)
+    
+    def flush_writes(self) -> int:
+        """Write all queued rows now."""
+        return self.writer.flush()
+    
+    def close(self):
+        """Flush queued writes and stop the background writer."""
+        self.writer.close()
+    
     # Trades
     def insert_trade(self, trade_data: Dict[str, Any]):
         """Insert completed trade with schema-safe handling."""
@@ -27,6 +27,10 @@ class SupabaseLogHandler(logging.Handler):
             if not self.supabase_client:
                 return
             
+            # Don't feed the writer's own flush errors back into the queue
+            if record.name == 'core.supabase_client':
+                return
+            
             # Map Python log levels to our log levels
             level_map = {
                 logging.DEBUG: "info",
@@ -42,8 +46,8 @@ class SupabaseLogHandler(logging.Handler):
             # Extract component from logger name (e.g., "trading.engine" -> "trading")
             component = record.name.split('.')[0] if '.' in record.name else record.name
             
-            # Insert log into Supabase
-            self.supabase_client.insert_log({
+            # Queue log for the next bulk insert
+            self.supabase_client.queue_log({
                 "level": level,
                 "message": message,
                 "component": component,
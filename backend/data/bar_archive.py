@@ -0,0 +1,460 @@
+"""
+Bar Archive
+
+Local on-disk store of historical bars, so bars that were fetched or
+streamed once are read from disk instead of being downloaded again:
+
+    {root}/{timeframe}/{SYMBOL}/{partition}.npy    one partition per UTC day (1Min) or year (1Day)
+    {root}/{timeframe}/{SYMBOL}/coverage.json      [start, end) ranges known to be complete
+
+- Columnar and memory-mapped: a partition is a float64 array with one row
+  per column (timestamps, then COLUMNS), so each column is contiguous and
+  reads use np.load(mmap_mode='r'). Row 0 holds the int64 nanosecond UTC
+  timestamps bit-for-bit. NumPy's .npy format keeps the archive free of a
+  Parquet dependency.
+- Append-only writes: new bars are merged into their partition by timestamp
+  (a revised bar replaces the stored one) and the partition file is replaced
+  atomically, so readers never see a half-written file.
+- Streamed bars are buffered per symbol and written every `flush_bars` bars;
+  reads include the buffer.
+- Gap detection: coverage records which ranges a fetch has returned in full.
+  gaps() is the requested range minus coverage, so read_through() downloads
+  only what is missing. A fetch that returns no bars for a symbol is not
+  recorded (it may have failed), and coverage never extends past a fetch's
+  last bar or into the current, still forming bar.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import RLock
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+from data.bar_series import BarSeries
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'trade_count', 'vwap')
+
+# timeframe -> (bar length, partition unit)
+TIMEFRAMES = {
+    '1Min': (pd.Timedelta(minutes=1), 'D'),
+    '1Day': (pd.Timedelta(days=1), 'Y'),
+}
+
+Range = Tuple[pd.Timestamp, pd.Timestamp]
+FetchFunc = Callable[[List[str], datetime, datetime], Optional[Dict[str, pd.DataFrame]]]
+
+
+def _utc(value) -> pd.Timestamp:
+    """Datetimes/strings/Timestamps as UTC Timestamps (naive values are taken as UTC)."""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+
+
+def _frame_arrays(bars: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """(int64 ns timestamps, columns x bars values) of a bars frame."""
+    if 'timestamp' in bars.columns:
+        index = pd.DatetimeIndex(bars['timestamp'])
+    else:
+        index = bars.index
+        if isinstance(index, pd.MultiIndex):
+            index = index.get_level_values(-1)
+        index = pd.DatetimeIndex(index)
+    index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+
+    values = np.full((len(COLUMNS), len(bars)), np.nan)
+    for row, name in enumerate(COLUMNS):
+        if name in bars.columns:
+            values[row] = pd.to_numeric(bars[name], errors='coerce').to_numpy(dtype=np.float64)
+    return index.as_unit('ns').asi8.copy(), values
+
+
+def _concat(parts_stamps: List[np.ndarray], parts_values: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Join partition slices (a single slice is returned as-is, keeping mmap views)."""
+    if not parts_stamps:
+        return np.empty(0, np.int64), np.empty((len(COLUMNS), 0))
+    if len(parts_stamps) == 1:
+        return parts_stamps[0], parts_values[0]
+    return np.concatenate(parts_stamps), np.concatenate(parts_values, axis=1)
+
+
+def _merge(stamps: np.ndarray, values: np.ndarray, new_stamps: np.ndarray, new_values: np.ndarray):
+    """Sorted union by timestamp; on duplicates the new bar wins."""
+    all_stamps = np.concatenate([stamps, new_stamps])
+    all_values = np.concatenate([values, new_values], axis=1)
+    order = np.argsort(all_stamps, kind='stable')
+    all_stamps, all_values = all_stamps[order], all_values[:, order]
+    keep = np.append(all_stamps[1:] != all_stamps[:-1], True)
+    return all_stamps[keep], all_values[:, keep]
+
+
+class BarArchive:
+    """
+    Partitioned columnar bar archive with coverage tracking.
+
+    Thread-safe: writes, buffer changes and coverage updates go through one
+    lock; reads of already written partitions are lock-free.
+    """
+
+    def __init__(self, root: str, enabled: bool = True, flush_bars: int = 30):
+        self.root = Path(root)
+        self.enabled = enabled
+        self.flush_bars = max(1, flush_bars)
+        self._lock = RLock()
+        self._pending: Dict[Tuple[str, str], Dict[int, np.ndarray]] = {}
+        self._coverage: Dict[Tuple[str, str], List[List[int]]] = {}
+        self.bars_written = 0
+        self.bars_read = 0
+        self.fetches = 0
+        self.served_from_disk = 0  # Symbols returned by read_through without any fetch
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _symbol_dir(self, symbol: str, timeframe: str) -> Path:
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Unsupported archive timeframe: {timeframe}")
+        return self.root / timeframe / symbol
+
+    @staticmethod
+    def _partition_keys(stamps: np.ndarray, timeframe: str) -> np.ndarray:
+        unit = TIMEFRAMES[timeframe][1]
+        return np.datetime_as_string(stamps.astype('datetime64[ns]').astype(f'datetime64[{unit}]'))
+
+    def _partitions(self, symbol: str, timeframe: str, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> List[Path]:
+        directory = self._symbol_dir(symbol, timeframe)
+        if not directory.is_dir():
+            return []
+        paths = sorted(directory.glob('*.npy'))
+        if start is not None:
+            first = self._partition_keys(np.array([start.value]), timeframe)[0]
+            paths = [p for p in paths if p.stem >= first]
+        if end is not None:
+            last = self._partition_keys(np.array([end.value]), timeframe)[0]
+            paths = [p for p in paths if p.stem <= last]
+        return paths
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write(
+        self,
+        symbol: str,
+        bars: Optional[pd.DataFrame],
+        timeframe: str = '1Min',
+        covered: Optional[Range] = None
+    ) -> int:
+        """
+        Merge a fetched bars frame into the archive.
+
+        Args:
+            symbol: Stock symbol
+            bars: Bars frame (timestamp index or column, Alpaca column names)
+            timeframe: '1Min' or '1Day'
+            covered: Range the fetch requested; recorded as complete up to the
+                last returned bar (nothing is recorded when no bars came back)
+
+        Returns:
+            Number of bars written
+        """
+        if not self.enabled or bars is None or bars.empty:
+            return 0
+        try:
+            stamps, values = _frame_arrays(bars)
+            with self._lock:
+                written = self._upsert(symbol, timeframe, stamps, values)
+                if covered is not None:
+                    bar_length = TIMEFRAMES[timeframe][0]
+                    last_bar_end = pd.Timestamp(int(stamps.max()), tz='UTC') + bar_length
+                    self._mark_covered(symbol, timeframe, _utc(covered[0]), min(_utc(covered[1]), last_bar_end))
+            return written
+        except Exception as e:
+            logger.error(f"Failed to archive bars for {symbol}: {e}")
+            return 0
+
+    def write_many(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        timeframe: str = '1Min',
+        covered: Optional[Range] = None
+    ) -> int:
+        """write() for each {symbol: frame}."""
+        return sum(self.write(symbol, df, timeframe, covered) for symbol, df in frames.items())
+
+    def append_bar(self, symbol: str, bar: Dict, timestamp=None, timeframe: str = '1Min'):
+        """Buffer one streamed bar; the symbol's buffer is written every flush_bars bars."""
+        if not self.enabled:
+            return
+        try:
+            ts = _utc(timestamp if timestamp is not None else bar['timestamp'])
+            row = np.array([float(bar.get(name) if bar.get(name) is not None else np.nan) for name in COLUMNS])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Not archiving malformed bar for {symbol}: {e}")
+            return
+
+        with self._lock:
+            pending = self._pending.setdefault((symbol, timeframe), {})
+            pending[ts.value] = row
+            if len(pending) >= self.flush_bars:
+                self._flush_key((symbol, timeframe))
+
+    def flush(self, symbol: Optional[str] = None):
+        """Write buffered streamed bars (all symbols, or one)."""
+        with self._lock:
+            for key in [k for k in self._pending if symbol is None or k[0] == symbol]:
+                self._flush_key(key)
+
+    def _flush_key(self, key: Tuple[str, str]):
+        pending = self._pending.pop(key, None)
+        if not pending:
+            return
+        try:
+            stamps = np.fromiter(pending.keys(), dtype=np.int64, count=len(pending))
+            values = np.stack(list(pending.values()), axis=1)
+            self._upsert(key[0], key[1], stamps, values)
+        except Exception as e:
+            logger.error(f"Failed to archive streamed bars for {key[0]}: {e}")
+
+    def _upsert(self, symbol: str, timeframe: str, stamps: np.ndarray, values: np.ndarray) -> int:
+        directory = self._symbol_dir(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        keys = self._partition_keys(stamps, timeframe)
+        for key in np.unique(keys):
+            mask = keys == key
+            path = directory / f"{key}.npy"
+            new_stamps, new_values = stamps[mask], values[:, mask]
+            if path.exists():
+                stored = np.load(path)
+                new_stamps, new_values = _merge(stored[0].view(np.int64), stored[1:], new_stamps, new_values)
+            else:
+                new_stamps, new_values = _merge(*_concat([], []), new_stamps, new_values)
+
+            partition = np.empty((len(COLUMNS) + 1, len(new_stamps)))
+            partition[0] = new_stamps.view(np.float64)
+            partition[1:] = new_values
+            tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp, 'wb') as f:
+                np.save(f, partition)
+            os.replace(tmp, path)
+        self.bars_written += len(stamps)
+        return len(stamps)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read_arrays(
+        self,
+        symbol: str,
+        start=None,
+        end=None,
+        timeframe: str = '1Min'
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (int64 ns timestamps, columns x bars values) with start <= timestamp <= end.
+        A range inside one partition returns read-only views of the mapped file.
+        """
+        start = _utc(start) if start is not None else None
+        end = _utc(end) if end is not None else None
+        parts_stamps, parts_values = [], []
+        for path in self._partitions(symbol, timeframe, start, end):
+            try:
+                mapped = np.load(path, mmap_mode='r')
+            except (OSError, ValueError) as e:
+                logger.error(f"Unreadable bar archive partition {path}: {e}")
+                continue
+            stamps = mapped[0].view(np.int64)
+            lo = np.searchsorted(stamps, start.value, 'left') if start is not None else 0
+            hi = np.searchsorted(stamps, end.value, 'right') if end is not None else len(stamps)
+            if hi > lo:
+                parts_stamps.append(stamps[lo:hi])
+                parts_values.append(mapped[1:, lo:hi])
+
+        stamps, values = _concat(parts_stamps, parts_values)
+
+        with self._lock:
+            pending = dict(self._pending.get((symbol, timeframe), {}))
+        if pending:
+            buffered = np.fromiter(pending.keys(), dtype=np.int64, count=len(pending))
+            in_range = np.ones(len(buffered), dtype=bool)
+            if start is not None:
+                in_range &= buffered >= start.value
+            if end is not None:
+                in_range &= buffered <= end.value
+            if in_range.any():
+                rows = np.stack(list(pending.values()), axis=1)
+                stamps, values = _merge(stamps, values, buffered[in_range], rows[:, in_range])
+
+        self.bars_read += len(stamps)
+        return stamps, values
+
+    def read(self, symbol: str, start=None, end=None, timeframe: str = '1Min') -> pd.DataFrame:
+        """Bars in [start, end] as a frame shaped like Alpaca's per-symbol bars."""
+        stamps, values = self.read_arrays(symbol, start, end, timeframe)
+        index = pd.DatetimeIndex(stamps.astype('datetime64[ns]'), name='timestamp').tz_localize('UTC')
+        return pd.DataFrame({name: values[row] for row, name in enumerate(COLUMNS)}, index=index)
+
+    def read_series(self, symbol: str, start=None, end=None, timeframe: str = '1Min') -> BarSeries:
+        """Bars in [start, end] as a BarSeries (views of the mapped partition when possible)."""
+        stamps, values = self.read_arrays(symbol, start, end, timeframe)
+        if not len(stamps):
+            return BarSeries.empty()
+        return BarSeries(stamps.view('datetime64[ns]'), *(values[COLUMNS.index(name)] for name in
+                                                          ('open', 'high', 'low', 'close', 'volume')))
+
+    # ------------------------------------------------------------------
+    # Coverage and gaps
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def settled(timeframe: str = '1Min', now: Optional[datetime] = None) -> pd.Timestamp:
+        """Start of the current, still forming bar; coverage never reaches past it."""
+        now = _utc(now or datetime.now(timezone.utc))
+        return now.floor(TIMEFRAMES[timeframe][0])
+
+    def _load_coverage(self, symbol: str, timeframe: str) -> List[List[int]]:
+        key = (symbol, timeframe)
+        if key not in self._coverage:
+            path = self._symbol_dir(symbol, timeframe) / 'coverage.json'
+            try:
+                self._coverage[key] = json.loads(path.read_text()) if path.exists() else []
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable archive coverage for {symbol}: {e}")
+                self._coverage[key] = []
+        return self._coverage[key]
+
+    def _mark_covered(self, symbol: str, timeframe: str, start: pd.Timestamp, end: pd.Timestamp):
+        end = min(end, self.settled(timeframe))
+        if end <= start:
+            return
+        intervals = sorted(self._load_coverage(symbol, timeframe) + [[start.value, end.value]])
+        merged: List[List[int]] = []
+        for lo, hi in intervals:
+            if merged and lo <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        self._coverage[(symbol, timeframe)] = merged
+
+        path = self._symbol_dir(symbol, timeframe) / 'coverage.json'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(merged))
+        os.replace(tmp, path)
+
+    def gaps(self, symbol: str, start, end, timeframe: str = '1Min') -> List[Range]:
+        """Sub-ranges of [start, end) the archive has not seen in full."""
+        start, end = _utc(start), _utc(end)
+        if end <= start:
+            return []
+        with self._lock:
+            intervals = list(self._load_coverage(symbol, timeframe))
+
+        missing: List[Range] = []
+        cursor = start.value
+        for lo, hi in intervals:
+            if hi <= cursor:
+                continue
+            if lo >= end.value:
+                break
+            if lo > cursor:
+                missing.append((pd.Timestamp(cursor, tz='UTC'), pd.Timestamp(lo, tz='UTC')))
+            cursor = max(cursor, hi)
+        if cursor < end.value:
+            missing.append((pd.Timestamp(cursor, tz='UTC'), end))
+        return missing
+
+    # ------------------------------------------------------------------
+    # Read-through
+    # ------------------------------------------------------------------
+
+    def read_through(
+        self,
+        symbols: List[str],
+        start,
+        end,
+        fetch: FetchFunc,
+        timeframe: str = '1Min'
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Bars for each symbol in [start, end], downloading only the gaps.
+
+        Symbols sharing a gap (the usual case: everything since the last
+        refresh) are fetched together in one fetch(symbols, gap_start, gap_end)
+        call.
+
+        Returns:
+            {symbol: bars frame} for symbols with bars in the range
+        """
+        if not self.enabled:
+            return fetch(symbols, start, end) or {}
+
+        start, end = _utc(start), _utc(end)
+        span_end = end + TIMEFRAMES[timeframe][0]  # The bar at `end` is part of the range
+        by_gap: Dict[Range, List[str]] = {}
+        for symbol in symbols:
+            for gap in self.gaps(symbol, start, span_end, timeframe):
+                by_gap.setdefault(gap, []).append(symbol)
+
+        # Bars a fetch returned are part of the result even if the source
+        # answered with a wider range than requested
+        bounds = {symbol: (start, end) for symbol in symbols}
+        for (gap_start, gap_end), group in by_gap.items():
+            self.fetches += 1
+            fetched = fetch(group, gap_start.to_pydatetime(), gap_end.to_pydatetime()) or {}
+            for symbol, df in fetched.items():
+                if symbol not in bounds or df is None or df.empty:
+                    continue
+                stamps, _ = _frame_arrays(df)
+                lo, hi = bounds[symbol]
+                bounds[symbol] = (min(lo, pd.Timestamp(int(stamps.min()), tz='UTC')),
+                                  max(hi, pd.Timestamp(int(stamps.max()), tz='UTC')))
+                self.write(symbol, df, timeframe, (gap_start, gap_end))
+
+        fetched_symbols = {s for group in by_gap.values() for s in group}
+        self.served_from_disk += len(set(symbols) - fetched_symbols)
+
+        result = {}
+        for symbol in symbols:
+            df = self.read(symbol, *bounds[symbol], timeframe)
+            if not df.empty:
+                result[symbol] = df
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pending = sum(len(p) for p in self._pending.values())
+        return {
+            'enabled': self.enabled,
+            'root': str(self.root),
+            'bars_written': self.bars_written,
+            'bars_read': self.bars_read,
+            'fetches': self.fetches,
+            'served_from_disk': self.served_from_disk,
+            'pending_stream_bars': pending,
+        }
+
+
+# Global instance
+_bar_archive: Optional[BarArchive] = None
+
+
+def get_bar_archive() -> BarArchive:
+    """Get or create the global bar archive."""
+    global _bar_archive
+    if _bar_archive is None:
+        _bar_archive = BarArchive(
+            root=settings.bar_archive_dir,
+            enabled=settings.bar_archive_enabled,
+            flush_bars=settings.bar_archive_flush_bars
+        )
+    return _bar_archive
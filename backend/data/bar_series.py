@@ -0,0 +1,161 @@
+"""
+Columnar Bar Series
+
+A compact OHLCV container: one float64 NumPy array per field plus a
+datetime64[ns] timestamp array, instead of a list of per-bar dicts.
+
+- from_frame() takes views of an Alpaca bars DataFrame's columns (no copy
+  when the columns are already float64, as Alpaca returns them).
+- split_frame() cuts a multi-symbol (symbol, timestamp) frame into one
+  series per symbol; symbols are contiguous in Alpaca responses, so every
+  series is a slice (view) of the frame's columns.
+- coerce() also accepts the legacy list-of-dicts form, so callers can pass
+  either while consumers work on arrays.
+
+Indexing with a slice returns a BarSeries of views; indexing with an int
+returns that bar as a dict (same keys as the legacy bar dicts).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[name].to_numpy(dtype=np.float64, copy=False)
+
+
+@dataclass(frozen=True)
+class BarSeries:
+    """OHLCV bars for one symbol as parallel arrays (oldest first)."""
+    timestamps: np.ndarray  # datetime64[ns], UTC (NaT when unknown)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def empty(cls) -> 'BarSeries':
+        nothing = np.empty(0)
+        return cls(np.empty(0, dtype='datetime64[ns]'), nothing, nothing, nothing, nothing, nothing)
+
+    @classmethod
+    def from_frame(cls, df: Optional[pd.DataFrame]) -> 'BarSeries':
+        """
+        Series over a per-symbol bars frame (timestamp index or 'timestamp'
+        column). A multi-index frame must hold a single symbol.
+        """
+        if df is None or df.empty:
+            return cls.empty()
+
+        if 'timestamp' in df.columns:
+            stamps = pd.DatetimeIndex(df['timestamp'])
+        else:
+            index = df.index
+            if isinstance(index, pd.MultiIndex):
+                index = index.get_level_values(-1)
+            stamps = pd.DatetimeIndex(index)
+        if stamps.tz is not None:
+            stamps = stamps.tz_convert('UTC').tz_localize(None)
+
+        return cls(
+            timestamps=stamps.to_numpy(dtype='datetime64[ns]'),
+            **{name: _column(df, name) for name in FIELDS}
+        )
+
+    @classmethod
+    def from_records(cls, bars: Iterable[Dict]) -> 'BarSeries':
+        """Series from legacy per-bar dicts (missing fields become NaN/NaT)."""
+        bars = list(bars)
+        if not bars:
+            return cls.empty()
+        stamps = pd.to_datetime([bar.get('timestamp') for bar in bars], utc=True)
+        return cls(
+            timestamps=stamps.tz_localize(None).to_numpy(dtype='datetime64[ns]'),
+            **{
+                name: np.array([bar.get(name, np.nan) for bar in bars], dtype=np.float64)
+                for name in FIELDS
+            }
+        )
+
+    @classmethod
+    def coerce(cls, bars: Union['BarSeries', pd.DataFrame, Iterable[Dict], None]) -> 'BarSeries':
+        """Accept a BarSeries, a bars DataFrame or a list of bar dicts."""
+        if isinstance(bars, BarSeries):
+            return bars
+        if bars is None:
+            return cls.empty()
+        if isinstance(bars, pd.DataFrame):
+            return cls.from_frame(bars)
+        return cls.from_records(bars)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return BarSeries(self.timestamps[key], *(getattr(self, name)[key] for name in FIELDS))
+        return self.bar(key)
+
+    def tail(self, n: int) -> 'BarSeries':
+        """Last n bars (all bars if fewer)."""
+        return self[-n:] if n < len(self) else self
+
+    def bar(self, i: int) -> Dict:
+        """Bar i as a legacy bar dict."""
+        timestamp = self.timestamps[i]
+        return {
+            'timestamp': None if np.isnat(timestamp) else pd.Timestamp(timestamp, tz='UTC'),
+            'open': float(self.open[i]),
+            'high': float(self.high[i]),
+            'low': float(self.low[i]),
+            'close': float(self.close[i]),
+            'volume': float(self.volume[i]),
+        }
+
+    def to_records(self) -> List[Dict]:
+        """Legacy list-of-dicts form (allocates one dict per bar)."""
+        return [self.bar(i) for i in range(len(self))]
+
+    @property
+    def last_close(self) -> float:
+        return float(self.close[-1]) if len(self) else 0.0
+
+
+def split_frame(bars: Optional[pd.DataFrame]) -> Dict[str, BarSeries]:
+    """
+    One BarSeries per symbol from an Alpaca (symbol, timestamp) multi-index
+    frame. Contiguous symbol blocks become views into the frame's columns.
+    """
+    if bars is None or bars.empty:
+        return {}
+    if not isinstance(bars.index, pd.MultiIndex):
+        raise ValueError("split_frame expects a (symbol, timestamp) multi-index frame")
+
+    names = bars.index.levels[0]
+    codes = np.asarray(bars.index.codes[0])
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    if len(starts) != len(np.unique(codes)):
+        # Interleaved symbols: group them (keeping bar order) at the cost of one copy
+        bars = bars.iloc[np.argsort(codes, kind='stable')]
+        codes = np.asarray(bars.index.codes[0])
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+    whole = BarSeries.from_frame(bars)
+    ends = np.r_[starts[1:], len(codes)]
+    return {str(names[codes[start]]): whole[start:end] for start, end in zip(starts, ends)}
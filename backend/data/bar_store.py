@@ -0,0 +1,224 @@
+"""
+Incremental Bar Store
+
+Keeps a rolling window of 1-minute OHLCV bars per symbol in memory so the
+market data loop only has to fetch bars newer than what it already holds,
+instead of re-downloading a full day of history every minute.
+
+Bars enter the store from three places:
+- seed(): the initial historical fetch for a symbol (at startup, or when
+  it is added to the watchlist / stream subscriptions)
+- extend(): incremental REST fetches (only bars newer than the last stored one)
+- append_bar(): bars pushed by the real-time stream
+"""
+
+from collections import deque
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# (timestamp, open, high, low, close, volume)
+BarTuple = Tuple[pd.Timestamp, float, float, float, float, float]
+
+
+def _to_timestamp(value) -> pd.Timestamp:
+    """Normalize datetimes/strings/Timestamps to a UTC pandas Timestamp."""
+    if value is None:
+        value = datetime.now(timezone.utc)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        return ts.tz_localize('UTC')
+    return ts.tz_convert('UTC')
+
+
+class BarStore:
+    """
+    Per-symbol ring buffer of OHLCV bars with a configurable maximum depth.
+
+    Thread-safe: all mutations and reads go through a single lock so the
+    store can be fed from the stream handlers and read by the data loop.
+    """
+
+    def __init__(self, max_bars: int = 500):
+        if max_bars <= 0:
+            raise ValueError("max_bars must be positive")
+        self.max_bars = max_bars
+        self._bars: Dict[str, Deque[BarTuple]] = {}
+        # Symbols holding fetched history, not just bars streamed since subscribing
+        self._seeded: Set[str] = set()
+        self._lock = Lock()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def seed(self, symbol: str, bars_df: pd.DataFrame) -> int:
+        """
+        Replace the stored history for a symbol with a freshly fetched frame.
+        Streamed bars newer than the fetched history are kept.
+
+        Returns:
+            Number of bars held for the symbol after seeding
+        """
+        buffer: Deque[BarTuple] = deque(maxlen=self.max_bars)
+        for bar in self._iter_frame(bars_df):
+            self._merge(buffer, bar)
+
+        with self._lock:
+            for bar in self._bars.get(symbol, ()):
+                self._merge(buffer, bar)
+            self._bars[symbol] = buffer
+            self._seeded.add(symbol)
+            return len(buffer)
+
+    def extend(self, symbol: str, bars_df: pd.DataFrame) -> int:
+        """
+        Merge bars from a fetched frame, keeping only bars newer than (or
+        revising) the last stored bar.
+
+        Returns:
+            Number of new bars appended
+        """
+        if bars_df is None or bars_df.empty:
+            return 0
+
+        with self._lock:
+            buffer = self._bars.setdefault(symbol, deque(maxlen=self.max_bars))
+            added = 0
+            for bar in self._iter_frame(bars_df):
+                added += self._merge(buffer, bar)
+            return added
+
+    def append_bar(self, symbol: str, bar: Dict, timestamp=None) -> bool:
+        """
+        Append a single bar (e.g. from the stream).
+
+        Returns:
+            True if the bar was appended as a new bar
+        """
+        try:
+            ts = _to_timestamp(timestamp if timestamp is not None else bar.get('timestamp'))
+            bar_tuple: BarTuple = (
+                ts,
+                float(bar.get('open') or 0),
+                float(bar.get('high') or 0),
+                float(bar.get('low') or 0),
+                float(bar.get('close') or 0),
+                float(bar.get('volume') or 0),
+            )
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Ignoring malformed bar for {symbol}: {e}")
+            return False
+
+        with self._lock:
+            buffer = self._bars.setdefault(symbol, deque(maxlen=self.max_bars))
+            return self._merge(buffer, bar_tuple) == 1
+
+    def clear(self, symbol: Optional[str] = None):
+        """Drop stored bars for one symbol, or for all symbols."""
+        with self._lock:
+            if symbol is None:
+                self._bars.clear()
+                self._seeded.clear()
+            else:
+                self._bars.pop(symbol, None)
+                self._seeded.discard(symbol)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def has_symbol(self, symbol: str) -> bool:
+        """True if the symbol has at least one stored bar."""
+        with self._lock:
+            return bool(self._bars.get(symbol))
+
+    def is_seeded(self, symbol: str) -> bool:
+        """True once the symbol's history has been seeded (streamed bars alone don't count)."""
+        with self._lock:
+            return symbol in self._seeded
+
+    def bar_count(self, symbol: str) -> int:
+        """Number of bars stored for a symbol."""
+        with self._lock:
+            return len(self._bars.get(symbol, ()))
+
+    def last_timestamp(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the most recent stored bar, or None."""
+        with self._lock:
+            buffer = self._bars.get(symbol)
+            return buffer[-1][0] if buffer else None
+
+    def symbols(self) -> List[str]:
+        """Symbols currently held in the store."""
+        with self._lock:
+            return [s for s, buffer in self._bars.items() if buffer]
+
+    def get_dataframe(self, symbol: str) -> pd.DataFrame:
+        """
+        Return stored bars as a DataFrame indexed by timestamp with
+        open/high/low/close/volume columns (same shape as a per-symbol
+        slice of the Alpaca bars frame). The frame is a copy and safe to mutate.
+        """
+        with self._lock:
+            rows = list(self._bars.get(symbol, ()))
+
+        if not rows:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        index = pd.DatetimeIndex([row[0] for row in rows], name='timestamp')
+        return pd.DataFrame([row[1:] for row in rows], index=index, columns=OHLCV_COLUMNS)
+
+    def get_stats(self) -> Dict:
+        """Store statistics for status endpoints."""
+        with self._lock:
+            counts = {s: len(buffer) for s, buffer in self._bars.items()}
+        return {
+            'symbols': len(counts),
+            'total_bars': sum(counts.values()),
+            'max_bars': self.max_bars,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _merge(buffer: Deque[BarTuple], bar: BarTuple) -> int:
+        """
+        Merge a bar into a buffer. Newer bars are appended, a bar with the
+        same timestamp as the last one replaces it (in-progress bar revised),
+        and older bars are ignored.
+
+        Returns:
+            1 if appended, 0 otherwise
+        """
+        if buffer:
+            last_ts = buffer[-1][0]
+            if bar[0] < last_ts:
+                return 0
+            if bar[0] == last_ts:
+                buffer[-1] = bar
+                return 0
+        buffer.append(bar)
+        return 1
+
+    @staticmethod
+    def _iter_frame(bars_df: Optional[pd.DataFrame]):
+        """Yield bar tuples from a per-symbol bars frame in timestamp order."""
+        if bars_df is None or bars_df.empty:
+            return
+
+        frame = bars_df.sort_index()
+        timestamps = [_to_timestamp(ts) for ts in frame.index]
+        columns = [frame[col].astype(float).tolist() for col in OHLCV_COLUMNS]
+        for i, ts in enumerate(timestamps):
+            yield (ts, columns[0][i], columns[1][i], columns[2][i], columns[3][i], columns[4][i])
@@ -0,0 +1,201 @@
+"""
+Bulk Bar Fetcher
+
+Fetches historical bars for many symbols by splitting them into chunks, each
+requested with a single multi-symbol StockBarsRequest, and running the chunks
+concurrently on a small worker pool. A shared rate budget keeps the total
+request rate under the broker's per-minute limit.
+
+Async callers (the scanner) await fetch_async(), which runs the blocking
+requests on the worker pool so the event loop keeps serving the position
+monitor and stop-loss checks while a scan is in flight.
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from typing import Deque, Dict, List, Optional
+
+import pandas as pd
+from alpaca.data.timeframe import TimeFrame
+
+from config import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def split_bars_by_symbol(bars: Optional[pd.DataFrame], symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Split an Alpaca (symbol, timestamp) bars frame into per-symbol frames."""
+    if bars is None or bars.empty:
+        return {}
+
+    result = {}
+    available = set(bars.index.get_level_values(0))
+    for symbol in symbols:
+        if symbol not in available:
+            continue
+        try:
+            symbol_bars = bars.loc[symbol]
+            if not symbol_bars.empty:
+                result[symbol] = symbol_bars
+        except Exception as e:
+            logger.error(f"Error processing bars for {symbol}: {e}")
+    return result
+
+
+class RateBudget:
+    """
+    Sliding-window request budget shared by all fetch workers.
+
+    acquire() blocks the calling worker thread until a request slot is free.
+    """
+
+    def __init__(self, requests_per_minute: int, window_seconds: float = 60.0):
+        self.requests_per_minute = max(1, requests_per_minute)
+        self.window_seconds = window_seconds
+        self._sent: Deque[float] = deque()
+        self._lock = Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.window_seconds:
+                    self._sent.popleft()
+                if len(self._sent) < self.requests_per_minute:
+                    self._sent.append(now)
+                    return
+                wait = self.window_seconds - (now - self._sent[0])
+            time.sleep(max(wait, 0.01))
+
+
+class BulkBarFetcher:
+    """Chunked, concurrent multi-symbol bar fetching with a shared rate budget."""
+
+    def __init__(
+        self,
+        alpaca_client,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None
+    ):
+        self.alpaca = alpaca_client
+        self.chunk_size = max(1, chunk_size or settings.bulk_fetch_chunk_size)
+        self.max_concurrency = max(1, max_concurrency or settings.bulk_fetch_max_concurrency)
+        self.rate_budget = RateBudget(requests_per_minute or settings.bulk_fetch_requests_per_minute)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='bar-fetch'
+        )
+
+        self.requests_sent = 0
+        self.last_fetch_seconds = 0.0
+        self._stats_lock = Lock()
+
+    def chunk(self, symbols: List[str]) -> List[List[str]]:
+        """Split symbols (deduplicated, order kept) into request-sized chunks."""
+        unique = list(dict.fromkeys(symbols))
+        return [unique[i:i + self.chunk_size] for i in range(0, len(unique), self.chunk_size)]
+
+    def fetch(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        timeframe: TimeFrame = TimeFrame.Minute
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch bars for all symbols (blocking). A single chunk is requested on
+        the calling thread; multiple chunks run concurrently on the worker pool.
+
+        Returns:
+            {symbol: bars frame} for symbols that returned bars
+        """
+        chunks = self.chunk(symbols)
+        if not chunks:
+            return {}
+
+        started = time.perf_counter()
+        if len(chunks) == 1:
+            parts = [self._fetch_chunk(chunks[0], start, end, timeframe)]
+        else:
+            parts = list(self._executor.map(
+                lambda chunk: self._fetch_chunk(chunk, start, end, timeframe), chunks
+            ))
+        return self._combine(parts, len(symbols), len(chunks), started)
+
+    async def fetch_async(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        timeframe: TimeFrame = TimeFrame.Minute
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch bars for all symbols without blocking the event loop.
+
+        Returns:
+            {symbol: bars frame} for symbols that returned bars
+        """
+        chunks = self.chunk(symbols)
+        if not chunks:
+            return {}
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, self._fetch_chunk, chunk, start, end, timeframe)
+            for chunk in chunks
+        ])
+        return self._combine(parts, len(symbols), len(chunks), started)
+
+    def _fetch_chunk(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: Optional[datetime],
+        timeframe: TimeFrame
+    ) -> Dict[str, pd.DataFrame]:
+        """Request one chunk of symbols with a single multi-symbol request."""
+        self.rate_budget.acquire()
+        with self._stats_lock:
+            self.requests_sent += 1
+
+        try:
+            bars = self.alpaca.get_bars(
+                symbols=symbols,
+                timeframe=timeframe,
+                start=start,
+                end=end
+            )
+            return split_bars_by_symbol(bars, symbols)
+        except Exception as e:
+            logger.error(f"Failed to fetch bars for chunk of {len(symbols)} symbols: {e}")
+            return {}
+
+    def _combine(self, parts: List[Dict], num_symbols: int, num_chunks: int, started: float) -> Dict[str, pd.DataFrame]:
+        result = {}
+        for part in parts:
+            result.update(part)
+
+        self.last_fetch_seconds = time.perf_counter() - started
+        if num_chunks > 1:
+            logger.info(
+                f"Bulk fetched bars for {len(result)}/{num_symbols} symbols "
+                f"in {num_chunks} requests ({self.last_fetch_seconds:.2f}s)"
+            )
+        return result
+
+    def get_stats(self) -> Dict:
+        """Fetcher statistics for status endpoints."""
+        return {
+            'chunk_size': self.chunk_size,
+            'max_concurrency': self.max_concurrency,
+            'requests_per_minute': self.rate_budget.requests_per_minute,
+            'requests_sent': self.requests_sent,
+            'last_fetch_seconds': round(self.last_fetch_seconds, 3),
+        }
@@ -21,10 +21,13 @@ import numpy as np
 import requests
 import os
 from config import settings
+from data.bar_archive import get_bar_archive
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+DAILY_BARS = 200  # Need 200 days for 200-EMA
+
 
 class DailyCache:
     """
@@ -117,7 +120,7 @@ class DailyCache:
             params = {
                 'symbol': symbol,
                 'interval': '1day',
-                'outputsize': 200,  # Need 200 days for 200-EMA
+                'outputsize': DAILY_BARS,
                 'apikey': self.current_api_key
             }
             
@@ -169,6 +172,39 @@ class DailyCache:
             logger.error(f"Failed to fetch Twelve Data bars for {symbol}: {e}")
             return None
     
+    def get_daily_bars(self, symbol: str) -> Optional[list]:
+        """
+        Daily bars (oldest to newest), read from the local bar archive when it
+        already holds the last DAILY_BARS completed sessions; otherwise fetched
+        from Twelve Data and archived.
+        
+        Args:
+            symbol: Stock symbol
+            
+        Returns:
+            List of daily bars (Twelve Data field names) or None if failed
+        """
+        archive = get_bar_archive()
+        today = archive.settled('1Day')
+        
+        if archive.enabled:
+            archived = archive.read(symbol, end=today - pd.Timedelta(days=1), timeframe='1Day').tail(DAILY_BARS)
+            if len(archived) == DAILY_BARS and not archive.gaps(symbol, archived.index[0], today, '1Day'):
+                return [
+                    {'datetime': ts.strftime('%Y-%m-%d'), **{k: row[k] for k in ('open', 'high', 'low', 'close', 'volume')}}
+                    for ts, row in archived.iterrows()
+                ]
+        
+        bars = self.fetch_twelvedata_bars(symbol)
+        if bars:
+            try:
+                frame = pd.DataFrame(bars)
+                frame.index = pd.to_datetime(frame.pop('datetime'), utc=True)
+                archive.write(symbol, frame, '1Day', covered=(frame.index[0], today))
+            except Exception as e:
+                logger.debug(f"Non-fatal: failed to archive daily bars for {symbol}: {e}")
+        return bars
+    
     def calculate_ema(self, prices: list, period: int) -> float:
         """
         Calculate EMA manually.
@@ -235,8 +271,8 @@ class DailyCache:
                         self.switch_api_key()
                         logger.info(f"🔄 Switched to {'secondary' if self.api_key_index == 1 else 'primary'} key (processed {i} symbols)")
                     
-                    # Fetch daily bars from Twelve Data
-                    bars = self.fetch_twelvedata_bars(symbol)
+                    # Daily bars from the local archive, else Twelve Data
+                    bars = self.get_daily_bars(symbol)
                     
                     if not bars:
                         logger.warning(f"No daily bars for {symbol}")
@@ -0,0 +1,199 @@
+"""
+Feature Cache
+
+Memoizes computed features per bar set so the strategy, scanner, momentum
+and MTF loops do not recompute indicators on bars that have not changed
+since the last request.
+
+A bar set is identified by (symbol, timeframe, last bar stamp), where the
+stamp is the last bar's timestamp plus its close and volume, so a revised
+in-progress bar is a new bar set. A `kind` string names what was computed
+from it (including any parameters, e.g. "panel:9:21"), so different
+feature sets over the same bars never collide. Entries are evicted
+least-recently-used once `max_entries` is reached; nothing expires by time
+because a new or revised bar moves the key on.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+from data.bar_series import BarSeries
+
+# (timestamp, close, volume) of the last bar
+BarStamp = Tuple[pd.Timestamp, float, float]
+CacheKey = Tuple[str, str, str, BarStamp]
+
+
+def bar_stamp(bars: Union[pd.DataFrame, BarSeries, None]) -> Optional[BarStamp]:
+    """
+    Stamp of the last bar of a frame or BarSeries, or None if there are no
+    bars or they carry no timestamps (DatetimeIndex or 'timestamp' column).
+    Bars without a stamp are never cached.
+    """
+    if bars is None or len(bars) == 0:
+        return None
+    if isinstance(bars, BarSeries):
+        if np.isnat(bars.timestamps[-1]):
+            return None
+        return (pd.Timestamp(bars.timestamps[-1], tz='UTC'), float(bars.close[-1]), float(bars.volume[-1]))
+    try:
+        last = bars.iloc[-1]
+        if 'timestamp' in bars.columns:
+            ts = pd.Timestamp(last['timestamp'])
+        elif isinstance(bars.index, pd.DatetimeIndex):
+            ts = bars.index[-1]
+        else:
+            return None
+        return (ts, float(last['close']), float(last['volume']))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def feature_kind(ema_short: int, ema_long: int) -> str:
+    """Kind of the FeatureEngine feature set (shared by every engine that emits it)."""
+    return f"features:{ema_short}:{ema_long}"
+
+
+class FeatureCache:
+    """
+    LRU map of (kind, symbol, timeframe, last bar stamp) -> features.
+
+    Thread-safe. Dict values are copied on the way in and out, so callers
+    that stamp or extend their features do not alter the cached entry.
+    """
+
+    def __init__(self, max_entries: int = 2000, enabled: bool = True):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[CacheKey, Any]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return dict(value) if isinstance(value, dict) else value
+
+    @staticmethod
+    def make_key(kind: str, symbol: str, timeframe: str, stamp: Optional[BarStamp]) -> Optional[CacheKey]:
+        if stamp is None:
+            return None
+        return (kind, symbol, timeframe, stamp)
+
+    def get(self, kind: str, symbol: str, timeframe: str, stamp: Optional[BarStamp]) -> Optional[Any]:
+        """Cached features for a bar set, or None (counted as a miss unless unstamped)."""
+        key = self.make_key(kind, symbol, timeframe, stamp)
+        if key is None:
+            return None
+        with self._lock:
+            if not self.enabled or key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._copy(self._entries[key])
+
+    def put(self, kind: str, symbol: str, timeframe: str, stamp: Optional[BarStamp], features: Any):
+        """Store features for a bar set (None results are not cached)."""
+        key = self.make_key(kind, symbol, timeframe, stamp)
+        if not self.enabled or key is None or features is None:
+            return
+        with self._lock:
+            self._entries[key] = self._copy(features)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(
+        self,
+        kind: str,
+        symbol: str,
+        timeframe: str,
+        stamp: Optional[BarStamp],
+        compute: Callable[[], Any]
+    ) -> Any:
+        """Return cached features for the bar set or compute and store them."""
+        cached = self.get(kind, symbol, timeframe, stamp)
+        if cached is not None:
+            return cached
+        features = compute()
+        self.put(kind, symbol, timeframe, stamp, features)
+        return features
+
+    def get_or_compute_batch(
+        self,
+        kind: str,
+        frames: Dict[str, pd.DataFrame],
+        compute: Callable[[Dict[str, pd.DataFrame]], Dict[str, Any]],
+        timeframe: str = '1min'
+    ) -> Dict[str, Any]:
+        """
+        Batch variant for vectorized engines: `compute` only receives the
+        frames whose bar set has no cached entry.
+
+        Returns:
+            {symbol: features} for cached and newly computed symbols
+        """
+        results: Dict[str, Any] = {}
+        stale: Dict[str, pd.DataFrame] = {}
+        stamps = {symbol: bar_stamp(df) for symbol, df in frames.items()}
+        for symbol, df in frames.items():
+            cached = self.get(kind, symbol, timeframe, stamps[symbol])
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                stale[symbol] = df
+
+        if stale:
+            computed = compute(stale) or {}
+            for symbol, features in computed.items():
+                self.put(kind, symbol, timeframe, stamps.get(symbol), features)
+            results.update(computed)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hit_rate(), 4),
+            }
+
+
+# Global instance
+_feature_cache: Optional[FeatureCache] = None
+
+
+def get_feature_cache() -> FeatureCache:
+    """Get or create the global feature cache."""
+    global _feature_cache
+    if _feature_cache is None:
+        _feature_cache = FeatureCache(
+            max_entries=settings.feature_cache_max_entries,
+            enabled=settings.feature_cache_enabled
+        )
+    return _feature_cache
@@ -8,6 +8,7 @@ from indicators.vwap import calculate_vwap, vwap_signals
 from indicators.momentum import calculate_rsi, calculate_macd, rsi_momentum_filter, macd_momentum_filter
 from indicators.trend import calculate_adx, detect_market_regime
 from indicators.volume import calculate_volume_ratio, detect_volume_spike, calculate_on_balance_volume
+from indicators import kernels
 
 logger = setup_logger(__name__)
 
@@ -18,19 +19,12 @@ class FeatureEngine:
     @staticmethod
     def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
         """Calculate Exponential Moving Average."""
-        return prices.ewm(span=period, adjust=False).mean()
+        return pd.Series(kernels.ema(prices, period), index=prices.index)
     
     @staticmethod
     def calculate_atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
         """Calculate Average True Range."""
-        high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
-        
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-        
-        return true_range.rolling(window=period).mean()
+        return pd.Series(kernels.atr(high, low, close, period), index=high.index)
     
     @staticmethod
     def calculate_volume_zscore(volume: pd.Series, period: int = 20) -> float:
@@ -145,6 +139,82 @@ class FeatureEngine:
             logger.error(f"Failed to calculate enhanced features: {e}")
             return None
     
+    @staticmethod
+    def assemble_features(
+        price: float, ema_short: float, ema_long: float, prev_ema_short: float,
+        prev_ema_long: float, atr: float, volume: float, volume_zscore: float,
+        vwap: float, rsi: float, prev_rsi: float, macd: float, macd_signal: float,
+        macd_histogram: float, prev_macd_histogram: float, adx: float,
+        plus_di: float, minus_di: float, volume_ratio: float, obv: float,
+    ) -> Dict:
+        """
+        Build a feature dict (same keys as calculate_features) from the latest
+        indicator values: derived regime, VWAP/RSI/MACD signals and confidence.
+        
+        Shared by the vectorized panel (data/panel_features.py) and the
+        incremental engine (data/incremental_features.py).
+        """
+        if adx > 25:
+            market_regime = 'trending'
+        elif adx < 20:
+            market_regime = 'ranging'
+        else:
+            market_regime = 'transitional'
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deviation = np.float64(price - vwap) / np.float64(vwap)
+        if deviation > 0.001:
+            vwap_signal = 1
+        elif deviation < -0.001:
+            vwap_signal = -1
+        else:
+            vwap_signal = 0
+
+        rsi_momentum = 0
+        if rsi > 50 and rsi > prev_rsi:
+            rsi_momentum = 1
+        elif rsi < 50 and rsi < prev_rsi:
+            rsi_momentum = -1
+
+        macd_momentum = 0
+        if macd_histogram > 0 and macd_histogram > prev_macd_histogram:
+            macd_momentum = 1
+        elif macd_histogram < 0 and macd_histogram < prev_macd_histogram:
+            macd_momentum = -1
+
+        confidence_score = FeatureEngine.calculate_confidence_score(
+            ema_short, ema_long, rsi, macd_histogram, volume_ratio, price, vwap
+        )
+
+        return {
+            'price': float(price),
+            'ema_short': float(ema_short),
+            'ema_long': float(ema_long),
+            'prev_ema_short': float(prev_ema_short),
+            'prev_ema_long': float(prev_ema_long),
+            'atr': float(atr),
+            'volume': int(volume),
+            'volume_zscore': float(volume_zscore),
+            'ema_diff': float(ema_short - ema_long),
+            'ema_diff_pct': float((ema_short / ema_long - 1) * 100),
+            'vwap': float(vwap),
+            'rsi': float(rsi),
+            'macd': float(macd),
+            'macd_signal': float(macd_signal),
+            'macd_histogram': float(macd_histogram),
+            'adx': float(adx),
+            'plus_di': float(plus_di),
+            'minus_di': float(minus_di),
+            'market_regime': market_regime,
+            'volume_ratio': float(volume_ratio),
+            'volume_spike': bool(volume_ratio > 2.0),
+            'obv': float(obv),
+            'vwap_signal': vwap_signal,
+            'rsi_momentum': rsi_momentum,
+            'macd_momentum': macd_momentum,
+            'confidence_score': confidence_score,
+        }
+    
     @staticmethod
     def calculate_confidence_score(ema_short: float, ema_long: float, rsi: float, 
                                  macd_histogram: float, volume_ratio: float,
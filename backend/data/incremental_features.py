@@ -0,0 +1,388 @@
+"""
+Incremental (Streaming) Indicator Engine
+
+Maintains per-symbol indicator state that is updated in constant time per new
+bar, instead of recomputing every indicator over the full DataFrame on every
+tick. The emitted feature dict has the same keys and semantics as
+FeatureEngine.calculate_features, so strategy/scanner consumers are unchanged.
+
+Indicators tracked:
+- EMA short/long (and previous values for crossover detection)
+- RSI (Wilder smoothing)
+- MACD line, signal and histogram
+- ATR (14-bar simple average of true range, as in FeatureEngine)
+- Wilder ADX, +DI, -DI
+- VWAP (reset each trading session)
+- Volume ratio, volume spike, volume z-score, OBV
+
+The smoothing recurrences replicate pandas `ewm(adjust=False)` exactly,
+including how NaN observations are weighted, so values match the pandas
+implementations in indicators/*.py bar for bar (see tests/test_incremental_features.py).
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from data.features import FeatureEngine
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+NAN = float('nan')
+SESSION_TZ = 'America/New_York'
+
+
+def _div(numerator: float, denominator: float) -> float:
+    """Division with pandas/numpy semantics (x/0 -> +/-inf, 0/0 -> NaN)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+
+class _EWM:
+    """
+    One-observation-at-a-time equivalent of `Series.ewm(alpha=..., adjust=False).mean()`.
+
+    Mirrors the pandas recurrence: the running mean starts at the first valid
+    observation, and each missing observation decays the old weight by (1 - alpha).
+    """
+
+    __slots__ = ('alpha', 'value', '_old_wt')
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.value = NAN
+        self._old_wt = 1.0
+
+    @classmethod
+    def from_span(cls, span: int) -> '_EWM':
+        return cls(2.0 / (span + 1.0))
+
+    def update(self, x: float) -> float:
+        if math.isnan(self.value):
+            if not math.isnan(x):
+                self.value = x
+                self._old_wt = 1.0
+            return self.value
+
+        self._old_wt *= (1.0 - self.alpha)
+        if not math.isnan(x):
+            self.value = (self._old_wt * self.value + self.alpha * x) / (self._old_wt + self.alpha)
+            self._old_wt = 1.0
+        return self.value
+
+    def copy(self) -> '_EWM':
+        clone = _EWM(self.alpha)
+        clone.value = self.value
+        clone._old_wt = self._old_wt
+        return clone
+
+
+class IncrementalIndicatorState:
+    """
+    Streaming indicator state for a single symbol.
+
+    Call update() once per bar in timestamp order. A bar with the same
+    timestamp as the last one is treated as a revision of that bar: the state
+    is rolled back to before the previous update and the revised bar applied.
+    """
+
+    # Fields that hold mutable containers and must be cloned for checkpoints
+    _CONTAINER_FIELDS = (
+        'ema_short', 'ema_long', 'ema_fast', 'ema_slow', 'macd_signal_ewm',
+        'rsi_gain', 'rsi_loss', 'wilder_tr', 'wilder_plus_dm', 'wilder_minus_dm',
+        'adx_ewm', 'tr_window', 'volume_window',
+    )
+
+    def __init__(
+        self,
+        ema_short: int = 9,
+        ema_long: int = 21,
+        rsi_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        atr_period: int = 14,
+        adx_period: int = 14,
+        volume_window: int = 20,
+        reset_vwap_daily: bool = True,
+    ):
+        self.ema_short_period = ema_short
+        self.ema_long_period = ema_long
+        self.min_bars = max(ema_long, macd_slow)
+        self.reset_vwap_daily = reset_vwap_daily
+
+        self.ema_short = _EWM.from_span(ema_short)
+        self.ema_long = _EWM.from_span(ema_long)
+        self.ema_fast = _EWM.from_span(macd_fast)
+        self.ema_slow = _EWM.from_span(macd_slow)
+        self.macd_signal_ewm = _EWM.from_span(macd_signal)
+
+        self.rsi_gain = _EWM(1.0 / rsi_period)
+        self.rsi_loss = _EWM(1.0 / rsi_period)
+
+        self.wilder_tr = _EWM(1.0 / adx_period)
+        self.wilder_plus_dm = _EWM(1.0 / adx_period)
+        self.wilder_minus_dm = _EWM(1.0 / adx_period)
+        self.adx_ewm = _EWM(1.0 / adx_period)
+
+        self.tr_window: Deque[float] = deque(maxlen=atr_period)
+        self.volume_window: Deque[float] = deque(maxlen=volume_window)
+
+        self.bar_count = 0
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.session_date = None
+
+        self.close = NAN
+        self.high = NAN
+        self.low = NAN
+        self.volume = 0.0
+
+        self.prev_ema_short = NAN
+        self.prev_ema_long = NAN
+        self.rsi = NAN
+        self.prev_rsi = NAN
+        self.macd = NAN
+        self.macd_signal = NAN
+        self.macd_histogram = NAN
+        self.prev_macd_histogram = NAN
+        self.atr = NAN
+        self.plus_di = NAN
+        self.minus_di = NAN
+        self.adx = NAN
+        self.volume_ratio = NAN
+        self.obv = 0.0
+        self.cum_pv = 0.0
+        self.cum_volume = 0.0
+        self.vwap = NAN
+
+        self._checkpoint: Optional[Dict] = None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(
+        self,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        timestamp=None,
+    ) -> bool:
+        """
+        Apply one bar.
+
+        Returns:
+            False if the bar is older than the last applied bar and was ignored
+        """
+        ts = pd.Timestamp(timestamp) if timestamp is not None else None
+        if ts is not None and ts.tzinfo is None:
+            ts = ts.tz_localize('UTC')
+
+        if ts is not None and self.last_timestamp is not None:
+            if ts < self.last_timestamp:
+                return False
+            if ts == self.last_timestamp and self._checkpoint is not None:
+                self._restore(self._checkpoint)
+
+        self._checkpoint = self._snapshot()
+        self._apply(float(high), float(low), float(close), float(volume), ts)
+        return True
+
+    def update_from_frame(self, bars_df: pd.DataFrame, since: Optional[pd.Timestamp] = None) -> int:
+        """
+        Apply bars from a per-symbol OHLCV frame, optionally only those at or
+        after `since` (the last applied timestamp is re-applied as a revision).
+
+        Returns:
+            Number of bars applied
+        """
+        if bars_df is None or bars_df.empty:
+            return 0
+
+        frame = bars_df
+        if since is not None:
+            start = frame.index.searchsorted(since)
+            frame = frame.iloc[start:]
+
+        applied = 0
+        for ts, o, h, l, c, v in zip(
+            frame.index,
+            frame['open'].to_numpy(dtype=float),
+            frame['high'].to_numpy(dtype=float),
+            frame['low'].to_numpy(dtype=float),
+            frame['close'].to_numpy(dtype=float),
+            frame['volume'].to_numpy(dtype=float),
+        ):
+            if self.update(o, h, l, c, v, ts):
+                applied += 1
+        return applied
+
+    def can_resume_from(self, bars_df: pd.DataFrame) -> bool:
+        """True if the frame still contains the last applied bar, so only its tail needs applying."""
+        if self.last_timestamp is None or bars_df is None or bars_df.empty:
+            return False
+        return bars_df.index[0] <= self.last_timestamp <= bars_df.index[-1]
+
+    def _apply(self, high: float, low: float, close: float, volume: float, ts: Optional[pd.Timestamp]):
+        prev_close = self.close
+        prev_high = self.high
+        prev_low = self.low
+        first_bar = self.bar_count == 0
+
+        # EMAs
+        self.prev_ema_short = self.ema_short.value
+        self.prev_ema_long = self.ema_long.value
+        self.ema_short.update(close)
+        self.ema_long.update(close)
+
+        # RSI (Wilder) - first delta is NaN and counts as zero gain/loss
+        delta = NAN if first_bar else close - prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.prev_rsi = self.rsi
+        rs = _div(self.rsi_gain.update(gain), self.rsi_loss.update(loss))
+        self.rsi = 100.0 - _div(100.0, 1.0 + rs)
+
+        # MACD
+        self.macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        self.macd_signal = self.macd_signal_ewm.update(self.macd)
+        self.prev_macd_histogram = self.macd_histogram
+        self.macd_histogram = self.macd - self.macd_signal
+
+        # True range (first bar: high - low only)
+        if first_bar:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        # ATR: simple average of the last N true ranges
+        self.tr_window.append(true_range)
+        if len(self.tr_window) == self.tr_window.maxlen:
+            self.atr = sum(self.tr_window) / len(self.tr_window)
+
+        # Directional movement and Wilder ADX
+        plus_dm = minus_dm = 0.0
+        if not first_bar:
+            up_move = high - prev_high
+            down_move = prev_low - low
+            if up_move > down_move and up_move > 0:
+                plus_dm = up_move
+            if down_move > up_move and down_move > 0:
+                minus_dm = down_move
+        wilder_atr = self.wilder_tr.update(true_range)
+        self.plus_di = 100.0 * _div(self.wilder_plus_dm.update(plus_dm), wilder_atr)
+        self.minus_di = 100.0 * _div(self.wilder_minus_dm.update(minus_dm), wilder_atr)
+        dx = 100.0 * _div(abs(self.plus_di - self.minus_di), self.plus_di + self.minus_di)
+        self.adx = self.adx_ewm.update(dx)
+
+        # Volume ratio against rolling average
+        self.volume_window.append(volume)
+        if len(self.volume_window) == self.volume_window.maxlen:
+            self.volume_ratio = _div(volume, sum(self.volume_window) / len(self.volume_window))
+
+        # OBV
+        if not first_bar:
+            if close > prev_close:
+                self.obv += volume
+            elif close < prev_close:
+                self.obv -= volume
+
+        # Session VWAP
+        if self.reset_vwap_daily and ts is not None:
+            session_date = ts.tz_convert(SESSION_TZ).date()
+            if session_date != self.session_date:
+                self.session_date = session_date
+                self.cum_pv = 0.0
+                self.cum_volume = 0.0
+        typical_price = (high + low + close) / 3.0
+        self.cum_pv += typical_price * volume
+        self.cum_volume += volume
+        self.vwap = _div(self.cum_pv, self.cum_volume)
+
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.bar_count += 1
+        if ts is not None:
+            self.last_timestamp = ts
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    @property
+    def is_ready(self) -> bool:
+        """True once enough bars were applied to emit features (same warm-up as FeatureEngine)."""
+        return self.bar_count >= self.min_bars
+
+    def volume_zscore(self) -> float:
+        """Z-score of the latest volume against the rolling volume window."""
+        window = self.volume_window
+        if len(window) < window.maxlen:
+            return 0.0
+        mean = sum(window) / len(window)
+        variance = sum((v - mean) ** 2 for v in window) / (len(window) - 1)
+        std = math.sqrt(variance)
+        if std == 0:
+            return 0.0
+        return (self.volume - mean) / std
+
+    def features(self) -> Optional[Dict]:
+        """
+        Emit the current feature dict (same keys as FeatureEngine.calculate_features),
+        or None during warm-up.
+        """
+        if not self.is_ready:
+            return None
+
+        try:
+            return FeatureEngine.assemble_features(
+                price=self.close,
+                ema_short=self.ema_short.value,
+                ema_long=self.ema_long.value,
+                prev_ema_short=self.prev_ema_short,
+                prev_ema_long=self.prev_ema_long,
+                atr=self.atr,
+                volume=self.volume,
+                volume_zscore=self.volume_zscore(),
+                vwap=self.vwap,
+                rsi=self.rsi,
+                prev_rsi=self.prev_rsi,
+                macd=self.macd,
+                macd_signal=self.macd_signal,
+                macd_histogram=self.macd_histogram,
+                prev_macd_histogram=self.prev_macd_histogram,
+                adx=self.adx,
+                plus_di=self.plus_di,
+                minus_di=self.minus_di,
+                volume_ratio=self.volume_ratio,
+                obv=self.obv,
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to emit incremental features: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Checkpointing (for revised bars)
+    # ------------------------------------------------------------------
+
+    def _snapshot(self) -> Dict:
+        state = {k: v for k, v in self.__dict__.items() if k != '_checkpoint'}
+        for field in self._CONTAINER_FIELDS:
+            state[field] = state[field].copy()
+        return state
+
+    def _restore(self, state: Dict):
+        checkpoint = self._checkpoint
+        self.__dict__.update(state)
+        for field in self._CONTAINER_FIELDS:
+            setattr(self, field, state[field].copy())
+        self._checkpoint = checkpoint
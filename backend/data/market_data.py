@@ -1,11 +1,19 @@
 import pandas as pd
-from datetime import datetime, timedelta
+from threading import Lock
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 from alpaca.data.timeframe import TimeFrame
 from core.alpaca_client import AlpacaClient
 from core.supabase_client import SupabaseClient
+from core.async_io import run_blocking
 from core.state import trading_state
+from data.bar_archive import get_bar_archive
+from data.bar_store import BarStore
+from data.bulk_bars import BulkBarFetcher
 from data.features import FeatureEngine
+from data.incremental_features import IncrementalIndicatorState
+from data.feature_cache import bar_stamp, feature_kind, get_feature_cache
+from data.panel_features import cached_panel_features
 from config import settings
 from utils.logger import setup_logger
 
@@ -25,6 +33,13 @@ class MarketDataManager:
         self.alpaca = alpaca_client
         self.supabase = supabase_client
         self.feature_engine = FeatureEngine()
+        self.bar_store = BarStore(max_bars=settings.bar_store_max_bars)
+        self.bulk_fetcher = BulkBarFetcher(alpaca_client)
+        self.indicator_states: Dict[str, IncrementalIndicatorState] = {}
+        self.feature_cache = get_feature_cache()
+        self.archive = get_bar_archive()
+        # Indicator states are advanced from the data loop and stream handlers on I/O threads
+        self._indicator_lock = Lock()
     
     def fetch_historical_bars(
         self,
@@ -34,32 +49,61 @@ class MarketDataManager:
         """
         Fetch historical bars for symbols.
         Used for initial feature computation.
+        Bars already in the local archive are read from disk; only gaps are downloaded.
+        """
+        end = datetime.now(timezone.utc)
+        return self.archive.read_through(symbols, end - timedelta(days=days), end, self._fetch_bars)
+    
+    async def fetch_historical_bars_async(
+        self,
+        symbols: List[str],
+        days: int = 30
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch historical bars for symbols without blocking the event loop.
+        Gaps in the local archive are requested in concurrent chunks (see BulkBarFetcher).
         """
         try:
-            start = datetime.now() - timedelta(days=days)
-            end = datetime.now()
-            
-            bars = self.alpaca.get_bars(
-                symbols=symbols,
-                timeframe=TimeFrame.Minute,
-                start=start,
-                end=end
+            end = datetime.now(timezone.utc)
+            return await run_blocking(
+                self.archive.read_through, symbols, end - timedelta(days=days), end, self._fetch_bars
             )
+        except Exception as e:
+            logger.error(f"Failed to fetch historical bars: {e}")
+            return {}
+    
+    def fetch_bars_since(
+        self,
+        symbols: List[str],
+        start: datetime
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch only the bars at or after `start` for symbols.
+        Used for incremental updates of the bar store; new bars are also archived.
+        """
+        result = self._fetch_bars(symbols, start=start, end=None, verbose=False)
+        self.archive.write_many(result, covered=(start, datetime.now(timezone.utc)))
+        return result
+    
+    def _fetch_bars(
+        self,
+        symbols: List[str],
+        start: datetime,
+        end: Optional[datetime],
+        verbose: bool = True
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch 1-minute bars for symbols (chunked) and split them per symbol."""
+        try:
+            result = self.bulk_fetcher.fetch(symbols, start=start, end=end, timeframe=TimeFrame.Minute)
             
-            if bars is None or bars.empty:
-                logger.warning("No historical bars fetched")
+            if not result:
+                if verbose:
+                    logger.warning("No historical bars fetched")
                 return {}
             
-            # Group by symbol
-            result = {}
-            for symbol in symbols:
-                try:
-                    symbol_bars = bars.loc[symbol] if symbol in bars.index.get_level_values(0) else pd.DataFrame()
-                    if not symbol_bars.empty:
-                        result[symbol] = symbol_bars
-                        logger.info(f"Fetched {len(symbol_bars)} bars for {symbol}")
-                except Exception as e:
-                    logger.error(f"Error processing bars for {symbol}: {e}")
+            if verbose:
+                for symbol, symbol_bars in result.items():
+                    logger.info(f"Fetched {len(symbol_bars)} bars for {symbol}")
             
             return result
             
@@ -102,27 +146,31 @@ class MarketDataManager:
     ) -> Optional[Dict]:
         """
         Compute features for a symbol.
+        
+        With incremental features enabled, only bars newer than the symbol's
+        indicator state are applied; otherwise all indicators are recomputed
+        over the full frame.
         """
         try:
-            features = self.feature_engine.calculate_features(
-                bars_df,
-                ema_short=settings.ema_short,
-                ema_long=settings.ema_long
-            )
+            kind = feature_kind(settings.ema_short, settings.ema_long)
+            stamp = bar_stamp(bars_df)
+            if settings.incremental_features_enabled:
+                # The indicator state must see every bar, so the cache is only filled here
+                with self._indicator_lock:
+                    features = self._sync_indicator_state(symbol, bars_df).features()
+                self.feature_cache.put(kind, symbol, '1min', stamp, features)
+            else:
+                features = self.feature_cache.get_or_compute(
+                    kind, symbol, '1min', stamp,
+                    lambda: self.feature_engine.calculate_features(
+                        bars_df,
+                        ema_short=settings.ema_short,
+                        ema_long=settings.ema_long
+                    )
+                )
             
             if features:
-                features['symbol'] = symbol
-                features['timestamp'] = datetime.utcnow().isoformat()
-                
-                # Store in state
-                trading_state.update_features(symbol, features)
-                
-                # Store in database
-                self.supabase.upsert_features(features)
-                
-                logger.debug(f"Computed features for {symbol}: EMA_short={features['ema_short']:.2f}, EMA_long={features['ema_long']:.2f}")
-                
-                return features
+                return self._publish_features(symbol, features)
             
             return None
             
@@ -130,25 +178,115 @@ class MarketDataManager:
             logger.error(f"Failed to compute features for {symbol}: {e}")
             return None
     
+    def compute_features_batch(self, bars: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """
+        Compute features for many symbols in one vectorized pass over a
+        symbols x time panel and publish them. Symbols whose bars have not
+        changed since features were last computed reuse the cached result.
+        
+        Returns:
+            {symbol: features} for symbols with enough history
+        """
+        try:
+            batch = cached_panel_features(
+                bars,
+                ema_short=settings.ema_short,
+                ema_long=settings.ema_long,
+                cache=self.feature_cache
+            )
+            return {
+                symbol: self._publish_features(symbol, features)
+                for symbol, features in batch.items()
+            }
+        except Exception as e:
+            logger.error(f"Failed to compute batch features: {e}")
+            return {}
+    
+    def _sync_indicator_state(self, symbol: str, bars_df: pd.DataFrame) -> IncrementalIndicatorState:
+        """
+        Bring a symbol's incremental indicator state up to date with a bars frame.
+        Rebuilds the state from scratch if the frame no longer contains its last bar.
+        """
+        state = self.indicator_states.get(symbol)
+        if state is not None and state.can_resume_from(bars_df):
+            state.update_from_frame(bars_df, since=state.last_timestamp)
+            return state
+        
+        state = IncrementalIndicatorState(
+            ema_short=settings.ema_short,
+            ema_long=settings.ema_long
+        )
+        state.update_from_frame(bars_df)
+        self.indicator_states[symbol] = state
+        return state
+    
+    def _publish_features(self, symbol: str, features: Dict) -> Dict:
+        """Stamp features and store them in state and database."""
+        features['symbol'] = symbol
+        features['timestamp'] = datetime.utcnow().isoformat()
+        
+        # Store in state
+        trading_state.update_features(symbol, features)
+        
+        # Store in database (write-behind, coalesced per symbol)
+        self.supabase.queue_features(features)
+        
+        logger.debug(f"Computed features for {symbol}: EMA_short={features['ema_short']:.2f}, EMA_long={features['ema_long']:.2f}")
+        
+        return features
+    
     def update_all_features(self, symbols: List[str]):
         """
         Update features for all symbols.
-        Fetches latest bars and computes indicators.
+        
+        Symbols not yet seeded in the bar store get a day of history;
+        symbols already held only fetch bars newer than their last stored bar.
+        Features are then computed from the rolling store, either per symbol
+        from the incremental indicator states or in one vectorized batch.
         """
         try:
-            # Fetch historical data for feature computation
-            historical_bars = self.fetch_historical_bars(symbols, days=1)
+            store = self.bar_store
+            seeded = [s for s in symbols if store.is_seeded(s)]
+            self.seed_bar_store(symbols)
+            
+            if seeded:
+                last_seen = [ts for ts in (store.last_timestamp(s) for s in seeded) if ts is not None]
+                if last_seen:
+                    new_bars = self.fetch_bars_since(seeded, min(last_seen).to_pydatetime())
+                    appended = sum(store.extend(symbol, bars_df) for symbol, bars_df in new_bars.items())
+                    logger.debug(f"Bar store: {appended} new bars across {len(seeded)} symbols")
             
-            for symbol in symbols:
-                if symbol in historical_bars:
-                    bars_df = historical_bars[symbol]
+            frames = {symbol: store.get_dataframe(symbol) for symbol in symbols}
+            frames = {symbol: bars_df for symbol, bars_df in frames.items() if not bars_df.empty}
+            
+            if settings.incremental_features_enabled:
+                for symbol, bars_df in frames.items():
                     self.compute_features(symbol, bars_df)
+            else:
+                self.compute_features_batch(frames)
             
             logger.info(f"Updated features for {len(symbols)} symbols")
             
         except Exception as e:
             logger.error(f"Failed to update features: {e}")
     
+    def seed_bar_store(self, symbols: List[str]) -> int:
+        """
+        Seed the bar store with a day of history for symbols it does not hold yet
+        (e.g. symbols just added to the stream subscriptions).
+        
+        Returns:
+            Number of symbols seeded
+        """
+        unseeded = [s for s in symbols if not self.bar_store.is_seeded(s)]
+        if not unseeded:
+            return 0
+        
+        historical_bars = self.fetch_historical_bars(unseeded, days=1)
+        for symbol, bars_df in historical_bars.items():
+            self.bar_store.seed(symbol, bars_df)
+        return len(historical_bars)
+    
     def store_bars_to_db(self, symbol: str, bars: List[Dict]):
         """
         Store market data bars to database.
@@ -207,7 +345,7 @@ class MarketDataManager:
 
         trading_state.update_features(symbol, features)
         try:
-            self.supabase.upsert_features(features)
+            self.supabase.queue_features(features)
         except Exception as exc:
             logger.debug(f"Non-fatal: failed to upsert streaming feature for {symbol}: {exc}")
 
@@ -218,9 +356,12 @@ class MarketDataManager:
         price = float(bar.get("close") or 0)
         if price:
             self.apply_stream_price(symbol, price, timestamp or datetime.utcnow())
+            self.bar_store.append_bar(symbol, bar, timestamp)
+            self.archive.append_bar(symbol, bar, timestamp)
+            self._apply_stream_bar_to_indicators(symbol, bar, timestamp)
 
         try:
-            self.supabase.insert_bars(
+            self.supabase.queue_bars(
                 [
                     {
                         "symbol": symbol,
@@ -236,3 +377,32 @@ class MarketDataManager:
             )
         except Exception as exc:
             logger.debug(f"Non-fatal: failed to store streaming bar for {symbol}: {exc}")
+
+    def _apply_stream_bar_to_indicators(self, symbol: str, bar: Dict[str, float], timestamp: Optional[datetime]):
+        """
+        Advance the symbol's incremental indicator state by one streamed bar and
+        publish fresh features, so features refresh per bar instead of once a minute.
+        States are created by the market data loop; symbols without one are skipped.
+        """
+        state = self.indicator_states.get(symbol)
+        if not settings.incremental_features_enabled or state is None:
+            return
+
+        try:
+            with self._indicator_lock:
+                applied = state.update(
+                    float(bar.get("open") or 0),
+                    float(bar.get("high") or 0),
+                    float(bar.get("low") or 0),
+                    float(bar.get("close") or 0),
+                    float(bar.get("volume") or 0),
+                    timestamp,
+                )
+                if not applied:
+                    return
+
+                features = state.features()
+            if features:
+                self._publish_features(symbol, features)
+        except Exception as exc:
+            logger.debug(f"Non-fatal: failed to apply streaming bar to indicators for {symbol}: {exc}")
@@ -0,0 +1,251 @@
+"""
+Vectorized Multi-Symbol Feature Engine
+
+Computes the FeatureEngine indicator set for many symbols in one pass over a
+symbols x time NumPy panel, instead of slicing the bars frame per symbol and
+running a pandas ewm/rolling chain for each one.
+
+Series are right-aligned in the panel (the latest bar of every symbol sits in
+the last column) and shorter histories are padded with NaN on the left. The
+indicator math runs through the batch (2-D) APIs in indicators/kernels.py, so
+every symbol is smoothed in one compiled filter call per indicator.
+
+The emitted feature dicts have the same keys and values as
+FeatureEngine.calculate_features (see tests/test_panel_features.py).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data.feature_cache import FeatureCache, feature_kind, get_feature_cache
+from data.features import FeatureEngine
+from indicators import kernels
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+BarsInput = Union[pd.DataFrame, Dict[str, pd.DataFrame]]
+
+
+@dataclass
+class BarPanel:
+    """Right-aligned symbols x time OHLCV arrays (NaN-padded on the left)."""
+    symbols: List[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    lengths: np.ndarray
+
+    @property
+    def mask(self) -> np.ndarray:
+        """True where a cell holds a real bar."""
+        width = self.close.shape[1]
+        return np.arange(width)[None, :] >= (width - self.lengths)[:, None]
+
+
+def build_panel(bars: BarsInput, symbols: Optional[Iterable[str]] = None) -> BarPanel:
+    """
+    Build a panel from an Alpaca (symbol, timestamp) multi-index bars frame or
+    from a dict of per-symbol frames.
+
+    Args:
+        bars: Multi-index frame or {symbol: frame}
+        symbols: Optional subset/order of symbols to include
+
+    Returns:
+        BarPanel (symbols without bars are left out)
+    """
+    if isinstance(bars, dict):
+        frames = {s: df for s, df in bars.items() if df is not None and not df.empty}
+        bars = pd.concat(frames, names=['symbol', 'timestamp']) if frames else pd.DataFrame()
+
+    wanted = list(dict.fromkeys(symbols)) if symbols is not None else None
+    if wanted is not None and bars is not None and not bars.empty:
+        bars = bars[bars.index.get_level_values(0).isin(wanted)]
+
+    if bars is None or bars.empty:
+        empty = np.empty((0, 0))
+        return BarPanel([], empty, empty, empty, empty, empty, np.empty(0, dtype=int))
+
+    bars = bars.sort_index(level=[0, 1], sort_remaining=False)
+    codes, uniques = pd.factorize(bars.index.get_level_values(0), sort=False)
+    lengths = np.bincount(codes, minlength=len(uniques))
+    width = int(lengths.max()) if len(lengths) else 0
+
+    # Position of each bar within its symbol, shifted so the last bar lands in the last column
+    position = bars.groupby(level=0, sort=False).cumcount().to_numpy()
+    columns = width - lengths[codes] + position
+
+    arrays = {}
+    for col in OHLCV_COLUMNS:
+        panel = np.full((len(uniques), width), np.nan)
+        panel[codes, columns] = bars[col].to_numpy(dtype=float)
+        arrays[col] = panel
+
+    panel = BarPanel(symbols=[str(s) for s in uniques], lengths=lengths, **arrays)
+
+    if wanted is not None:
+        order = {s: i for i, s in enumerate(panel.symbols)}
+        rows = [order[s] for s in wanted if s in order]
+        panel = BarPanel(
+            symbols=[panel.symbols[i] for i in rows],
+            lengths=panel.lengths[rows],
+            **{col: getattr(panel, col)[rows] for col in OHLCV_COLUMNS}
+        )
+    return panel
+
+
+def _last_window(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing window of each row (NaN-padded if the panel is narrower than the window)."""
+    if values.shape[1] >= window:
+        return values[:, -window:]
+    pad = np.full((values.shape[0], window - values.shape[1]), np.nan)
+    return np.hstack([pad, values])
+
+
+def calculate_panel_features(
+    bars: Union[BarsInput, BarPanel],
+    ema_short: int = 9,
+    ema_long: int = 21,
+    symbols: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict]:
+    """
+    Calculate FeatureEngine features for every symbol in one vectorized pass.
+
+    Args:
+        bars: Multi-index bars frame, {symbol: frame} or a prebuilt BarPanel
+        ema_short: Short EMA period
+        ema_long: Long EMA period
+        symbols: Optional subset of symbols
+
+    Returns:
+        {symbol: features}; symbols with too little history are omitted
+    """
+    try:
+        panel = bars if isinstance(bars, BarPanel) else build_panel(bars, symbols)
+        if not panel.symbols:
+            return {}
+
+        min_bars = max(ema_long, 26)
+        ready = panel.lengths >= min_bars
+        if not ready.any():
+            return {}
+
+        # Only rows with enough history; trim leading columns no row uses
+        width = int(panel.lengths[ready].max())
+        rows = np.flatnonzero(ready)
+        names = [panel.symbols[i] for i in rows]
+        high = panel.high[rows, -width:]
+        low = panel.low[rows, -width:]
+        close = panel.close[rows, -width:]
+        volume = panel.volume[rows, -width:]
+        lengths = panel.lengths[rows]
+        mask = np.arange(width)[None, :] >= (width - lengths)[:, None]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = kernels.diff(close)
+
+            # EMAs
+            ema_s = kernels.ema(close, ema_short)
+            ema_l = kernels.ema(close, ema_long)
+
+            # RSI (Wilder); the first bar of each symbol has zero gain/loss
+            gains = np.where(mask, np.where(delta > 0, delta, 0.0), np.nan)
+            losses = np.where(mask, np.where(delta < 0, -delta, 0.0), np.nan)
+            rs = kernels.wilder(gains, 14) / kernels.wilder(losses, 14)
+            rsi = 100.0 - 100.0 / (1.0 + rs[:, -2:])
+
+            # MACD
+            macd_line, macd_signal, macd_hist = kernels.macd(close)
+
+            # True range (first bar: high - low)
+            true_range = kernels.true_range(high, low, close)
+            atr = _last_window(true_range, 14).mean(axis=1)
+
+            # Wilder ADX
+            plus_dm, minus_dm = kernels.directional_movement(high, low)
+            plus_dm = np.where(mask, plus_dm, np.nan)
+            minus_dm = np.where(mask, minus_dm, np.nan)
+
+            wilder_atr = kernels.wilder(true_range, 14)
+            plus_di = 100.0 * kernels.wilder(plus_dm, 14) / wilder_atr
+            minus_di = 100.0 * kernels.wilder(minus_dm, 14) / wilder_atr
+            dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            dx = np.where(mask, dx, np.nan)
+            adx = kernels.wilder(dx, 14)[:, -1]
+
+            # Volume ratio, z-score and OBV
+            volume_window = _last_window(volume, 20)
+            volume_mean = volume_window.mean(axis=1)
+            volume_ratio = volume[:, -1] / volume_mean
+            volume_std = volume_window.std(axis=1, ddof=1)
+            volume_zscore = np.where(
+                (lengths >= 20) & (volume_std != 0),
+                (volume[:, -1] - volume_mean) / volume_std,
+                0.0
+            )
+            obv = np.nansum(np.sign(delta) * volume, axis=1)
+
+            # Cumulative VWAP over the whole frame
+            typical_price = (high + low + close) / 3.0
+            vwap = np.nansum(typical_price * volume, axis=1) / np.nansum(volume, axis=1)
+
+        results = {}
+        for i, symbol in enumerate(names):
+            try:
+                results[symbol] = FeatureEngine.assemble_features(
+                    price=close[i, -1],
+                    ema_short=ema_s[i, -1],
+                    ema_long=ema_l[i, -1],
+                    prev_ema_short=ema_s[i, -2],
+                    prev_ema_long=ema_l[i, -2],
+                    atr=atr[i],
+                    volume=volume[i, -1],
+                    volume_zscore=volume_zscore[i],
+                    vwap=vwap[i],
+                    rsi=rsi[i, -1],
+                    prev_rsi=rsi[i, -2],
+                    macd=macd_line[i, -1],
+                    macd_signal=macd_signal[i, -1],
+                    macd_histogram=macd_hist[i, -1],
+                    prev_macd_histogram=macd_hist[i, -2],
+                    adx=adx[i],
+                    plus_di=plus_di[i, -1],
+                    minus_di=minus_di[i, -1],
+                    volume_ratio=volume_ratio[i],
+                    obv=obv[i],
+                )
+            except Exception as e:
+                logger.error(f"Failed to assemble panel features for {symbol}: {e}")
+
+        return results
+
+    except Exception as e:
+        logger.error(f"Failed to calculate panel features: {e}")
+        return {}
+
+
+def cached_panel_features(
+    frames: Dict[str, pd.DataFrame],
+    ema_short: int = 9,
+    ema_long: int = 21,
+    cache: Optional[FeatureCache] = None,
+) -> Dict[str, Dict]:
+    """
+    calculate_panel_features over {symbol: frame}, reusing the features of
+    bar sets already computed by any loop (see data/feature_cache.py). Only
+    symbols whose bars changed go into the vectorized pass.
+    """
+    cache = cache or get_feature_cache()
+    return cache.get_or_compute_batch(
+        feature_kind(ema_short, ema_long),
+        frames,
+        lambda stale: calculate_panel_features(stale, ema_short=ema_short, ema_long=ema_long),
+    )
@@ -0,0 +1,225 @@
+"""Indicator Kernels: shared EMA/RSI/MACD/ATR/ADX math on float64 arrays
+
+Every indicator consumer (FeatureEngine and indicators/*.py, the panel
+engine, the MTF feature engine, momentum/indicators.py and the backtester)
+computes through these kernels instead of its own pandas/NumPy copy.
+
+- Inputs are anything array-like; they are converted once to contiguous
+  float64. Outputs are plain ndarrays (callers wrap them in Series if needed).
+- 1-D inputs are one series; 2-D inputs are a batch of series, one per row,
+  computed along the last axis in a single call.
+- Exponential smoothing matches `Series.ewm(alpha=..., adjust=False).mean()`
+  bit for bit up to float rounding, including NaN handling. The recurrence
+  runs in scipy's compiled IIR filter; series with gaps after their first
+  observation fall back to an explicit loop, JIT-compiled when numba is
+  installed.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+try:
+    from numba import njit
+    JIT_AVAILABLE = True
+except ImportError:  # Optional: plain Python loop for the (rare) gap path
+    JIT_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+def as_float_array(values) -> np.ndarray:
+    """Contiguous float64 view/copy of values (Series, list or ndarray)."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------
+# Smoothing primitives
+# ---------------------------------------------------------------------------
+
+@njit(cache=True)
+def _ewm_loop(x: np.ndarray, alpha: float) -> np.ndarray:
+    """pandas adjust=False recurrence, row by row: a missing observation decays
+    the previous weight by (1 - alpha) instead of resetting the mean."""
+    rows, cols = x.shape
+    out = np.empty_like(x)
+    decay = 1.0 - alpha
+    for r in range(rows):
+        mean = np.nan
+        old_wt = 1.0
+        for t in range(cols):
+            v = x[r, t]
+            if np.isnan(mean):
+                if not np.isnan(v):
+                    mean = v
+                    old_wt = 1.0
+            else:
+                old_wt *= decay
+                if not np.isnan(v):
+                    mean = (old_wt * mean + alpha * v) / (old_wt + alpha)
+                    old_wt = 1.0
+            out[r, t] = mean
+    return out
+
+
+def _ewm_filter(x: np.ndarray, alpha: float) -> np.ndarray:
+    """y[t] = alpha * x[t] + (1 - alpha) * y[t-1], seeded so that y[0] = x[0]."""
+    zi = (1.0 - alpha) * x[:, :1]
+    return lfilter([alpha], [1.0, alpha - 1.0], x, axis=-1, zi=zi)[0]
+
+
+def ewm(values, alpha: float) -> np.ndarray:
+    """Equivalent of `Series.ewm(alpha=alpha, adjust=False).mean()` along the last axis."""
+    x = as_float_array(values)
+    if x.size == 0:
+        return x.copy()
+
+    rows = x.reshape(-1, x.shape[-1])
+    missing = np.isnan(rows)
+    if not missing.any():
+        return _ewm_filter(rows, alpha).reshape(x.shape)
+
+    started = np.logical_or.accumulate(~missing, axis=1)
+    if (missing & started).any():
+        return _ewm_loop(rows, alpha).reshape(x.shape)
+
+    # Leading NaNs only: start each row at its first observation. A constant
+    # lead-in equal to that observation leaves the running mean unchanged.
+    first = rows[np.arange(rows.shape[0]), np.argmax(started, axis=1)]
+    out = _ewm_filter(np.where(missing, first[:, None], rows), alpha)
+    out[~started] = np.nan
+    return out.reshape(x.shape)
+
+
+def ema(values, period: int) -> np.ndarray:
+    """Exponential moving average (span=period)."""
+    return ewm(values, 2.0 / (period + 1.0))
+
+
+def wilder(values, period: int) -> np.ndarray:
+    """Wilder's smoothing as an EWM (alpha = 1/period, seeded at the first value)."""
+    return ewm(values, 1.0 / period)
+
+
+def wilder_sma_seeded(values, period: int) -> np.ndarray:
+    """
+    Classic Wilder smoothing: zeros for the first period-1 values, the simple
+    mean of the first `period` values at index period-1, then the recurrence.
+    """
+    x = as_float_array(values)
+    out = np.zeros_like(x)
+    if x.shape[-1] < period:
+        return out
+
+    rows = x.reshape(-1, x.shape[-1])
+    result = out.reshape(-1, x.shape[-1])
+    alpha = 1.0 / period
+    seed = rows[:, :period].mean(axis=1)
+    result[:, period - 1] = seed
+    if rows.shape[1] > period:
+        zi = (1.0 - alpha) * seed[:, None]
+        result[:, period:] = lfilter([alpha], [1.0, alpha - 1.0], rows[:, period:], axis=-1, zi=zi)[0]
+    return out
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """Trailing simple mean; NaN until the window is full or if it holds a NaN."""
+    x = as_float_array(values)
+    out = np.full_like(x, np.nan)
+    if x.shape[-1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(x, window, axis=-1)
+        out[..., window - 1:] = windows.mean(axis=-1)
+    return out
+
+
+def diff(values) -> np.ndarray:
+    """First difference along the last axis (NaN for the first element)."""
+    x = as_float_array(values)
+    out = np.empty_like(x)
+    out[..., :1] = np.nan
+    out[..., 1:] = x[..., 1:] - x[..., :-1]
+    return out
+
+
+def shift(values) -> np.ndarray:
+    """Previous value along the last axis (NaN for the first element)."""
+    x = as_float_array(values)
+    out = np.empty_like(x)
+    out[..., :1] = np.nan
+    out[..., 1:] = x[..., :-1]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Indicators
+# ---------------------------------------------------------------------------
+
+def rsi_components(close, period: int = 14) -> Tuple[np.ndarray, np.ndarray]:
+    """Wilder-smoothed average gain and loss (the first bar counts as zero change)."""
+    delta = diff(close)
+    with np.errstate(invalid='ignore'):
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+    return wilder(gains, period), wilder(losses, period)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """RSI = 100 - 100 / (1 + avg_gain / avg_loss)."""
+    avg_gains, avg_losses = rsi_components(close, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100.0 - 100.0 / (1.0 + avg_gains / avg_losses)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram."""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """max(high - low, |high - prev_close|, |low - prev_close|); the first bar is high - low."""
+    high, low = as_float_array(high), as_float_array(low)
+    prev_close = shift(close)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def true_range_seeded(high, low, close) -> np.ndarray:
+    """
+    True range with the first bar's previous close taken as its own close
+    (the momentum calculators' convention); NaN inputs propagate.
+    """
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    prev_close = shift(close)
+    prev_close[..., :1] = close[..., :1]
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range as a simple rolling mean of true range."""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def directional_movement(high, low) -> Tuple[np.ndarray, np.ndarray]:
+    """+DM and -DM (zero where the move is not dominant or on the first bar)."""
+    up_move = diff(high)
+    down_move = -diff(low)
+    with np.errstate(invalid='ignore'):
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    return plus_dm, minus_dm
+
+
+def adx(high, low, close, period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Wilder ADX, +DI and -DI (EWM smoothing of TR, DM and DX)."""
+    wilder_atr = wilder(true_range(high, low, close), period)
+    plus_dm, minus_dm = directional_movement(high, low)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100.0 * wilder(plus_dm, period) / wilder_atr
+        minus_di = 100.0 * wilder(minus_dm, period) / wilder_atr
+        dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return wilder(dx, period), plus_di, minus_di
@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 from typing import Tuple
 
+from indicators import kernels
+
 
 def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
     """
@@ -22,20 +24,8 @@ def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
     Returns:
         Series with RSI values (0-100)
     """
-    # Calculate price changes
-    delta = prices.diff()
-    
-    # Separate gains and losses
-    gains = delta.where(delta > 0, 0)
-    losses = -delta.where(delta < 0, 0)
-    
-    # Calculate average gains and losses using Wilder's smoothing
-    avg_gains = gains.ewm(alpha=1/period, adjust=False).mean()
-    avg_losses = losses.ewm(alpha=1/period, adjust=False).mean()
-    
-    # Calculate RS and RSI
-    rs = avg_gains / avg_losses
-    rsi = 100 - (100 / (1 + rs))
+    # Wilder-smoothed gains/losses (see indicators/kernels.py)
+    rsi = pd.Series(kernels.rsi(prices, period), index=prices.index)
     
     return rsi
 
@@ -80,18 +70,10 @@ def calculate_macd(prices: pd.Series, fast: int = 12, slow: int = 26,
     Returns:
         Tuple of (macd_line, signal_line, histogram)
     """
-    # Calculate EMAs
-    ema_fast = prices.ewm(span=fast, adjust=False).mean()
-    ema_slow = prices.ewm(span=slow, adjust=False).mean()
-    
-    # Calculate MACD line
-    macd_line = ema_fast - ema_slow
-    
-    # Calculate signal line
-    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-    
-    # Calculate histogram
-    histogram = macd_line - signal_line
+    macd_line, signal_line, histogram = (
+        pd.Series(values, index=prices.index)
+        for values in kernels.macd(prices, fast, slow, signal)
+    )
     
     return macd_line, signal_line, histogram
 
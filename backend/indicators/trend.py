@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 from typing import Tuple
 
+from indicators import kernels
+
 
 def calculate_true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
     """
@@ -14,13 +16,7 @@ def calculate_true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> p
     
     TR = max(high - low, abs(high - prev_close), abs(low - prev_close))
     """
-    prev_close = close.shift(1)
-    
-    tr1 = high - low
-    tr2 = abs(high - prev_close)
-    tr3 = abs(low - prev_close)
-    
-    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    true_range = pd.Series(kernels.true_range(high, low, close), index=high.index)
     
     return true_range
 
@@ -29,17 +25,9 @@ def calculate_directional_movement(high: pd.Series, low: pd.Series) -> Tuple[pd.
     """
     Calculate Directional Movement (+DM and -DM).
     """
-    high_diff = high.diff()
-    low_diff = -low.diff()
-    
-    plus_dm = pd.Series(0.0, index=high.index)
-    minus_dm = pd.Series(0.0, index=high.index)
-    
-    # +DM when up move is greater than down move
-    plus_dm[(high_diff > low_diff) & (high_diff > 0)] = high_diff
-    
-    # -DM when down move is greater than up move
-    minus_dm[(low_diff > high_diff) & (low_diff > 0)] = low_diff
+    plus_dm, minus_dm = (
+        pd.Series(values, index=high.index) for values in kernels.directional_movement(high, low)
+    )
     
     return plus_dm, minus_dm
 
@@ -56,24 +44,10 @@ def calculate_adx(high: pd.Series, low: pd.Series, close: pd.Series,
     Returns:
         Tuple of (ADX, +DI, -DI) series
     """
-    # Calculate True Range and Directional Movement
-    tr = calculate_true_range(high, low, close)
-    plus_dm, minus_dm = calculate_directional_movement(high, low)
-    
-    # Smooth TR and DM using Wilder's smoothing
-    atr = tr.ewm(alpha=1/period, adjust=False).mean()
-    plus_di_raw = plus_dm.ewm(alpha=1/period, adjust=False).mean()
-    minus_di_raw = minus_dm.ewm(alpha=1/period, adjust=False).mean()
-    
-    # Calculate DI lines
-    plus_di = 100 * (plus_di_raw / atr)
-    minus_di = 100 * (minus_di_raw / atr)
-    
-    # Calculate DX (Directional Index)
-    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-    
-    # Calculate ADX (smoothed DX)
-    adx = dx.ewm(alpha=1/period, adjust=False).mean()
+    # Wilder smoothing of TR, DM and DX (see indicators/kernels.py)
+    adx, plus_di, minus_di = (
+        pd.Series(values, index=high.index) for values in kernels.adx(high, low, close, period)
+    )
     
     return adx, plus_di, minus_di
 
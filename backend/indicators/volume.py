@@ -6,6 +6,8 @@ Volume is crucial for confirming price movements and detecting institutional act
 import pandas as pd
 import numpy as np
 
+from indicators import kernels
+
 
 def calculate_volume_ratio(volume: pd.Series, window: int = 20) -> pd.Series:
     """
@@ -13,7 +15,7 @@ def calculate_volume_ratio(volume: pd.Series, window: int = 20) -> pd.Series:
     
     Volume Ratio = Current Volume / Average Volume
     """
-    avg_volume = volume.rolling(window=window).mean()
+    avg_volume = pd.Series(kernels.rolling_mean(volume, window), index=volume.index)
     volume_ratio = volume / avg_volume
     
     return volume_ratio
@@ -20,6 +20,8 @@ from copilot.prompts import get_system_prompt, get_perplexity_prompt
 from advisory.openrouter import OpenRouterClient
 from advisory.perplexity import PerplexityClient
 from core.alpaca_client import AlpacaClient
+from core.async_io import io_queue_depth, run_blocking, shutdown_io_executor
+from core.runtime_metrics import get_runtime_metrics
 from core.supabase_client import SupabaseClient
 from core.state import trading_state, Position as StatePosition
 from trading.risk_manager import RiskManager
@@ -27,11 +29,13 @@ from trading.order_manager import OrderManager
 from trading.position_manager import PositionManager
 from trading.strategy import EMAStrategy
 from trading.trading_engine import TradingEngine, set_trading_engine, get_trading_engine
+from data.bar_archive import get_bar_archive
+from data.feature_cache import get_feature_cache
 from data.features import FeatureEngine
 from data.market_data import MarketDataManager
 from news.news_client import NewsClient
 from options.options_client import OptionsClient
-from streaming import stream_manager, StreamingBroadcaster
+from streaming import stream_manager, StreamingBroadcaster, StateSync
 from utils.logger import setup_logger
 from ml.shadow_mode import MLShadowMode
 
@@ -128,9 +132,10 @@ def _serialize_advisories(limit: int = 20) -> List[Dict[str, Any]]:
     ]
 
 
-def build_streaming_snapshot() -> Dict[str, Any]:
+def build_streaming_state() -> Dict[str, Any]:
+    """Live part of the streaming snapshot; diffed into deltas by StateSync."""
     metrics = trading_state.get_metrics()
-    snapshot = {
+    return {
         "metrics": {
             "equity": metrics.equity,
             "cash": metrics.cash,
@@ -148,6 +153,12 @@ def build_streaming_snapshot() -> Dict[str, Any]:
         },
         "positions": _serialize_positions(),
         "orders": _serialize_orders(),
+    }
+
+
+def build_streaming_extras() -> Dict[str, Any]:
+    """Slower part of the streaming snapshot (queries Supabase); cached by StateSync."""
+    return {
         "logs": _serialize_logs(limit=50),
         "advisories": _serialize_advisories(limit=20),
         "feature_flags": {
@@ -158,6 +169,11 @@ def build_streaming_snapshot() -> Dict[str, Any]:
         },
         "timestamp": datetime.utcnow().isoformat(),
     }
+
+
+def build_streaming_snapshot() -> Dict[str, Any]:
+    snapshot = build_streaming_state()
+    snapshot.update(build_streaming_extras())
     return snapshot
 
 
@@ -234,7 +250,27 @@ async def lifespan(app: FastAPI):
         perplexity_client = PerplexityClient()
         command_handler = CommandHandler(alpaca_client)
         streaming_broadcaster = StreamingBroadcaster()
-        await streaming_broadcaster.start(snapshot_builder=build_streaming_snapshot)
+        state_sync = StateSync(
+            state_builder=build_streaming_state,
+            version=lambda: trading_state.version,
+            extras_builder=build_streaming_extras,
+            history=settings.streaming_delta_history,
+            extras_ttl=settings.streaming_snapshot_extras_ttl_seconds
+        )
+        await streaming_broadcaster.start(snapshot_builder=build_streaming_snapshot, state_sync=state_sync)
+        
+        # Runtime instrumentation (event-loop lag, loop/call latency, queue depths)
+        runtime_metrics = get_runtime_metrics()
+        runtime_metrics.register_gauge("broadcaster_queue_depth", streaming_broadcaster.queue_depth)
+        runtime_metrics.register_gauge("broadcaster_clients", streaming_broadcaster.client_count)
+        runtime_metrics.register_gauge("io_pool_queue_depth", io_queue_depth)
+        runtime_metrics.register_gauge("supabase_write_pending", supabase_client.writer.pending)
+        feature_cache = get_feature_cache()
+        runtime_metrics.register_gauge("feature_cache_entries", lambda: len(feature_cache))
+        runtime_metrics.register_gauge("feature_cache_hit_rate", feature_cache.hit_rate)
+        bar_archive = get_bar_archive()
+        runtime_metrics.register_gauge("bar_archive_pending_bars", lambda: bar_archive.stats()['pending_stream_bars'])
+        runtime_metrics.start_lag_monitor()
         
         # Attach WebSocket log handler
         from utils.websocket_logger import WebSocketLogHandler
@@ -273,9 +309,7 @@ async def lifespan(app: FastAPI):
             action_executor._engine = engine
         
         # Sync initial state
-        await sync_state()
-        if streaming_broadcaster:
-            await streaming_broadcaster.enqueue({"type": "snapshot", "payload": build_streaming_snapshot()})
+        await sync_state()  # Reaches connected clients as the first state delta
         
         # Start trading engine in background
         asyncio.create_task(engine.start())
@@ -296,6 +330,11 @@ async def lifespan(app: FastAPI):
         await engine.stop()
     if streaming_broadcaster:
         await streaming_broadcaster.stop()
+    await get_runtime_metrics().stop_lag_monitor()
+    if supabase_client:
+        await run_blocking(supabase_client.close)
+    await run_blocking(get_bar_archive().flush)
+    shutdown_io_executor()
 
 
 app = FastAPI(
@@ -335,7 +374,13 @@ async def websocket_stream(websocket: WebSocket):
         await websocket.close()
         return
 
-    await streaming_broadcaster.connect(websocket)
+    # Reconnecting clients pass the epoch/seq they last applied to resume from deltas
+    since = websocket.query_params.get("since")
+    await streaming_broadcaster.connect(
+        websocket,
+        epoch=websocket.query_params.get("epoch"),
+        since=int(since) if since and since.isdigit() else None
+    )
     await streaming_broadcaster.listen(websocket)
 
 
@@ -343,13 +388,13 @@ async def sync_state():
     """Sync state from Alpaca and Supabase."""
     try:
         # Get account info
-        account = alpaca_client.get_account()
+        account = await run_blocking(alpaca_client.get_account)
         equity = float(account.equity)
         cash = float(account.cash)
         buying_power = float(account.buying_power)
         
         # Get positions from Alpaca
-        alpaca_positions = alpaca_client.get_positions()
+        alpaca_positions = await run_blocking(alpaca_client.get_positions)
         
         # Update state
         for pos in alpaca_positions:
@@ -867,7 +912,7 @@ async def get_market_status():
 async def get_account():
     """Get account information."""
     try:
-        account = alpaca_client.get_account()
+        account = await run_blocking(alpaca_client.get_account)
         return {
             "equity": float(account.equity),
             "cash": float(account.cash),
@@ -956,7 +1001,8 @@ async def submit_order(
 ):
     """Submit a new order."""
     try:
-        order = order_manager.submit_order(
+        order = await run_blocking(
+            order_manager.submit_order,
             symbol,
             side,
             qty,
@@ -985,7 +1031,7 @@ async def submit_order(
 async def cancel_order(order_id: str):
     """Cancel an order."""
     try:
-        success = order_manager.cancel_order(order_id)
+        success = await run_blocking(order_manager.cancel_order, order_id)
         return {
             "success": success,
             "message": "Order canceled" if success else "Failed to cancel order"
@@ -999,7 +1045,7 @@ async def cancel_order(order_id: str):
 async def close_position(symbol: str):
     """Close a position."""
     try:
-        success = alpaca_client.close_position(symbol)
+        success = await run_blocking(alpaca_client.close_position, symbol)
         if success:
             trading_state.remove_position(symbol)
         return {
@@ -1015,7 +1061,7 @@ async def close_position(symbol: str):
 async def emergency_stop():
     """Emergency stop: disable trading and close all positions."""
     try:
-        risk_manager.emergency_stop()
+        await run_blocking(risk_manager.emergency_stop)
         return {
             "success": True,
             "message": "Emergency stop executed"
@@ -1436,6 +1482,18 @@ async def get_engine_status():
     }
 
 
+@app.get("/metrics/runtime")
+async def get_runtime_metrics_endpoint():
+    """
+    Runtime instrumentation: event-loop lag, engine loop iteration times,
+    per-method Alpaca call latency, queue depths, feature cache and bar archive counters.
+    """
+    snapshot = get_runtime_metrics().snapshot()
+    snapshot['feature_cache'] = get_feature_cache().stats()
+    snapshot['bar_archive'] = get_bar_archive().stats()
+    return snapshot
+
+
 @app.post("/engine/start")
 async def start_engine(background_tasks: BackgroundTasks):
     """Start the trading engine."""
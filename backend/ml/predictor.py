@@ -120,7 +120,7 @@ class Predictor:
     async def _log_prediction(self, features: Dict[str, Any], result: Dict[str, Any]):
         """Log prediction to database"""
         try:
-            self.supabase.table('ml_predictions').insert({
+            self.supabase.queue_insert('ml_predictions', {
                 'trade_id': features.get('trade_id'),
                 'model_id': self.model_id,
                 'probability': result['probability'],
@@ -128,7 +128,7 @@ class Predictor:
                 'prediction': result['prediction'],
                 'latency_ms': result['latency_ms'],
                 'features_used': features
-            }).execute()
+            })
         except Exception as e:
             logger.error(f"Error logging prediction: {e}")
     
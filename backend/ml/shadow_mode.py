@@ -162,8 +162,8 @@ class MLShadowMode:
                 'was_correct': None
             }
             
-            # Insert into database
-            self.supabase.table('ml_predictions').insert(record).execute()
+            # Queue for the next bulk insert
+            self.supabase.queue_insert('ml_predictions', record)
             self.predictions_logged += 1
             
         except Exception as e:
@@ -58,6 +58,7 @@ class BracketAdjustmentEngine:
             quantity: Position size
             side: 'long' or 'short'
             market_data: Dict with 'high', 'low', 'close', 'volume' lists
+                (and optionally 'bar_stamp' to reuse indicators on unchanged bars)
             
         Returns:
             MomentumSignal if evaluated, None if skipped
@@ -91,7 +92,8 @@ class BracketAdjustmentEngine:
                 low=market_data['low'],
                 close=market_data['close'],
                 volume=market_data['volume'],
-                current_profit_r=profit_r
+                current_profit_r=profit_r,
+                bar_stamp=market_data.get('bar_stamp')
             )
             
             # If momentum is strong, adjust brackets
@@ -4,6 +4,8 @@ import numpy as np
 from typing import List, Tuple
 import logging
 
+from indicators import kernels
+
 logger = logging.getLogger(__name__)
 
 class ADXCalculator:
@@ -18,9 +20,9 @@ class ADXCalculator:
             if len(high) < self.period + 1:
                 return 0.0
             
-            high = np.array(high)
-            low = np.array(low)
-            close = np.array(close)
+            high = kernels.as_float_array(high)
+            low = kernels.as_float_array(low)
+            close = kernels.as_float_array(close)
             
             # Calculate True Range
             tr = self._calculate_true_range(high, low, close)
@@ -54,41 +56,16 @@ class ADXCalculator:
             return 0.0
     
     def _calculate_true_range(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
-        """Calculate True Range"""
-        prev_close = np.roll(close, 1)
-        prev_close[0] = close[0]
-        
-        tr1 = high - low
-        tr2 = np.abs(high - prev_close)
-        tr3 = np.abs(low - prev_close)
-        
-        return np.maximum(tr1, np.maximum(tr2, tr3))
+        """Calculate True Range (first bar uses its own close as previous close)"""
+        return kernels.true_range_seeded(high, low, close)
     
     def _calculate_directional_movement(self, high: np.ndarray, low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Calculate +DM and -DM"""
-        up_move = high - np.roll(high, 1)
-        down_move = np.roll(low, 1) - low
-        
-        up_move[0] = 0
-        down_move[0] = 0
-        
-        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-        
-        return plus_dm, minus_dm
+        return kernels.directional_movement(high, low)
     
     def _wilders_smoothing(self, data: np.ndarray, period: int) -> np.ndarray:
-        """Apply Wilder's smoothing"""
-        alpha = 1.0 / period
-        result = np.zeros_like(data)
-        
-        if len(data) >= period:
-            result[period-1] = np.mean(data[:period])
-            
-            for i in range(period, len(data)):
-                result[i] = alpha * data[i] + (1 - alpha) * result[i-1]
-        
-        return result
+        """Apply Wilder's smoothing (SMA-seeded)"""
+        return kernels.wilder_sma_seeded(data, period)
 
 class VolumeAnalyzer:
     """Analyzes volume relative to average"""
@@ -126,7 +103,7 @@ class TrendStrengthCalculator:
             if len(close) < max(self.ema_periods) + 10:
                 return 0.0
             
-            close = np.array(close)
+            close = kernels.as_float_array(close)
             current_price = close[-1]
             
             score = 0.0
@@ -191,14 +168,7 @@ class TrendStrengthCalculator:
     
     def _calculate_ema(self, data: np.ndarray, period: int) -> np.ndarray:
         """Calculate Exponential Moving Average"""
-        alpha = 2.0 / (period + 1)
-        ema = np.zeros_like(data)
-        ema[0] = data[0]
-        
-        for i in range(1, len(data)):
-            ema[i] = alpha * data[i] + (1 - alpha) * ema[i-1]
-        
-        return ema
+        return kernels.ema(data, period)
 
 class ATRCalculator:
     """Calculates Average True Range"""
@@ -212,9 +182,9 @@ class ATRCalculator:
             if len(high) < self.period + 1:
                 return 0.0
             
-            high = np.array(high)
-            low = np.array(low)
-            close = np.array(close)
+            high = kernels.as_float_array(high)
+            low = kernels.as_float_array(low)
+            close = kernels.as_float_array(close)
             
             tr = self._calculate_true_range(high, low, close)
             atr = np.mean(tr[-self.period:])
@@ -226,12 +196,5 @@ class ATRCalculator:
             return 0.0
     
     def _calculate_true_range(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
-        """Calculate True Range"""
-        prev_close = np.roll(close, 1)
-        prev_close[0] = close[0]
-        
-        tr1 = high - low
-        tr2 = np.abs(high - prev_close)
-        tr3 = np.abs(low - prev_close)
-        
-        return np.maximum(tr1, np.maximum(tr2, tr3))
+        """Calculate True Range (first bar uses its own close as previous close)"""
+        return kernels.true_range_seeded(high, low, close)
@@ -2,9 +2,11 @@
 # Determines if momentum is strong enough to extend targets
 
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+from data.feature_cache import get_feature_cache
+
 from .config import MomentumConfig
 from .signals import MomentumSignal
 from .indicators import ADXCalculator, VolumeAnalyzer, TrendStrengthCalculator
@@ -24,6 +26,7 @@ class MomentumSignalValidator:
         self.adx_calculator = ADXCalculator(period=config.adx_period)
         self.volume_analyzer = VolumeAnalyzer(lookback_period=config.volume_lookback)
         self.trend_calculator = TrendStrengthCalculator()
+        self.feature_cache = get_feature_cache()
         
         logger.info("✅ Momentum Signal Validator initialized")
         self.config.log_config()
@@ -36,7 +39,8 @@ class MomentumSignalValidator:
         close: List[float],
         volume: List[float],
         current_profit_r: float,
-        data_timestamp: Optional[datetime] = None
+        data_timestamp: Optional[datetime] = None,
+        bar_stamp: Optional[tuple] = None
     ) -> MomentumSignal:
         """
         Validate if momentum is strong enough to extend target.
@@ -49,6 +53,8 @@ class MomentumSignalValidator:
             volume: List of volume values
             current_profit_r: Current profit in R-multiples
             data_timestamp: Timestamp of the data (for freshness check)
+            bar_stamp: Last-bar stamp of the bars (data.feature_cache.bar_stamp);
+                indicators are reused while it is unchanged
             
         Returns:
             MomentumSignal with decision and all indicator values
@@ -90,10 +96,12 @@ class MomentumSignalValidator:
                     current_profit_r=current_profit_r
                 )
             
-            # Calculate all indicators
-            adx = self.adx_calculator.calculate(high, low, close)
-            volume_ratio = self.volume_analyzer.calculate_volume_ratio(volume)
-            trend_strength = self.trend_calculator.calculate(close, high, low)
+            # Calculate all indicators (cached per bar set)
+            adx, volume_ratio, trend_strength = self.feature_cache.get_or_compute(
+                f"momentum:{self.config.adx_period}:{self.config.volume_lookback}",
+                symbol, '1min', bar_stamp,
+                lambda: self._calculate_indicators(high, low, close, volume)
+            )
             
             # Check each indicator against thresholds
             adx_pass = adx > self.config.adx_threshold
@@ -145,6 +153,19 @@ class MomentumSignalValidator:
                 current_profit_r=current_profit_r
             )
     
+    def _calculate_indicators(
+        self,
+        high: List[float],
+        low: List[float],
+        close: List[float],
+        volume: List[float]
+    ) -> Tuple[float, float, float]:
+        """ADX, volume ratio and trend strength for one bar set"""
+        adx = self.adx_calculator.calculate(high, low, close)
+        volume_ratio = self.volume_analyzer.calculate_volume_ratio(volume)
+        trend_strength = self.trend_calculator.calculate(close, high, low)
+        return adx, volume_ratio, trend_strength
+    
     def _check_data_freshness(self, data_timestamp: Optional[datetime]) -> bool:
         """Check if data is fresh enough"""
         if data_timestamp is None:
@@ -168,7 +189,8 @@ class MomentumSignalValidator:
         volume: List[float],
         rsi: float,
         current_profit_r: float,
-        data_timestamp: Optional[datetime] = None
+        data_timestamp: Optional[datetime] = None,
+        bar_stamp: Optional[tuple] = None
     ) -> MomentumSignal:
         """
         Validate momentum with optional RSI component.
@@ -182,6 +204,8 @@ class MomentumSignalValidator:
             rsi: RSI value (0-100)
             current_profit_r: Current profit in R-multiples
             data_timestamp: Timestamp of the data
+            bar_stamp: Last-bar stamp of the bars (data.feature_cache.bar_stamp);
+                indicators are reused while it is unchanged
             
         Returns:
             MomentumSignal with decision and all indicator values including RSI
@@ -194,7 +218,8 @@ class MomentumSignalValidator:
             close=close,
             volume=volume,
             current_profit_r=current_profit_r,
-            data_timestamp=data_timestamp
+            data_timestamp=data_timestamp,
+            bar_stamp=bar_stamp
         )
         
         # Add RSI component if enabled
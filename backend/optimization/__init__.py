@@ -9,6 +9,8 @@ from .models import (
     OptimizationResult,
     ValidationResult,
     PerformanceMetrics,
+    FoldResult,
+    WalkForwardResult,
     REGIME_PARAMETERS,
     MOMENTUM_PARAMETERS,
 )
@@ -16,18 +18,25 @@ from .optimizer import ParameterOptimizer
 from .validator import WalkForwardValidator
 from .fitness import FitnessCalculator
 from .logger import ResultsLogger
+from .backtest import BacktestConfig, BacktestEngine
+from .walk_forward import WalkForwardRunner
 from .integration import OptimizationIntegration, run_integrated_optimization
 
 __all__ = [
     "OptimizationResult",
     "ValidationResult",
     "PerformanceMetrics",
+    "FoldResult",
+    "WalkForwardResult",
     "REGIME_PARAMETERS",
     "MOMENTUM_PARAMETERS",
     "ParameterOptimizer",
     "WalkForwardValidator",
     "FitnessCalculator",
     "ResultsLogger",
+    "BacktestConfig",
+    "BacktestEngine",
+    "WalkForwardRunner",
     "OptimizationIntegration",
     "run_integrated_optimization",
 ]
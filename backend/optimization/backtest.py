@@ -0,0 +1,561 @@
+"""
+Bar-replay backtest engine for parameter optimization.
+
+Replays stored minute bars through the live decision logic and returns the
+trade list FitnessCalculator expects:
+
+    engine = BacktestEngine(bars)                 # {symbol: OHLCV frame}
+    trades = engine.run({'neutral_profit_target_r': 2.5, 'adx_threshold': 28})
+    train, validate = engine.split(0.7)           # chronological halves
+
+Everything that does not depend on the optimized parameters is computed once
+per dataset: the FeatureEngine indicator set (EMA, ATR, RSI, MACD, ADX,
+volume ratio, VWAP), the confidence score and signal direction from
+detect_enhanced_signal, EMAStrategy's volume/price-position/RSI filters, and
+the momentum engine's trend strength. A run only applies the parameter
+dependent confidence threshold, then walks each position bar by bar:
+
+- Entry at the next bar's open plus slippage; stop and target from the ATR
+  helpers in utils/helpers.py, size from calculate_position_size
+- Stop is checked first in each bar (gaps fill at the open), then partial
+  profits (ShareAllocation quantities) and the bracket target
+- After the bar: breakeven at 1R, R-based trailing stop, and the momentum
+  extension (wider target, progressive stop, ATR trail) when ADX, volume
+  and trend strength clear their thresholds
+- Forced exit at settings.eod_exit_time or the session's last bar
+
+Each position is sized from the starting equity on its own; there is no
+portfolio-level position limit.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+from data.features import FeatureEngine
+from indicators.momentum import calculate_macd, calculate_rsi
+from indicators.trend import calculate_adx
+from indicators.volume import calculate_volume_ratio
+from momentum.config import MomentumConfig
+from trading.profit_protection.models import ShareAllocation
+from utils.helpers import calculate_atr_stop, calculate_atr_target, calculate_position_size
+
+logger = logging.getLogger(__name__)
+
+# Live regime defaults (trading/regime_manager.py), used for any parameter a run omits
+DEFAULT_REGIME_PARAMS: Dict[str, Dict[str, float]] = {
+    "extreme_fear": {"profit_target_r": 3.0, "partial_profit_1_r": 2.0, "partial_profit_2_r": 4.0,
+                     "trailing_stop_r": 1.0, "position_size_mult": 1.0},
+    "fear": {"profit_target_r": 2.5, "partial_profit_1_r": 2.0, "partial_profit_2_r": 3.5,
+             "trailing_stop_r": 0.85, "position_size_mult": 1.0},
+    "neutral": {"profit_target_r": 2.0, "partial_profit_1_r": 1.5, "partial_profit_2_r": 3.0,
+                "trailing_stop_r": 0.75, "position_size_mult": 1.0},
+    "greed": {"profit_target_r": 2.0, "partial_profit_1_r": 1.5, "partial_profit_2_r": 2.5,
+              "trailing_stop_r": 0.75, "position_size_mult": 0.9},
+    "extreme_greed": {"profit_target_r": 1.5, "partial_profit_1_r": 1.0, "partial_profit_2_r": 2.0,
+                      "trailing_stop_r": 0.5, "position_size_mult": 0.7},
+}
+
+# AdaptiveThresholds base values
+DEFAULT_CONFIDENCE_PARAMS = {"base_long_threshold": 0.50, "base_short_threshold": 0.55}
+
+# Bars needed before the first signal (trend strength uses EMA50 + 10 bars)
+WARMUP_BARS = 60
+
+BarsInput = Union[pd.DataFrame, Dict[str, pd.DataFrame]]
+
+
+@dataclass
+class BacktestConfig:
+    """Simulation settings that are not optimized."""
+    starting_equity: float = 10000.0  # FitnessCalculator assumes a $10k base
+    risk_per_trade_pct: float = field(default_factory=lambda: settings.risk_per_trade_pct)
+    stop_loss_atr_mult: float = field(default_factory=lambda: settings.stop_loss_atr_mult)
+    take_profit_atr_mult: float = field(default_factory=lambda: settings.take_profit_atr_mult)
+    slippage_bps: float = 5.0  # Applied to market fills (entries, stops, partials, EOD)
+    cooldown_minutes: int = field(default_factory=lambda: settings.trade_cooldown_minutes)
+    entry_cutoff_time: str = field(default_factory=lambda: settings.entry_cutoff_time)
+    eod_exit_time: str = field(default_factory=lambda: settings.eod_exit_time)
+    long_only: bool = field(default_factory=lambda: settings.long_only_mode)
+    ema_short: int = field(default_factory=lambda: settings.ema_short)
+    ema_long: int = field(default_factory=lambda: settings.ema_long)
+    momentum_enabled: bool = True
+    regime: str = "neutral"  # Regime used for sessions missing from `regimes`
+
+
+def _minutes(hhmm: str) -> int:
+    hour, minute = map(int, hhmm.split(':'))
+    return hour * 60 + minute
+
+
+def _split_symbols(bars: BarsInput) -> Dict[str, pd.DataFrame]:
+    """{symbol: frame} from a dict or an Alpaca (symbol, timestamp) multi-index frame."""
+    if isinstance(bars, dict):
+        return {str(s): df for s, df in bars.items() if df is not None and not df.empty}
+    if bars is None or bars.empty:
+        return {}
+    return {str(s): df.droplevel(0) for s, df in bars.groupby(level=0, sort=False)}
+
+
+def _trend_strength(close: pd.Series, high: pd.Series, low: pd.Series, direction: int) -> np.ndarray:
+    """
+    Per-bar TrendStrengthCalculator score (momentum/indicators.py) for one
+    direction: 0.4 * share of EMA9/21/50 price is beyond, 0.3 * ROC(10)/5%,
+    0.3 * improvement of the 10-bar extreme over the previous 10 bars / 3%.
+    """
+    emas = [FeatureEngine.calculate_ema(close, period) for period in (9, 21, 50)]
+    beyond = sum(((close - ema) * direction > 0).astype(float) for ema in emas) / 3.0
+
+    roc = (close / close.shift(10) - 1.0) * 100.0 * direction
+    roc_score = (roc / 5.0).clip(0.0, 1.0).fillna(0.0)
+
+    if direction > 0:
+        recent = high.rolling(10).max()
+        improvement = recent / recent.shift(10) - 1.0
+    else:
+        recent = low.rolling(10).min()
+        improvement = 1.0 - recent / recent.shift(10)
+    hh_score = (improvement / 0.03).clip(0.0, 1.0).fillna(0.0)
+
+    score = (0.4 * beyond + 0.3 * roc_score + 0.3 * hh_score).clip(0.0, 1.0)
+    return score.to_numpy(dtype=float)
+
+
+def _confidence_scores(ema_s, ema_l, rsi, macd_hist, volume_ratio, price, vwap) -> np.ndarray:
+    """Vectorized FeatureEngine.calculate_confidence_score (same point bands)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ema_diff = np.abs((ema_s - ema_l) / ema_l) * 100
+        vwap_diff = np.abs((price - vwap) / vwap) * 100
+    hist = np.abs(macd_hist)
+
+    score = np.select([ema_diff > 0.5, ema_diff > 0.3, ema_diff > 0.15, ema_diff > 0.05], [20, 17, 14, 10], 5)
+    score = score + np.select(
+        [(rsi >= 30) & (rsi <= 70), ((rsi >= 25) & (rsi < 30)) | ((rsi > 70) & (rsi <= 75))], [12, 8], 4
+    )
+    score = score + np.where(rsi != 50, 8, 0)
+    score = score + np.select([hist > 0.1, hist > 0.05, hist > 0.02, hist > 0.005], [20, 16, 12, 8], 4)
+    score = score + np.select(
+        [volume_ratio > 1.5, volume_ratio > 1.0, volume_ratio > 0.7, volume_ratio > 0.4, volume_ratio > 0.2],
+        [20, 15, 12, 8, 4], 0
+    )
+    score = score + np.select([vwap_diff < 0.1, vwap_diff < 0.3, vwap_diff < 0.5, vwap_diff < 1.0], [20, 15, 10, 5], 0)
+    return np.minimum(score, 100).astype(float)
+
+
+def _iter_bars(s: 'SymbolSeries', start: int, stop: int):
+    """
+    Yield (index, open, high, low, close) as Python floats. Slices are
+    converted in growing chunks: most positions close within a few bars,
+    and per-element NumPy scalar access dominates the replay loop otherwise.
+    """
+    chunk = 8
+    while start < stop:
+        end = min(start + chunk, stop)
+        yield from zip(
+            range(start, end),
+            s.open[start:end].tolist(),
+            s.high[start:end].tolist(),
+            s.low[start:end].tolist(),
+            s.close[start:end].tolist(),
+        )
+        start = end
+        chunk *= 4
+
+
+@dataclass
+class SymbolSeries:
+    """Precomputed per-bar arrays for one symbol."""
+    symbol: str
+    timestamps: np.ndarray  # datetime64[ns], UTC
+    cooldown_end: np.ndarray  # First bar past the order cooldown from each bar
+    session: np.ndarray  # Session date as days since epoch (ET)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    atr: np.ndarray
+    adx: np.ndarray
+    momentum_volume: np.ndarray  # Current volume / mean of the previous 20 bars
+    trend_long: np.ndarray
+    trend_short: np.ndarray
+    confidence: np.ndarray
+    long_ok: np.ndarray  # Long signal passing all parameter-free filters
+    short_ok: np.ndarray
+    exit_bar: np.ndarray  # Forced-exit bar of each bar's session
+    exit_at_open: np.ndarray  # Whether that exit fills at the bar's open (EOD time) or close
+    risk_mult: np.ndarray  # EMAStrategy confidence risk multiplier
+
+
+def prepare_symbol(symbol: str, df: pd.DataFrame, config: BacktestConfig) -> Optional[SymbolSeries]:
+    """Compute every parameter-independent series for one symbol's bars."""
+    df = df.sort_index()
+    df = df[~df.index.duplicated(keep='last')]
+    if len(df) < WARMUP_BARS + 2:
+        return None
+
+    index = pd.DatetimeIndex(df.index)
+    index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+    local = index.tz_convert('America/New_York')
+    minute_of_day = (local.hour * 60 + local.minute).to_numpy()
+    session = (local.normalize().tz_localize(None).to_numpy().astype('datetime64[D]')).astype(np.int64)
+
+    close, high, low, volume = df['close'].astype(float), df['high'].astype(float), df['low'].astype(float), df['volume'].astype(float)
+
+    # FeatureEngine indicator set over the whole series (all causal)
+    ema_s = FeatureEngine.calculate_ema(close, config.ema_short).to_numpy()
+    ema_l = FeatureEngine.calculate_ema(close, config.ema_long).to_numpy()
+    atr = FeatureEngine.calculate_atr(high, low, close).to_numpy()
+    rsi = calculate_rsi(close).to_numpy()
+    _, _, macd_hist = calculate_macd(close)
+    macd_hist = macd_hist.to_numpy()
+    adx = calculate_adx(high, low, close)[0].to_numpy()
+    volume_ratio = calculate_volume_ratio(volume).to_numpy()
+    momentum_volume = (volume / volume.shift(1).rolling(20).mean()).to_numpy()
+
+    # VWAP restarts each session (calculate_vwap is cumulative over its input frame)
+    session_key = pd.Series(session, index=df.index)
+    pv = ((high + low + close) / 3.0) * volume
+    vwap = (pv.groupby(session_key).cumsum() / volume.groupby(session_key).cumsum()).to_numpy()
+    price = close.to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deviation = (price - vwap) / vwap
+        ema_diff_pct = (ema_s / ema_l - 1) * 100
+    vwap_signal = np.where(deviation > 0.001, 1, np.where(deviation < -0.001, -1, 0))
+    confidence = _confidence_scores(ema_s, ema_l, rsi, macd_hist, volume_ratio, price, vwap)
+
+    # detect_enhanced_signal: crossover first, otherwise trend direction past 0.1% separation
+    prev_s = np.concatenate([ema_s[:1], ema_s[:-1]])
+    prev_l = np.concatenate([ema_l[:1], ema_l[:-1]])
+    cross_up = (prev_s <= prev_l) & (ema_s > ema_l)
+    cross_down = (prev_s >= prev_l) & (ema_s < ema_l)
+    trend_dir = np.where(np.abs(ema_diff_pct) > 0.1, np.sign(ema_s - ema_l), 0)
+    direction = np.where(cross_up, 1, np.where(cross_down, -1, trend_dir))
+
+    is_long, is_short = direction > 0, direction < 0
+    confirmations = (
+        np.where(is_long, rsi > 50, rsi < 50).astype(int)
+        + np.where(is_long, macd_hist > 0, macd_hist < 0).astype(int)
+        + (volume_ratio > 0.8).astype(int)
+        + np.where(is_long, vwap_signal >= 0, vwap_signal <= 0).astype(int)
+    )
+    enough_confirmations = confirmations >= np.where(confidence >= 65, 2, 3)
+
+    # Trading window: regular session, before the entry cutoff, with a next bar to fill on
+    in_window = (minute_of_day >= 9 * 60 + 30) & (minute_of_day < _minutes(config.entry_cutoff_time))
+    same_session_next = np.append(session[1:] == session[:-1], False)
+    ready = np.arange(len(df)) >= WARMUP_BARS
+    valid = ready & in_window & same_session_next & enough_confirmations & np.isfinite(atr) & (atr > 0)
+
+    # EMAStrategy filters that don't depend on optimized parameters
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_position_pct = (price - ema_s) / ema_s * 100
+    long_ok = valid & is_long & (volume_ratio >= 0.20)
+    short_ok = (
+        valid & is_short & (ema_s < ema_l)
+        & (price_position_pct <= np.where(confidence >= 60, 0.5, 0.2))
+        & (volume_ratio >= 0.30)
+        & ((rsi >= 25) | ((volume_ratio >= 3.0) & (confidence >= 75)))
+    )
+    if config.long_only:
+        short_ok[:] = False
+
+    # Forced exit: first bar at/after the EOD time in each session, else the session's last bar
+    n = len(df)
+    eod_minute = _minutes(config.eod_exit_time)
+    starts = np.flatnonzero(np.append(True, session[1:] != session[:-1]))
+    ends = np.append(starts[1:], n) - 1
+    exit_bar = np.empty(n, dtype=np.int64)
+    exit_at_open = np.zeros(n, dtype=bool)
+    for start, end in zip(starts, ends):
+        late = np.flatnonzero(minute_of_day[start:end + 1] >= eod_minute)
+        exit_bar[start:end + 1] = start + late[0] if len(late) else end
+        exit_at_open[start:end + 1] = bool(len(late))
+
+    minute_ts = index.as_unit('ns').asi8 // 60_000_000_000
+    risk_mult = np.select(
+        [confidence >= 90, confidence >= 85, confidence >= 80, confidence >= 75, confidence >= 70],
+        [2.0, 1.8, 1.5, 1.2, 1.0], 0.8
+    )
+
+    return SymbolSeries(
+        symbol=symbol,
+        timestamps=index.tz_localize(None).to_numpy(),
+        cooldown_end=np.searchsorted(minute_ts, minute_ts + config.cooldown_minutes),
+        session=session,
+        open=df['open'].to_numpy(dtype=float),
+        high=high.to_numpy(),
+        low=low.to_numpy(),
+        close=price,
+        atr=atr,
+        adx=adx,
+        momentum_volume=momentum_volume,
+        trend_long=_trend_strength(close, high, low, 1),
+        trend_short=_trend_strength(close, high, low, -1),
+        confidence=confidence,
+        long_ok=long_ok,
+        short_ok=short_ok,
+        exit_bar=exit_bar,
+        exit_at_open=exit_at_open,
+        risk_mult=risk_mult,
+    )
+
+
+class BacktestEngine:
+    """
+    Replays precomputed bar series with a parameter set.
+
+    Instances are callable, so an engine can be passed directly as the
+    backtest_func of ParameterOptimizer.optimize().
+    """
+
+    def __init__(
+        self,
+        bars: BarsInput,
+        config: Optional[BacktestConfig] = None,
+        regimes: Optional[Dict[date, str]] = None,
+    ):
+        """
+        Args:
+            bars: {symbol: OHLCV frame} or a (symbol, timestamp) multi-index frame
+            config: Simulation settings (defaults from settings)
+            regimes: Optional {session date: regime} for per-session regime parameters
+        """
+        self.config = config or BacktestConfig()
+        self.series: List[SymbolSeries] = []
+        for symbol, df in _split_symbols(bars).items():
+            try:
+                prepared = prepare_symbol(symbol, df, self.config)
+                if prepared is not None:
+                    self.series.append(prepared)
+            except Exception as e:
+                logger.error(f"Failed to prepare backtest bars for {symbol}: {e}")
+
+        self.regimes = {
+            int(np.datetime64(day, 'D').astype(np.int64)): regime for day, regime in (regimes or {}).items()
+        }
+        self.session_range: Tuple[Optional[int], Optional[int]] = (None, None)
+        logger.info(f"Backtest engine ready: {len(self.series)} symbols, {self.bar_count} bars")
+
+    @property
+    def bar_count(self) -> int:
+        return sum(len(s.close) for s in self.series)
+
+    def sessions(self) -> np.ndarray:
+        """Sorted session days (days since epoch) within this engine's range."""
+        if not self.series:
+            return np.empty(0, dtype=np.int64)
+        days = np.unique(np.concatenate([s.session for s in self.series]))
+        first, last = self.session_range
+        if first is not None:
+            days = days[days >= first]
+        if last is not None:
+            days = days[days < last]
+        return days
+
+    def split(self, train_ratio: float = 0.7) -> Tuple['BacktestEngine', 'BacktestEngine']:
+        """
+        Chronological train/validation engines over the same precomputed
+        series; indicators stay warm across the boundary.
+        """
+        days = self.sessions()
+        cut = days[min(int(len(days) * train_ratio), len(days) - 1)] if len(days) else None
+        return self.window(self.session_range[0], cut), self.window(cut, self.session_range[1])
+
+    def window(self, first_session: Optional[int], end_session: Optional[int]) -> 'BacktestEngine':
+        """Engine sharing this one's data, limited to entries in [first_session, end_session)."""
+        engine = object.__new__(BacktestEngine)
+        engine.__dict__.update(self.__dict__)
+        engine.session_range = (first_session, end_session)
+        return engine
+
+    def __call__(self, params: Dict[str, float]) -> List[Dict]:
+        return self.run(params)
+
+    def run(self, params: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """
+        Simulate all symbols with one parameter set.
+
+        Args:
+            params: Any of REGIME_PARAMETERS, MOMENTUM_PARAMETERS and
+                CONFIDENCE_PARAMETERS keys; missing keys use live defaults
+
+        Returns:
+            Trades sorted by exit time, each with 'pnl' and 'return'
+        """
+        params = params or {}
+        resolved = self._resolve(params)
+        trades: List[Dict] = []
+        for series in self.series:
+            trades.extend(self._run_symbol(series, resolved))
+        trades.sort(key=lambda t: t['exit_time'])
+        return trades
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _resolve(self, params: Dict[str, float]) -> Dict:
+        momentum = MomentumConfig()
+        regime_params = {
+            regime: {key: float(params.get(f"{regime}_{key}", value)) for key, value in defaults.items()}
+            for regime, defaults in DEFAULT_REGIME_PARAMS.items()
+        }
+        return {
+            'regimes': regime_params,
+            'long_threshold': float(params.get('base_long_threshold', DEFAULT_CONFIDENCE_PARAMS['base_long_threshold'])) * 100,
+            # EMAStrategy caps the short threshold at 75%
+            'short_threshold': min(float(params.get('base_short_threshold', DEFAULT_CONFIDENCE_PARAMS['base_short_threshold'])), 0.75) * 100,
+            'adx_threshold': float(params.get('adx_threshold', momentum.adx_threshold)),
+            'volume_threshold': float(params.get('volume_threshold', momentum.volume_threshold)),
+            'trend_threshold': float(params.get('trend_threshold', momentum.trend_threshold)),
+            'atr_trailing_multiplier': float(params.get('atr_trailing_multiplier', momentum.atr_trailing_multiplier)),
+            'evaluation_profit_r': float(params.get('evaluation_profit_r', momentum.evaluation_profit_r)),
+            'extended_target_r': momentum.extended_target_r,
+            'progressive_stop_r': momentum.progressive_stop_r,
+        }
+
+    def _run_symbol(self, s: SymbolSeries, p: Dict) -> List[Dict]:
+        config = self.config
+        # EMAStrategy rejects everything when the ATR bracket can't reach 1.95:1
+        if config.take_profit_atr_mult / config.stop_loss_atr_mult < 1.95:
+            return []
+
+        longs = s.long_ok & (s.confidence >= p['long_threshold'])
+        entries = longs | (s.short_ok & (s.confidence >= p['short_threshold']))
+        first, last = self.session_range
+        if first is not None:
+            entries &= s.session >= first
+        if last is not None:
+            entries &= s.session < last
+        candidates = np.flatnonzero(entries)
+        directions = np.where(longs[candidates], 1, -1).tolist()
+
+        trades = []
+        pos = 0
+        while pos < len(candidates):
+            i = int(candidates[pos])
+            trade, exit_idx = self._simulate(s, i, directions[pos], p)
+            if trade is not None:
+                trades.append(trade)
+                # Next entry: after this position closed and after the order cooldown
+                earliest = max(exit_idx + 1, int(s.cooldown_end[i]))
+            else:
+                earliest = i + 1
+            pos = int(candidates.searchsorted(earliest))
+        return trades
+
+    def _simulate(self, s: SymbolSeries, i: int, d: int, p: Dict) -> Tuple[Optional[Dict], int]:
+        """Open a position (d: 1 long, -1 short) on the bar after signal bar i and replay it to the exit."""
+        config = self.config
+        side = 'buy' if d > 0 else 'sell'
+        e = i + 1
+        end = int(s.exit_bar[i])
+        if e > end or (e == end and s.exit_at_open[i]):
+            return None, i
+
+        regime = self.regimes.get(int(s.session[i]), config.regime)
+        rp = p['regimes'].get(regime, p['regimes']['neutral'])
+        slip = config.slippage_bps / 10000.0
+
+        atr = float(s.atr[i])
+        entry = float(s.open[e]) * (1 + d * slip)
+        stop = calculate_atr_stop(entry, atr, config.stop_loss_atr_mult, side)
+        target = calculate_atr_target(entry, atr, rp['profit_target_r'] * config.stop_loss_atr_mult, side)
+        risk = abs(entry - stop)
+        risk_pct = max(0.01, min(config.risk_per_trade_pct * s.risk_mult[i] * rp['position_size_mult'], 0.035))
+        qty = calculate_position_size(config.starting_equity, risk_pct, entry, stop)
+        if qty < 1 or risk <= 0:
+            return None, i
+
+        allocation = ShareAllocation(original_quantity=qty, remaining_quantity=qty)
+        partials = [
+            [entry + d * rp['partial_profit_1_r'] * risk, allocation.calculate_next_exit_quantity(2.0)],
+            [entry + d * rp['partial_profit_2_r'] * risk, allocation.calculate_next_exit_quantity(3.0)],
+        ]
+        remaining = qty
+        pnl = 0.0
+        extreme = entry
+        extended = False
+        reason = 'eod'
+        exit_price = None
+        exit_idx = end
+
+        for j, o, h, l, c in _iter_bars(s, e, end + 1):
+
+            if j == end and s.exit_at_open[i]:
+                exit_price = o * (1 - d * slip)
+                break
+
+            adverse, favorable = (l, h) if d > 0 else (h, l)
+            if d * (adverse - stop) <= 0:
+                fill = o if d * (o - stop) < 0 else stop
+                exit_price = fill * (1 - d * slip)
+                reason = 'stop_loss' if d * (stop - entry) < 0 else 'protective_stop'
+                exit_idx = j
+                break
+
+            for partial in partials:
+                level, shares = partial
+                if shares and d * (favorable - level) >= 0 and shares < remaining:
+                    fill = o if d * (o - level) > 0 else level
+                    pnl += d * (fill * (1 - d * slip) - entry) * shares
+                    remaining -= shares
+                    partial[1] = 0
+
+            if d * (favorable - target) >= 0:
+                exit_price = o if d * (o - target) > 0 else target
+                reason = 'target'
+                exit_idx = j
+                break
+
+            if j == end:
+                exit_price = c * (1 - d * slip)
+                break
+
+            # End-of-bar protection updates apply from the next bar
+            extreme = max(extreme, h) if d > 0 else min(extreme, l)
+            best_r = d * (extreme - entry) / risk
+            if best_r >= 1.0:
+                stop = self._tighten(stop, entry, d)
+                stop = self._tighten(stop, extreme - d * rp['trailing_stop_r'] * risk, d)
+
+            if config.momentum_enabled:
+                if not extended and d * (c - entry) / risk >= p['evaluation_profit_r']:
+                    trend = s.trend_long[j] if d > 0 else s.trend_short[j]
+                    if (s.adx[j] > p['adx_threshold'] and s.momentum_volume[j] > p['volume_threshold']
+                            and trend > p['trend_threshold']):
+                        extended = True
+                        target = self._tighten(target, entry + d * p['extended_target_r'] * risk, d)
+                        stop = self._tighten(stop, entry + d * p['progressive_stop_r'] * risk, d)
+                if extended:
+                    stop = self._tighten(stop, c - d * p['atr_trailing_multiplier'] * s.atr[j], d)
+
+        pnl += d * (exit_price - entry) * remaining
+        entry_value = entry * qty
+        return {
+            'symbol': s.symbol,
+            'side': side,
+            'entry_time': str(s.timestamps[e].astype('datetime64[s]')),
+            'exit_time': str(s.timestamps[exit_idx].astype('datetime64[s]')),
+            'entry_price': round(entry, 4),
+            'exit_price': round(float(exit_price), 4),
+            'qty': qty,
+            'pnl': float(pnl),
+            'return': float(pnl / config.starting_equity),
+            'r_multiple': float(pnl / (risk * qty)),
+            'pnl_pct': float(pnl / entry_value * 100) if entry_value else 0.0,
+            'exit_reason': reason,
+            'regime': regime,
+            'momentum_extended': extended,
+        }, exit_idx
+
+    @staticmethod
+    def _tighten(level: float, candidate: float, direction: int) -> float:
+        """Move a stop/target level toward profit only (never loosen)."""
+        return candidate if direction * (candidate - level) > 0 else level
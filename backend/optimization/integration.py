@@ -5,13 +5,19 @@ Bridges the new PSO/GA optimizer with the existing adaptive parameter system.
 
 import logging
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
+import pandas as pd
+
+from config import settings
+from data.bar_archive import get_bar_archive
+from .backtest import BacktestConfig, BacktestEngine
 from .optimizer import ParameterOptimizer as ScikitOptimizer
 from .validator import WalkForwardValidator
 from .fitness import FitnessCalculator
 from .logger import ResultsLogger
-from .models import REGIME_PARAMETERS, MOMENTUM_PARAMETERS, PerformanceMetrics
+from .models import REGIME_PARAMETERS, MOMENTUM_PARAMETERS, PerformanceMetrics, WalkForwardResult
+from .walk_forward import WalkForwardRunner
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +27,8 @@ class OptimizationIntegration:
     Integrates scikit-opt optimization with the live trading system.
     
     This class:
-    1. Fetches historical trades from Supabase
-    2. Runs PSO/GA optimization with walk-forward validation
+    1. Fetches stored minute bars from Supabase
+    2. Runs PSO/GA optimization over bar-replay backtests with walk-forward validation
     3. Updates the regime_manager and momentum config with optimized values
     4. Logs results for verification
     """
@@ -32,10 +38,15 @@ class OptimizationIntegration:
         Initialize optimization integration.
         
         Args:
-            supabase_client: Optional Supabase client for fetching trades
+            supabase_client: Optional SupabaseClient for fetching trades and stored bars
         """
         self.supabase = supabase_client
-        self.optimizer = ScikitOptimizer(algorithm="PSO", population_size=30, max_iterations=50)
+        self.optimizer = ScikitOptimizer(
+            algorithm="PSO",
+            population_size=30,
+            max_iterations=50,
+            workers=settings.optimizer_workers,
+        )
         self.validator = WalkForwardValidator()
         self.fitness_calc = FitnessCalculator()
         self.results_logger = ResultsLogger(results_dir="backend/optimization_results")
@@ -59,7 +70,7 @@ class OptimizationIntegration:
         try:
             start_date = datetime.now() - timedelta(days=days)
             
-            result = self.supabase.table('trades').select('*').gte(
+            result = self.supabase.client.table('trades').select('*').gte(
                 'entry_time', start_date.isoformat()
             ).execute()
             
@@ -90,90 +101,80 @@ class OptimizationIntegration:
         
         return trades
     
-    def create_backtest_function(self, trades: List[Dict], params_to_optimize: str = "regime"):
+    async def fetch_historical_bars(self, symbols: Optional[List[str]] = None, days: int = 60) -> Dict[str, pd.DataFrame]:
         """
-        Create a backtest function that simulates trading with given parameters.
+        Load minute bars for backtesting: from the local bar archive, with
+        gaps filled from the Supabase market_data table.
         
         Args:
-            trades: Historical trades to base simulation on
-            params_to_optimize: "regime" or "momentum"
+            symbols: Symbols to load (default: settings.watchlist)
+            days: Number of days of history to fetch
             
         Returns:
-            Callable that takes parameters and returns simulated trades
+            {symbol: OHLCV DataFrame indexed by timestamp}
         """
-        import random
+        archive = get_bar_archive()
+        if not self.supabase and not archive.enabled:
+            logger.warning("No Supabase client - no bars to backtest")
+            return {}
         
-        def backtest(params: Dict[str, float]) -> List[Dict]:
-            """Simulate trades with given parameters."""
-            # Calculate parameter quality score
-            param_score = self._calculate_param_score(params, params_to_optimize)
-            
-            # Adjust win rate based on parameter quality
-            base_win_rate = 0.70
-            adjusted_win_rate = min(0.85, base_win_rate + param_score * 0.1)
-            
-            # Generate simulated trades
-            simulated_trades = []
-            for _ in range(len(trades)):
-                is_winner = random.random() < adjusted_win_rate
-                
-                if is_winner:
-                    # Use profit target from params if available
-                    profit_mult = params.get('neutral_profit_target_r', 2.0) / 2.0
-                    pnl = random.uniform(50, 500) * profit_mult
-                else:
-                    # Use trailing stop from params if available
-                    loss_mult = params.get('neutral_trailing_stop_r', 0.75) / 0.75
-                    pnl = random.uniform(-300, -50) * loss_mult
-                
-                simulated_trades.append({
-                    'pnl': pnl,
-                    'return': pnl / 10000,
-                })
-            
-            return simulated_trades
+        symbols = symbols or settings.watchlist_symbols
+        end = datetime.now(timezone.utc)
+        bars = {
+            symbol: df[['open', 'high', 'low', 'close', 'volume']]
+            for symbol, df in archive.read_through(
+                symbols, end - timedelta(days=days), end, self._query_stored_bars
+            ).items()
+        }
         
-        return backtest
+        logger.info(f"📊 Loaded {sum(len(df) for df in bars.values())} bars for {len(bars)} symbols")
+        return bars
     
-    def _calculate_param_score(self, params: Dict[str, float], param_type: str) -> float:
-        """Calculate a quality score for parameters (0-1)."""
-        score = 0.0
-        count = 0
+    def _query_stored_bars(self, symbols: List[str], start: datetime, end: datetime) -> Dict[str, pd.DataFrame]:
+        """Page minute bars for symbols in [start, end] out of the Supabase market_data table."""
+        if not self.supabase:
+            return {}
         
-        if param_type == "regime":
-            # Score based on reasonable profit targets and trailing stops
-            for key, value in params.items():
-                if 'profit_target' in key:
-                    # Prefer moderate targets (2-3R)
-                    if 2.0 <= value <= 3.5:
-                        score += 1.0
-                    elif 1.5 <= value <= 4.0:
-                        score += 0.5
-                    count += 1
-                elif 'trailing_stop' in key:
-                    # Prefer moderate trailing stops (0.75-1.25R)
-                    if 0.75 <= value <= 1.25:
-                        score += 1.0
-                    elif 0.5 <= value <= 1.5:
-                        score += 0.5
-                    count += 1
+        page_size = 1000
+        bars = {}
         
-        elif param_type == "momentum":
-            # Score based on reasonable momentum thresholds
-            if 'adx_threshold' in params:
-                if 22 <= params['adx_threshold'] <= 28:
-                    score += 1.0
-                count += 1
-            if 'volume_threshold' in params:
-                if 1.4 <= params['volume_threshold'] <= 1.8:
-                    score += 1.0
-                count += 1
-            if 'trend_threshold' in params:
-                if 0.65 <= params['trend_threshold'] <= 0.75:
-                    score += 1.0
-                count += 1
+        for symbol in symbols:
+            try:
+                rows = []
+                while True:
+                    result = self.supabase.client.table('market_data').select(
+                        'timestamp,open,high,low,close,volume'
+                    ).eq('symbol', symbol).gte('timestamp', start.isoformat()).lte(
+                        'timestamp', end.isoformat()
+                    ).order(
+                        'timestamp'
+                    ).range(len(rows), len(rows) + page_size - 1).execute()
+                    page = result.data or []
+                    rows.extend(page)
+                    if len(page) < page_size:
+                        break
+                
+                if rows:
+                    df = pd.DataFrame(rows)
+                    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+                    bars[symbol] = df.set_index('timestamp').astype(float)
+            except Exception as e:
+                logger.error(f"Error fetching bars for {symbol}: {e}")
         
-        return score / max(count, 1)
+        return bars
+    
+    def create_backtest_function(self, bars, config: Optional[BacktestConfig] = None) -> BacktestEngine:
+        """
+        Create a backtest function that replays bars with given parameters.
+        
+        Args:
+            bars: {symbol: OHLCV frame} or (symbol, timestamp) multi-index frame
+            config: Optional simulation settings
+            
+        Returns:
+            BacktestEngine; call it with a parameter dict to get trades
+        """
+        return BacktestEngine(bars, config)
     
     async def run_full_optimization(self) -> Dict[str, Any]:
         """
@@ -186,28 +187,37 @@ class OptimizationIntegration:
         logger.info("🚀 RUNNING FULL PARAMETER OPTIMIZATION")
         logger.info("=" * 60)
         
-        # Fetch historical trades
-        trades = await self.fetch_historical_trades(days=180)
+        # Fetch stored bars and build the replay engine
+        bars = await self.fetch_historical_bars()
+        engine = self.create_backtest_function(bars)
+        
+        if not engine.series:
+            logger.error("❌ No bars available - cannot backtest parameters")
+            return {'status': 'no_data', 'results': {}, 'overfitting_detected': False}
         
-        if len(trades) < 50:
-            logger.warning(f"⚠️ Only {len(trades)} trades - need more data for reliable optimization")
+        # Baseline: current live parameters over the full period
+        baseline_trades = engine.run()
+        if len(baseline_trades) < 50:
+            logger.warning(f"⚠️ Only {len(baseline_trades)} trades - need more data for reliable optimization")
         
         # Calculate baseline metrics
-        baseline_metrics = self.fitness_calc.calculate_metrics(trades)
+        baseline_metrics = self.fitness_calc.calculate_metrics(baseline_trades)
         logger.info(
             f"📊 Baseline: Sharpe={baseline_metrics.sharpe_ratio:.2f}, "
             f"WinRate={baseline_metrics.win_rate*100:.1f}%"
         )
         
+        # Chronological train/validation windows over the same bars
+        train_backtest, validate_backtest = engine.split(self.validator.train_ratio)
+        
         results = {}
         
         # 1. Optimize regime parameters
         logger.info("\n🎯 Optimizing REGIME parameters...")
-        regime_backtest = self.create_backtest_function(trades, "regime")
         regime_result, regime_validation = self.optimizer.optimize_with_validation(
             REGIME_PARAMETERS,
-            regime_backtest,
-            regime_backtest,  # Same function, different random seed
+            train_backtest,
+            validate_backtest,
         )
         results['regime'] = {
             'optimization': regime_result,
@@ -216,11 +226,10 @@ class OptimizationIntegration:
         
         # 2. Optimize momentum parameters
         logger.info("\n📈 Optimizing MOMENTUM parameters...")
-        momentum_backtest = self.create_backtest_function(trades, "momentum")
         momentum_result, momentum_validation = self.optimizer.optimize_with_validation(
             MOMENTUM_PARAMETERS,
-            momentum_backtest,
-            momentum_backtest,
+            train_backtest,
+            validate_backtest,
         )
         results['momentum'] = {
             'optimization': momentum_result,
@@ -258,6 +267,42 @@ class OptimizationIntegration:
             'results_file': filepath,
         }
     
+    async def run_walk_forward(
+        self,
+        parameter_space: Dict = MOMENTUM_PARAMETERS,
+        n_folds: Optional[int] = None,
+        days: int = 60,
+    ) -> Optional[WalkForwardResult]:
+        """
+        Run rolling walk-forward optimization over stored bars.
+        
+        Args:
+            parameter_space: Parameters to optimize (default: momentum)
+            n_folds: Number of folds (default: settings.walk_forward_folds)
+            days: Days of bar history to fetch
+            
+        Returns:
+            WalkForwardResult (also saved by the results logger), or None without data
+        """
+        bars = await self.fetch_historical_bars(days=days)
+        engine = self.create_backtest_function(bars)
+        
+        if not engine.series:
+            logger.error("❌ No bars available - cannot run walk-forward")
+            return None
+        
+        runner = WalkForwardRunner(
+            optimizer=self.optimizer,
+            validator=self.validator,
+            n_folds=n_folds or settings.walk_forward_folds,
+            workers=settings.optimizer_workers,
+            results_logger=self.results_logger,
+        )
+        result = runner.run(parameter_space, engine)
+        if result:
+            logger.info("\n" + self.results_logger.generate_walk_forward_summary(result))
+        return result
+    
     def apply_optimized_parameters(self, results: Dict[str, Any]) -> bool:
         """
         Apply optimized parameters to the live trading system.
@@ -289,9 +334,20 @@ class OptimizationIntegration:
 
 
 # Convenience function for CLI usage
-async def run_integrated_optimization():
-    """Run optimization with integration to trading system."""
-    integration = OptimizationIntegration()
+async def run_integrated_optimization(supabase_client=None):
+    """
+    Run optimization with integration to trading system.
+    
+    Args:
+        supabase_client: SupabaseClient for stored trades/bars (created if omitted)
+    """
+    if supabase_client is None:
+        try:
+            from core.supabase_client import SupabaseClient
+            supabase_client = SupabaseClient()
+        except Exception as e:
+            logger.warning(f"Supabase unavailable, using the local bar archive only: {e}")
+    integration = OptimizationIntegration(supabase_client)
     results = await integration.run_full_optimization()
     
     if not results.get('overfitting_detected'):
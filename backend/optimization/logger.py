@@ -15,6 +15,7 @@ from .models import (
     ValidationResult,
     PerformanceMetrics,
     VerificationResult,
+    WalkForwardResult,
 )
 
 logger = logging.getLogger(__name__)
@@ -81,6 +82,25 @@ class ResultsLogger:
         logger.info(f"💾 Results saved to: {filepath}")
         return str(filepath)
     
+    def save_walk_forward(self, result: WalkForwardResult) -> str:
+        """
+        Save walk-forward results (per-fold and aggregate) to timestamped file.
+        
+        Args:
+            result: Walk-forward result
+            
+        Returns:
+            Path to saved file
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.results_dir / f"walk_forward_{timestamp}.json"
+        
+        with open(filepath, 'w') as f:
+            json.dump(result.to_dict(), f, indent=2)
+        
+        logger.info(f"💾 Walk-forward results saved to: {filepath}")
+        return str(filepath)
+    
     def load_results(self, filepath: str) -> Dict:
         """Load results from file."""
         with open(filepath, 'r') as f:
@@ -158,6 +178,8 @@ class ResultsLogger:
             f"📅 Timestamp: {opt_result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
             f"🔄 Iterations: {opt_result.iterations_run}",
             f"🏆 Best Fitness: {opt_result.best_fitness:.4f}",
+            f"⚡ Evaluations: {opt_result.evaluations} on {opt_result.workers} worker(s) "
+            f"in {opt_result.evaluation_seconds:.1f}s ({opt_result.speedup:.1f}x speedup)",
             "",
             "📈 Performance Metrics:",
             f"   Sharpe Ratio: {opt_result.metrics.sharpe_ratio:.2f}",
@@ -185,3 +207,52 @@ class ResultsLogger:
         lines.extend(["", "=" * 60])
         
         return "\n".join(lines)
+    
+    def generate_walk_forward_summary(self, result: WalkForwardResult) -> str:
+        """
+        Generate human-readable summary of walk-forward results.
+        
+        Args:
+            result: Walk-forward result
+            
+        Returns:
+            Formatted summary string
+        """
+        lines = [
+            "=" * 60,
+            "🚶 WALK-FORWARD RESULTS",
+            "=" * 60,
+            "",
+            f"📅 Timestamp: {result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"🔁 Folds: {len(result.folds)} ({result.workers} in parallel, {result.elapsed_seconds:.1f}s)",
+            "",
+            "📉 Folds (test window: out-sample Sharpe / win rate):",
+        ]
+        
+        for fold in result.folds:
+            metrics = fold.validation.out_sample_metrics
+            lines.append(
+                f"   #{fold.index} {fold.test_start}..{fold.test_end or 'end'}: "
+                f"{metrics.sharpe_ratio:.2f} / {metrics.win_rate*100:.1f}%"
+                f"{' ⚠️ overfit' if fold.validation.overfitting_detected else ''}"
+            )
+        
+        lines.extend([
+            "",
+            "✅ Aggregate:",
+            f"   In-Sample Sharpe: {result.in_sample_metrics.sharpe_ratio:.2f}",
+            f"   Out-Sample Sharpe: {result.out_sample_metrics.sharpe_ratio:.2f}",
+            f"   Out-Sample Trades: {result.out_sample_metrics.total_trades}",
+            f"   Degradation: {result.degradation_percent*100:.1f}%",
+            f"   Overfit Folds: {result.overfit_folds}/{len(result.folds)}",
+            f"   Overfitting: {'⚠️ YES' if result.overfitting_detected else '✅ NO'}",
+            "",
+            "🔧 Robust Parameters (median across folds):",
+        ])
+        
+        for name, value in sorted(result.robust_parameters.items()):
+            lines.append(f"   {name}: {value:.4f}")
+        
+        lines.extend(["", "=" * 60])
+        
+        return "\n".join(lines)
@@ -37,6 +37,10 @@ class OptimizationResult:
     iterations_run: int
     convergence_history: List[float] = field(default_factory=list)
     timestamp: datetime = field(default_factory=datetime.now)
+    evaluations: int = 0  # Backtest runs scored during the search
+    workers: int = 1  # Processes used for fitness evaluation
+    evaluation_seconds: float = 0.0  # Wall time spent scoring populations
+    speedup: float = 1.0  # Summed backtest CPU time / wall time
     
     def to_dict(self) -> Dict:
         return {
@@ -45,6 +49,10 @@ class OptimizationResult:
             "metrics": self.metrics.to_dict(),
             "iterations_run": self.iterations_run,
             "convergence_history": self.convergence_history,
+            "evaluations": self.evaluations,
+            "workers": self.workers,
+            "evaluation_seconds": self.evaluation_seconds,
+            "speedup": self.speedup,
             "timestamp": self.timestamp.isoformat(),
         }
 
@@ -66,6 +74,58 @@ class ValidationResult:
         }
 
 
+@dataclass
+class FoldResult:
+    """One walk-forward fold: optimized on its train window, scored on its test window."""
+    index: int
+    train_start: str  # Session dates (ISO), test_end exclusive
+    test_start: str
+    test_end: str
+    optimization: OptimizationResult
+    validation: ValidationResult
+    in_sample_trades: List[Dict] = field(default_factory=list, repr=False)
+    out_sample_trades: List[Dict] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict:
+        return {
+            "index": self.index,
+            "train_start": self.train_start,
+            "test_start": self.test_start,
+            "test_end": self.test_end,
+            "optimization": self.optimization.to_dict(),
+            "validation": self.validation.to_dict(),
+        }
+
+
+@dataclass
+class WalkForwardResult:
+    """Aggregate of rolling walk-forward folds."""
+    folds: List[FoldResult]
+    in_sample_metrics: PerformanceMetrics  # All folds' training windows
+    out_sample_metrics: PerformanceMetrics  # Stitched test windows
+    overfitting_detected: bool
+    degradation_percent: float
+    overfit_folds: int
+    robust_parameters: Dict[str, float]  # Per-parameter median across folds
+    workers: int = 1  # Folds optimized concurrently
+    elapsed_seconds: float = 0.0
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> Dict:
+        return {
+            "folds": [fold.to_dict() for fold in self.folds],
+            "in_sample_metrics": self.in_sample_metrics.to_dict(),
+            "out_sample_metrics": self.out_sample_metrics.to_dict(),
+            "overfitting_detected": self.overfitting_detected,
+            "degradation_percent": self.degradation_percent,
+            "overfit_folds": self.overfit_folds,
+            "robust_parameters": self.robust_parameters,
+            "workers": self.workers,
+            "elapsed_seconds": self.elapsed_seconds,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+
 @dataclass
 class VerificationResult:
     """Result from comparing pre/post optimization performance."""
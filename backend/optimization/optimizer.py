@@ -10,6 +10,7 @@ import logging
 
 from sko.PSO import PSO
 from sko.GA import GA
+from sko.tools import set_run_mode
 
 from .models import (
     OptimizationResult,
@@ -21,6 +22,7 @@ from .models import (
     clamp_parameters,
 )
 from .fitness import FitnessCalculator
+from .parallel import PopulationEvaluator, resolve_workers
 from .validator import WalkForwardValidator
 
 logger = logging.getLogger(__name__)
@@ -37,6 +39,8 @@ class ParameterOptimizer:
         algorithm: str = "PSO",
         population_size: int = 40,
         max_iterations: int = 100,
+        workers: Optional[int] = 1,
+        seed: Optional[int] = None,
     ):
         """
         Initialize parameter optimizer.
@@ -45,51 +49,22 @@ class ParameterOptimizer:
             algorithm: "PSO" or "GA"
             population_size: Number of particles/individuals
             max_iterations: Maximum optimization iterations
+            workers: Processes scoring each generation (None/0 = all cores, 1 = serial)
+            seed: Seed for the optimizer and every backtest run (None = unseeded)
         """
         self.algorithm = algorithm.upper()
         self.population_size = population_size
         self.max_iterations = max_iterations
+        self.workers = resolve_workers(workers)
+        self.seed = seed
         self.fitness_calculator = FitnessCalculator()
         self.validator = WalkForwardValidator()
         
         logger.info(
             f"🔧 Parameter Optimizer initialized: {self.algorithm}, "
-            f"pop={population_size}, iter={max_iterations}"
+            f"pop={population_size}, iter={max_iterations}, workers={self.workers}"
         )
     
-    def _create_fitness_function(
-        self,
-        parameter_names: List[str],
-        backtest_func: Callable[[Dict[str, float]], List[Dict]],
-    ) -> Callable:
-        """
-        Create fitness function for optimization.
-        
-        Args:
-            parameter_names: List of parameter names in order
-            backtest_func: Function that takes parameters and returns trades
-            
-        Returns:
-            Fitness function for PSO/GA
-        """
-        def fitness(x):
-            # Convert array to parameter dict
-            params = {name: x[i] for i, name in enumerate(parameter_names)}
-            
-            # Run backtest
-            try:
-                trades = backtest_func(params)
-                
-                # Calculate fitness (negative because PSO minimizes)
-                fitness_score = self.fitness_calculator.calculate_fitness(params, trades)
-                
-                return -fitness_score  # Negative for minimization
-            except Exception as e:
-                logger.warning(f"Backtest failed: {e}")
-                return float('inf')  # Worst fitness
-        
-        return fitness
-    
     def optimize(
         self,
         parameter_space: Dict[str, Tuple[float, float]],
@@ -111,14 +86,70 @@ class ParameterOptimizer:
         lb = [parameter_space[name][0] for name in param_names]
         ub = [parameter_space[name][1] for name in param_names]
         
-        logger.info(f"🚀 Starting {self.algorithm} optimization with {n_dim} parameters")
+        if self.algorithm not in ("PSO", "GA"):
+            raise ValueError(f"Unknown algorithm: {self.algorithm}")
+        
+        logger.info(
+            f"🚀 Starting {self.algorithm} optimization with {n_dim} parameters "
+            f"on {self.workers} worker(s)"
+        )
+        
+        if self.seed is not None:
+            np.random.seed(self.seed)
+        
+        # Score each generation as one batch, across the worker pool
+        evaluator = PopulationEvaluator(
+            param_names,
+            backtest_func,
+            self.fitness_calculator,
+            workers=self.workers,
+            seed=self.seed,
+        )
+        set_run_mode(evaluator, 'vectorization')
+        
+        with evaluator:
+            best_x, best_y, convergence_history = self._run_algorithm(evaluator, n_dim, lb, ub)
         
-        # Create fitness function
-        fitness_func = self._create_fitness_function(param_names, backtest_func)
+        # Convert to parameter dict
+        best_params = {name: float(best_x[i]) for i, name in enumerate(param_names)}
         
-        # Run optimization
-        convergence_history = []
+        # Clamp to valid bounds
+        best_params = clamp_parameters(best_params, parameter_space)
+        
+        # Get final metrics
+        final_trades = backtest_func(best_params)
+        metrics = self.fitness_calculator.calculate_metrics(final_trades)
         
+        # Handle numpy array return from optimizer
+        best_fitness = float(-best_y[0]) if hasattr(best_y, '__iter__') else float(-best_y)
+        
+        logger.info(
+            f"✅ Optimization complete! Best fitness: {best_fitness:.4f}, "
+            f"Sharpe: {metrics.sharpe_ratio:.2f}, WinRate: {metrics.win_rate*100:.1f}%, "
+            f"{evaluator.evaluations} evaluations in {evaluator.wall_seconds:.1f}s "
+            f"({evaluator.speedup:.1f}x speedup)"
+        )
+        
+        return OptimizationResult(
+            best_parameters=best_params,
+            best_fitness=best_fitness,
+            metrics=metrics,
+            iterations_run=self.max_iterations,
+            convergence_history=convergence_history,
+            evaluations=evaluator.evaluations,
+            workers=self.workers,
+            evaluation_seconds=evaluator.wall_seconds,
+            speedup=evaluator.speedup,
+        )
+    
+    def _run_algorithm(
+        self,
+        fitness_func: Callable,
+        n_dim: int,
+        lb: List[float],
+        ub: List[float],
+    ) -> Tuple[np.ndarray, np.ndarray, List[float]]:
+        """Run PSO/GA and return (best_x, best_y, convergence history)."""
         if self.algorithm == "PSO":
             optimizer = PSO(
                 func=fitness_func,
@@ -134,7 +165,7 @@ class ParameterOptimizer:
             best_x, best_y = optimizer.run()
             convergence_history = list(-np.array(optimizer.gbest_y_hist))
             
-        elif self.algorithm == "GA":
+        else:
             optimizer = GA(
                 func=fitness_func,
                 n_dim=n_dim,
@@ -146,34 +177,8 @@ class ParameterOptimizer:
             )
             best_x, best_y = optimizer.run()
             convergence_history = list(-np.array(optimizer.generation_best_Y))
-        else:
-            raise ValueError(f"Unknown algorithm: {self.algorithm}")
-        
-        # Convert to parameter dict
-        best_params = {name: best_x[i] for i, name in enumerate(param_names)}
-        
-        # Clamp to valid bounds
-        best_params = clamp_parameters(best_params, parameter_space)
-        
-        # Get final metrics
-        final_trades = backtest_func(best_params)
-        metrics = self.fitness_calculator.calculate_metrics(final_trades)
         
-        # Handle numpy array return from optimizer
-        best_fitness = float(-best_y[0]) if hasattr(best_y, '__iter__') else float(-best_y)
-        
-        logger.info(
-            f"✅ Optimization complete! Best fitness: {best_fitness:.4f}, "
-            f"Sharpe: {metrics.sharpe_ratio:.2f}, WinRate: {metrics.win_rate*100:.1f}%"
-        )
-        
-        return OptimizationResult(
-            best_parameters=best_params,
-            best_fitness=best_fitness,
-            metrics=metrics,
-            iterations_run=self.max_iterations,
-            convergence_history=convergence_history,
-        )
+        return best_x, best_y, [float(v) for v in np.ravel(convergence_history)]
     
     def optimize_regime_parameters(
         self,
@@ -0,0 +1,148 @@
+"""
+Parallel fitness evaluation for ParameterOptimizer.
+
+PSO and GA score a whole population per generation. PopulationEvaluator
+receives that population in one call (scikit-opt's vectorization mode) and
+spreads it over a process pool instead of scoring particle by particle.
+
+- Market data is shared, not shipped: the pool is forked after the backtest
+  function (e.g. a BacktestEngine with its precomputed arrays) exists, so
+  workers read the parent's memory copy-on-write and only parameter dicts
+  and scores cross process boundaries. Where fork is unavailable the
+  function is pickled once per worker at start-up.
+- Each evaluation reseeds `random` and NumPy from (seed, evaluation number),
+  so scores do not depend on the worker count or scheduling, and a serial
+  run reproduces a parallel one.
+- Summed per-evaluation CPU time over wall time gives the achieved
+  speedup (CPU rather than elapsed time, so oversubscribed cores do not
+  inflate it).
+"""
+
+import logging
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state, set once by _init_worker
+_backtest_func: Optional[Callable[[Dict[str, float]], List[Dict]]] = None
+_fitness_calculator = None
+
+
+def _init_worker(backtest_func, fitness_calculator):
+    global _backtest_func, _fitness_calculator
+    _backtest_func = backtest_func
+    _fitness_calculator = fitness_calculator
+
+
+def _seed(evaluation_seed: Optional[int]):
+    if evaluation_seed is not None:
+        random.seed(evaluation_seed)
+        np.random.seed(evaluation_seed)
+
+
+def _evaluate(task: Tuple[Optional[int], Dict[str, float]]) -> Tuple[float, float]:
+    """Score one parameter set in a worker: (minimization score, CPU seconds)."""
+    evaluation_seed, params = task
+    started = time.process_time()
+    _seed(evaluation_seed)
+    try:
+        trades = _backtest_func(params)
+        score = -_fitness_calculator.calculate_fitness(params, trades)  # Negative for minimization
+    except Exception as e:
+        logger.warning(f"Backtest failed: {e}")
+        score = float('inf')  # Worst fitness
+    return score, time.process_time() - started
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Worker count: None or 0 means all cores."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+class PopulationEvaluator:
+    """
+    Callable scoring a (population x parameters) array in one call.
+
+    Use as a context manager so the pool is started once per optimization
+    and shut down afterwards.
+    """
+
+    def __init__(
+        self,
+        parameter_names: List[str],
+        backtest_func: Callable[[Dict[str, float]], List[Dict]],
+        fitness_calculator,
+        workers: Optional[int] = 1,
+        seed: Optional[int] = None,
+    ):
+        self.parameter_names = parameter_names
+        self.backtest_func = backtest_func
+        self.fitness_calculator = fitness_calculator
+        self.workers = resolve_workers(workers)
+        self.seed = seed
+        self.evaluations = 0
+        self.wall_seconds = 0.0
+        self.evaluation_seconds = 0.0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'PopulationEvaluator':
+        if self.workers > 1:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.backtest_func, self.fitness_calculator),
+            )
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        return False
+
+    @property
+    def speedup(self) -> float:
+        """Summed evaluation CPU time over wall time (~1.0 when serial)."""
+        return self.evaluation_seconds / self.wall_seconds if self.wall_seconds > 0 else 1.0
+
+    def _tasks(self, population: np.ndarray) -> List[Tuple[Optional[int], Dict[str, float]]]:
+        tasks = []
+        for row in population:
+            evaluation_seed = None if self.seed is None else (self.seed + self.evaluations) % (2 ** 32)
+            tasks.append((evaluation_seed, {name: float(row[i]) for i, name in enumerate(self.parameter_names)}))
+            self.evaluations += 1
+        return tasks
+
+    def __call__(self, population: np.ndarray) -> np.ndarray:
+        tasks = self._tasks(np.atleast_2d(population))
+        started = time.perf_counter()
+
+        if self._pool is not None:
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            results = list(self._pool.map(_evaluate, tasks, chunksize=chunksize))
+        else:
+            # Same per-evaluation seeding in-process, without disturbing the
+            # optimizer's own random stream
+            np_state, py_state = np.random.get_state(), random.getstate()
+            _init_worker(self.backtest_func, self.fitness_calculator)
+            try:
+                results = [_evaluate(task) for task in tasks]
+            finally:
+                np.random.set_state(np_state)
+                random.setstate(py_state)
+
+        self.wall_seconds += time.perf_counter() - started
+        self.evaluation_seconds += sum(seconds for _, seconds in results)
+        return np.array([score for score, _ in results])
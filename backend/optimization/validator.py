@@ -123,6 +123,33 @@ class WalkForwardValidator:
         
         return train_data, validate_data
     
+    def rolling_folds(self, n_periods: int, n_folds: int = 5) -> List[Tuple[int, int, int]]:
+        """
+        Rolling walk-forward folds over n chronological periods (e.g. sessions).
+        
+        Each fold trains on a window followed by an adjacent test window in
+        train_ratio proportion; consecutive folds step forward by one test
+        window, so the test windows tile the end of the data without overlap.
+        
+        Args:
+            n_periods: Number of periods available
+            n_folds: Requested number of folds (reduced if the data is too short)
+            
+        Returns:
+            List of (train_start, test_start, test_end) period indices
+        """
+        if n_periods < 2 or n_folds < 1:
+            return []
+        
+        test_size = max(1, int(n_periods / (n_folds + self.train_ratio / self.validate_ratio)))
+        n_folds = min(n_folds, (n_periods - 1) // test_size)
+        train_size = n_periods - n_folds * test_size
+        
+        return [
+            (i * test_size, i * test_size + train_size, (i + 1) * test_size + train_size)
+            for i in range(n_folds)
+        ]
+    
     def detect_overfitting(
         self,
         in_sample_metrics: PerformanceMetrics,
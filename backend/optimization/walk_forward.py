@@ -0,0 +1,202 @@
+"""
+Rolling walk-forward optimization.
+
+Runs N train/test folds over one BacktestEngine instead of a single split:
+
+    runner = WalkForwardRunner(ParameterOptimizer(seed=7), n_folds=6)
+    result = runner.run(MOMENTUM_PARAMETERS, BacktestEngine(bars))
+
+- Features are computed once: the engine precomputes every indicator over
+  the full dataset, and each fold's train/test windows are engine.window()
+  views over those arrays (indicators stay warm across fold boundaries).
+- Folds are optimized concurrently in a process pool forked after the
+  engine exists, so workers share its arrays copy-on-write. Cores left over
+  once every fold has a process go to each fold's population evaluation.
+- Out-of-sample trades from all test windows are stitched into one track
+  and compared with the in-sample trades through detect_overfitting; each
+  fold also gets its own ValidationResult.
+"""
+
+import copy
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .backtest import BacktestEngine
+from .logger import ResultsLogger
+from .models import FoldResult, WalkForwardResult
+from .optimizer import ParameterOptimizer
+from .parallel import resolve_workers
+from .validator import WalkForwardValidator
+
+logger = logging.getLogger(__name__)
+
+# (index, train_start, test_start, test_end) with session days since epoch (None = open end)
+FoldWindow = Tuple[int, Optional[int], Optional[int], Optional[int]]
+
+# Per-worker state, set once by _init_worker
+_context: Optional[Tuple] = None
+
+
+def _init_worker(engine, parameter_space, optimizer, validator):
+    global _context
+    _context = (engine, parameter_space, optimizer, validator)
+
+
+def _session_date(day: Optional[int]) -> str:
+    return str(np.datetime64(int(day), 'D')) if day is not None else ''
+
+
+def _run_fold(window: FoldWindow) -> FoldResult:
+    """Optimize one fold on its train window and score it on its test window."""
+    engine, parameter_space, optimizer, validator = _context
+    index, train_start, test_start, test_end = window
+    train = engine.window(train_start, test_start)
+    test = engine.window(test_start, test_end)
+
+    fold_optimizer = copy.copy(optimizer)
+    if optimizer.seed is not None:
+        fold_optimizer.seed = optimizer.seed + index
+
+    opt_result = fold_optimizer.optimize(parameter_space, train)
+    in_sample_trades = train(opt_result.best_parameters)
+    out_sample_trades = test(opt_result.best_parameters)
+
+    return FoldResult(
+        index=index,
+        train_start=_session_date(train_start),
+        test_start=_session_date(test_start),
+        test_end=_session_date(test_end),
+        optimization=opt_result,
+        validation=validator.validate(opt_result.best_parameters, in_sample_trades, out_sample_trades),
+        in_sample_trades=in_sample_trades,
+        out_sample_trades=out_sample_trades,
+    )
+
+
+class WalkForwardRunner:
+    """
+    Optimizes and validates parameters over rolling walk-forward folds.
+    """
+
+    def __init__(
+        self,
+        optimizer: Optional[ParameterOptimizer] = None,
+        validator: Optional[WalkForwardValidator] = None,
+        n_folds: int = 5,
+        workers: Optional[int] = 0,
+        results_logger: Optional[ResultsLogger] = None,
+    ):
+        """
+        Initialize walk-forward runner.
+
+        Args:
+            optimizer: Template optimizer (algorithm, population, iterations, seed);
+                each fold's seed is offset by its index
+            validator: Fold boundaries (train_ratio) and overfitting detection
+            n_folds: Number of rolling folds
+            workers: Total processes (None/0 = all cores), split between folds
+                and each fold's population evaluation
+            results_logger: Where to persist results (None = don't save)
+        """
+        self.optimizer = optimizer or ParameterOptimizer()
+        self.validator = validator or WalkForwardValidator()
+        self.n_folds = n_folds
+        self.workers = resolve_workers(workers)
+        self.results_logger = results_logger
+
+    def fold_windows(self, engine: BacktestEngine) -> List[FoldWindow]:
+        """Session-day bounds of each fold within the engine's range."""
+        days = engine.sessions()
+        end = engine.session_range[1]
+
+        def day(i: int) -> Optional[int]:
+            return int(days[i]) if i < len(days) else end
+
+        return [
+            (index, day(train_start), day(test_start), day(test_end))
+            for index, (train_start, test_start, test_end)
+            in enumerate(self.validator.rolling_folds(len(days), self.n_folds))
+        ]
+
+    def run(self, parameter_space: Dict[str, Tuple[float, float]], engine: BacktestEngine) -> Optional[WalkForwardResult]:
+        """
+        Run every fold and aggregate the out-of-sample results.
+
+        Args:
+            parameter_space: Dict of parameter name -> (min, max) bounds
+            engine: BacktestEngine over the full walk-forward period
+
+        Returns:
+            WalkForwardResult, or None if the data is too short for one fold
+        """
+        windows = self.fold_windows(engine)
+        if not windows:
+            logger.error("❌ Not enough sessions for a walk-forward fold")
+            return None
+
+        fold_workers = min(len(windows), self.workers)
+        optimizer = copy.copy(self.optimizer)
+        optimizer.workers = max(1, self.workers // fold_workers)
+
+        logger.info(
+            f"🚶 Walk-forward: {len(windows)} folds, {fold_workers} in parallel, "
+            f"{optimizer.workers} evaluation worker(s) each"
+        )
+
+        started = time.perf_counter()
+        context = (engine, parameter_space, optimizer, self.validator)
+        if fold_workers > 1:
+            methods = multiprocessing.get_all_start_methods()
+            with ProcessPoolExecutor(
+                max_workers=fold_workers,
+                mp_context=multiprocessing.get_context('fork' if 'fork' in methods else None),
+                initializer=_init_worker,
+                initargs=context,
+            ) as pool:
+                folds = list(pool.map(_run_fold, windows))
+        else:
+            _init_worker(*context)
+            folds = [_run_fold(window) for window in windows]
+
+        result = self._aggregate(folds, fold_workers, time.perf_counter() - started)
+
+        logger.info(
+            f"✅ Walk-forward complete in {result.elapsed_seconds:.1f}s: "
+            f"out-of-sample Sharpe={result.out_sample_metrics.sharpe_ratio:.2f}, "
+            f"WinRate={result.out_sample_metrics.win_rate*100:.1f}%, "
+            f"{result.overfit_folds}/{len(folds)} folds overfit"
+        )
+
+        if self.results_logger is not None:
+            self.results_logger.save_walk_forward(result)
+
+        return result
+
+    def _aggregate(self, folds: List[FoldResult], workers: int, elapsed: float) -> WalkForwardResult:
+        calculator = self.validator.fitness_calculator
+        in_sample = calculator.calculate_metrics([t for f in folds for t in f.in_sample_trades])
+        out_sample = calculator.calculate_metrics([t for f in folds for t in f.out_sample_trades])
+        overfitted, degradation = self.validator.detect_overfitting(in_sample, out_sample)
+
+        names = folds[0].optimization.best_parameters.keys()
+        robust = {
+            name: float(np.median([f.optimization.best_parameters[name] for f in folds]))
+            for name in names
+        }
+
+        return WalkForwardResult(
+            folds=folds,
+            in_sample_metrics=in_sample,
+            out_sample_metrics=out_sample,
+            overfitting_detected=overfitted,
+            degradation_percent=degradation,
+            overfit_folds=sum(f.validation.overfitting_detected for f in folds),
+            robust_parameters=robust,
+            workers=workers,
+            elapsed_seconds=elapsed,
+        )
@@ -17,6 +17,7 @@ from .fill_verification import FillVerification
 from .multi_method_verifier import MultiMethodVerifier
 from .error_recovery_manager import ErrorRecoveryManager
 from .ultimate_fill_validator import UltimateFillValidator
+from core.order_mirror import TERMINAL_STATUSES, wait_for_order_status, wait_for_order_update
 
 
 class FillDetectionEngine:
@@ -141,6 +142,7 @@ class FillDetectionEngine:
         """
         iteration = 0
         last_status = None
+        order = None
         start_time = deadline - self.config.timeout_seconds
         
         self.logger.debug(f"🔍 Starting primary monitor loop for {order_id}")
@@ -235,8 +237,8 @@ class FillDetectionEngine:
                 result.retries_attempted += 1
                 # Continue monitoring even on errors
             
-            # Wait before next check
-            time.sleep(poll_interval)
+            # Wait before next check - returns early on a trade-update event
+            wait_for_order_update(self.alpaca, order_id, order, min(poll_interval, max(deadline - time.time(), 0)))
         
         # Timeout reached
         return None
@@ -277,7 +279,7 @@ class FillDetectionEngine:
                 result.api_calls_made += 1
                 
                 # Verify cancellation
-                time.sleep(0.5)  # Brief wait
+                wait_for_order_status(self.alpaca, order_id, TERMINAL_STATUSES, 0.5)
                 canceled_order = self._get_order_with_retry(order_id, result)
                 
                 if canceled_order and self._is_order_canceled(canceled_order):
@@ -325,8 +327,8 @@ class FillDetectionEngine:
                             return fill_result
                         else:
                             self.logger.warning(f"⚠️  Cancel race detected but fill verification failed - checking again...")
-                            # Try one more time with a brief delay
-                            time.sleep(0.2)
+                            # Try one more time after the next update (or a brief delay)
+                            wait_for_order_update(self.alpaca, order_id, race_order, 0.2)
                             final_race_order = self._get_order_with_retry(order_id, result)
                             if final_race_order:
                                 final_fill_detected, final_method = self._bulletproof_fill_check(final_race_order)
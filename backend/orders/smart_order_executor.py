@@ -8,6 +8,7 @@ from typing import Dict, Optional, Tuple
 from datetime import datetime, time
 from dataclasses import dataclass
 from alpaca.trading.enums import OrderSide
+from core.order_mirror import TERMINAL_STATUSES, wait_for_order_status
 
 logger = logging.getLogger(__name__)
 
@@ -153,7 +154,6 @@ class SmartOrderExecutor:
                 filled_price = final_price
             else:
                 logger.warning(f"⚠️  Order {order_id} not filled within {timeout}s, attempting cancel...")
-                import time
                 
                 # Try to cancel - but watch for "already filled" error
                 cancel_result, cancel_error = self._cancel_order_with_error(order_id)
@@ -161,7 +161,7 @@ class SmartOrderExecutor:
                 if cancel_error and 'filled' in cancel_error.lower():
                     # CRITICAL: Cancel failed because order was ALREADY FILLED!
                     logger.info(f"🎉 CANCEL RACE DETECTED! Order {order_id} was already filled")
-                    time.sleep(0.3)  # Brief wait for status to update
+                    wait_for_order_status(self.alpaca, order_id, TERMINAL_STATUSES, 0.3)  # Wait for the fill event
                     final_price = self._final_fill_check(order_id)
                     if final_price:
                         logger.info(f"✅ Order filled (race condition detected) @ ${final_price:.2f}")
@@ -173,14 +173,14 @@ class SmartOrderExecutor:
                         filled_price = signal_price
                 else:
                     # ALWAYS do a final fill check after cancel attempt
-                    time.sleep(0.5)  # Brief wait for order status to update
+                    wait_for_order_status(self.alpaca, order_id, TERMINAL_STATUSES, 0.5)  # Wait for cancel/fill event
                     final_price = self._final_fill_check(order_id)
                     if final_price:
                         logger.info(f"✅ Order filled (detected after cancel attempt) @ ${final_price:.2f}")
                         filled_price = final_price
                     elif not cancel_result:
                         # Cancel failed for other reason - try one more time
-                        time.sleep(0.3)
+                        wait_for_order_status(self.alpaca, order_id, TERMINAL_STATUSES, 0.3)
                         final_price = self._final_fill_check(order_id)
                         if final_price:
                             logger.info(f"✅ Order filled (final retry) @ ${final_price:.2f}")
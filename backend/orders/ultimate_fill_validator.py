@@ -6,12 +6,12 @@ This runs after timeout to do one last comprehensive check.
 """
 
 import logging
-import time
 from typing import Any, Optional
 from datetime import datetime
 
 from .fill_result import FillResult, FillStatus, DetectionMethod
 from .multi_method_verifier import MultiMethodVerifier
+from core.order_mirror import wait_for_order_update
 
 
 class UltimateFillValidator:
@@ -50,6 +50,7 @@ class UltimateFillValidator:
         self.logger.info(f"🛡️  ULTIMATE FILL CHECK: {order_id}")
         
         # Method 1: Multiple status checks with delays
+        order = None
         for attempt in range(3):
             self.logger.debug(f"   Ultimate check attempt {attempt + 1}/3")
             
@@ -97,12 +98,12 @@ class UltimateFillValidator:
                 
                 # Not filled yet, wait before next attempt
                 if attempt < 2:
-                    time.sleep(0.5)
+                    wait_for_order_update(self.alpaca, order_id, order, 0.5)
                     
             except Exception as e:
                 self.logger.debug(f"   Ultimate check attempt {attempt + 1} failed: {e}")
                 if attempt < 2:
-                    time.sleep(0.3)
+                    wait_for_order_update(self.alpaca, order_id, order, 0.3)
         
         # Method 2: Position-based verification
         fill_found = self._check_position_changes(order_id, original_result)
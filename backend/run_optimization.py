@@ -4,7 +4,7 @@ Run parameter optimization with walk-forward validation.
 Single command to optimize trading parameters.
 
 Usage:
-    python run_optimization.py [--regime] [--momentum] [--all]
+    python run_optimization.py [--regime] [--momentum] [--all] [--workers N] [--seed S]
 """
 
 import argparse
@@ -70,9 +70,12 @@ def run_optimization(
     optimize_momentum: bool = True,
     population_size: int = 30,
     max_iterations: int = 50,
+    workers: int = 0,
+    seed: int = None,
 ):
     """
     Run parameter optimization with walk-forward validation.
+    Each generation is scored across `workers` processes (0 = all cores).
     """
     logger.info("=" * 60)
     logger.info("🚀 PARAMETER OPTIMIZATION SYSTEM")
@@ -83,6 +86,8 @@ def run_optimization(
         algorithm="PSO",
         population_size=population_size,
         max_iterations=max_iterations,
+        workers=workers,
+        seed=seed,
     )
     validator = WalkForwardValidator()
     results_logger = ResultsLogger(results_dir="backend/optimization_results")
@@ -175,6 +180,8 @@ def main():
     parser.add_argument("--all", action="store_true", help="Optimize all parameters (default)")
     parser.add_argument("--pop", type=int, default=30, help="Population size")
     parser.add_argument("--iter", type=int, default=50, help="Max iterations")
+    parser.add_argument("--workers", type=int, default=0, help="Fitness worker processes (0 = all cores)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
     
     args = parser.parse_args()
     
@@ -188,6 +195,8 @@ def main():
         optimize_momentum=args.momentum or args.all,
         population_size=args.pop,
         max_iterations=args.iter,
+        workers=args.workers,
+        seed=args.seed,
     )
 
 
@@ -12,6 +12,8 @@ from datetime import datetime
 import logging
 import time
 
+from data.bar_series import BarSeries
+
 logger = logging.getLogger(__name__)
 
 # Import the data model
@@ -178,10 +180,10 @@ class MomentumScanner:
                 
                 movers.append({
                     'symbol': symbol,
-                    'price': bars[-1]['close'],
+                    'price': float(bars.close[-1]),
                     'change_pct': snap_data['change_pct'],
                     'bars': bars,
-                    'volume': bars[-1]['volume']
+                    'volume': float(bars.volume[-1])
                 })
             except Exception as e:
                 logger.debug(f"Error getting bars for {symbol}: {e}")
@@ -243,7 +245,7 @@ class MomentumScanner:
             # Fallback - return symbols without filtering
             return [(s, {'change_pct': 0}) for s in symbols[:limit]]
 
-    async def _get_recent_bars(self, symbol: str, periods: int = 60) -> List[Dict]:
+    async def _get_recent_bars(self, symbol: str, periods: int = 60) -> BarSeries:
         """
         Get recent price bars for a symbol.
         
@@ -252,29 +254,18 @@ class MomentumScanner:
             periods: Number of 1-minute bars to fetch
             
         Returns:
-            List of bar dictionaries with OHLCV data
+            Columnar BarSeries over the response frame (empty if unavailable)
         """
         try:
             if hasattr(self.market_data, 'get_bars'):
                 bars_response = self.market_data.get_bars(symbol, '1Min', limit=periods)
                 
                 if hasattr(bars_response, 'df') and not bars_response.df.empty:
-                    df = bars_response.df
-                    bars = []
-                    for idx, row in df.iterrows():
-                        bars.append({
-                            'timestamp': idx,
-                            'open': float(row['open']),
-                            'high': float(row['high']),
-                            'low': float(row['low']),
-                            'close': float(row['close']),
-                            'volume': int(row['volume'])
-                        })
-                    return bars
-            return []
+                    return BarSeries.from_frame(bars_response.df)
+            return BarSeries.empty()
         except Exception as e:
             logger.debug(f"Error fetching bars for {symbol}: {e}")
-            return []
+            return BarSeries.empty()
     
     def filter_by_volume_surge(self, candidates: List[Dict], min_ratio: float = 1.5) -> List[Dict]:
         """
@@ -314,21 +305,21 @@ class MomentumScanner:
         Calculate volume ratio vs average.
         
         Args:
-            candidate: Candidate dictionary with bars data
+            candidate: Candidate dictionary with bars data (BarSeries or bar dicts)
             
         Returns:
             Volume ratio (current volume / average volume)
         """
-        bars = candidate.get('bars', [])
-        if len(bars) < self.lookback_periods:
+        volume = BarSeries.coerce(candidate.get('bars')).volume
+        if len(volume) < self.lookback_periods:
             return 1.0  # Default to neutral if insufficient data
         
         # Current volume (latest bar)
-        current_volume = bars[-1]['volume']
+        current_volume = float(volume[-1])
         
         # Average volume over lookback period (excluding current bar)
-        historical_volumes = [bar['volume'] for bar in bars[-self.lookback_periods:-1]]
-        avg_volume = sum(historical_volumes) / len(historical_volumes) if historical_volumes else 1
+        historical_volumes = volume[-self.lookback_periods:-1]
+        avg_volume = float(historical_volumes.mean()) if len(historical_volumes) else 1
         
         # Calculate ratio
         volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1.0
@@ -9,7 +9,7 @@ import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from data.market_data import MarketDataManager
-from data.features import FeatureEngine
+from data.panel_features import cached_panel_features
 from scanner.stock_universe import StockUniverse
 from scanner.opportunity_scorer import OpportunityScorer
 from scanner.ai_opportunity_finder import get_ai_opportunity_finder
@@ -115,21 +115,15 @@ class OpportunityScanner:
             
             opportunities = []
             
+            # Fetch bars (concurrent chunks) and calculate features off the event loop
+            scan_features = await self._calculate_scan_features_async(symbols)
+            
             for symbol in symbols:
                 try:
-                    # Get market data (fetch 1 day of 5-min bars = ~78 bars)
-                    bars_dict = self.market_data.fetch_historical_bars([symbol], days=1)
-                    df = bars_dict.get(symbol) if bars_dict else None
-                    
-                    if df is None or len(df) < 30:
-                        logger.debug(f"Insufficient data for {symbol}")
-                        continue
-                    
-                    # Calculate features
-                    features = FeatureEngine.calculate_features(df)
+                    features = scan_features.get(symbol)
                     
                     if not features:
-                        logger.debug(f"Failed to calculate features for {symbol}")
+                        logger.debug(f"Insufficient data for {symbol}")
                         continue
                     
                     # Score opportunity (base score)
@@ -211,6 +205,39 @@ class OpportunityScanner:
             logger.error(f"Error scanning universe: {e}")
             return []
     
+    async def _calculate_scan_features_async(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Async variant of _calculate_scan_features: bars are fetched in
+        concurrent chunks and features calculated on a worker thread, so the
+        event loop stays free for position monitoring during a scan.
+        
+        Returns:
+            {symbol: features} for symbols with enough data
+        """
+        bars_dict = await self.market_data.fetch_historical_bars_async(symbols, days=1)
+        if not bars_dict:
+            return {}
+        
+        bars_dict = {s: df for s, df in bars_dict.items() if len(df) >= 30}
+        return await asyncio.to_thread(cached_panel_features, bars_dict)
+    
+    def _calculate_scan_features(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch a day of bars for all symbols in chunked multi-symbol requests
+        and calculate their features in a single vectorized pass (symbols
+        whose bars the strategy loop already processed come from the
+        feature cache).
+        
+        Returns:
+            {symbol: features} for symbols with enough data
+        """
+        bars_dict = self.market_data.fetch_historical_bars(symbols, days=1)
+        if not bars_dict:
+            return {}
+        
+        bars_dict = {s: df for s, df in bars_dict.items() if len(df) >= 30}
+        return cached_panel_features(bars_dict)
+    
     def scan_universe(self, symbols: Optional[List[str]] = None, 
                           min_score: float = 50.0) -> List[Dict]:
         """
@@ -248,21 +275,15 @@ class OpportunityScanner:
             
             opportunities = []
             
+            # Fetch bars and calculate features for all symbols in one pass
+            scan_features = self._calculate_scan_features(symbols)
+            
             for symbol in symbols:
                 try:
-                    # Get market data (fetch 1 day of 5-min bars = ~78 bars)
-                    bars_dict = self.market_data.fetch_historical_bars([symbol], days=1)
-                    df = bars_dict.get(symbol) if bars_dict else None
-                    
-                    if df is None or len(df) < 30:
-                        logger.debug(f"Insufficient data for {symbol}")
-                        continue
-                    
-                    # Calculate features
-                    features = FeatureEngine.calculate_features(df)
+                    features = scan_features.get(symbol)
                     
                     if not features:
-                        logger.debug(f"Failed to calculate features for {symbol}")
+                        logger.debug(f"Insufficient data for {symbol}")
                         continue
                     
                     # Score opportunity (base score)
@@ -14,11 +14,17 @@ is a BAD trade. We need ROOM TO RUN.
 """
 
 import logging
-from typing import List, Dict, Optional, Tuple
-import statistics
+from typing import Iterable, List, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from data.bar_series import BarSeries
 
 logger = logging.getLogger(__name__)
 
+# A BarSeries, or the legacy list of OHLCV bar dicts
+Bars = Union[BarSeries, Iterable[Dict]]
+
 
 class ResistanceAnalyzer:
     """
@@ -30,7 +36,7 @@ class ResistanceAnalyzer:
         self.lookback_periods = 20
         logger.info("✅ ResistanceAnalyzer initialized - upside potential analysis ready")
     
-    def find_resistance_level(self, bars: List[Dict], lookback: int = 20) -> float:
+    def find_resistance_level(self, bars: Bars, lookback: int = 20) -> float:
         """
         Find the next major resistance level using recent highs and pivot points.
         
@@ -40,26 +46,27 @@ class ResistanceAnalyzer:
         - Previous day high
         
         Args:
-            bars: List of OHLCV bars
+            bars: OHLCV bars (BarSeries or list of bar dicts)
             lookback: Number of bars to analyze
             
         Returns:
             Resistance level price
         """
-        if not bars or len(bars) < 3:
+        bars = BarSeries.coerce(bars)
+        if len(bars) < 3:
             return 0.0
         
-        current_price = bars[-1]['close']
-        recent_bars = bars[-lookback:] if len(bars) >= lookback else bars
+        current_price = float(bars.close[-1])
+        recent_highs = bars.high[-lookback:]
         
         # Method 1: Find swing highs (local maxima)
-        swing_highs = self._find_swing_highs(recent_bars)
+        swing_highs = self._find_swing_highs(recent_highs)
         
         # Method 2: Find round number resistance
         round_resistance = self._find_round_number_resistance(current_price)
         
         # Method 3: Recent high
-        recent_high = max(bar['high'] for bar in recent_bars)
+        recent_high = float(recent_highs.max())
         
         # Combine methods - find nearest resistance ABOVE current price
         resistance_levels = []
@@ -81,29 +88,14 @@ class ResistanceAnalyzer:
         # Return the nearest resistance above current price
         return min(resistance_levels)
     
-    def _find_swing_highs(self, bars: List[Dict], window: int = 3) -> List[float]:
+    def _find_swing_highs(self, highs: np.ndarray, window: int = 3) -> List[float]:
         """
         Find swing highs (local maxima) in price data.
         
-        A swing high is a bar where the high is higher than
-        the highs of the bars on either side.
+        A swing high is a bar where the high is strictly higher than
+        the highs of the `window` bars on either side.
         """
-        swing_highs = []
-        
-        for i in range(window, len(bars) - window):
-            current_high = bars[i]['high']
-            is_swing_high = True
-            
-            # Check if current high is higher than surrounding bars
-            for j in range(1, window + 1):
-                if bars[i - j]['high'] >= current_high or bars[i + j]['high'] >= current_high:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                swing_highs.append(current_high)
-        
-        return swing_highs
+        return [float(v) for v in _swing_points(highs, window, np.greater)]
     
     def _find_round_number_resistance(self, price: float) -> float:
         """
@@ -128,7 +120,7 @@ class ResistanceAnalyzer:
         next_round = ((int(price) // increment) + 1) * increment
         return float(next_round)
 
-    def find_support_level(self, bars: List[Dict], lookback: int = 20) -> float:
+    def find_support_level(self, bars: Bars, lookback: int = 20) -> float:
         """
         Find recent support level using recent lows.
         
@@ -138,23 +130,24 @@ class ResistanceAnalyzer:
         - Round number support
         
         Args:
-            bars: List of OHLCV bars
+            bars: OHLCV bars (BarSeries or list of bar dicts)
             lookback: Number of bars to analyze
             
         Returns:
             Support level price
         """
-        if not bars or len(bars) < 3:
+        bars = BarSeries.coerce(bars)
+        if len(bars) < 3:
             return 0.0
         
-        current_price = bars[-1]['close']
-        recent_bars = bars[-lookback:] if len(bars) >= lookback else bars
+        current_price = float(bars.close[-1])
+        recent_lows = bars.low[-lookback:]
         
         # Method 1: Find swing lows (local minima)
-        swing_lows = self._find_swing_lows(recent_bars)
+        swing_lows = self._find_swing_lows(recent_lows)
         
         # Method 2: Recent low
-        recent_low = min(bar['low'] for bar in recent_bars)
+        recent_low = float(recent_lows.min())
         
         # Combine methods - find nearest support BELOW current price
         support_levels = []
@@ -173,29 +166,14 @@ class ResistanceAnalyzer:
         # Return the nearest support below current price
         return max(support_levels)
     
-    def _find_swing_lows(self, bars: List[Dict], window: int = 3) -> List[float]:
+    def _find_swing_lows(self, lows: np.ndarray, window: int = 3) -> List[float]:
         """
         Find swing lows (local minima) in price data.
         
-        A swing low is a bar where the low is lower than
-        the lows of the bars on either side.
+        A swing low is a bar where the low is strictly lower than
+        the lows of the `window` bars on either side.
         """
-        swing_lows = []
-        
-        for i in range(window, len(bars) - window):
-            current_low = bars[i]['low']
-            is_swing_low = True
-            
-            # Check if current low is lower than surrounding bars
-            for j in range(1, window + 1):
-                if bars[i - j]['low'] <= current_low or bars[i + j]['low'] <= current_low:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                swing_lows.append(current_low)
-        
-        return swing_lows
+        return [float(v) for v in _swing_points(lows, window, np.less)]
     
     def calculate_upside_percentage(self, price: float, resistance: float) -> float:
         """
@@ -270,16 +248,17 @@ class ResistanceAnalyzer:
         else:
             return "poor"
 
-    def analyze(self, bars: List[Dict]) -> Dict:
+    def analyze(self, bars: Bars) -> Dict:
         """
         Full resistance/support analysis for a stock.
         
         Args:
-            bars: List of OHLCV bars
+            bars: OHLCV bars (BarSeries or list of bar dicts)
             
         Returns:
             Dictionary with resistance, support, upside, R/R, and quality
         """
+        bars = BarSeries.coerce(bars)
         if not bars:
             return {
                 'resistance': 0.0,
@@ -290,7 +269,7 @@ class ResistanceAnalyzer:
                 'quality': 'poor'
             }
         
-        price = bars[-1]['close']
+        price = float(bars.close[-1])
         resistance = self.find_resistance_level(bars)
         support = self.find_support_level(bars)
         upside_pct = self.calculate_upside_percentage(price, resistance)
@@ -310,12 +289,12 @@ class ResistanceAnalyzer:
             'quality': quality
         }
     
-    def should_trade(self, bars: List[Dict], min_upside: float = 1.0, min_rr: float = 1.5) -> Tuple[bool, str]:
+    def should_trade(self, bars: Bars, min_upside: float = 1.0, min_rr: float = 1.5) -> Tuple[bool, str]:
         """
         Determine if a stock should be traded based on upside potential.
         
         Args:
-            bars: List of OHLCV bars
+            bars: OHLCV bars (BarSeries or list of bar dicts)
             min_upside: Minimum upside percentage required
             min_rr: Minimum risk/reward ratio required
             
@@ -334,3 +313,14 @@ class ResistanceAnalyzer:
             return False, "Poor upside quality - too close to resistance"
         
         return True, f"Good setup: {analysis['upside_pct']:.1f}% upside, {analysis['risk_reward']:.1f} R/R"
+
+
+def _swing_points(values: np.ndarray, window: int, beats) -> np.ndarray:
+    """Values at positions where `beats(value, neighbour)` holds for all
+    `window` neighbours on each side, in bar order."""
+    if len(values) < 2 * window + 1:
+        return values[:0]
+    windows = np.lib.stride_tricks.sliding_window_view(values, 2 * window + 1)
+    centre = windows[:, window:window + 1]
+    neighbours = np.delete(windows, window, axis=1)
+    return windows[beats(centre, neighbours).all(axis=1), window]
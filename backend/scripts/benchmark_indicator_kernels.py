@@ -0,0 +1,123 @@
+"""
+Benchmark: legacy per-module indicator implementations vs indicators/kernels.py.
+
+Times EMA, RSI, MACD, ATR and ADX on a short window (scan-sized), a long
+series (backtest-sized) and a batch of symbols (one 2-D kernel call vs a
+pandas call per symbol).
+
+Usage: python scripts/benchmark_indicator_kernels.py
+"""
+
+import sys
+import os
+import timeit
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import kernels
+
+
+# ---------------------------------------------------------------------------
+# Legacy implementations (as they were in data/features.py and indicators/*.py)
+# ---------------------------------------------------------------------------
+
+def legacy_ema(close: pd.Series, period: int = 20) -> pd.Series:
+    return close.ewm(span=period, adjust=False).mean()
+
+
+def legacy_rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    delta = close.diff()
+    gains = delta.where(delta > 0, 0.0)
+    losses = -delta.where(delta < 0, 0.0)
+    avg_gains = gains.ewm(alpha=1 / period, adjust=False).mean()
+    avg_losses = losses.ewm(alpha=1 / period, adjust=False).mean()
+    return 100 - (100 / (1 + avg_gains / avg_losses))
+
+
+def legacy_macd(close: pd.Series):
+    line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = line.ewm(span=9, adjust=False).mean()
+    return line, signal, line - signal
+
+
+def legacy_true_range(high, low, close) -> pd.Series:
+    prev_close = close.shift(1)
+    return pd.concat([high - low, abs(high - prev_close), abs(low - prev_close)], axis=1).max(axis=1)
+
+
+def legacy_atr(high, low, close, period: int = 14) -> pd.Series:
+    return legacy_true_range(high, low, close).rolling(window=period).mean()
+
+
+def legacy_adx(high, low, close, period: int = 14):
+    tr = legacy_true_range(high, low, close)
+    high_diff, low_diff = high.diff(), -low.diff()
+    plus_dm = pd.Series(0.0, index=high.index)
+    minus_dm = pd.Series(0.0, index=high.index)
+    plus_dm[(high_diff > low_diff) & (high_diff > 0)] = high_diff
+    minus_dm[(low_diff > high_diff) & (low_diff > 0)] = low_diff
+    atr = tr.ewm(alpha=1 / period, adjust=False).mean()
+    plus_di = 100 * plus_dm.ewm(alpha=1 / period, adjust=False).mean() / atr
+    minus_di = 100 * minus_dm.ewm(alpha=1 / period, adjust=False).mean() / atr
+    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    return dx.ewm(alpha=1 / period, adjust=False).mean(), plus_di, minus_di
+
+
+def make_bars(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    high = close + rng.uniform(0.05, 1.0, n)
+    low = close - rng.uniform(0.05, 1.0, n)
+    return high, low, close
+
+
+def best_of(func, number: int) -> float:
+    """Best per-call time in microseconds over 5 repeats."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def benchmark_series(n: int, number: int):
+    high, low, close = make_bars(n)
+    hs, ls, cs = pd.Series(high), pd.Series(low), pd.Series(close)
+    cases = {
+        'EMA': (lambda: legacy_ema(cs), lambda: kernels.ema(close, 20)),
+        'RSI': (lambda: legacy_rsi(cs), lambda: kernels.rsi(close)),
+        'MACD': (lambda: legacy_macd(cs), lambda: kernels.macd(close)),
+        'ATR': (lambda: legacy_atr(hs, ls, cs), lambda: kernels.atr(high, low, close)),
+        'ADX': (lambda: legacy_adx(hs, ls, cs), lambda: kernels.adx(high, low, close)),
+    }
+    print(f"\n{n} bars, single series (µs per call)")
+    print(f"{'indicator':<10}{'legacy':>12}{'kernel':>12}{'speedup':>10}")
+    for name, (old, new) in cases.items():
+        t_old, t_new = best_of(old, number), best_of(new, number)
+        print(f"{name:<10}{t_old:>12.1f}{t_new:>12.1f}{t_old / t_new:>9.1f}x")
+
+
+def benchmark_batch(symbols: int, n: int, number: int):
+    bars = [make_bars(n, seed=s) for s in range(symbols)]
+    high, low, close = (np.vstack([b[i] for b in bars]) for i in range(3))
+    frames = [tuple(pd.Series(a) for a in b) for b in bars]
+    cases = {
+        'EMA': (lambda: [legacy_ema(c) for _, _, c in frames], lambda: kernels.ema(close, 20)),
+        'RSI': (lambda: [legacy_rsi(c) for _, _, c in frames], lambda: kernels.rsi(close)),
+        'MACD': (lambda: [legacy_macd(c) for _, _, c in frames], lambda: kernels.macd(close)),
+        'ATR': (lambda: [legacy_atr(h, l, c) for h, l, c in frames], lambda: kernels.atr(high, low, close)),
+        'ADX': (lambda: [legacy_adx(h, l, c) for h, l, c in frames], lambda: kernels.adx(high, low, close)),
+    }
+    print(f"\n{symbols} symbols x {n} bars, batch (ms per scan)")
+    print(f"{'indicator':<10}{'legacy':>12}{'kernel':>12}{'speedup':>10}")
+    for name, (old, new) in cases.items():
+        t_old, t_new = best_of(old, number) / 1e3, best_of(new, number) / 1e3
+        print(f"{name:<10}{t_old:>12.2f}{t_new:>12.2f}{t_old / t_new:>9.1f}x")
+
+
+if __name__ == '__main__':
+    print(f"Indicator kernel benchmark (numba JIT: {'on' if kernels.JIT_AVAILABLE else 'off'})")
+    print("=" * 50)
+    benchmark_series(100, number=200)
+    benchmark_series(10_000, number=20)
+    benchmark_batch(50, 100, number=5)
@@ -1,4 +1,6 @@
 # Streaming module for real-time market data
 
-from .stream_manager import stream_manager, StreamManager  # noqa: F401
+from .stream_manager import stream_manager, StreamManager, cap_symbols  # noqa: F401
 from .broadcaster import StreamingBroadcaster  # noqa: F401
+from .state_sync import StateSync  # noqa: F401
+from .trade_update_stream import TradeUpdateStreamManager, FakeTradingStream  # noqa: F401
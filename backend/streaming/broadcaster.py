@@ -1,67 +1,168 @@
+"""
+Streaming Broadcaster
+
+Fans streaming updates (quotes, trades, bars, metrics, logs, snapshots) out
+to WebSocket clients without letting market-data bursts or slow clients
+stall the event loop:
+
+- Conflation: between flushes only the latest quote/trade per symbol and the
+  latest metrics/snapshot message are kept; other messages queue in order
+  up to `max_pending` (oldest dropped beyond that).
+- Batching: every `flush_interval` seconds the pending messages are
+  serialized once, as one JSON array frame, and handed to every client.
+- Backpressure: each client has its own bounded frame buffer drained by its
+  own sender task. A client whose buffer is full is disconnected instead of
+  delaying everyone else.
+- State sync: with a StateSync attached, each tick also picks up position,
+  order and metrics changes as a sequenced delta, and connecting clients get
+  a cached snapshot or, when resuming, only the deltas they missed.
+"""
+
 import asyncio
 import contextlib
 import json
-from typing import Any, Callable, Dict, Optional, Set
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
 
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketDisconnect
 
+from config import settings
+from streaming.state_sync import StateSync
 from utils.logger import setup_logger
 
+try:
+    import orjson
+    FAST_JSON = True
+except ImportError:  # Optional: stdlib json is slower but equivalent
+    orjson = None
+    FAST_JSON = False
+
 logger = setup_logger(__name__)
 
+# Message types where only the latest value per symbol matters to a client
+CONFLATED_BY_SYMBOL = ('quote', 'trade')
+# Message types where only the latest value matters at all
+CONFLATED_BY_TYPE = ('metrics', 'snapshot')
+
+
+def _json_default(obj: Any):
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
+
+
+def encode(message: Any) -> str:
+    """Serialize a message or batch to a JSON text frame."""
+    if FAST_JSON:
+        return orjson.dumps(message, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message, default=_json_default, separators=(',', ':'))
+
+
+def conflation_key(message: Dict[str, Any]) -> Optional[Hashable]:
+    """Key under which a newer message replaces an older pending one (None: never replaced)."""
+    kind = message.get("type")
+    if kind in CONFLATED_BY_SYMBOL and message.get("symbol"):
+        return (kind, message["symbol"])
+    if kind in CONFLATED_BY_TYPE:
+        return (kind,)
+    return None
+
+
+class _Client:
+    """A connected WebSocket with its bounded frame buffer and sender task."""
+
+    def __init__(self, websocket: WebSocket, buffer_frames: int):
+        self.websocket = websocket
+        self.frames: asyncio.Queue[str] = asyncio.Queue(maxsize=buffer_frames)
+        self.sender: Optional[asyncio.Task] = None
+
 
 class StreamingBroadcaster:
     """Fan-out broadcaster that pushes streaming updates to WebSocket clients."""
 
-    def __init__(self):
-        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
-        self._clients: Set[WebSocket] = set()
-        self._lock = asyncio.Lock()
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        client_buffer_frames: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else settings.streaming_flush_interval_ms / 1000
+        )
+        self.client_buffer_frames = max(1, client_buffer_frames or settings.streaming_client_buffer_frames)
+        self.max_pending = max(1, max_pending or settings.streaming_max_pending_messages)
+
+        # Pending batch: conflated messages by key plus an ordered backlog
+        self._latest: Dict[Hashable, Dict[str, Any]] = {}
+        self._backlog: Deque[Dict[str, Any]] = deque()
+        self._clients: Dict[WebSocket, _Client] = {}
         self._worker: Optional[asyncio.Task] = None
         self._snapshot_builder: Optional[Callable[[], Dict[str, Any]]] = None
+        self._state_sync: Optional[StateSync] = None
 
-    async def start(self, snapshot_builder: Optional[Callable[[], Dict[str, Any]]] = None):
-        """Start background dispatcher."""
+        self.messages_in = 0
+        self.messages_conflated = 0
+        self.messages_dropped = 0
+        self.frames_sent = 0
+        self.clients_dropped = 0
+
+    async def start(
+        self,
+        snapshot_builder: Optional[Callable[[], Dict[str, Any]]] = None,
+        state_sync: Optional[StateSync] = None
+    ):
+        """Start background flusher."""
         if snapshot_builder:
             self._snapshot_builder = snapshot_builder
+        if state_sync:
+            self._state_sync = state_sync
 
         if self._worker is None or self._worker.done():
-            self._worker = asyncio.create_task(self._dispatcher())
-            logger.info("Streaming broadcaster worker started")
+            self._worker = asyncio.create_task(self._flusher())
+            logger.info(
+                "Streaming broadcaster worker started (flush every %.0f ms, %s encoder)",
+                self.flush_interval * 1000, "orjson" if FAST_JSON else "json"
+            )
 
     async def stop(self):
-        """Stop background dispatcher and close client connections."""
+        """Stop background flusher and close client connections."""
         if self._worker:
             self._worker.cancel()
-            with contextlib.suppress(Exception):
+            with contextlib.suppress(Exception, asyncio.CancelledError):
                 await self._worker
             self._worker = None
 
-        async with self._lock:
-            clients = list(self._clients)
-            self._clients.clear()
+        for websocket in list(self._clients):
+            await self.disconnect(websocket)
 
-        for client in clients:
-            with contextlib.suppress(Exception):
-                await client.close()
+    async def connect(self, websocket: WebSocket, epoch: Optional[str] = None, since: Optional[int] = None):
+        """
+        Accept connection, queue the initial state and start its sender.
 
-    async def connect(self, websocket: WebSocket):
-        """Accept connection and send initial snapshot."""
+        Args:
+            websocket: Client connection
+            epoch: State sync epoch the client last saw (resume)
+            since: Last delta seq the client applied (resume)
+        """
         await websocket.accept()
-        async with self._lock:
-            self._clients.add(websocket)
-
-        if self._snapshot_builder:
-            snapshot = self._snapshot_builder()
-            await self._send(websocket, {"type": "snapshot", "payload": snapshot})
+        client = _Client(websocket, self.client_buffer_frames)
+        if self._state_sync:
+            initial = await self._state_sync.initial_messages(epoch, since)
+            if initial:
+                client.frames.put_nowait(encode(initial))
+        elif self._snapshot_builder:
+            client.frames.put_nowait(encode({"type": "snapshot", "payload": self._snapshot_builder()}))
+        client.sender = asyncio.create_task(self._sender(client))
+        self._clients[websocket] = client
 
         logger.debug("WebSocket connected. Total clients: %s", len(self._clients))
 
     async def disconnect(self, websocket: WebSocket):
         """Remove connection from pool."""
-        async with self._lock:
-            self._clients.discard(websocket)
+        client = self._clients.pop(websocket, None)
+        if client and client.sender and client.sender is not asyncio.current_task():
+            client.sender.cancel()
         with contextlib.suppress(Exception):
             await websocket.close()
         logger.debug("WebSocket disconnected. Total clients: %s", len(self._clients))
@@ -76,37 +177,96 @@ class StreamingBroadcaster:
         finally:
             await self.disconnect(websocket)
 
+    def queue_depth(self) -> int:
+        """Number of messages waiting for the next flush."""
+        return len(self._latest) + len(self._backlog)
+
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def publish(self, message: Dict[str, Any]):
+        """Add a message to the pending batch (non-blocking; call from the event loop)."""
+        self.messages_in += 1
+        key = conflation_key(message)
+        if key is not None:
+            if key in self._latest:
+                self.messages_conflated += 1
+            self._latest[key] = message
+        else:
+            if len(self._backlog) >= self.max_pending:
+                self._backlog.popleft()
+                self.messages_dropped += 1
+            self._backlog.append(message)
+
     async def enqueue(self, message: Dict[str, Any]):
         """Queue message for broadcast."""
-        await self._queue.put(message)
+        self.publish(message)
 
-    async def _dispatcher(self):
-        while True:
-            message = await self._queue.get()
-            await self._broadcast(message)
+    def flush(self) -> int:
+        """
+        Serialize the pending batch once and hand it to every client.
 
-    async def _broadcast(self, message: Dict[str, Any]):
-        async with self._lock:
-            clients = list(self._clients)
+        Returns:
+            Number of messages in the frame (0 if nothing was pending)
+        """
+        if self._state_sync:
+            delta = self._state_sync.poll()
+            if delta:
+                self.publish(delta)
 
-        if not clients:
-            return
+        batch = self._take_batch()
+        if not batch or not self._clients:
+            return 0
 
-        payload = json.dumps(message, default=self._json_serializer)
+        frame = encode(batch)
+        for websocket, client in list(self._clients.items()):
+            try:
+                client.frames.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.clients_dropped += 1
+                logger.warning("Dropping slow WebSocket client (%s frames unsent)", client.frames.qsize())
+                asyncio.create_task(self.disconnect(websocket))
+        return len(batch)
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        # Ordered messages (logs, bars, ...) first, then the latest conflated values
+        batch = list(self._backlog)
+        batch.extend(self._latest.values())
+        self._backlog.clear()
+        self._latest.clear()
+        return batch
 
-        for websocket in clients:
+    async def _flusher(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
             try:
-                await websocket.send_text(payload)
+                self.flush()
             except Exception as exc:
-                logger.debug("WebSocket send failed; removing client. Error: %s", exc)
-                await self.disconnect(websocket)
-
-    @staticmethod
-    async def _send(websocket: WebSocket, message: Dict[str, Any]):
-        await websocket.send_text(json.dumps(message, default=StreamingBroadcaster._json_serializer))
-
-    @staticmethod
-    def _json_serializer(obj: Any):
-        if hasattr(obj, "isoformat"):
-            return obj.isoformat()
-        return str(obj)
+                logger.error("Streaming flush failed: %s", exc)
+
+    async def _sender(self, client: _Client):
+        try:
+            while True:
+                frame = await client.frames.get()
+                await client.websocket.send_text(frame)
+                self.frames_sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.debug("WebSocket send failed; removing client. Error: %s", exc)
+            await self.disconnect(client.websocket)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            'clients': len(self._clients),
+            'pending': self.queue_depth(),
+            'messages_in': self.messages_in,
+            'messages_conflated': self.messages_conflated,
+            'messages_dropped': self.messages_dropped,
+            'frames_sent': self.frames_sent,
+            'clients_dropped': self.clients_dropped,
+            'encoder': 'orjson' if FAST_JSON else 'json',
+        }
+        if self._state_sync:
+            stats['state_sync'] = self._state_sync.stats()
+        return stats
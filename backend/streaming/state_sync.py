@@ -0,0 +1,181 @@
+"""
+Streaming State Sync
+
+Versioned snapshot/delta protocol for /ws/stream clients:
+
+- Live state (positions, orders, metrics) is re-serialized only when
+  TradingState.version moves. Each change becomes a delta with a
+  monotonically increasing `seq`:
+
+      {"type": "delta", "epoch": "...", "seq": 42,
+       "positions": {"upsert": [...], "remove": ["AAPL"]},
+       "orders": {"upsert": [...], "remove": ["order-id"]},
+       "metrics": {...changed fields...}}
+
+- Only the broadcaster's flush polls, and it sends every delta it gets to
+  all connected clients. Snapshots and resumes serve the last published
+  state, so a client connecting never consumes a delta the others miss.
+- The snapshot is cached: live state as of the latest seq plus the slower
+  extras (logs, advisories, feature flags), which are rebuilt off the event
+  loop at most every `extras_ttl` seconds however many clients connect.
+- Resume: a client reconnecting with the epoch and last seq it applied gets
+  the deltas it missed from a bounded history instead of a full snapshot.
+  The epoch changes on every restart, so sequences are never mixed up.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from core.async_io import run_blocking
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Keyed sections of the live state and the field identifying their items
+KEYED_SECTIONS = {'positions': 'symbol', 'orders': 'order_id'}
+
+
+def _index(items: List[Dict[str, Any]], key: str) -> Dict[Any, Dict[str, Any]]:
+    return {item[key]: item for item in items}
+
+
+def diff_state(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Changes from one serialized live state to the next (empty dict: no change)."""
+    changes: Dict[str, Any] = {}
+    for section, key in KEYED_SECTIONS.items():
+        before = _index(previous.get(section, []), key)
+        after = _index(current.get(section, []), key)
+        upsert = [item for k, item in after.items() if before.get(k) != item]
+        remove = [k for k in before if k not in after]
+        if upsert or remove:
+            changes[section] = {'upsert': upsert, 'remove': remove}
+
+    before_metrics = previous.get('metrics', {})
+    metrics = {k: v for k, v in current.get('metrics', {}).items() if before_metrics.get(k) != v}
+    if metrics:
+        changes['metrics'] = metrics
+    return changes
+
+
+class StateSync:
+    """Tracks live state versions, emits deltas and serves cached snapshots."""
+
+    def __init__(
+        self,
+        state_builder: Callable[[], Dict[str, Any]],
+        version: Callable[[], int],
+        extras_builder: Optional[Callable[[], Dict[str, Any]]] = None,
+        history: int = 1000,
+        extras_ttl: float = 30.0
+    ):
+        """
+        Args:
+            state_builder: Serializes live state: {'positions': [...], 'orders': [...], 'metrics': {...}}
+            version: Cheap change counter for the live state (TradingState.version)
+            extras_builder: Blocking builder for the rest of the snapshot (logs, advisories, ...)
+            history: Deltas kept for resuming clients
+            extras_ttl: Seconds a built extras section is reused
+        """
+        self.state_builder = state_builder
+        self.version = version
+        self.extras_builder = extras_builder
+        self.extras_ttl = extras_ttl
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+
+        self._state: Dict[str, Any] = {}
+        self._seen_version: Optional[int] = None
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=max(1, history))
+        self._extras: Dict[str, Any] = {}
+        self._extras_built_at = 0.0
+        self._extras_lock: Optional[asyncio.Lock] = None
+
+        self.snapshots_served = 0
+        self.resumes_served = 0
+        self.extras_builds = 0
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """
+        Pick up live state changes since the last poll.
+
+        The caller must broadcast the returned delta (StreamingBroadcaster.flush
+        does); clients at the previous seq cannot apply later deltas without it.
+
+        Returns:
+            The new delta message, or None if nothing changed
+        """
+        version = self.version()
+        if version == self._seen_version:
+            return None
+        self._seen_version = version
+
+        try:
+            state = self.state_builder()
+        except Exception as e:
+            logger.error(f"Failed to serialize streaming state: {e}")
+            return None
+
+        changes = diff_state(self._state, state)
+        self._state = state
+        if not changes:
+            return None
+
+        self.seq += 1
+        delta = {'type': 'delta', 'epoch': self.epoch, 'seq': self.seq, **changes}
+        self._history.append(delta)
+        return delta
+
+    def deltas_since(self, epoch: Optional[str], seq: Optional[int]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Deltas after `seq` for a resuming client.
+
+        Returns:
+            The missed deltas (possibly none), or None when the client has to
+            start over from a snapshot (other epoch, or history too short)
+        """
+        if epoch != self.epoch or seq is None or seq > self.seq:
+            return None
+        if seq == self.seq:
+            return []
+        if not self._history or self._history[0]['seq'] > seq + 1:
+            return None
+        return [delta for delta in self._history if delta['seq'] > seq]
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """Full snapshot at the last published seq; extras are rebuilt only once stale."""
+        if self.extras_builder and time.monotonic() - self._extras_built_at > self.extras_ttl:
+            if self._extras_lock is None:
+                self._extras_lock = asyncio.Lock()
+            async with self._extras_lock:
+                # A client that waited on the lock finds the extras fresh
+                if time.monotonic() - self._extras_built_at > self.extras_ttl:
+                    try:
+                        self._extras = await run_blocking(self.extras_builder)
+                        self.extras_builds += 1
+                    except Exception as e:
+                        logger.error(f"Failed to build streaming snapshot extras: {e}")
+                    self._extras_built_at = time.monotonic()
+
+        self.snapshots_served += 1
+        return {**self._extras, **self._state, 'epoch': self.epoch, 'seq': self.seq}
+
+    async def initial_messages(self, epoch: Optional[str] = None, seq: Optional[int] = None) -> List[Dict[str, Any]]:
+        """What a connecting client gets first: missed deltas when resumable, else a snapshot."""
+        missed = self.deltas_since(epoch, seq)
+        if missed is not None:
+            self.resumes_served += 1
+            return missed
+        return [{'type': 'snapshot', 'payload': await self.snapshot()}]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'epoch': self.epoch,
+            'seq': self.seq,
+            'history': len(self._history),
+            'snapshots_served': self.snapshots_served,
+            'resumes_served': self.resumes_served,
+            'extras_builds': self.extras_builds,
+        }
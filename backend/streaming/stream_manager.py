@@ -1,11 +1,17 @@
 """
 Central stream manager that coordinates all real-time data streams.
 Handles connection lifecycle, health monitoring, and reconnection logic.
+
+Subscriptions follow the trading engine: `update_subscriptions` diffs the
+wanted symbols (watchlist plus open positions, capped at
+settings.stream_max_symbols) against the live set and only
+subscribes/unsubscribes the difference.
 """
 
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Optional, List
 from datetime import datetime
 from .stock_stream import StockStreamManager
+from core.async_io import run_blocking
 from utils.logger import setup_logger
 import asyncio
 from config import settings
@@ -13,6 +19,22 @@ from config import settings
 logger = setup_logger(__name__)
 
 
+def cap_symbols(symbols: Iterable[str], keep: Optional[Iterable[str]] = None,
+                max_symbols: Optional[int] = None) -> List[str]:
+    """
+    Symbols to stream: every pinned symbol (open positions) first, then the
+    watchlist in order until max_symbols. Pinned symbols are never dropped,
+    even past the cap.
+    """
+    if max_symbols is None:
+        max_symbols = settings.stream_max_symbols
+    pinned = list(dict.fromkeys(keep or []))
+    pinned_set = set(pinned)
+    room = max(max_symbols - len(pinned), 0)
+    rest = [s for s in dict.fromkeys(symbols) if s not in pinned_set][:room]
+    return pinned + rest
+
+
 class StreamManager:
     """Coordinates all real-time data streams."""
     
@@ -24,6 +46,8 @@ class StreamManager:
         self._reconnect_attempts = 0
         self._last_reconnect: Optional[datetime] = None
         self._reconnect_delay = settings.stream_reconnect_delay
+        self._subscription_lock: Optional[asyncio.Lock] = None
+        self.subscription_updates = 0
         
         logger.info("Stream manager initialized")
     
@@ -38,11 +62,11 @@ class StreamManager:
             logger.warning("Streams already running")
             return
         
-        self._symbols = symbols
+        self._symbols = list(dict.fromkeys(symbols))
 
         try:
             self.stock_stream = StockStreamManager()
-            self.stock_stream.subscribe(symbols, data_types=['quotes', 'trades', 'bars'])
+            self.stock_stream.subscribe(self._symbols, data_types=['quotes', 'trades', 'bars'])
 
             stream_task = asyncio.create_task(self._run_with_reconnect())
             self._tasks.append(stream_task)
@@ -84,10 +108,63 @@ class StreamManager:
         except Exception as e:
             logger.error(f"Error stopping streams: {e}")
     
+    async def update_subscriptions(self, symbols: Iterable[str], keep: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """
+        Bring stream subscriptions in line with the wanted symbols.
+
+        Only the difference against the current subscriptions is sent, so an
+        unchanged watchlist costs nothing. Safe to call from several loops.
+        The set is capped at settings.stream_max_symbols; `keep` symbols are
+        always subscribed and count against the cap first.
+
+        Args:
+            symbols: Symbols to stream (e.g. the current watchlist)
+            keep: Symbols that must stay subscribed regardless (open positions)
+
+        Returns:
+            {'added': [...], 'removed': [...]}
+        """
+        wanted = cap_symbols(symbols, keep)
+
+        if self._subscription_lock is None:
+            self._subscription_lock = asyncio.Lock()
+
+        async with self._subscription_lock:
+            current = set(self._symbols)
+            wanted_set = set(wanted)
+            added = [s for s in wanted if s not in current]
+            removed = [s for s in self._symbols if s not in wanted_set]
+            if not added and not removed:
+                return {'added': [], 'removed': []}
+
+            if self.is_running and self.stock_stream:
+                # The Alpaca stream blocks on its own event loop while (un)subscribing
+                if added:
+                    await run_blocking(self.stock_stream.subscribe, added, ['quotes', 'trades', 'bars'])
+                if removed:
+                    await run_blocking(self.stock_stream.unsubscribe, removed, ['quotes', 'trades', 'bars'])
+
+            # Also used to resubscribe after a reconnect
+            self._symbols = wanted
+            self.subscription_updates += 1
+
+        logger.info(
+            f"Stream subscriptions updated: {len(wanted)} symbols "
+            f"(+{len(added)}: {', '.join(added[:10])}{'...' if len(added) > 10 else ''}; "
+            f"-{len(removed)}: {', '.join(removed[:10])}{'...' if len(removed) > 10 else ''})"
+        )
+        return {'added': added, 'removed': removed}
+
+    def get_symbols(self) -> List[str]:
+        """Symbols currently subscribed (or to subscribe on start/reconnect)."""
+        return list(self._symbols)
+
     def get_status(self) -> Dict:
         """Get status of all streams."""
         return {
             "running": self.is_running,
+            "symbols": len(self._symbols),
+            "subscription_updates": self.subscription_updates,
             "reconnect_attempts": self._reconnect_attempts,
             "last_reconnect": self._last_reconnect.isoformat() if self._last_reconnect else None,
             "stock_stream": self.stock_stream.get_status() if self.stock_stream else None
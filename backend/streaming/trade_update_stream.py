@@ -0,0 +1,159 @@
+"""
+Trade-updates stream feeding the order mirror.
+
+Alpaca pushes every order event (new, fill, partial_fill, canceled, replaced,
+rejected, expired, ...) over the trading websocket. TradeUpdateStreamManager
+applies them to AlpacaClient.order_mirror so order waits resolve at event
+latency instead of on the next poll.
+
+FakeTradingStream has the same surface as alpaca's TradingStream and lets
+tests push events without a network connection.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from alpaca.trading.stream import TradingStream
+
+from config import settings
+from core.async_io import run_blocking
+from core.order_mirror import OrderMirror
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TradeUpdateStreamManager:
+    """Runs the trade-updates websocket and applies events to an OrderMirror."""
+
+    def __init__(self, order_mirror: OrderMirror, stream=None, live_window_seconds: Optional[float] = None):
+        self.order_mirror = order_mirror
+        self.stream = stream
+        self.live_window_seconds = (
+            live_window_seconds if live_window_seconds is not None
+            else settings.order_mirror_live_window_seconds
+        )
+        self.is_running = False
+        self._connected = False
+        self._thread: Optional[threading.Thread] = None
+        self._last_event: Optional[datetime] = None
+        self._last_event_at = 0.0
+
+    async def start(self):
+        """Connect and start applying trade updates."""
+        if self.is_running:
+            logger.warning("Trade update stream already running")
+            return
+
+        if self.stream is None:
+            self.stream = TradingStream(
+                api_key=settings.alpaca_api_key,
+                secret_key=settings.alpaca_secret_key,
+                paper=True,
+            )
+        self.stream.subscribe_trade_updates(self._handle_trade_update)
+        self.order_mirror.set_live_check(self.is_connected)
+        # TradingStream.run() owns its event loop and reconnects on its own;
+        # the mirror only trusts it while events keep arriving
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, name="trade-updates", daemon=True)
+        self._thread.start()
+        logger.info("✅ Trade update stream started (order mirror)")
+
+    async def stop(self):
+        """Disconnect; the mirror reverts to REST reads."""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        self._connected = False
+        self.order_mirror.set_live_check(None)
+        try:
+            await run_blocking(self.stream.stop)
+        except Exception as e:
+            logger.error(f"Error stopping trade update stream: {e}")
+        if self._thread:
+            await run_blocking(self._thread.join, 5.0)
+        self._thread = None
+        logger.info("Trade update stream stopped")
+
+    def is_connected(self) -> bool:
+        """
+        True once the stream has delivered an event and for
+        live_window_seconds after the latest one. TradingStream does not
+        report authentication or its internal reconnects, so a quiet stream
+        counts as down and the mirror reads and polls over REST until the
+        next event arrives.
+        """
+        if not (self.is_running and self._connected):
+            return False
+        return time.monotonic() - self._last_event_at < self.live_window_seconds
+
+    def get_status(self) -> Dict:
+        return {
+            "running": self.is_running,
+            "connected": self.is_connected(),
+            "last_event": self._last_event.isoformat() if self._last_event else None,
+            "mirror": self.order_mirror.get_stats(),
+        }
+
+    async def _handle_trade_update(self, update):
+        try:
+            self._last_event = datetime.now(timezone.utc)
+            self._last_event_at = time.monotonic()
+            self._connected = True
+            self.order_mirror.apply_update(update)
+        except Exception as e:
+            logger.error(f"Error handling trade update: {e}")
+
+    def _run(self):
+        """Stream thread: blocks in TradingStream.run() until stopped."""
+        try:
+            self.stream.run()
+        except Exception as e:
+            logger.error(f"Trade update stream exited: {e}")
+        finally:
+            self._connected = False
+            self.is_running = False
+
+
+class FakeTradingStream:
+    """In-process stand-in for TradingStream: tests push events with push()."""
+
+    def __init__(self):
+        self._handler = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._started = threading.Event()
+
+    def subscribe_trade_updates(self, handler):
+        self._handler = handler
+
+    def run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._started.set()
+        await self._stopped.wait()
+
+    def stop(self):
+        """Close the stream; run() returns, as on an unrecoverable disconnect."""
+        if self._started.wait(timeout=1.0):
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def push(self, event: str, order, **fields):
+        """Deliver one trade update (event name plus the order's new state) on the stream's loop."""
+        update = SimpleNamespace(
+            event=event,
+            order=order,
+            timestamp=fields.pop('timestamp', datetime.now(timezone.utc)),
+            **fields,
+        )
+        self._started.wait(timeout=1.0)
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._handler(update), self._loop))
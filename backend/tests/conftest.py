@@ -0,0 +1,9 @@
+"""
+Shared test setup: code under test that archives bars (market data, daily
+cache) writes to a throwaway directory instead of the working tree.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault('BAR_ARCHIVE_DIR', tempfile.mkdtemp(prefix='bar_archive_'))
@@ -0,0 +1,137 @@
+"""
+Tests for the async execution layer: blocking broker/DB calls must run on the
+I/O thread pool so the event loop keeps its cadence.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.async_io import AsyncClientProxy, get_io_executor, run_blocking
+from trading.trading_engine import TradingEngine
+
+
+async def measure_ticks(duration: float, interval: float = 0.05):
+    """Record timestamps of a coroutine that should tick every `interval` seconds."""
+    ticks = []
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        ticks.append(time.perf_counter())
+        await asyncio.sleep(interval)
+    return ticks
+
+
+def max_gap(ticks):
+    return max(b - a for a, b in zip(ticks, ticks[1:]))
+
+
+class SlowClient:
+    """Blocking client whose calls take `delay` seconds."""
+
+    rate_limit = 200
+
+    def __init__(self, delay: float = 0.3):
+        self.delay = delay
+        self.threads = []
+
+    def get_account(self, detail: bool = False):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        return {'equity': 1000, 'detail': detail}
+
+    def fail(self):
+        raise RuntimeError("broker down")
+
+
+class TestRunBlocking:
+
+    def test_runs_on_io_pool_without_blocking_loop(self):
+        client = SlowClient(delay=0.3)
+
+        async def run():
+            call = asyncio.create_task(run_blocking(client.get_account, detail=True))
+            ticks = await measure_ticks(0.3)
+            return await call, ticks
+
+        result, ticks = asyncio.run(run())
+        assert result == {'equity': 1000, 'detail': True}
+        assert client.threads[0].startswith('io')
+        assert max_gap(ticks) < 0.2
+
+    def test_exceptions_propagate(self):
+        with pytest.raises(RuntimeError, match="broker down"):
+            asyncio.run(run_blocking(SlowClient().fail))
+
+    def test_pool_is_shared(self):
+        assert get_io_executor() is get_io_executor()
+
+
+class TestAsyncClientProxy:
+
+    def test_methods_become_awaitable(self):
+        client = SlowClient(delay=0)
+        proxy = AsyncClientProxy(client)
+
+        result = asyncio.run(proxy.get_account(detail=True))
+
+        assert result['detail'] is True
+        assert proxy.get_account.__name__ == 'get_account'
+        assert proxy.client is client
+
+    def test_plain_attributes_pass_through(self):
+        assert AsyncClientProxy(SlowClient()).rate_limit == 200
+
+
+class TestEngineDoesNotBlock:
+
+    def _engine(self, alpaca) -> TradingEngine:
+        engine = TradingEngine.__new__(TradingEngine)
+        engine.alpaca = alpaca
+        engine.alpaca_async = AsyncClientProxy(alpaca)
+        engine.supabase = None
+        engine.supabase_async = None
+        engine.momentum_engine = Mock()
+        engine.position_manager = Mock()
+        return engine
+
+    def test_eod_close_keeps_loop_responsive(self):
+        position = Mock(symbol='AAPL', qty='10', avg_entry_price='100', current_price='101',
+                        unrealized_pl='10', unrealized_plpc='0.01')
+        alpaca = Mock()
+        alpaca.get_positions.return_value = [position]
+        alpaca.get_orders.return_value = [Mock(symbol='AAPL', id='o1')]
+        alpaca.close_position.side_effect = lambda symbol: time.sleep(0.3) or True
+        engine = self._engine(alpaca)
+
+        async def run():
+            close = asyncio.create_task(engine._close_all_positions_eod())
+            ticks = await measure_ticks(0.9)
+            await close
+            return ticks
+
+        ticks = asyncio.run(run())
+        alpaca.cancel_order.assert_called_once_with('o1')
+        alpaca.close_position.assert_called_once_with('AAPL')
+        assert max_gap(ticks) < 0.2
+
+    def test_sync_account_runs_off_loop(self):
+        alpaca = Mock()
+        alpaca.get_account.side_effect = lambda: time.sleep(0.3) or Mock(equity='1000', cash='500', buying_power='2000')
+        engine = self._engine(alpaca)
+
+        async def run():
+            sync = asyncio.create_task(engine.sync_account())
+            ticks = await measure_ticks(0.3)
+            await sync
+            return ticks
+
+        ticks = asyncio.run(run())
+        engine.position_manager.sync_positions.assert_called_once()
+        assert max_gap(ticks) < 0.2
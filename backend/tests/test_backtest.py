@@ -0,0 +1,268 @@
+"""
+Tests for the bar-replay backtest engine used by parameter optimization:
+exits follow the live stop/partial/target rules, runs are deterministic and
+respond to parameters, and output feeds FitnessCalculator directly.
+"""
+
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.features import FeatureEngine
+from momentum.indicators import TrendStrengthCalculator
+from optimization import BacktestConfig, BacktestEngine, FitnessCalculator, OptimizationIntegration
+from optimization.backtest import WARMUP_BARS, _confidence_scores, _trend_strength
+from optimization.models import MOMENTUM_PARAMETERS
+from optimization.optimizer import ParameterOptimizer
+
+SIGNAL_BAR = 100  # 11:10 ET on the first session
+
+
+def session_index(day: str, periods: int = 390) -> pd.DatetimeIndex:
+    start = pd.Timestamp(f"{day} 09:30", tz='America/New_York')
+    return pd.date_range(start, periods=periods, freq='min').tz_convert('UTC')
+
+
+def flat_bars(days=('2025-03-03',)) -> pd.DataFrame:
+    """Price 100 with a 0.2 range on every bar (ATR = 0.2, so 1R = 0.3)."""
+    index = pd.DatetimeIndex(np.concatenate([session_index(d) for d in days]))
+    n = len(index)
+    return pd.DataFrame({
+        'open': np.full(n, 100.0),
+        'high': np.full(n, 100.1),
+        'low': np.full(n, 99.9),
+        'close': np.full(n, 100.0),
+        'volume': np.full(n, 1000.0),
+    }, index=index)
+
+
+def random_walk_bars(symbols=5, days=10, seed=7):
+    rng = np.random.default_rng(seed)
+    sessions = [d.strftime('%Y-%m-%d') for d in pd.bdate_range('2025-03-03', periods=days)]
+    index = pd.DatetimeIndex(np.concatenate([session_index(d) for d in sessions]))
+    bars = {}
+    for k in range(symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        bars[f"SYM{k}"] = pd.DataFrame({
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0004, len(index)))),
+            'low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0004, len(index)))),
+            'close': close,
+            'volume': rng.integers(500, 5000, len(index)).astype(float),
+        }, index=index)
+    return bars
+
+
+def single_signal_engine(df: pd.DataFrame, **config) -> BacktestEngine:
+    """Engine over one symbol with exactly one long signal at SIGNAL_BAR."""
+    params = {'slippage_bps': 0.0, 'momentum_enabled': False, 'risk_per_trade_pct': 0.01}
+    params.update(config)
+    engine = BacktestEngine({'TEST': df}, BacktestConfig(**params))
+    series = engine.series[0]
+    series.long_ok[:] = False
+    series.short_ok[:] = False
+    series.long_ok[SIGNAL_BAR] = True
+    series.confidence[SIGNAL_BAR] = 70.0
+    series.risk_mult[SIGNAL_BAR] = 1.0
+    return engine
+
+
+def set_bar(df: pd.DataFrame, i: int, o: float, h: float, l: float, c: float):
+    df.iloc[i, :4] = [o, h, l, c]
+
+
+class TestExits:
+
+    def test_stop_loss(self):
+        df = flat_bars()
+        # Drop through the 99.7 stop three bars after entry
+        set_bar(df, SIGNAL_BAR + 3, 99.9, 99.9, 99.5, 99.6)
+
+        trades = single_signal_engine(df).run()
+
+        assert len(trades) == 1
+        trade = trades[0]
+        assert trade['exit_reason'] == 'stop_loss'
+        assert trade['exit_price'] == pytest.approx(99.7)
+        assert trade['r_multiple'] == pytest.approx(-1.0)
+        assert trade['qty'] == 333  # 1% of $10k / $0.30 risk
+
+    def test_gap_through_stop_fills_at_open(self):
+        df = flat_bars()
+        set_bar(df, SIGNAL_BAR + 3, 99.4, 99.5, 99.3, 99.4)
+
+        trade = single_signal_engine(df).run()[0]
+
+        assert trade['exit_price'] == pytest.approx(99.4)
+        assert trade['r_multiple'] == pytest.approx(-2.0)
+
+    def test_partial_then_target(self):
+        df = flat_bars()
+        # 1.5R partial (100.45) without reaching the 2R target (100.60)
+        set_bar(df, SIGNAL_BAR + 2, 100.0, 100.5, 100.0, 100.4)
+        set_bar(df, SIGNAL_BAR + 3, 100.4, 100.7, 100.35, 100.6)
+
+        trade = single_signal_engine(df).run()[0]
+
+        assert trade['exit_reason'] == 'target'
+        assert trade['exit_price'] == pytest.approx(100.6)
+        # 50% of 333 shares at +0.45, remaining 167 at +0.60
+        assert trade['pnl'] == pytest.approx(166 * 0.45 + 167 * 0.60)
+
+    def test_breakeven_after_1r(self):
+        df = flat_bars()
+        set_bar(df, SIGNAL_BAR + 2, 100.0, 100.35, 100.0, 100.3)
+        set_bar(df, SIGNAL_BAR + 3, 100.2, 100.2, 99.5, 99.6)
+
+        trade = single_signal_engine(df).run()[0]
+
+        assert trade['exit_reason'] == 'protective_stop'
+        # Trailing stop at 100.35 - 0.75R sits above breakeven
+        assert trade['exit_price'] == pytest.approx(100.35 - 0.225)
+        assert trade['pnl'] > 0
+
+    def test_eod_exit(self):
+        trade = single_signal_engine(flat_bars()).run()[0]
+
+        assert trade['exit_reason'] == 'eod'
+        assert trade['exit_time'].endswith('20:55:00')  # 15:55 ET
+        assert trade['pnl'] == pytest.approx(0.0)
+
+    def test_regime_params_change_exits(self):
+        df = flat_bars()
+        set_bar(df, SIGNAL_BAR + 2, 100.0, 100.5, 100.0, 100.4)
+        set_bar(df, SIGNAL_BAR + 3, 100.4, 100.7, 100.35, 100.6)
+        engine = single_signal_engine(df)
+
+        default = engine.run()[0]
+        wider = engine.run({'neutral_profit_target_r': 3.0, 'neutral_partial_profit_1_r': 2.5})[0]
+
+        assert default['exit_reason'] == 'target'
+        # Wider target not reached; the next bar opens below the trailed stop
+        assert wider['exit_reason'] == 'protective_stop'
+        assert wider['exit_price'] == pytest.approx(100.0)
+
+
+class TestEngine:
+
+    def test_deterministic(self):
+        engine = BacktestEngine(random_walk_bars())
+        assert engine.run({'adx_threshold': 25}) == engine.run({'adx_threshold': 25})
+
+    def test_confidence_threshold_filters_entries(self):
+        engine = BacktestEngine(random_walk_bars())
+        loose = engine.run({'base_long_threshold': 0.45, 'base_short_threshold': 0.50})
+        strict = engine.run({'base_long_threshold': 0.60, 'base_short_threshold': 0.65})
+        assert len(strict) < len(loose)
+
+    def test_trades_feed_fitness_calculator(self):
+        trades = BacktestEngine(random_walk_bars()).run()
+        assert trades
+        assert all({'pnl', 'return', 'entry_time', 'exit_time'} <= set(t) for t in trades)
+        assert [t['exit_time'] for t in trades] == sorted(t['exit_time'] for t in trades)
+
+        metrics = FitnessCalculator().calculate_metrics(trades)
+        assert metrics.total_trades == len(trades)
+        assert metrics.total_return == pytest.approx(sum(t['pnl'] for t in trades) / 10000)
+
+    def test_one_position_per_symbol_at_a_time(self):
+        trades = BacktestEngine(random_walk_bars()).run()
+        by_symbol = {}
+        for trade in sorted(trades, key=lambda t: t['entry_time']):
+            previous = by_symbol.get(trade['symbol'])
+            if previous is not None:
+                assert trade['entry_time'] > previous['exit_time']
+            by_symbol[trade['symbol']] = trade
+
+    def test_split_is_chronological(self):
+        engine = BacktestEngine(random_walk_bars())
+        train, validate = engine.split(0.7)
+        train_trades, validate_trades = train.run(), validate.run()
+
+        assert train_trades and validate_trades
+        assert max(t['entry_time'] for t in train_trades) < min(t['entry_time'] for t in validate_trades)
+
+    def test_multi_index_input(self):
+        bars = random_walk_bars(symbols=2, days=3)
+        frame = pd.concat(bars, names=['symbol', 'timestamp'])
+        assert BacktestEngine(frame).run() == BacktestEngine(bars).run()
+
+    def test_runs_are_fast(self):
+        engine = BacktestEngine(random_walk_bars(symbols=10, days=20))
+        started = time.perf_counter()
+        for _ in range(5):
+            engine.run()
+        assert (time.perf_counter() - started) / 5 < 1.0
+
+
+class TestOptimizationIntegration:
+
+    def test_optimizer_runs_on_engine(self):
+        engine = OptimizationIntegration().create_backtest_function(random_walk_bars(symbols=2, days=5))
+        optimizer = ParameterOptimizer(algorithm="PSO", population_size=4, max_iterations=2)
+
+        result = optimizer.optimize(MOMENTUM_PARAMETERS, engine)
+
+        for name, (low, high) in MOMENTUM_PARAMETERS.items():
+            assert low <= result.best_parameters[name] <= high
+        assert result.metrics.total_trades > 0
+
+    def test_stored_bars_page_through_the_supabase_wrapper(self):
+        index = session_index('2025-03-03', periods=2500)
+        rows = [{'timestamp': ts.isoformat(), 'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 10.0}
+                for ts in index]
+
+        class Query:
+            def __getattr__(self, name):
+                if name == 'range':
+                    return lambda start, end: SimpleNamespace(execute=lambda: SimpleNamespace(data=rows[start:end + 1]))
+                return lambda *args, **kwargs: self
+
+        wrapper = SimpleNamespace(client=SimpleNamespace(table=lambda name: Query()))
+        integration = OptimizationIntegration(supabase_client=wrapper)
+
+        bars = integration._query_stored_bars(['AAPL'], datetime(2025, 3, 3, tzinfo=timezone.utc), datetime.now(timezone.utc))
+
+        assert len(bars['AAPL']) == 2500
+        assert bars['AAPL'].index[0] == index[0]
+
+
+class TestScorerParity:
+    """The vectorized precomputations must match the live scorers bar for bar."""
+
+    def test_trend_strength_matches_live_calculator(self):
+        df = random_walk_bars(symbols=1, days=1)['SYM0']
+        calculator = TrendStrengthCalculator()
+        close, high = df['close'].to_numpy(), df['high'].to_numpy()
+
+        vectorized = _trend_strength(df['close'], df['high'], df['low'], 1)
+        live = [calculator.calculate(close[:i + 1], high[:i + 1]) for i in range(WARMUP_BARS, len(df))]
+
+        np.testing.assert_allclose(vectorized[WARMUP_BARS:], live, atol=1e-9)
+
+    def test_confidence_matches_feature_engine(self):
+        rng = np.random.default_rng(3)
+        n = 2000
+        inputs = [
+            rng.normal(100, 0.3, n),  # ema_short
+            rng.normal(100, 0.3, n),  # ema_long
+            rng.uniform(15, 85, n),  # rsi
+            rng.normal(0, 0.06, n),  # macd histogram
+            rng.uniform(0, 2, n),  # volume ratio
+            rng.normal(100, 0.5, n),  # price
+            rng.normal(100, 0.5, n),  # vwap
+        ]
+
+        vectorized = _confidence_scores(*inputs)
+        live = [FeatureEngine.calculate_confidence_score(*(x[i] for x in inputs)) for i in range(n)]
+
+        np.testing.assert_array_equal(vectorized, live)
@@ -0,0 +1,178 @@
+"""
+Tests for the local bar archive: columnar partitions with memory-mapped
+reads, upserts, buffered stream appends, gap detection and read-through
+for the market data and daily cache consumers.
+"""
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.bar_archive import BarArchive
+from data.daily_cache import DAILY_BARS, DailyCache
+from data.market_data import MarketDataManager
+from tests.test_incremental_features import make_bars
+
+START = pd.Timestamp('2025-03-03 14:30', tz='UTC')
+
+
+def two_days(seed=1):
+    first = make_bars(60, seed=seed)
+    second = make_bars(60, seed=seed + 1)
+    second.index = second.index + pd.Timedelta(days=1)
+    return pd.concat([first, second])
+
+
+class TestBarArchive:
+
+    def test_round_trip_across_partitions(self, tmp_path):
+        archive = BarArchive(str(tmp_path))
+        bars = two_days()
+
+        archive.write('AAPL', bars)
+
+        assert sorted(p.name for p in (tmp_path / '1Min' / 'AAPL').iterdir()) == ['2025-03-03.npy', '2025-03-04.npy']
+        read = archive.read('AAPL')
+        pd.testing.assert_frame_equal(read[bars.columns], bars, check_freq=False, check_index_type=False)
+        assert read['vwap'].isna().all()
+        assert len(archive.read('AAPL', START + pd.Timedelta(minutes=10), START + pd.Timedelta(days=1))) == 51
+
+    def test_reads_within_a_partition_are_memory_mapped(self, tmp_path):
+        archive = BarArchive(str(tmp_path))
+        archive.write('AAPL', make_bars(60, seed=2))
+
+        stamps, values = archive.read_arrays('AAPL', START, START + pd.Timedelta(minutes=20))
+        series = archive.read_series('AAPL')
+
+        assert isinstance(values, np.memmap) and len(stamps) == 21
+        assert values.flags['C_CONTIGUOUS'] is False and values[3].flags['C_CONTIGUOUS']
+        assert len(series) == 60 and series.timestamps[0] == np.datetime64('2025-03-03T14:30')
+
+    def test_revised_bars_replace_stored_ones(self, tmp_path):
+        archive = BarArchive(str(tmp_path))
+        bars = make_bars(30, seed=3)
+        archive.write('AAPL', bars)
+
+        revised = bars.iloc[-5:].copy()
+        revised['close'] += 1.0
+        archive.write('AAPL', pd.concat([revised, make_bars(35, seed=3).iloc[30:]]))
+
+        read = archive.read('AAPL')
+        assert len(read) == 35 and read.index.is_monotonic_increasing
+        np.testing.assert_allclose(read['close'].iloc[25:30], bars['close'].iloc[25:30] + 1.0)
+
+    def test_streamed_bars_are_buffered_then_flushed(self, tmp_path):
+        archive = BarArchive(str(tmp_path), flush_bars=3)
+        bars = make_bars(4, seed=4)
+        for ts, row in bars.iloc[:2].iterrows():
+            archive.append_bar('AAPL', row.to_dict(), ts)
+
+        assert not (tmp_path / '1Min' / 'AAPL').exists()
+        assert len(archive.read('AAPL')) == 2
+
+        for ts, row in bars.iloc[2:].iterrows():
+            archive.append_bar('AAPL', row.to_dict(), ts)
+        assert archive.stats()['pending_stream_bars'] == 1
+
+        archive.flush()
+        assert len(BarArchive(str(tmp_path)).read('AAPL')) == 4
+
+    def test_gaps_follow_fetched_coverage(self, tmp_path):
+        archive = BarArchive(str(tmp_path))
+        bars = make_bars(60, seed=5)
+        end = START + pd.Timedelta(hours=3)
+
+        archive.write('AAPL', bars, covered=(START, end))
+
+        # Coverage stops after the last returned bar, and is persisted
+        last_bar_end = bars.index[-1] + pd.Timedelta(minutes=1)
+        assert BarArchive(str(tmp_path)).gaps('AAPL', START - pd.Timedelta(hours=1), end) == [
+            (START - pd.Timedelta(hours=1), START), (last_bar_end, end)
+        ]
+        archive.write('MSFT', bars.iloc[:0], covered=(START, end))
+        assert archive.gaps('MSFT', START, end) == [(START, end)]
+
+    def test_read_through_only_fetches_gaps(self, tmp_path):
+        archive = BarArchive(str(tmp_path))
+        frames = {'AAPL': make_bars(60, seed=6), 'MSFT': make_bars(60, seed=7)}
+        end = START + pd.Timedelta(minutes=59)
+        fetch = Mock(side_effect=lambda symbols, start, stop: {
+            s: frames[s][(frames[s].index >= start) & (frames[s].index <= stop)] for s in symbols
+        })
+
+        first = archive.read_through(['AAPL', 'MSFT'], START, end, fetch)
+        second = archive.read_through(['AAPL', 'MSFT'], START, end, fetch)
+
+        fetch.assert_called_once()
+        assert fetch.call_args.args == (['AAPL', 'MSFT'], START, end + pd.Timedelta(minutes=1))
+        pd.testing.assert_frame_equal(first['MSFT'], second['MSFT'])
+        assert archive.stats()['served_from_disk'] == 2
+
+        archive.read_through(['AAPL'], START, end + pd.Timedelta(minutes=5), fetch)
+        assert fetch.call_args.args[1:] == (end + pd.Timedelta(minutes=1), end + pd.Timedelta(minutes=6))
+
+    def test_disabled_archive_passes_through(self, tmp_path):
+        archive = BarArchive(str(tmp_path), enabled=False)
+        fetch = Mock(return_value={'AAPL': make_bars(5)})
+
+        assert len(archive.read_through(['AAPL'], START, START, fetch)['AAPL']) == 5
+        archive.write('AAPL', make_bars(5))
+        assert not any(tmp_path.iterdir())
+
+
+class TestConsumers:
+
+    def test_market_data_history_reads_archive_first(self, tmp_path):
+        manager = MarketDataManager(Mock(), Mock())
+        manager.archive = BarArchive(str(tmp_path))
+        bars = make_bars(60, seed=8)
+        now = bars.index[-1] + pd.Timedelta(minutes=1)
+        manager.bulk_fetcher = Mock()
+        manager.bulk_fetcher.fetch.return_value = {'AAPL': bars}
+
+        with patch('data.market_data.datetime') as clock, \
+                patch('data.bar_archive.datetime') as archive_clock:
+            clock.now.return_value = archive_clock.now.return_value = now.to_pydatetime()
+            manager.fetch_historical_bars(['AAPL'], days=1)
+            again = manager.fetch_historical_bars(['AAPL'], days=1)
+
+        # The second call only asks for the still-forming bar
+        first_call, second_call = manager.bulk_fetcher.fetch.call_args_list
+        assert first_call.kwargs['start'] == now - timedelta(days=1)
+        assert second_call.kwargs['start'] == now
+        assert len(again['AAPL']) == 60
+
+    def test_stream_bars_are_archived(self, tmp_path):
+        manager = MarketDataManager(Mock(), Mock())
+        manager.archive = BarArchive(str(tmp_path))
+        ts = START.to_pydatetime()
+
+        manager.apply_stream_bar('AAPL', {'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 100}, ts)
+
+        assert manager.archive.read('AAPL')['close'].tolist() == [1.5]
+
+    def test_daily_bars_served_from_archive(self, tmp_path):
+        archive = BarArchive(str(tmp_path))
+        today = archive.settled('1Day')
+        days = pd.bdate_range(end=today - timedelta(days=1), periods=DAILY_BARS)
+        bars = [
+            {'datetime': d.strftime('%Y-%m-%d'), 'open': '1', 'high': '2', 'low': '0.5', 'close': str(100 + i), 'volume': '10'}
+            for i, d in enumerate(days)
+        ]
+        cache = DailyCache()
+
+        with patch('data.daily_cache.get_bar_archive', return_value=archive), \
+                patch.object(DailyCache, 'fetch_twelvedata_bars', return_value=bars) as fetch:
+            first = cache.get_daily_bars('AAPL')
+            second = cache.get_daily_bars('AAPL')
+
+        fetch.assert_called_once()
+        assert first is bars and len(second) == DAILY_BARS
+        assert second[-1]['datetime'] == bars[-1]['datetime'] and second[-1]['close'] == 100 + DAILY_BARS - 1
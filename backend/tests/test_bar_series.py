@@ -0,0 +1,115 @@
+"""
+Tests for the columnar BarSeries: zero-copy views over Alpaca bar frames,
+legacy bar-dict compatibility, and the consumers that accept it.
+"""
+
+from unittest.mock import Mock
+import asyncio
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.bar_series import BarSeries, split_frame
+from data.feature_cache import bar_stamp
+from scanner.momentum_scanner import MomentumScanner
+from scanner.resistance_analyzer import ResistanceAnalyzer
+from tests.test_incremental_features import make_bars
+
+
+def multi(frames):
+    return pd.concat(frames, names=['symbol', 'timestamp'])
+
+
+def legacy_swings(values, window, higher):
+    """The original per-bar loop from ResistanceAnalyzer."""
+    found = []
+    for i in range(window, len(values) - window):
+        current = values[i]
+        beaten = any(
+            (values[i - j] >= current or values[i + j] >= current) if higher
+            else (values[i - j] <= current or values[i + j] <= current)
+            for j in range(1, window + 1)
+        )
+        if not beaten:
+            found.append(current)
+    return found
+
+
+class TestBarSeries:
+
+    def test_split_frame_returns_views_per_symbol(self):
+        frames = {'AAPL': make_bars(30, seed=1), 'MSFT': make_bars(20, seed=2)}
+        bars = multi(frames)
+
+        series = split_frame(bars)
+
+        assert list(series) == ['AAPL', 'MSFT'] and len(series['MSFT']) == 20
+        np.testing.assert_array_equal(series['MSFT'].close, frames['MSFT']['close'].to_numpy())
+        assert np.shares_memory(series['AAPL'].close, bars['close'].to_numpy())
+        assert series['AAPL'].timestamps[0] == np.datetime64('2025-03-03T14:30')
+
+    def test_split_frame_groups_interleaved_symbols(self):
+        bars = multi({'AAPL': make_bars(5, seed=1), 'MSFT': make_bars(5, seed=2)})
+        interleaved = bars.iloc[[0, 5, 1, 6, 2, 7, 3, 8, 4, 9]]
+
+        series = split_frame(interleaved)
+
+        np.testing.assert_array_equal(series['MSFT'].close, bars.loc['MSFT', 'close'].to_numpy())
+
+    def test_records_round_trip(self):
+        frame = make_bars(10, seed=3)
+        series = BarSeries.from_frame(frame)
+        records = series.to_records()
+
+        again = BarSeries.coerce(records)
+
+        assert series[-1] == records[-1] and records[-1]['timestamp'] == frame.index[-1]
+        np.testing.assert_array_equal(again.volume, series.volume)
+        np.testing.assert_array_equal(again.timestamps, series.timestamps)
+        assert bar_stamp(series) == bar_stamp(frame)
+
+    def test_slices_and_empty(self):
+        series = BarSeries.from_frame(make_bars(10, seed=4))
+
+        assert len(series[2:5]) == 3 and len(series.tail(4)) == 4 and len(series.tail(50)) == 10
+        assert not BarSeries.empty() and not BarSeries.coerce(None)
+        assert BarSeries.empty().last_close == 0.0
+
+
+class TestConsumers:
+
+    def test_resistance_analysis_matches_bar_dicts(self):
+        analyzer = ResistanceAnalyzer()
+        for seed in range(20):
+            series = BarSeries.from_frame(make_bars(60, seed=seed))
+            records = series.to_records()
+
+            assert analyzer.analyze(series) == analyzer.analyze(records)
+            assert analyzer._find_swing_highs(series.high) == legacy_swings(list(series.high), 3, True)
+            assert analyzer._find_swing_lows(series.low) == legacy_swings(list(series.low), 3, False)
+
+    def test_volume_ratio_accepts_series_and_dicts(self):
+        scanner = MomentumScanner(Mock(), Mock())
+        series = BarSeries.from_frame(make_bars(40, seed=5))
+        expected = series.volume[-1] / series.volume[-20:-1].mean()
+
+        assert scanner._calculate_volume_ratio({'bars': series}) == pytest.approx(expected)
+        assert scanner._calculate_volume_ratio({'bars': series.to_records()}) == pytest.approx(expected)
+        assert scanner._calculate_volume_ratio({'bars': series[:5]}) == 1.0
+
+    def test_recent_bars_are_columnar(self):
+        frame = multi({'AAPL': make_bars(60, seed=6)})
+        market_data = Mock()
+        market_data.get_bars.return_value = Mock(df=frame)
+        scanner = MomentumScanner(Mock(), market_data)
+
+        bars = asyncio.run(scanner._get_recent_bars('AAPL'))
+
+        assert isinstance(bars, BarSeries) and len(bars) == 60
+        assert bars.close[-1] == frame['close'].iloc[-1]
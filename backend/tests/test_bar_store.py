@@ -0,0 +1,176 @@
+"""
+Tests for the incremental bar store and the incremental feature update path
+in MarketDataManager.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.bar_store import BarStore
+from data.market_data import MarketDataManager
+
+
+def make_bars(num_bars: int, end: datetime = None, seed: int = 0) -> pd.DataFrame:
+    """Create a per-symbol OHLCV frame indexed by UTC minute timestamps."""
+    rng = np.random.default_rng(seed)
+    end = end or datetime(2025, 1, 2, 16, 0, tzinfo=timezone.utc)
+    index = pd.date_range(end=end, periods=num_bars, freq='1min', name='timestamp')
+    close = 100 + np.cumsum(rng.normal(0, 0.2, num_bars))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.05, num_bars),
+        'high': close + 0.3,
+        'low': close - 0.3,
+        'close': close,
+        'volume': rng.integers(1_000, 50_000, num_bars).astype(float),
+        'trade_count': 10,
+        'vwap': close,
+    }, index=index)
+
+
+def to_multi_index(frames: dict) -> pd.DataFrame:
+    """Build an Alpaca-style (symbol, timestamp) multi-index frame."""
+    return pd.concat(frames, names=['symbol', 'timestamp'])
+
+
+class TestBarStore:
+
+    def test_seed_respects_max_depth(self):
+        store = BarStore(max_bars=50)
+        bars = make_bars(120)
+
+        assert store.seed('AAPL', bars) == 50
+        df = store.get_dataframe('AAPL')
+        assert len(df) == 50
+        assert df.index[-1] == bars.index[-1]
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+
+    def test_extend_only_appends_newer_bars(self):
+        store = BarStore(max_bars=500)
+        bars = make_bars(100)
+        store.seed('AAPL', bars.iloc[:80])
+
+        # Overlapping fetch: last stored bar plus 20 new ones
+        added = store.extend('AAPL', bars.iloc[79:])
+
+        assert added == 20
+        assert store.bar_count('AAPL') == 100
+        assert store.last_timestamp('AAPL') == bars.index[-1]
+
+    def test_same_timestamp_revises_last_bar(self):
+        store = BarStore()
+        bars = make_bars(10)
+        store.seed('AAPL', bars)
+
+        last_ts = bars.index[-1]
+        appended = store.append_bar('AAPL', {'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5, 'volume': 9}, last_ts)
+
+        assert appended is False
+        assert store.bar_count('AAPL') == 10
+        assert store.get_dataframe('AAPL')['close'].iloc[-1] == 1.5
+
+    def test_stale_stream_bar_is_ignored(self):
+        store = BarStore()
+        bars = make_bars(10)
+        store.seed('AAPL', bars)
+
+        stale = bars.index[0] - timedelta(minutes=5)
+        assert store.append_bar('AAPL', {'open': 1, 'high': 1, 'low': 1, 'close': 1, 'volume': 1}, stale) is False
+        assert store.get_dataframe('AAPL')['close'].iloc[-1] == pytest.approx(bars['close'].iloc[-1])
+
+    def test_naive_timestamps_are_treated_as_utc(self):
+        store = BarStore()
+        store.append_bar('AAPL', {'open': 1, 'high': 1, 'low': 1, 'close': 1, 'volume': 1}, datetime(2025, 1, 2, 15, 0))
+        assert store.last_timestamp('AAPL') == pd.Timestamp('2025-01-02 15:00', tz='UTC')
+
+    def test_streamed_bars_do_not_count_as_seeded(self):
+        store = BarStore()
+        bars = make_bars(30)
+        streamed = bars.index[-1] + timedelta(minutes=1)
+        store.append_bar('NVDA', {'open': 1, 'high': 1, 'low': 1, 'close': 1, 'volume': 1}, streamed)
+
+        assert store.has_symbol('NVDA') and not store.is_seeded('NVDA')
+
+        # Seeding keeps the bar streamed while the history was being fetched
+        assert store.seed('NVDA', bars) == 31
+        assert store.is_seeded('NVDA')
+        assert store.last_timestamp('NVDA') == streamed
+
+    def test_invalid_depth_rejected(self):
+        with pytest.raises(ValueError):
+            BarStore(max_bars=0)
+
+
+class TestIncrementalFeatureUpdate:
+
+    def _manager(self, alpaca):
+        manager = MarketDataManager(alpaca, Mock())
+        manager.compute_features = Mock(return_value={})
+        return manager
+
+    def test_seeds_once_then_fetches_incrementally(self):
+        full = {'AAPL': make_bars(200, seed=1), 'MSFT': make_bars(200, seed=2)}
+        alpaca = Mock()
+        alpaca.get_bars.return_value = to_multi_index({s: df.iloc[:150] for s, df in full.items()})
+        manager = self._manager(alpaca)
+
+        manager.update_all_features(['AAPL', 'MSFT'])
+        assert manager.bar_store.bar_count('AAPL') == 150
+
+        # Second tick: broker returns only the tail since the last stored bar
+        alpaca.get_bars.return_value = to_multi_index({s: df.iloc[149:] for s, df in full.items()})
+        manager.update_all_features(['AAPL', 'MSFT'])
+
+        second_call = alpaca.get_bars.call_args_list[1].kwargs
+        assert second_call['start'] == full['AAPL'].index[149].to_pydatetime()
+        assert manager.bar_store.bar_count('AAPL') == 200
+        assert manager.bar_store.bar_count('MSFT') == 200
+
+        computed = manager.compute_features.call_args_list[-1].args
+        assert computed[0] == 'MSFT'
+        assert len(computed[1]) == 200
+
+    def test_new_symbol_is_seeded_separately(self):
+        alpaca = Mock()
+        alpaca.get_bars.return_value = to_multi_index({'AAPL': make_bars(60)})
+        manager = self._manager(alpaca)
+        manager.update_all_features(['AAPL'])
+
+        alpaca.get_bars.reset_mock()
+        alpaca.get_bars.return_value = to_multi_index({'NVDA': make_bars(60, seed=3)})
+        manager.update_all_features(['AAPL', 'NVDA'])
+
+        requested = [c.kwargs['symbols'] for c in alpaca.get_bars.call_args_list]
+        assert ['NVDA'] in requested
+        assert ['AAPL'] in requested
+        assert manager.bar_store.bar_count('NVDA') == 60
+
+    def test_streamed_symbol_still_gets_history(self):
+        alpaca = Mock()
+        alpaca.get_bars.return_value = to_multi_index({'NVDA': make_bars(60, seed=3)})
+        manager = self._manager(alpaca)
+        streamed = datetime(2025, 1, 2, 16, 1, tzinfo=timezone.utc)
+
+        # Newly subscribed symbol: a streamed bar arrives before the first seed
+        manager.bar_store.append_bar('NVDA', {'open': 10, 'high': 11, 'low': 9, 'close': 10.5, 'volume': 500}, streamed)
+        assert manager.seed_bar_store(['NVDA']) == 1
+
+        assert manager.bar_store.bar_count('NVDA') == 61
+        assert manager.seed_bar_store(['NVDA']) == 0
+
+    def test_stream_bar_feeds_store(self):
+        manager = self._manager(Mock())
+        manager.supabase = Mock()
+        ts = datetime(2025, 1, 2, 15, 31, tzinfo=timezone.utc)
+
+        manager.apply_stream_bar('AAPL', {'open': 10, 'high': 11, 'low': 9, 'close': 10.5, 'volume': 500}, ts)
+
+        assert manager.bar_store.bar_count('AAPL') == 1
+        assert manager.bar_store.last_timestamp('AAPL') == pd.Timestamp(ts)
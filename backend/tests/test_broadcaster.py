@@ -0,0 +1,126 @@
+"""
+Tests for the streaming broadcaster: per-symbol conflation, batched frames
+serialized once per tick, and per-client backpressure.
+"""
+
+import asyncio
+import json
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streaming import broadcaster as broadcaster_module
+from streaming.broadcaster import StreamingBroadcaster
+
+
+class FakeWebSocket:
+    def __init__(self, stall: bool = False):
+        self.sent = []
+        self.closed = False
+        self.stall = stall
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.stall:
+            await asyncio.Event().wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self):
+        self.closed = True
+
+
+def quote(symbol, bid):
+    return {'type': 'quote', 'symbol': symbol, 'bid': bid, 'ask': bid + 0.01,
+            'timestamp': datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)}
+
+
+class TestConflation:
+
+    def test_latest_quote_per_symbol_is_kept(self):
+        broadcaster = StreamingBroadcaster(flush_interval=1)
+        for i in range(100):
+            broadcaster.publish(quote('AAPL', 100 + i))
+            broadcaster.publish(quote('MSFT', 200 + i))
+        broadcaster.publish({'type': 'log', 'payload': {'message': 'a'}})
+        broadcaster.publish({'type': 'log', 'payload': {'message': 'b'}})
+
+        assert broadcaster.queue_depth() == 4
+        batch = broadcaster._take_batch()
+
+        assert [m['type'] for m in batch] == ['log', 'log', 'quote', 'quote']
+        assert [m['bid'] for m in batch[2:]] == [199, 299]
+        assert broadcaster.stats()['messages_conflated'] == 198
+
+    def test_backlog_is_bounded(self):
+        broadcaster = StreamingBroadcaster(flush_interval=1, max_pending=3)
+        for i in range(5):
+            broadcaster.publish({'type': 'log', 'payload': {'i': i}})
+
+        assert [m['payload']['i'] for m in broadcaster._take_batch()] == [2, 3, 4]
+        assert broadcaster.messages_dropped == 2
+
+
+class TestBatchedDelivery:
+
+    def test_one_frame_per_tick_serialized_once(self, monkeypatch):
+        calls = []
+        real_encode = broadcaster_module.encode
+        monkeypatch.setattr(broadcaster_module, 'encode', lambda m: calls.append(m) or real_encode(m))
+
+        async def run():
+            broadcaster = StreamingBroadcaster(flush_interval=0.01)
+            clients = [FakeWebSocket(), FakeWebSocket()]
+            for ws in clients:
+                await broadcaster.connect(ws)
+            await broadcaster.start()
+            for i in range(50):
+                await broadcaster.enqueue(quote('AAPL', 100 + i))
+            await asyncio.sleep(0.05)
+            await broadcaster.stop()
+            return clients
+
+        clients = asyncio.run(run())
+
+        assert len(calls) == 1
+        for ws in clients:
+            assert ws.sent == [[{'type': 'quote', 'symbol': 'AAPL', 'bid': 149, 'ask': 149.01,
+                                 'timestamp': '2025-03-03T14:30:00+00:00'}]]
+            assert ws.closed
+
+    def test_snapshot_is_sent_on_connect(self):
+        async def run():
+            broadcaster = StreamingBroadcaster(flush_interval=0.01)
+            await broadcaster.start(snapshot_builder=lambda: {'positions': []})
+            ws = FakeWebSocket()
+            await broadcaster.connect(ws)
+            await asyncio.sleep(0.02)
+            await broadcaster.stop()
+            return ws
+
+        assert asyncio.run(run()).sent[0] == {'type': 'snapshot', 'payload': {'positions': []}}
+
+    def test_slow_client_is_dropped_without_stalling_others(self):
+        async def run():
+            broadcaster = StreamingBroadcaster(flush_interval=0.01, client_buffer_frames=2)
+            slow, fast = FakeWebSocket(stall=True), FakeWebSocket()
+            await broadcaster.connect(slow)
+            await broadcaster.connect(fast)
+            for i in range(6):
+                broadcaster.publish({'type': 'log', 'payload': {'i': i}})
+                broadcaster.flush()
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+            stats = broadcaster.stats()
+            await broadcaster.stop()
+            return slow, fast, stats
+
+        slow, fast, stats = asyncio.run(run())
+
+        assert slow.closed and slow.sent == []
+        assert [frame[0]['payload']['i'] for frame in fast.sent] == list(range(6))
+        assert stats['clients_dropped'] == 1 and stats['clients'] == 1
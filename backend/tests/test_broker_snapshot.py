@@ -0,0 +1,194 @@
+"""
+Tests for the broker snapshot cache: repeated account/positions/orders reads
+within a tick must share one broker call, and mutations must invalidate.
+"""
+
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.alpaca_client import AlpacaClient
+from core.broker_snapshot import BrokerSnapshot, order_type_key
+from core.order_mirror import OrderMirror
+from core.state import trading_state, Position
+from trading.position_manager import PositionManager
+
+
+def make_order(symbol: str, order_type: str, order_id: str = None):
+    return SimpleNamespace(
+        id=order_id or f"{symbol}-{order_type}",
+        symbol=symbol,
+        order_type=SimpleNamespace(value=order_type),
+    )
+
+
+def make_trading_client(positions=('AAPL', 'MSFT'), orders=None):
+    client = Mock()
+    client.get_account.return_value = SimpleNamespace(equity='100000')
+    client.get_all_positions.return_value = [SimpleNamespace(symbol=s, qty='10') for s in positions]
+    client.get_orders.return_value = orders if orders is not None else [
+        make_order('AAPL', 'stop'),
+        make_order('AAPL', 'limit'),
+        make_order('MSFT', 'trailing_stop'),
+    ]
+    return client
+
+
+def make_alpaca(trading_client) -> AlpacaClient:
+    alpaca = AlpacaClient.__new__(AlpacaClient)
+    alpaca.trading_client = trading_client
+    alpaca.broker_snapshot = BrokerSnapshot(trading_client, ttl_seconds=60)
+    alpaca.order_mirror = OrderMirror(trading_client, on_change=alpaca._on_order_change)
+    return alpaca
+
+
+class TestBrokerSnapshot:
+
+    def test_reads_within_ttl_share_one_call(self):
+        client = make_trading_client()
+        snapshot = BrokerSnapshot(client, ttl_seconds=60)
+
+        for _ in range(10):
+            snapshot.get_account()
+            snapshot.get_positions()
+            snapshot.get_position('AAPL')
+            snapshot.get_open_orders()
+
+        assert client.get_account.call_count == 1
+        assert client.get_all_positions.call_count == 1
+        assert client.get_orders.call_count == 1
+        assert snapshot.get_stats()['misses'] == 3
+
+    def test_expires_after_ttl(self):
+        client = make_trading_client()
+        snapshot = BrokerSnapshot(client, ttl_seconds=0.05)
+
+        snapshot.get_positions()
+        time.sleep(0.06)
+        snapshot.get_positions()
+
+        assert client.get_all_positions.call_count == 2
+
+    def test_order_indexes(self):
+        snapshot = BrokerSnapshot(make_trading_client(), ttl_seconds=60)
+
+        assert [o.id for o in snapshot.get_open_orders_for('AAPL')] == ['AAPL-stop', 'AAPL-limit']
+        assert [o.id for o in snapshot.get_open_orders_for('AAPL', 'STOP')] == ['AAPL-stop']
+        assert snapshot.get_open_orders_for('TSLA') == []
+        assert [o.id for o in snapshot.get_open_orders(['MSFT', 'TSLA'])] == ['MSFT-trailing_stop']
+        assert snapshot.get_position('MSFT').qty == '10'
+        assert snapshot.get_position('TSLA') is None
+
+    def test_invalidate_single_kind(self):
+        client = make_trading_client()
+        snapshot = BrokerSnapshot(client, ttl_seconds=60)
+        snapshot.get_positions()
+        snapshot.get_open_orders()
+
+        snapshot.invalidate('orders')
+        snapshot.get_positions()
+        snapshot.get_open_orders()
+
+        assert client.get_all_positions.call_count == 1
+        assert client.get_orders.call_count == 2
+
+    def test_invalidation_during_fetch_is_not_overwritten(self):
+        client = make_trading_client()
+        snapshot = BrokerSnapshot(client, ttl_seconds=60)
+
+        def fetch_then_invalidate():
+            snapshot.invalidate('positions')
+            return []
+
+        client.get_all_positions.side_effect = fetch_then_invalidate
+        snapshot.get_positions()
+        snapshot.get_positions()
+
+        assert client.get_all_positions.call_count == 2
+
+    def test_concurrent_readers_share_fetch(self):
+        client = make_trading_client()
+        client.get_all_positions.side_effect = lambda: time.sleep(0.1) or []
+        snapshot = BrokerSnapshot(client, ttl_seconds=60)
+
+        threads = [threading.Thread(target=snapshot.get_positions) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert client.get_all_positions.call_count == 1
+
+    def test_order_type_key_normalizes(self):
+        assert order_type_key(SimpleNamespace(order_type=SimpleNamespace(value='Stop'))) == 'stop'
+        assert order_type_key(SimpleNamespace(order_type=None, type='limit')) == 'limit'
+
+
+class TestAlpacaClientSnapshot:
+
+    def test_open_orders_served_from_snapshot(self):
+        client = make_trading_client()
+        alpaca = make_alpaca(client)
+
+        alpaca.get_orders(status='open')
+        assert [o.id for o in alpaca.get_orders(status='open', symbols=['MSFT'])] == ['MSFT-trailing_stop']
+        assert [o.id for o in alpaca.get_orders(symbol='AAPL', status='open')] == ['AAPL-stop', 'AAPL-limit']
+        assert client.get_orders.call_count == 1
+
+    def test_mutations_invalidate(self):
+        client = make_trading_client()
+        alpaca = make_alpaca(client)
+
+        alpaca.get_orders(status='open')
+        alpaca.cancel_order('AAPL-stop')
+        alpaca.get_orders(status='open')
+        assert client.get_orders.call_count == 2
+
+        alpaca.get_positions()
+        alpaca.close_position('AAPL')
+        alpaca.get_positions()
+        assert client.get_all_positions.call_count == 2
+
+    def test_observed_fill_invalidates(self):
+        client = make_trading_client()
+        client.get_order_by_id.return_value = SimpleNamespace(status=SimpleNamespace(value='filled'))
+        alpaca = make_alpaca(client)
+
+        alpaca.get_positions()
+        alpaca.get_order('o1')
+        alpaca.get_positions()
+
+        assert client.get_all_positions.call_count == 2
+
+    def test_closed_orders_bypass_snapshot(self):
+        client = make_trading_client()
+        alpaca = make_alpaca(client)
+
+        alpaca.get_orders(status='all')
+        alpaca.get_orders(status='all')
+
+        assert client.get_orders.call_count == 2
+
+    def test_manual_stop_check_uses_per_symbol_index(self):
+        client = make_trading_client()
+        manager = PositionManager.__new__(PositionManager)
+        manager.alpaca = make_alpaca(client)
+        trading_state.clear_positions()
+        for symbol, price in (('AAPL', 90.0), ('TSLA', 90.0)):
+            trading_state.update_position(Position(
+                symbol=symbol, qty=10, side='buy', avg_entry_price=100.0, current_price=price,
+                unrealized_pl=-100.0, unrealized_pl_pct=-10.0, market_value=price * 10,
+                stop_loss=95.0, take_profit=110.0, entry_time=datetime(2025, 3, 3, 15, 0),
+            ))
+        try:
+            assert manager.check_stops_and_targets() == [('TSLA', 'emergency_stop')]
+        finally:
+            trading_state.clear_positions()
+        assert client.get_orders.call_count == 1
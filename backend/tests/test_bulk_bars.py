@@ -0,0 +1,130 @@
+"""
+Tests for chunked, concurrent bar fetching and the non-blocking scanner path.
+"""
+
+import asyncio
+import time
+import pandas as pd
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.bulk_bars import BulkBarFetcher, RateBudget, split_bars_by_symbol
+from scanner.opportunity_scanner import OpportunityScanner
+from tests.test_incremental_features import make_bars
+
+
+def fake_get_bars(delay: float = 0.0, num_bars: int = 40):
+    """Mock AlpacaClient.get_bars returning a multi-index frame for the requested symbols."""
+    def get_bars(symbols, timeframe=None, start=None, end=None, limit=None):
+        time.sleep(delay)
+        frames = {s: make_bars(num_bars, seed=i) for i, s in enumerate(symbols)}
+        return pd.concat(frames, names=['symbol', 'timestamp'])
+    return Mock(side_effect=get_bars)
+
+
+def make_fetcher(get_bars, **kwargs) -> BulkBarFetcher:
+    alpaca = Mock()
+    alpaca.get_bars = get_bars
+    params = {'chunk_size': 10, 'max_concurrency': 4, 'requests_per_minute': 1000}
+    params.update(kwargs)
+    return BulkBarFetcher(alpaca, **params)
+
+
+START = datetime(2025, 3, 3, tzinfo=timezone.utc)
+
+
+class TestBulkBarFetcher:
+
+    def test_chunks_are_deduplicated_and_sized(self):
+        fetcher = make_fetcher(fake_get_bars(), chunk_size=3)
+        chunks = fetcher.chunk(['A', 'B', 'A', 'C', 'D', 'E', 'F', 'G'])
+        assert chunks == [['A', 'B', 'C'], ['D', 'E', 'F'], ['G']]
+
+    def test_fetch_combines_all_chunks(self):
+        get_bars = fake_get_bars()
+        fetcher = make_fetcher(get_bars)
+        symbols = [f"S{i}" for i in range(25)]
+
+        result = fetcher.fetch(symbols, start=START)
+
+        assert set(result) == set(symbols)
+        assert get_bars.call_count == 3
+        assert all(len(call.kwargs['symbols']) <= 10 for call in get_bars.call_args_list)
+        assert list(result['S0'].columns[:5]) == ['open', 'high', 'low', 'close', 'volume']
+
+    def test_chunks_run_concurrently(self):
+        fetcher = make_fetcher(fake_get_bars(delay=0.3), chunk_size=5, max_concurrency=4)
+        symbols = [f"S{i}" for i in range(20)]
+
+        started = time.perf_counter()
+        result = fetcher.fetch(symbols, start=START)
+        elapsed = time.perf_counter() - started
+
+        assert len(result) == 20
+        assert elapsed < 0.9  # 4 chunks x 0.3s serially would take 1.2s
+
+    def test_failed_chunk_does_not_drop_others(self):
+        def get_bars(symbols, **kwargs):
+            if 'S0' in symbols:
+                return None
+            return pd.concat({s: make_bars(30) for s in symbols}, names=['symbol', 'timestamp'])
+
+        fetcher = make_fetcher(Mock(side_effect=get_bars), chunk_size=2)
+        result = fetcher.fetch(['S0', 'S1', 'S2', 'S3'], start=START)
+        assert set(result) == {'S2', 'S3'}
+
+    def test_fetch_async_does_not_block_event_loop(self):
+        fetcher = make_fetcher(fake_get_bars(delay=0.3), chunk_size=5)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.05)
+
+        async def run():
+            fetch = asyncio.create_task(fetcher.fetch_async([f"S{i}" for i in range(10)], start=START))
+            await ticker()
+            return await fetch
+
+        result = asyncio.run(run())
+        assert len(result) == 10
+        gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+        assert max(gaps) < 0.2
+
+
+class TestRateBudget:
+
+    def test_blocks_until_window_frees(self):
+        budget = RateBudget(requests_per_minute=2, window_seconds=0.2)
+        started = time.perf_counter()
+        for _ in range(3):
+            budget.acquire()
+        assert time.perf_counter() - started >= 0.18
+
+
+def test_split_bars_by_symbol_skips_missing():
+    frames = {'AAPL': make_bars(5)}
+    bars = pd.concat(frames, names=['symbol', 'timestamp'])
+    assert list(split_bars_by_symbol(bars, ['AAPL', 'MSFT'])) == ['AAPL']
+    assert split_bars_by_symbol(None, ['AAPL']) == {}
+
+
+def test_scanner_async_features_use_bulk_fetch():
+    market_data = Mock()
+    market_data.fetch_historical_bars_async = AsyncMock(
+        return_value={'AAPL': make_bars(60, seed=1), 'MSFT': make_bars(10, seed=2)}
+    )
+    scanner = OpportunityScanner.__new__(OpportunityScanner)
+    scanner.market_data = market_data
+
+    features = asyncio.run(scanner._calculate_scan_features_async(['AAPL', 'MSFT']))
+
+    market_data.fetch_historical_bars_async.assert_awaited_once_with(['AAPL', 'MSFT'], days=1)
+    market_data.fetch_historical_bars.assert_not_called()
+    assert list(features) == ['AAPL']
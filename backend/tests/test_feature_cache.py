@@ -0,0 +1,137 @@
+"""
+Tests for the per-bar-set feature cache: keying on the last bar, LRU
+eviction, hit/miss counters and reuse across the consumers.
+"""
+
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.feature_cache import FeatureCache, bar_stamp, feature_kind
+from data.market_data import MarketDataManager
+from data.panel_features import cached_panel_features
+from momentum.config import MomentumConfig
+from momentum.validator import MomentumSignalValidator
+from tests.test_incremental_features import make_bars
+
+
+def stamp(minute, close=100.0, volume=1000.0):
+    return (pd.Timestamp('2025-03-03 14:30', tz='UTC') + pd.Timedelta(minutes=minute), close, volume)
+
+
+class TestFeatureCache:
+
+    def test_hit_on_unchanged_bar_set(self):
+        cache = FeatureCache(max_entries=10)
+        compute = Mock(return_value={'rsi': 55.0})
+
+        first = cache.get_or_compute('features:9:21', 'AAPL', '1min', stamp(0), compute)
+        second = cache.get_or_compute('features:9:21', 'AAPL', '1min', stamp(0), compute)
+
+        assert first == second == {'rsi': 55.0}
+        compute.assert_called_once()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_new_or_revised_last_bar_misses(self):
+        cache = FeatureCache(max_entries=10)
+        cache.put('k', 'AAPL', '1min', stamp(0), {'rsi': 50.0})
+
+        assert cache.get('k', 'AAPL', '1min', stamp(1)) is None
+        assert cache.get('k', 'AAPL', '1min', stamp(0, close=100.5)) is None
+        assert cache.get('k', 'AAPL', '5min', stamp(0)) is None
+        assert cache.get('other', 'AAPL', '1min', stamp(0)) is None
+
+    def test_lru_eviction(self):
+        cache = FeatureCache(max_entries=2)
+        cache.put('k', 'AAPL', '1min', stamp(0), 1)
+        cache.put('k', 'MSFT', '1min', stamp(0), 2)
+        cache.get('k', 'AAPL', '1min', stamp(0))
+        cache.put('k', 'NVDA', '1min', stamp(0), 3)
+
+        assert cache.get('k', 'MSFT', '1min', stamp(0)) is None
+        assert cache.get('k', 'AAPL', '1min', stamp(0)) == 1
+        assert cache.stats()['evictions'] == 1 and len(cache) == 2
+
+    def test_cached_dicts_are_isolated_from_callers(self):
+        cache = FeatureCache()
+        features = {'rsi': 50.0}
+        cache.put('k', 'AAPL', '1min', stamp(0), features)
+        features['symbol'] = 'AAPL'
+        cache.get('k', 'AAPL', '1min', stamp(0))['timestamp'] = 'now'
+
+        assert cache.get('k', 'AAPL', '1min', stamp(0)) == {'rsi': 50.0}
+
+    def test_unstamped_frames_are_not_cached(self):
+        cache = FeatureCache()
+        frame = make_bars(40, seed=1).reset_index(drop=True)
+
+        assert bar_stamp(frame) is None
+        cache.put('k', 'AAPL', '1min', bar_stamp(frame), {'rsi': 50.0})
+        assert len(cache) == 0 and cache.get('k', 'AAPL', '1min', None) is None
+        assert cache.misses == 0
+
+    def test_batch_only_computes_changed_symbols(self):
+        cache = FeatureCache()
+        frames = {'AAPL': make_bars(60, seed=1), 'MSFT': make_bars(60, seed=2)}
+        cached_panel_features(frames, cache=cache)
+
+        frames['MSFT'] = make_bars(61, seed=2)
+        with patch('data.panel_features.calculate_panel_features', wraps=lambda b, **kw: {}) as compute:
+            cached_panel_features(frames, cache=cache)
+
+        assert list(compute.call_args.args[0]) == ['MSFT']
+
+
+class TestConsumers:
+
+    def test_strategy_features_reused_by_scanner(self):
+        cache = FeatureCache()
+        bars = make_bars(60, seed=5)
+        manager = MarketDataManager(Mock(), Mock())
+        manager.feature_cache = cache
+
+        published = manager.compute_features('AAPL', bars)
+        with patch('data.panel_features.calculate_panel_features') as compute:
+            scanned = cached_panel_features({'AAPL': bars}, cache=cache)
+
+        compute.assert_not_called()
+        assert scanned['AAPL']['rsi'] == pytest.approx(published['rsi'])
+        assert 'timestamp' not in scanned['AAPL']
+
+    def test_momentum_indicators_reused_for_same_bars(self):
+        validator = MomentumSignalValidator(MomentumConfig(enabled=True))
+        validator.feature_cache = FeatureCache()
+        bars = make_bars(80, seed=3)
+        data = dict(high=list(bars['high']), low=list(bars['low']), close=list(bars['close']),
+                    volume=list(bars['volume']))
+
+        with patch.object(validator, '_calculate_indicators', wraps=validator._calculate_indicators) as calc:
+            first = validator.validate_momentum('AAPL', **data, current_profit_r=1.0, bar_stamp=bar_stamp(bars))
+            second = validator.validate_momentum('AAPL', **data, current_profit_r=1.2, bar_stamp=bar_stamp(bars))
+
+        calc.assert_called_once()
+        assert (first.adx, first.volume_ratio) == (second.adx, second.volume_ratio)
+
+    def test_rsi_validation_hits_the_cache(self):
+        validator = MomentumSignalValidator(MomentumConfig(enabled=True, include_rsi=True))
+        validator.feature_cache = FeatureCache()
+        bars = make_bars(80, seed=4)
+        data = dict(high=list(bars['high']), low=list(bars['low']), close=list(bars['close']),
+                    volume=list(bars['volume']))
+
+        with patch.object(validator, '_calculate_indicators', wraps=validator._calculate_indicators) as calc:
+            first = validator.validate_with_rsi('AAPL', **data, rsi=55.0, current_profit_r=1.0, bar_stamp=bar_stamp(bars))
+            second = validator.validate_with_rsi('AAPL', **data, rsi=65.0, current_profit_r=1.2, bar_stamp=bar_stamp(bars))
+
+        calc.assert_called_once()
+        assert validator.feature_cache.stats()['hits'] == 1
+        assert first.adx == second.adx and (first.rsi, second.rsi) == (55.0, 65.0)
+
+    def test_feature_kind_includes_periods(self):
+        assert feature_kind(9, 21) != feature_kind(5, 30)
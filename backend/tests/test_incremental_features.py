@@ -0,0 +1,220 @@
+"""
+Parity tests: streaming IncrementalIndicatorState vs the pandas implementations
+in data/features.py and indicators/*.py.
+
+Every indicator is compared bar by bar against the full-DataFrame computation,
+and the emitted feature dict is compared against FeatureEngine.calculate_features.
+"""
+
+import math
+import pytest
+import pandas as pd
+import numpy as np
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from hypothesis import given, strategies as st, settings
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.features import FeatureEngine
+from data.incremental_features import IncrementalIndicatorState
+from data.market_data import MarketDataManager
+from indicators.momentum import calculate_rsi, calculate_macd
+from indicators.trend import calculate_adx
+from indicators.volume import calculate_volume_ratio, calculate_on_balance_volume
+from indicators.vwap import calculate_vwap
+
+
+def make_bars(num_bars: int, seed: int = 0, flat_from: int = None, flat_len: int = 0) -> pd.DataFrame:
+    """Random-walk OHLCV bars within one session, with an optional flat (zero-range) stretch."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(
+        start=datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc),
+        periods=num_bars, freq='1min', name='timestamp'
+    )
+    close = 50 + np.cumsum(rng.normal(0, 0.15, num_bars))
+    high = close + rng.uniform(0, 0.2, num_bars)
+    low = close - rng.uniform(0, 0.2, num_bars)
+    open_ = low + (high - low) * rng.uniform(0, 1, num_bars)
+    volume = rng.integers(100, 20_000, num_bars).astype(float)
+
+    if flat_from is not None:
+        sl = slice(flat_from, flat_from + flat_len)
+        level = close[flat_from]
+        close[sl] = high[sl] = low[sl] = open_[sl] = level
+
+    return pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+        index=index,
+    )
+
+
+def run_stream(df: pd.DataFrame, **kwargs):
+    """Feed bars one at a time and record indicator values after each bar."""
+    state = IncrementalIndicatorState(**kwargs)
+    rows = []
+    for ts, row in df.iterrows():
+        state.update(row['open'], row['high'], row['low'], row['close'], row['volume'], ts)
+        rows.append({
+            'ema_short': state.ema_short.value,
+            'ema_long': state.ema_long.value,
+            'rsi': state.rsi,
+            'macd': state.macd,
+            'macd_signal': state.macd_signal,
+            'macd_histogram': state.macd_histogram,
+            'atr': state.atr,
+            'adx': state.adx,
+            'plus_di': state.plus_di,
+            'minus_di': state.minus_di,
+            'vwap': state.vwap,
+            'volume_ratio': state.volume_ratio,
+            'obv': state.obv,
+        })
+    return state, pd.DataFrame(rows, index=df.index)
+
+
+def assert_series_close(actual: pd.Series, expected: pd.Series, name: str):
+    np.testing.assert_allclose(
+        actual.to_numpy(dtype=float), expected.to_numpy(dtype=float),
+        rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=name,
+    )
+
+
+def assert_features_match(actual: dict, expected: dict):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        got = actual[key]
+        if isinstance(value, float):
+            if math.isnan(value):
+                assert math.isnan(got), key
+            else:
+                assert got == pytest.approx(value, rel=1e-9, abs=1e-9), key
+        else:
+            assert got == value, key
+
+
+class TestIndicatorParity:
+
+    @pytest.mark.parametrize('seed', [0, 1, 2])
+    def test_series_match_pandas(self, seed):
+        df = make_bars(300, seed=seed)
+        _, stream = run_stream(df)
+
+        close = df['close']
+        macd_line, macd_signal, macd_hist = calculate_macd(close)
+        adx, plus_di, minus_di = calculate_adx(df['high'], df['low'], close)
+
+        assert_series_close(stream['ema_short'], FeatureEngine.calculate_ema(close, 9), 'ema_short')
+        assert_series_close(stream['ema_long'], FeatureEngine.calculate_ema(close, 21), 'ema_long')
+        assert_series_close(stream['rsi'], calculate_rsi(close), 'rsi')
+        assert_series_close(stream['macd'], macd_line, 'macd')
+        assert_series_close(stream['macd_signal'], macd_signal, 'macd_signal')
+        assert_series_close(stream['macd_histogram'], macd_hist, 'macd_histogram')
+        assert_series_close(stream['atr'], FeatureEngine.calculate_atr(df['high'], df['low'], close), 'atr')
+        assert_series_close(stream['adx'], adx, 'adx')
+        assert_series_close(stream['plus_di'], plus_di, 'plus_di')
+        assert_series_close(stream['minus_di'], minus_di, 'minus_di')
+        assert_series_close(stream['vwap'], calculate_vwap(df), 'vwap')
+        assert_series_close(stream['volume_ratio'], calculate_volume_ratio(df['volume']), 'volume_ratio')
+        assert_series_close(stream['obv'], calculate_on_balance_volume(close, df['volume']).astype(float), 'obv')
+
+    def test_flat_bars_match_pandas_nan_handling(self):
+        """Zero-range stretches produce 0/0 in DX and RSI; NaN weighting must match pandas."""
+        df = make_bars(120, seed=5, flat_from=0, flat_len=30)
+        _, stream = run_stream(df)
+
+        adx, plus_di, minus_di = calculate_adx(df['high'], df['low'], df['close'])
+        assert_series_close(stream['adx'], adx, 'adx')
+        assert_series_close(stream['plus_di'], plus_di, 'plus_di')
+        assert_series_close(stream['rsi'], calculate_rsi(df['close']), 'rsi')
+
+    @given(
+        seed=st.integers(min_value=0, max_value=10_000),
+        num_bars=st.integers(min_value=26, max_value=150),
+    )
+    @settings(max_examples=25, deadline=None)
+    def test_property_feature_dict_matches_feature_engine(self, seed, num_bars):
+        df = make_bars(num_bars, seed=seed)
+        state, _ = run_stream(df)
+
+        expected = FeatureEngine.calculate_features(df.copy())
+        assert_features_match(state.features(), expected)
+
+
+class TestIncrementalBehaviour:
+
+    def test_warm_up_returns_none(self):
+        df = make_bars(25)
+        state, _ = run_stream(df)
+        assert state.features() is None
+        assert FeatureEngine.calculate_features(df.copy()) is None
+
+    def test_revised_last_bar_replaces_previous_update(self):
+        df = make_bars(80, seed=3)
+        revised = df.copy()
+        revised.iloc[-1, revised.columns.get_loc('close')] += 0.5
+        revised.iloc[-1, revised.columns.get_loc('high')] += 0.5
+
+        state, _ = run_stream(df)
+        last = revised.iloc[-1]
+        state.update(last['open'], last['high'], last['low'], last['close'], last['volume'], revised.index[-1])
+
+        assert state.bar_count == 80
+        assert_features_match(state.features(), FeatureEngine.calculate_features(revised.copy()))
+
+    def test_out_of_order_bar_is_ignored(self):
+        df = make_bars(40)
+        state, _ = run_stream(df)
+        before = state.features()
+
+        first = df.iloc[0]
+        assert state.update(first['open'], first['high'], first['low'], first['close'], first['volume'], df.index[0]) is False
+        assert_features_match(state.features(), before)
+
+    def test_update_from_frame_resumes_from_last_bar(self):
+        df = make_bars(100, seed=7)
+        state = IncrementalIndicatorState()
+        state.update_from_frame(df.iloc[:60])
+
+        assert state.can_resume_from(df)
+        applied = state.update_from_frame(df, since=state.last_timestamp)
+
+        assert applied == 41  # last stored bar re-applied + 40 new bars
+        assert state.bar_count == 100
+        assert_features_match(state.features(), FeatureEngine.calculate_features(df.copy()))
+
+    def test_vwap_resets_each_session(self):
+        day1 = make_bars(60, seed=1)
+        day2 = make_bars(60, seed=2)
+        day2.index = day2.index + pd.Timedelta(days=1)
+        df = pd.concat([day1, day2])
+
+        state, _ = run_stream(df)
+        assert state.vwap == pytest.approx(calculate_vwap(day2).iloc[-1])
+
+        cumulative, _ = run_stream(df, reset_vwap_daily=False)
+        assert cumulative.vwap == pytest.approx(calculate_vwap(df).iloc[-1])
+
+
+class TestMarketDataIntegration:
+
+    def test_stream_bar_refreshes_features_between_polls(self):
+        df = make_bars(90, seed=11)
+        manager = MarketDataManager(Mock(), Mock())
+
+        manager.bar_store.seed('AAPL', df.iloc[:89])
+        polled = manager.compute_features('AAPL', manager.bar_store.get_dataframe('AAPL'))
+        assert polled is not None
+
+        last = df.iloc[-1]
+        manager.apply_stream_bar('AAPL', last.to_dict(), df.index[-1].to_pydatetime())
+
+        published = manager.supabase.queue_features.call_args.args[0]
+        expected = FeatureEngine.calculate_features(df.copy())
+        assert published['symbol'] == 'AAPL'
+        assert published['ema_short'] == pytest.approx(expected['ema_short'], rel=1e-9)
+        assert published['rsi'] == pytest.approx(expected['rsi'], rel=1e-9)
+        assert manager.indicator_states['AAPL'].bar_count == 90
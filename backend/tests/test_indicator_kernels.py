@@ -0,0 +1,137 @@
+"""
+Tests for the shared indicator kernels: parity with the pandas reference
+formulas, 2-D batch rows equal per-series results, and NaN handling.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import kernels
+from momentum.indicators import ADXCalculator
+
+
+def make_bars(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    high = close + rng.uniform(0.05, 1.0, n)
+    low = close - rng.uniform(0.05, 1.0, n)
+    return pd.Series(high), pd.Series(low), pd.Series(close)
+
+
+def reference_true_range(high, low, close):
+    prev_close = close.shift(1)
+    return pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+
+
+class TestSmoothing:
+
+    @pytest.mark.parametrize('alpha', [0.1, 2 / 13, 1 / 14])
+    def test_ewm_matches_pandas(self, alpha):
+        _, _, close = make_bars()
+        expected = close.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(kernels.ewm(close, alpha), expected, rtol=1e-12)
+
+    def test_ewm_nan_lead_in_and_gaps(self):
+        _, _, close = make_bars(60)
+        for holes in ([0, 1, 2], [0, 10, 11, 30]):
+            series = close.copy()
+            series.iloc[holes] = np.nan
+            expected = series.ewm(alpha=0.2, adjust=False).mean().to_numpy()
+            np.testing.assert_allclose(kernels.ewm(series, 0.2), expected, rtol=1e-12)
+
+    def test_batch_rows_equal_single_series(self):
+        batch = np.vstack([make_bars(120, seed=s)[2].to_numpy() for s in range(4)])
+        batch[2, :5] = np.nan
+
+        result = kernels.ema(batch, 9)
+
+        for row in range(batch.shape[0]):
+            np.testing.assert_allclose(result[row], kernels.ema(batch[row], 9), rtol=1e-12)
+
+    def test_wilder_sma_seeded_matches_loop(self):
+        data = make_bars(50)[2].to_numpy()
+        period = 14
+        expected = np.zeros_like(data)
+        expected[period - 1] = data[:period].mean()
+        for i in range(period, len(data)):
+            expected[i] = data[i] / period + (1 - 1 / period) * expected[i - 1]
+
+        np.testing.assert_allclose(kernels.wilder_sma_seeded(data, period), expected, rtol=1e-12)
+        assert not kernels.wilder_sma_seeded(data[:10], period).any()
+
+
+class TestIndicators:
+
+    def test_rsi_and_macd_match_pandas(self):
+        _, _, close = make_bars()
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0.0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta.where(delta < 0, 0.0)).ewm(alpha=1 / 14, adjust=False).mean()
+        line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal = line.ewm(span=9, adjust=False).mean()
+
+        macd_line, signal_line, hist = kernels.macd(close)
+
+        np.testing.assert_allclose(kernels.rsi(close), (100 - 100 / (1 + gain / loss)).to_numpy(), rtol=1e-10)
+        np.testing.assert_allclose(macd_line, line.to_numpy(), rtol=1e-10)
+        np.testing.assert_allclose(hist, (line - signal).to_numpy(), rtol=1e-9, atol=1e-12)
+
+    def test_atr_and_adx_match_pandas(self):
+        high, low, close = make_bars()
+        tr = reference_true_range(high, low, close)
+        up, down = high.diff(), -low.diff()
+        plus_dm = up.where((up > down) & (up > 0), 0.0)
+        minus_dm = down.where((down > up) & (down > 0), 0.0)
+        atr = tr.ewm(alpha=1 / 14, adjust=False).mean()
+        plus_di = 100 * plus_dm.ewm(alpha=1 / 14, adjust=False).mean() / atr
+        minus_di = 100 * minus_dm.ewm(alpha=1 / 14, adjust=False).mean() / atr
+        dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+
+        adx, pdi, mdi = kernels.adx(high, low, close)
+
+        np.testing.assert_allclose(kernels.atr(high, low, close), tr.rolling(14).mean().to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(adx, dx.ewm(alpha=1 / 14, adjust=False).mean().to_numpy(), rtol=1e-10)
+        np.testing.assert_allclose(pdi, plus_di.to_numpy(), rtol=1e-10)
+        np.testing.assert_allclose(mdi, minus_di.to_numpy(), rtol=1e-10)
+
+    def test_momentum_adx_unchanged(self):
+        high, low, close = (s.to_numpy() for s in make_bars(80))
+        period = 14
+
+        def smooth(data):
+            out = np.zeros_like(data)
+            out[period - 1] = data[:period].mean()
+            for i in range(period, len(data)):
+                out[i] = data[i] / period + (1 - 1 / period) * out[i - 1]
+            return out
+
+        prev_close = np.concatenate([close[:1], close[:-1]])
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        up = np.concatenate([[0.0], np.diff(high)])
+        down = np.concatenate([[0.0], -np.diff(low)])
+        atr = smooth(tr)
+        atr = np.where(atr == 0, 1e-10, atr)
+        plus_di = 100 * smooth(np.where((up > down) & (up > 0), up, 0)) / atr
+        minus_di = 100 * smooth(np.where((down > up) & (down > 0), down, 0)) / atr
+        total = plus_di + minus_di
+        dx = 100 * np.abs(plus_di - minus_di) / np.where(total == 0, 1e-10, total)
+
+        result = ADXCalculator(period).calculate(list(high), list(low), list(close))
+
+        assert result == pytest.approx(smooth(dx)[-1], rel=1e-10)
+
+    def test_momentum_true_range_seeds_first_bar_with_its_close(self):
+        high = np.array([101.0, 102.0, np.nan])
+        low = np.array([100.0, 100.5, 101.0])
+        close = np.array([104.0, 101.0, 102.0])  # first close outside its range
+
+        tr = ADXCalculator()._calculate_true_range(high, low, close)
+
+        np.testing.assert_array_equal(tr, [4.0, 3.5, np.nan])  # |low - close[0]| on the first bar
+        assert kernels.true_range(high, low, close)[0] == 1.0
@@ -0,0 +1,139 @@
+"""
+Tests for the cached market clock: market-hours checks must be answered
+locally between refreshes and across open/close boundaries.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.market_clock import ET, MarketClock
+
+
+def et(day: int, hour: int, minute: int = 0) -> datetime:
+    """Aware UTC datetime for an ET wall-clock time in March 2025."""
+    return ET.localize(datetime(2025, 3, day, hour, minute)).astimezone(timezone.utc)
+
+
+def calendar_day(day: int, close_hour: int = 16):
+    return SimpleNamespace(
+        date=date(2025, 3, day),
+        open=datetime(2025, 3, day, 9, 30),
+        close=datetime(2025, 3, day, close_hour, 0),
+    )
+
+
+class FakeTime:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def make_client(clock_at: datetime, calendar=None):
+    """Trading client whose clock reflects the session of 2025-03-03 (Mon)."""
+    client = Mock()
+    client.get_clock.side_effect = lambda: SimpleNamespace(
+        timestamp=clock_at,
+        is_open=et(3, 9, 30) <= clock_at < et(3, 16),
+        next_open=et(3, 9, 30) if clock_at < et(3, 9, 30) else et(4, 9, 30),
+        next_close=et(3, 16) if clock_at < et(3, 16) else et(4, 16),
+    )
+    client.get_calendar.return_value = calendar if calendar is not None else [
+        calendar_day(d) for d in (3, 4, 5, 6, 7)
+    ]
+    return client
+
+
+class TestMarketClock:
+
+    def test_repeated_checks_use_cache(self):
+        now = FakeTime(et(3, 10))
+        client = make_client(now.now)
+        clock = MarketClock(client, refresh_seconds=300, now=now)
+
+        for _ in range(50):
+            assert clock.is_market_open() is True
+
+        assert client.get_clock.call_count == 1
+        assert client.get_calendar.call_count == 1
+
+    def test_crosses_close_and_open_without_refresh(self):
+        now = FakeTime(et(3, 15, 59))
+        client = make_client(now.now)
+        clock = MarketClock(client, refresh_seconds=3600 * 24, now=now)
+        assert clock.is_market_open() is True
+
+        now.now = et(3, 16, 1)
+        snapshot = clock.get_clock()
+        assert snapshot.is_open is False
+        assert snapshot.next_open == et(4, 9, 30)
+
+        now.now = et(4, 9, 31)
+        snapshot = clock.get_clock()
+        assert snapshot.is_open is True
+        assert snapshot.next_close == et(4, 16)
+        assert client.get_clock.call_count == 1
+
+    def test_early_close_from_calendar(self):
+        now = FakeTime(et(3, 12))
+        calendar = [calendar_day(3, close_hour=13), calendar_day(4)]
+        clock = MarketClock(make_client(now.now, calendar), now=now)
+
+        assert clock.get_clock().next_close == et(3, 13)
+        now.now = et(3, 13, 30)
+        assert clock.is_market_open() is False
+
+    def test_refreshes_when_interval_elapses(self):
+        now = FakeTime(et(3, 10))
+        client = make_client(now.now)
+        clock = MarketClock(client, refresh_seconds=0, now=now)
+
+        clock.is_market_open()
+        clock.is_market_open()
+        assert client.get_clock.call_count == 2
+
+    def test_falls_back_to_clock_boundaries_without_calendar(self):
+        now = FakeTime(et(3, 15, 30))
+        client = make_client(now.now)
+        client.get_calendar.side_effect = RuntimeError("calendar unavailable")
+        clock = MarketClock(client, refresh_seconds=3600, now=now)
+
+        assert clock.is_market_open() is True
+        assert clock.get_clock().next_close == et(3, 16)
+
+        # Crossing the close boundary forces a clock refresh
+        client.get_clock.side_effect = RuntimeError("broker down")
+        now.now = et(3, 16, 5)
+        assert clock.is_market_open() is False
+        assert client.get_clock.call_count == 2
+
+    def test_unavailable_clock_reports_closed(self):
+        client = Mock()
+        client.get_clock.side_effect = RuntimeError("broker down")
+        clock = MarketClock(client, now=FakeTime(et(3, 10)))
+
+        assert clock.is_market_open() is False
+        with pytest.raises(RuntimeError):
+            clock.get_clock()
+
+    def test_timestamps_are_eastern_across_utc_midnight(self):
+        # 19:30 EST on Monday is already Tuesday in UTC
+        now = FakeTime(et(3, 19, 30))
+        assert now.now.date() == date(2025, 3, 4)
+        clock = MarketClock(make_client(now.now), now=now)
+
+        snapshot = clock.get_clock()
+        assert snapshot.timestamp.date() == date(2025, 3, 3)
+        assert snapshot.timestamp.utcoffset() == timedelta(hours=-5)
+        assert (snapshot.next_open.hour, snapshot.next_open.minute) == (9, 30)
+
+        now.now = et(3, 23, 59)
+        assert clock.get_clock().timestamp.date() == date(2025, 3, 3)
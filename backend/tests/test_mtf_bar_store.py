@@ -0,0 +1,138 @@
+"""
+Tests for the shared 1-minute store behind MTFDataManager: bulk multi-symbol
+fetches, incremental 5m/15m resampling, and per-(symbol, timeframe) freshness.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import timedelta
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trading.mtf.data_manager import MTFDataManager, resample_bars
+
+T0 = pd.Timestamp.now(tz='UTC').floor('h') - pd.Timedelta(hours=6)  # inside the kept 1-minute history
+
+
+def minute_frame(start, count, base=100.0):
+    index = pd.date_range(start, periods=count, freq='1min')
+    close = base + np.arange(count) * 0.1
+    return pd.DataFrame({
+        'open': close - 0.05, 'high': close + 0.2, 'low': close - 0.2,
+        'close': close, 'volume': np.full(count, 100.0), 'vwap': close,
+    }, index=index)
+
+
+def multi(frames):
+    return pd.concat(frames, names=['symbol', 'timestamp'])
+
+
+class BulkClient:
+    """Multi-symbol get_bars client serving minute bars up to `self.now`."""
+
+    def __init__(self, symbols, now=T0 + pd.Timedelta(minutes=60)):
+        self.history = {s: minute_frame(T0, 240, base=100.0 + k) for k, s in enumerate(symbols)}
+        self.now = now
+        self.calls = []
+
+    def get_bars(self, symbols, timeframe, start=None, end=None, limit=None):
+        self.calls.append((tuple(symbols), str(timeframe), start))
+        if 'Day' in str(timeframe):
+            days = pd.date_range('2025-01-01', periods=40, freq='D', tz='UTC')
+            frame = pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0}, index=days)
+            return multi({s: frame for s in symbols})
+        start = pd.Timestamp(start)
+        return multi({
+            s: self.history[s][(self.history[s].index >= start) & (self.history[s].index < self.now)]
+            for s in symbols
+        })
+
+
+def expire(manager):
+    """Age every freshness stamp past its interval."""
+    for key in manager.last_refresh:
+        manager.last_refresh[key] -= timedelta(days=2)
+
+
+class TestSharedMinuteStore:
+
+    def test_bulk_fetch_serves_every_timeframe(self):
+        symbols = ['AAPL', 'MSFT', 'NVDA']
+        client = BulkClient(symbols)
+        manager = MTFDataManager(alpaca_client=client)
+
+        manager.refresh_symbols(symbols)
+        data = {s: manager.fetch_all_timeframes(s) for s in symbols}
+
+        assert len(client.calls) == 2  # one 1-min request + one daily request for all symbols
+        assert all(set(d) == {'1min', '5min', '15min', 'daily'} for d in data.values())
+        assert len(data['MSFT']['5min']) == 12 and len(data['MSFT']['15min']) == 4
+
+    def test_freshness_is_tracked_per_symbol(self):
+        client = BulkClient(['AAPL', 'MSFT'])
+        manager = MTFDataManager(alpaca_client=client)
+
+        manager.fetch_all_timeframes('AAPL')
+        manager.fetch_all_timeframes('MSFT')
+
+        assert manager.get_cached_data('MSFT', '5min') is not None
+        assert {c[0] for c in client.calls} == {('AAPL',), ('MSFT',)}
+
+    def test_incremental_resample_matches_full_resample(self):
+        client = BulkClient(['AAPL'], now=T0 + pd.Timedelta(minutes=37))
+        manager = MTFDataManager(alpaca_client=client)
+        manager.fetch_all_timeframes('AAPL')
+
+        client.now = T0 + pd.Timedelta(minutes=71)
+        expire(manager)
+        manager.fetch_all_timeframes('AAPL')
+
+        minute = manager.minute_bars['AAPL']
+        assert len(minute) == 71
+        minute_calls = [c for c in client.calls if c[1] == '1Min']
+        assert minute_calls[-1][2] == T0 + pd.Timedelta(minutes=36)  # re-reads the last stored bar
+        for timeframe, minutes in (('5min', 5), ('15min', 15)):
+            pd.testing.assert_frame_equal(manager.get_cached_data('AAPL', timeframe), resample_bars(minute, minutes))
+
+    def test_lagging_symbols_get_their_own_request(self):
+        client = BulkClient(['AAPL', 'MSFT', 'HALT'], now=T0 + pd.Timedelta(minutes=200))
+        manager = MTFDataManager(alpaca_client=client)
+        manager.minute_bars = {
+            'AAPL': minute_frame(T0 + pd.Timedelta(minutes=150), 40),  # last bar T0+189
+            'MSFT': minute_frame(T0, 100),                             # last bar T0+99
+            'HALT': minute_frame(T0 - pd.Timedelta(days=3), 10),       # outside the kept history
+        }
+
+        refreshed = manager._refresh_minutes(['AAPL', 'MSFT', 'HALT'])
+
+        starts = {c[0]: c[2] for c in client.calls}
+        assert starts[('MSFT',)] == T0 + pd.Timedelta(minutes=99)
+        assert starts[('AAPL',)] == T0 + pd.Timedelta(minutes=189)
+        assert starts[('HALT',)] >= pd.Timestamp.now(tz='UTC') - pd.Timedelta(minutes=manager.minute_history + 1)
+        assert refreshed == {'AAPL', 'MSFT', 'HALT'}
+        assert manager.minute_bars['AAPL'].index[-1] == T0 + pd.Timedelta(minutes=199)
+
+    def test_failed_refresh_keeps_store(self):
+        client = BulkClient(['AAPL'])
+        manager = MTFDataManager(alpaca_client=client)
+        manager.fetch_all_timeframes('AAPL')
+
+        client.get_bars = lambda **kwargs: None
+        expire(manager)
+        data = manager.fetch_all_timeframes('AAPL')
+
+        assert len(data['5min']) == 12
+        assert manager._needs_refresh('1min', 'AAPL')
+
+    def test_resample_ohlcv(self):
+        bars = resample_bars(minute_frame(T0, 10), 5)
+
+        first = bars.iloc[0]
+        assert list(bars.index) == [T0, T0 + pd.Timedelta(minutes=5)]
+        assert first['open'] == pytest.approx(99.95) and first['close'] == pytest.approx(100.4)
+        assert first['high'] == pytest.approx(100.6) and first['low'] == pytest.approx(99.8)
+        assert first['volume'] == 500.0 and first['vwap'] == pytest.approx(100.2)
@@ -0,0 +1,290 @@
+"""
+Tests for the order mirror: trade-update events replace order polling while
+the stream is live, waits resolve on events, and REST stays as the fallback
+while the stream is down or quiet.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.alpaca_client import AlpacaClient
+from core.broker_snapshot import BrokerSnapshot
+from config import settings
+from core.order_mirror import OrderMirror, TERMINAL_STATUSES, wait_for_order_status, wait_for_order_update
+from streaming.trade_update_stream import FakeTradingStream, TradeUpdateStreamManager
+from trading.position_manager import PositionManager
+from trading.profit_protection.order_sequencer import OrderSequencer
+
+T0 = datetime(2025, 3, 3, 15, 0, tzinfo=timezone.utc)
+
+
+def make_order(status='new', order_id='o1', symbol='AAPL', seconds=0, filled_qty='0', price=None):
+    return SimpleNamespace(
+        id=order_id, symbol=symbol, status=status,
+        submitted_at=T0, updated_at=T0 + timedelta(seconds=seconds),
+        filled_qty=filled_qty, filled_avg_price=price,
+    )
+
+
+def make_mirror(client=None, live=True, **kwargs) -> OrderMirror:
+    client = client or Mock()
+    params = {'reconcile_seconds': 60, 'fallback_poll_seconds': 0.01}
+    params.update(kwargs)
+    mirror = OrderMirror(client, **params)
+    mirror.set_live_check(lambda: live)
+    return mirror
+
+
+def push(mirror, event, order):
+    return mirror.apply_update(SimpleNamespace(event=event, order=order))
+
+
+class TestOrderMirror:
+
+    def test_live_reads_are_served_from_events(self):
+        client = Mock()
+        client.get_order_by_id.return_value = make_order('new')
+        mirror = make_mirror(client)
+
+        mirror.get_order('o1')
+        push(mirror, 'partial_fill', make_order('partially_filled', seconds=1, filled_qty='5'))
+        push(mirror, 'fill', make_order('filled', seconds=2, filled_qty='10', price='100.5'))
+
+        for _ in range(20):
+            order = mirror.get_order('o1')
+        assert order.status == 'filled'
+        assert client.get_order_by_id.call_count == 1
+
+    def test_reads_hit_rest_when_stream_is_down(self):
+        client = Mock()
+        client.get_order_by_id.return_value = make_order('new')
+        mirror = make_mirror(client, live=False)
+
+        mirror.get_order('o1')
+        mirror.get_order('o1')
+
+        assert client.get_order_by_id.call_count == 2
+
+    def test_out_of_order_event_is_ignored(self):
+        mirror = make_mirror()
+        push(mirror, 'fill', make_order('filled', seconds=5))
+        push(mirror, 'new', make_order('new', seconds=1))
+
+        assert mirror.get_order('o1').status == 'filled'
+        assert mirror.stats['stale_events'] == 1
+
+    def test_wait_for_status_wakes_on_event(self):
+        mirror = make_mirror()
+        push(mirror, 'new', make_order('new'))
+        threading.Timer(0.05, push, (mirror, 'fill', make_order('filled', seconds=1))).start()
+
+        started = time.perf_counter()
+        order = mirror.wait_for_status('o1', TERMINAL_STATUSES, timeout=5)
+
+        assert order.status == 'filled'
+        assert time.perf_counter() - started < 1.0
+
+    def test_wait_times_out_with_latest_state(self):
+        mirror = make_mirror()
+        push(mirror, 'new', make_order('new'))
+
+        order = mirror.wait_for_status('o1', TERMINAL_STATUSES, timeout=0.05)
+
+        assert order.status == 'new'
+
+    def test_fallback_polls_until_canceled(self):
+        client = Mock()
+        client.get_order_by_id.side_effect = [make_order('pending_cancel'), make_order('pending_cancel'),
+                                              make_order('canceled', seconds=1)]
+        mirror = make_mirror(client, live=False)
+
+        order = mirror.wait_for_status('o1', TERMINAL_STATUSES, timeout=2)
+
+        assert order.status == 'canceled'
+        assert client.get_order_by_id.call_count == 3
+
+    def test_async_wait_resolves_from_event(self):
+        mirror = make_mirror()
+        push(mirror, 'new', make_order('new'))
+
+        async def scenario():
+            waiter = asyncio.create_task(mirror.wait_for_status_async('o1', TERMINAL_STATUSES, timeout=5))
+            await asyncio.sleep(0.01)
+            push(mirror, 'fill', make_order('filled', seconds=1))
+            return await waiter
+
+        assert asyncio.run(scenario()).status == 'filled'
+        assert mirror.get_stats()['async_waiters'] == 0
+
+    def test_get_orders_reconciles_on_schedule(self):
+        client = Mock()
+        client.get_orders.return_value = [make_order('new', 'o1', 'AAPL'), make_order('held', 'o2', 'MSFT')]
+        mirror = make_mirror(client)
+
+        mirror.get_orders()
+        push(mirror, 'canceled', make_order('canceled', 'o1', 'AAPL', seconds=1))
+        orders = mirror.get_orders(['AAPL'])
+
+        assert [(o.id, o.status) for o in orders] == [('o1', 'canceled')]
+        assert client.get_orders.call_count == 1
+
+    def test_reconnect_forces_reconciliation(self):
+        client = Mock()
+        client.get_orders.return_value = []
+        live = {'value': True}
+        mirror = make_mirror(client)
+        mirror.set_live_check(lambda: live['value'])
+
+        mirror.get_orders()
+        live['value'] = False
+        mirror.is_live()
+        live['value'] = True
+        mirror.get_orders()
+
+        assert client.get_orders.call_count == 2
+
+    def test_terminal_statuses(self):
+        assert {'filled', 'canceled', 'expired', 'rejected', 'replaced'} <= TERMINAL_STATUSES
+        assert 'partially_filled' not in TERMINAL_STATUSES
+
+
+class TestMirrorCallers:
+
+    def make_alpaca(self, client) -> AlpacaClient:
+        alpaca = AlpacaClient.__new__(AlpacaClient)
+        alpaca.trading_client = client
+        alpaca.broker_snapshot = BrokerSnapshot(client, ttl_seconds=60)
+        alpaca.order_mirror = make_mirror(client, on_change=alpaca._on_order_change)
+        return alpaca
+
+    def test_fill_event_invalidates_broker_snapshot(self):
+        client = Mock()
+        client.get_all_positions.return_value = []
+        alpaca = self.make_alpaca(client)
+
+        alpaca.get_positions()
+        push(alpaca.order_mirror, 'fill', make_order('filled'))
+        alpaca.get_positions()
+
+        assert client.get_all_positions.call_count == 2
+
+    def test_sequencer_waits_on_events_instead_of_polling(self):
+        client = Mock()
+        client.get_order_by_id.return_value = make_order('new')
+        alpaca = self.make_alpaca(client)
+        sequencer = OrderSequencer(alpaca)
+        threading.Timer(0.05, push, (alpaca.order_mirror, 'fill',
+                                     make_order('filled', seconds=1, filled_qty='10', price='101.0'))).start()
+
+        result = sequencer._wait_for_fill('o1', timeout=5)
+
+        assert result == {'filled': True, 'filled_qty': 10, 'avg_fill_price': 101.0, 'status': 'filled'}
+        assert client.get_order_by_id.call_count == 1
+
+    def test_sequencer_recognizes_alpaca_cancel_spelling(self):
+        client = Mock()
+        client.get_order_by_id.return_value = make_order('canceled')
+        sequencer = OrderSequencer(self.make_alpaca(client))
+
+        assert sequencer._wait_for_cancellation('o1', timeout=1) is True
+
+    def test_position_manager_waits_for_cancel_events(self):
+        client = Mock()
+        client.get_order_by_id.return_value = make_order('pending_cancel')
+        alpaca = Mock(order_mirror=make_mirror(client))
+        alpaca.get_orders.return_value = [SimpleNamespace(id='o1', symbol='AAPL', type=SimpleNamespace(value='market'),
+                                                          side=SimpleNamespace(value='sell'))]
+        alpaca.cancel_order.side_effect = lambda order_id: threading.Timer(
+            0.05, push, (alpaca.order_mirror, 'canceled', make_order('canceled', seconds=1))).start()
+        manager = PositionManager.__new__(PositionManager)
+        manager.alpaca = alpaca
+
+        started = time.perf_counter()
+        manager._cancel_all_symbol_orders('AAPL')
+
+        assert 0.05 <= time.perf_counter() - started < 1.0
+        assert alpaca.order_mirror.get_order('o1').status == 'canceled'
+
+
+class TestTradeUpdateStream:
+
+    def test_fake_stream_feeds_mirror(self):
+        client = Mock()
+        mirror = OrderMirror(client, reconcile_seconds=60, fallback_poll_seconds=0.01)
+
+        async def scenario():
+            stream = FakeTradingStream()
+            manager = TradeUpdateStreamManager(mirror, stream=stream)
+            await manager.start()
+            assert not manager.is_connected() and not mirror.is_live()
+
+            await stream.push('fill', make_order('filled'))
+            assert manager.is_connected() and mirror.is_live()
+            order = mirror.get_order('o1')
+
+            # Stream gone (run() returned): the mirror falls back to REST
+            stream.stop()
+            await asyncio.to_thread(manager._thread.join, 1.0)
+            assert not mirror.is_live()
+            await manager.stop()
+            return order, manager
+
+        order, manager = asyncio.run(scenario())
+        assert order.status == 'filled'
+        assert client.get_order_by_id.call_count == 0
+        assert not manager.is_running
+        assert manager.get_status()['mirror']['events'] == 1
+
+    def test_quiet_stream_falls_back_to_rest(self):
+        client = Mock()
+        client.get_order_by_id.return_value = make_order('new', seconds=1)
+        mirror = OrderMirror(client, reconcile_seconds=60, fallback_poll_seconds=0.01)
+
+        async def scenario():
+            stream = FakeTradingStream()
+            manager = TradeUpdateStreamManager(mirror, stream=stream, live_window_seconds=0.05)
+            await manager.start()
+            await stream.push('new', make_order('new'))
+            assert mirror.is_live()
+
+            await asyncio.sleep(0.1)
+            assert not manager.is_connected()
+            mirror.get_order('o1')
+            await manager.stop()
+
+        asyncio.run(scenario())
+        assert client.get_order_by_id.call_count == 1
+
+
+class TestWaitWithoutMirror:
+
+    def test_status_wait_polls_the_client(self):
+        client = Mock()
+        client.get_order.side_effect = [make_order('new'), make_order('filled')]
+
+        with patch.object(settings, 'order_mirror_fallback_poll_seconds', 0.01):
+            started = time.perf_counter()
+            order = wait_for_order_status(client, 'o1', TERMINAL_STATUSES, timeout=5)
+
+        assert order.status == 'filled'
+        assert time.perf_counter() - started < 1.0
+
+    def test_update_wait_returns_on_change(self):
+        client = Mock()
+        seen = make_order('new')
+        client.get_order.side_effect = [make_order('new'), make_order('partially_filled', filled_qty='5')]
+
+        with patch.object(settings, 'order_mirror_fallback_poll_seconds', 0.01):
+            order = wait_for_order_update(client, 'o1', seen, timeout=5)
+
+        assert order.filled_qty == '5'
+        assert client.get_order.call_count == 2
@@ -0,0 +1,131 @@
+"""
+Parity tests: vectorized panel features vs FeatureEngine.calculate_features.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from unittest.mock import Mock, patch
+from hypothesis import given, strategies as st, settings
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.features import FeatureEngine
+from data.market_data import MarketDataManager
+from data.panel_features import build_panel, calculate_panel_features
+from indicators.kernels import ewm
+from scanner.opportunity_scanner import OpportunityScanner
+from tests.test_incremental_features import make_bars, assert_features_match, run_stream
+
+
+def to_multi_index(frames: dict) -> pd.DataFrame:
+    """Build an Alpaca-style (symbol, timestamp) multi-index frame."""
+    return pd.concat(frames, names=['symbol', 'timestamp'])
+
+
+class TestPanelParity:
+
+    def test_ragged_multi_index_matches_per_symbol(self):
+        frames = {
+            'AAPL': make_bars(300, seed=1),
+            'MSFT': make_bars(40, seed=2),
+            'FLAT': make_bars(90, seed=3, flat_from=0, flat_len=30),
+            'NVDA': make_bars(26, seed=4),
+        }
+        result = calculate_panel_features(to_multi_index(frames))
+
+        assert set(result) == set(frames)
+        for symbol, df in frames.items():
+            assert_features_match(result[symbol], FeatureEngine.calculate_features(df.copy()))
+
+    @given(
+        lengths=st.lists(st.integers(min_value=1, max_value=120), min_size=1, max_size=6),
+        seed=st.integers(min_value=0, max_value=10_000),
+    )
+    @settings(max_examples=20, deadline=None)
+    def test_property_dict_input_matches_feature_engine(self, lengths, seed):
+        frames = {f"S{i}": make_bars(n, seed=seed + i) for i, n in enumerate(lengths)}
+        result = calculate_panel_features(frames)
+
+        for symbol, df in frames.items():
+            expected = FeatureEngine.calculate_features(df.copy())
+            if expected is None:
+                assert symbol not in result
+            else:
+                assert_features_match(result[symbol], expected)
+
+    def test_batch_and_incremental_emit_the_same_features(self):
+        frames = {'AAPL': make_bars(200, seed=5), 'FLAT': make_bars(120, seed=6, flat_from=60, flat_len=60)}
+        batch = calculate_panel_features(frames)
+
+        for symbol, df in frames.items():
+            state, _ = run_stream(df)
+            assert_features_match(state.features(), batch[symbol])
+
+    def test_custom_ema_periods(self):
+        df = make_bars(80, seed=9)
+        result = calculate_panel_features({'AAPL': df}, ema_short=5, ema_long=30)
+        assert_features_match(result['AAPL'], FeatureEngine.calculate_features(df.copy(), 5, 30))
+
+    def test_batch_ewm_matches_pandas_with_gaps(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(3, 50))
+        values[0, :10] = np.nan
+        values[1, 20:25] = np.nan
+        values[2, ::7] = np.nan
+
+        out = ewm(values, 1.0 / 14)
+        for row in range(3):
+            expected = pd.Series(values[row]).ewm(alpha=1.0 / 14, adjust=False).mean()
+            np.testing.assert_allclose(out[row], expected.to_numpy(), rtol=1e-12, equal_nan=True)
+
+
+class TestBuildPanel:
+
+    def test_right_aligned_with_symbol_subset_order(self):
+        frames = {'AAPL': make_bars(5, seed=1), 'MSFT': make_bars(3, seed=2)}
+        panel = build_panel(to_multi_index(frames), symbols=['MSFT', 'AAPL', 'TSLA'])
+
+        assert panel.symbols == ['MSFT', 'AAPL']
+        assert list(panel.lengths) == [3, 5]
+        assert np.isnan(panel.close[0, :2]).all()
+        np.testing.assert_array_equal(panel.close[0, 2:], frames['MSFT']['close'].to_numpy())
+        np.testing.assert_array_equal(panel.mask[0], [False, False, True, True, True])
+
+    def test_empty_input(self):
+        assert build_panel({}).symbols == []
+        assert calculate_panel_features(pd.DataFrame()) == {}
+
+
+class TestBatchConsumers:
+
+    def test_update_all_features_uses_batch_when_incremental_disabled(self):
+        frames = {'AAPL': make_bars(60, seed=1), 'MSFT': make_bars(60, seed=2)}
+        alpaca = Mock()
+        alpaca.get_bars.return_value = to_multi_index(frames)
+        manager = MarketDataManager(alpaca, Mock())
+
+        with patch('data.market_data.settings.incremental_features_enabled', False):
+            manager.update_all_features(['AAPL', 'MSFT'])
+
+        published = {c.args[0]['symbol']: c.args[0] for c in manager.supabase.queue_features.call_args_list}
+        assert set(published) == {'AAPL', 'MSFT'}
+        assert published['MSFT']['rsi'] == pytest.approx(
+            FeatureEngine.calculate_features(frames['MSFT'].copy())['rsi'], rel=1e-9
+        )
+        assert manager.indicator_states == {}
+
+    def test_scanner_fetches_all_symbols_in_one_request(self):
+        frames = {'AAPL': make_bars(60, seed=1), 'MSFT': make_bars(20, seed=2)}
+        market_data = Mock()
+        market_data.fetch_historical_bars.return_value = frames
+
+        scanner = OpportunityScanner.__new__(OpportunityScanner)
+        scanner.market_data = market_data
+        features = scanner._calculate_scan_features(['AAPL', 'MSFT'])
+
+        market_data.fetch_historical_bars.assert_called_once_with(['AAPL', 'MSFT'], days=1)
+        assert list(features) == ['AAPL']
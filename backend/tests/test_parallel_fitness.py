@@ -0,0 +1,88 @@
+"""
+Tests for parallel fitness evaluation in ParameterOptimizer: a process-pool
+run matches the serial run for the same seed, and the result reports the
+evaluation count and speedup.
+"""
+
+import random
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from optimization import FitnessCalculator, OptimizationIntegration
+from optimization.models import MOMENTUM_PARAMETERS
+from optimization.optimizer import ParameterOptimizer
+from optimization.parallel import PopulationEvaluator
+from tests.test_backtest import random_walk_bars
+
+
+def noisy_backtest(params):
+    """Stochastic backtest (like run_optimization's mock): only reproducible when seeded."""
+    edge = params.get('volume_threshold', 1.5) - 1.5
+    return [{'pnl': random.gauss(50 + 100 * edge, 200), 'return': 0.0} for _ in range(40)]
+
+
+def failing_backtest(params):
+    raise RuntimeError("no data")
+
+
+class TestPopulationEvaluator:
+
+    def test_scores_whole_population(self):
+        population = np.array([[1.2, 0.5], [1.8, 0.5], [1.5, 0.7]])
+        names = ['volume_threshold', 'evaluation_profit_r']
+
+        with PopulationEvaluator(names, noisy_backtest, FitnessCalculator(), workers=1, seed=7) as serial:
+            serial_scores = serial(population)
+        with PopulationEvaluator(names, noisy_backtest, FitnessCalculator(), workers=2, seed=7) as parallel:
+            parallel_scores = parallel(population)
+
+        np.testing.assert_array_equal(serial_scores, parallel_scores)
+        assert serial.evaluations == parallel.evaluations == 3
+
+    def test_failed_backtest_scores_worst(self):
+        with PopulationEvaluator(['x'], failing_backtest, FitnessCalculator()) as evaluator:
+            assert np.isinf(evaluator(np.array([[1.0], [2.0]]))).all()
+
+    def test_serial_run_leaves_optimizer_random_state(self):
+        np.random.seed(3)
+        expected = np.random.rand()
+        np.random.seed(3)
+
+        with PopulationEvaluator(['volume_threshold'], noisy_backtest, FitnessCalculator(), seed=1) as evaluator:
+            evaluator(np.array([[1.5]]))
+
+        assert np.random.rand() == expected
+
+
+class TestParallelOptimizer:
+
+    @pytest.mark.parametrize('algorithm', ['PSO', 'GA'])
+    def test_parallel_matches_serial_for_same_seed(self, algorithm):
+        runs = [
+            ParameterOptimizer(algorithm=algorithm, population_size=6, max_iterations=3, workers=workers, seed=11)
+            .optimize(MOMENTUM_PARAMETERS, noisy_backtest)
+            for workers in (1, 3)
+        ]
+
+        assert runs[0].best_parameters == runs[1].best_parameters
+        assert runs[0].best_fitness == runs[1].best_fitness
+        assert runs[0].convergence_history == runs[1].convergence_history
+        assert (runs[0].workers, runs[1].workers) == (1, 3)
+
+    def test_reports_evaluations_and_speedup(self):
+        engine = OptimizationIntegration().create_backtest_function(random_walk_bars(symbols=2, days=5))
+        optimizer = ParameterOptimizer(algorithm="PSO", population_size=4, max_iterations=2, workers=2, seed=1)
+
+        result = optimizer.optimize(MOMENTUM_PARAMETERS, engine)
+
+        assert result.evaluations == 4 * 3  # Initial population plus one per iteration
+        assert result.evaluation_seconds > 0 and result.speedup > 0
+        assert result.to_dict()['speedup'] == result.speedup
+        for name, (low, high) in MOMENTUM_PARAMETERS.items():
+            assert low <= result.best_parameters[name] <= high
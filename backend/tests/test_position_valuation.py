@@ -0,0 +1,125 @@
+"""
+Tests for the position valuation engine: O(1) marks, R-multiples, portfolio
+exposure and daily P&L anchored to the broker account.
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.position_valuation import PositionValuation
+from core.state import Position, TradingState
+
+
+def make_position(symbol='AAPL', side='buy', qty=10, entry=100.0, stop=95.0):
+    return Position(symbol=symbol, qty=qty, side=side, avg_entry_price=entry, current_price=entry,
+                    unrealized_pl=0.0, unrealized_pl_pct=0.0, market_value=entry * qty,
+                    stop_loss=stop, take_profit=entry * 1.1, entry_time=datetime(2025, 3, 3))
+
+
+def make_valuation(*positions, capacity=64):
+    state = TradingState()
+    for position in positions:
+        state.update_position(position)
+    return state, PositionValuation(state=state, capacity=capacity, publish_interval=0)
+
+
+class TestMarks:
+
+    def test_long_mark(self):
+        _, valuation = make_valuation(make_position('AAPL'))
+
+        mark = valuation.mark('AAPL', 110.0)
+
+        assert (mark.unrealized_pl, mark.unrealized_pl_pct, mark.market_value) == (100.0, 10.0, 1100.0)
+        assert mark.r_multiple == pytest.approx(2.0)
+        assert valuation.get_price('AAPL') == 110.0
+
+    def test_short_mark(self):
+        _, valuation = make_valuation(make_position('TSLA', side='sell', stop=105.0))
+
+        mark = valuation.mark('TSLA', 97.5)
+
+        assert (mark.unrealized_pl, mark.market_value) == (25.0, -975.0)
+        assert mark.r_multiple == pytest.approx(0.5)
+
+    def test_r_multiple_uses_initial_risk_after_stop_trails(self):
+        state, valuation = make_valuation(make_position('AAPL', stop=95.0))
+        assert valuation.mark('AAPL', 105.0).r_multiple == pytest.approx(1.0)
+
+        for trailed_stop in (99.9, 100.1):
+            state.update_position(make_position('AAPL', stop=trailed_stop))
+            mark = valuation.mark('AAPL', 105.0)
+            assert mark.stop_loss == trailed_stop
+            assert mark.r_multiple == pytest.approx(1.0)
+
+    def test_unknown_symbol_is_not_marked(self):
+        _, valuation = make_valuation()
+
+        assert valuation.mark('AAPL', 100.0) is None
+        assert valuation.get_mark('AAPL') is None
+
+    def test_stale_marks_are_not_served(self):
+        _, valuation = make_valuation(make_position('AAPL'))
+        valuation.mark('AAPL', 101.0)
+
+        assert valuation.get_price('AAPL', max_age=60) == 101.0
+        assert valuation.get_price('AAPL', max_age=-1) is None
+
+    def test_slots_grow_past_capacity(self):
+        symbols = [f'S{i}' for i in range(5)]
+        _, valuation = make_valuation(*(make_position(s) for s in symbols), capacity=2)
+
+        for symbol in symbols:
+            valuation.mark(symbol, 101.0)
+
+        assert valuation.stats()['positions'] == 5
+        assert valuation.portfolio().unrealized_pl == pytest.approx(50.0)
+
+
+class TestPortfolio:
+
+    def test_exposure(self):
+        _, valuation = make_valuation(
+            make_position('AAPL', qty=10), make_position('TSLA', side='sell', qty=5, stop=105.0)
+        )
+        valuation.mark('AAPL', 110.0)
+        valuation.mark('TSLA', 90.0)
+
+        portfolio = valuation.portfolio()
+
+        assert (portfolio.long_exposure, portfolio.short_exposure) == (1100.0, 450.0)
+        assert (portfolio.gross_exposure, portfolio.net_exposure) == (1550.0, 650.0)
+        assert portfolio.unrealized_pl == pytest.approx(150.0)
+        assert portfolio.equity is None and portfolio.daily_pl is None
+
+    def test_daily_pl_moves_with_marks_after_anchor(self):
+        state, valuation = make_valuation(make_position('AAPL'))
+        valuation.mark('AAPL', 100.0)
+        valuation.set_account(equity=10_000.0, last_equity=10_000.0)
+
+        valuation.mark('AAPL', 90.0)
+        portfolio = valuation.portfolio()
+
+        assert (portfolio.equity, portfolio.daily_pl, portfolio.daily_pl_pct) == (9_900.0, -100.0, -1.0)
+        assert state.get_metrics().daily_pl == -100.0
+
+    def test_closing_a_position_realizes_instead_of_moving_equity(self):
+        state, valuation = make_valuation(make_position('AAPL'), make_position('MSFT'))
+        valuation.set_account(equity=10_000.0, last_equity=10_000.0)
+        valuation.mark('AAPL', 110.0)
+
+        state.update_position(make_position('AAPL', qty=4))  # Partial exit
+        valuation.mark('AAPL', 110.0)
+        assert valuation.portfolio().equity == pytest.approx(10_100.0)
+
+        state.remove_position('AAPL')
+        portfolio = valuation.portfolio()
+        assert portfolio.positions == 1
+        assert portfolio.equity == pytest.approx(10_100.0)
+        assert portfolio.long_exposure == pytest.approx(1000.0)
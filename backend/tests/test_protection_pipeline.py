@@ -0,0 +1,164 @@
+"""
+Tests for the single-pass protection pipeline: one order read per pass,
+rules only propose actions, at most one broker action per symbol, and drift
+repair through StopLossProtectionManager.sync_stop_loss.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.state import trading_state, Position
+from trading.protection_pipeline import ActionKind, ProtectionPipeline, aggressive_trail_stop
+from trading.stop_loss_protection import StopLossProtectionManager
+
+
+def make_position(symbol='AAPL', side='buy', entry=100.0, price=100.0, stop=98.0, target=106.0):
+    sign = 1 if side == 'buy' else -1
+    pnl_pct = sign * (price - entry) / entry * 100
+    return Position(
+        symbol=symbol, qty=10, side=side, avg_entry_price=entry, current_price=price,
+        unrealized_pl=pnl_pct * entry * 10 / 100, unrealized_pl_pct=pnl_pct,
+        market_value=price * 10, stop_loss=stop, take_profit=target, entry_time=datetime(2025, 3, 3, 15, 0),
+    )
+
+
+def make_stop_order(symbol='AAPL', stop=98.0, order_id='stop1', status='new'):
+    return SimpleNamespace(id=order_id, symbol=symbol, stop_price=str(stop),
+                           type=SimpleNamespace(value='stop'), status=SimpleNamespace(value=status))
+
+
+def make_pipeline(orders, trailing=None, partial=None):
+    alpaca = Mock()
+    alpaca.get_orders.return_value = orders
+    alpaca.replace_order.return_value = SimpleNamespace(id='stop2')
+
+    position_manager = Mock()
+    position_manager.regime_manager = None
+    position_manager.trailing_stop_manager.update_trailing_stop.return_value = trailing or {'updated': False}
+    position_manager.profit_taker.should_take_partial_profits.return_value = partial or {'should_take': False}
+    position_manager.close_position.return_value = True
+
+    protection_manager = StopLossProtectionManager(alpaca)
+    protection_manager.create_stop_loss = Mock(return_value=True)
+    return ProtectionPipeline(alpaca, position_manager, protection_manager)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    trading_state.clear_positions()
+    trading_state.features.clear()
+    yield
+    trading_state.clear_positions()
+    trading_state.features.clear()
+
+
+class TestProtectionPipeline:
+
+    def test_single_order_read_for_all_positions(self):
+        for symbol in ('AAPL', 'MSFT', 'NVDA'):
+            trading_state.update_position(make_position(symbol))
+        pipeline = make_pipeline([make_stop_order(s, order_id=s) for s in ('AAPL', 'MSFT', 'NVDA')])
+
+        result = pipeline.run()
+
+        assert result == {'actions': [], 'closed': []}
+        pipeline.alpaca.get_orders.assert_called_once_with(status='all', symbols=['AAPL', 'MSFT', 'NVDA'])
+        pipeline.position_manager.update_position_prices.assert_called_once_with(evaluate_rules=False)
+
+    def test_competing_stop_moves_collapse_into_one_replace(self):
+        # 2% up: aggressive trail wants 100.98, ATR trail wants 100.50, tracked stop wants 99.00
+        trading_state.update_position(make_position(price=102.0, stop=99.0))
+        pipeline = make_pipeline([make_stop_order(stop=98.0)],
+                                 trailing={'updated': True, 'new_stop': 100.5})
+
+        result = pipeline.run()
+
+        pipeline.alpaca.replace_order.assert_called_once_with(order_id='stop1', stop_price=100.98)
+        [action] = result['actions']
+        assert action.rule == 'aggressive_trailing'
+        assert trading_state.get_position('AAPL').stop_loss == 100.98
+        pipeline.position_manager.persist_position.assert_called_once()
+
+    def test_partial_exit_suppresses_stop_replace(self):
+        trading_state.update_position(make_position(price=104.0))
+        pipeline = make_pipeline([make_stop_order()],
+                                 partial={'should_take': True, 'percentage': 0.5, 'profit_r': 2.0})
+
+        result = pipeline.run()
+
+        assert [a.kind for a in result['actions']] == [ActionKind.PARTIAL_EXIT]
+        pipeline.position_manager.execute_partial_profit_taking.assert_called_once()
+        pipeline.alpaca.replace_order.assert_not_called()
+
+    def test_missing_stop_is_created_once_per_cooldown(self):
+        trading_state.update_position(make_position(price=102.0))
+        pipeline = make_pipeline([SimpleNamespace(id='tp', symbol='AAPL', stop_price=None,
+                                                  type=SimpleNamespace(value='limit'),
+                                                  status=SimpleNamespace(value='new'))])
+
+        first = pipeline.run()
+        second = pipeline.run()
+
+        assert [a.kind for a in first['actions']] == [ActionKind.CREATE_STOP]
+        assert second['actions'] == []
+        pipeline.protection_manager.create_stop_loss.assert_called_once()
+        pipeline.alpaca.replace_order.assert_not_called()
+
+    def test_position_without_orders_exits_through_stop(self):
+        trading_state.update_position(make_position('TSLA', side='sell', entry=200.0, price=205.0,
+                                                    stop=204.0, target=190.0))
+        pipeline = make_pipeline([])
+
+        result = pipeline.run()
+
+        assert result['closed'] == ['TSLA']
+        pipeline.position_manager.close_position.assert_called_once_with('TSLA', 'emergency_stop')
+        pipeline.protection_manager.create_stop_loss.assert_not_called()
+
+    def test_drift_syncs_held_bracket_leg(self):
+        trading_state.update_position(make_position(price=100.2, stop=99.0))
+        pipeline = make_pipeline([make_stop_order(stop=98.0, status='held')])
+
+        [action] = pipeline.run()['actions']
+
+        assert action.rule == 'stop_drift'
+        pipeline.alpaca.replace_order.assert_called_once_with(order_id='stop1', stop_price=99.0)
+        pipeline.position_manager.persist_position.assert_not_called()
+
+    def test_rejected_drift_sync_is_not_reported(self):
+        trading_state.update_position(make_position(price=100.2, stop=99.0))
+        pipeline = make_pipeline([make_stop_order(stop=98.0)])
+        pipeline.alpaca.replace_order.return_value = None
+
+        assert pipeline.run()['actions'] == []
+
+    def test_closed_orders_do_not_protect(self):
+        trading_state.update_position(make_position(price=97.0))
+        pipeline = make_pipeline([make_stop_order(stop=98.0, status='canceled')])
+
+        result = pipeline.run()
+
+        assert result['closed'] == ['AAPL']
+        pipeline.alpaca.replace_order.assert_not_called()
+
+    def test_stop_never_loosens(self):
+        trading_state.update_position(make_position(price=102.0, stop=99.0))
+        pipeline = make_pipeline([make_stop_order(stop=101.5)],
+                                 trailing={'updated': True, 'new_stop': 100.5})
+
+        assert pipeline.run()['actions'] == []
+        pipeline.alpaca.replace_order.assert_not_called()
+
+    def test_aggressive_trail_stop(self):
+        assert aggressive_trail_stop(100.0, 100.3, 0.3, True) is None
+        assert aggressive_trail_stop(100.0, 100.7, 0.7, True) == 100.1
+        assert aggressive_trail_stop(100.0, 103.0, 3.0, True) == 101.97
+        assert aggressive_trail_stop(100.0, 97.0, 3.0, False) == 97.97
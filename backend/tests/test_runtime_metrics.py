@@ -0,0 +1,128 @@
+"""
+Tests for runtime instrumentation: event-loop lag, loop iteration timing,
+per-method call latency and gauges.
+"""
+
+import asyncio
+import time
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.runtime_metrics import LatencyStats, RuntimeMetrics
+from streaming.broadcaster import StreamingBroadcaster
+
+
+class FakeClient:
+    def get_account(self):
+        time.sleep(0.01)
+        return 'account'
+
+    def cancel_order(self, order_id):
+        raise RuntimeError(f"cannot cancel {order_id}")
+
+    def _private(self):
+        return 'untouched'
+
+
+class TestLatencyStats:
+
+    def test_percentiles_over_window(self):
+        stats = LatencyStats(window=100)
+        for ms in range(1, 101):
+            stats.record(ms / 1000)
+
+        summary = stats.summary()
+        assert summary['count'] == 100
+        assert summary['p50_ms'] == pytest.approx(51, abs=1)
+        assert summary['p95_ms'] == pytest.approx(95, abs=1)
+        assert summary['max_ms'] == pytest.approx(100)
+
+    def test_lifetime_max_survives_window(self):
+        stats = LatencyStats(window=3)
+        stats.record(5.0)
+        for _ in range(3):
+            stats.record(0.001)
+
+        summary = stats.summary()
+        assert summary['max_ms'] == pytest.approx(5000)
+        assert summary['window_max_ms'] == pytest.approx(1)
+
+    def test_empty_summary(self):
+        summary = LatencyStats().summary()
+        assert summary['count'] == 0
+        assert summary['p95_ms'] == 0.0
+        assert summary['seconds_since_last'] is None
+
+
+class TestRuntimeMetrics:
+
+    def test_instrument_records_each_public_method(self):
+        metrics = RuntimeMetrics()
+        client = metrics.instrument(FakeClient(), 'alpaca')
+
+        assert client.get_account() == 'account'
+        with pytest.raises(RuntimeError):
+            client.cancel_order('abc')
+        assert client._private() == 'untouched'
+
+        calls = metrics.snapshot()['calls']
+        assert set(calls) == {'alpaca.get_account', 'alpaca.cancel_order'}
+        assert calls['alpaca.get_account']['count'] == 1
+        assert calls['alpaca.get_account']['last_ms'] >= 10
+        assert calls['alpaca.cancel_order']['errors'] == 1
+
+    def test_loop_iterations_are_tracked_per_loop(self):
+        metrics = RuntimeMetrics()
+        metrics.record_loop_iteration('position_monitor', 0.2)
+        metrics.record_loop_iteration('position_monitor', 0.4)
+        metrics.record_loop_iteration('strategy', 1.0)
+
+        loops = metrics.snapshot()['loops']
+        assert loops['position_monitor']['count'] == 2
+        assert loops['position_monitor']['max_ms'] == pytest.approx(400)
+        assert loops['strategy']['p50_ms'] == pytest.approx(1000)
+
+    def test_lag_monitor_detects_blocking_call(self):
+        metrics = RuntimeMetrics(lag_interval=0.05)
+
+        async def run():
+            metrics.start_lag_monitor()
+            await asyncio.sleep(0.1)
+            time.sleep(0.3)  # blocks the loop
+            await asyncio.sleep(0.1)
+            await metrics.stop_lag_monitor()
+
+        asyncio.run(run())
+        lag = metrics.snapshot()['event_loop_lag']
+        assert lag['count'] >= 2
+        assert lag['max_ms'] >= 200
+
+    def test_gauges_report_current_and_peak(self):
+        metrics = RuntimeMetrics()
+        depth = {'value': 7}
+        metrics.register_gauge('queue', lambda: depth['value'])
+        metrics.sample_gauges()
+        depth['value'] = 2
+
+        gauges = metrics.snapshot()['gauges']
+        assert gauges['queue'] == {'current': 2.0, 'peak': 7.0}
+
+    def test_failing_gauge_is_skipped(self):
+        metrics = RuntimeMetrics()
+        metrics.register_gauge('broken', lambda: 1 / 0)
+        assert metrics.snapshot()['gauges'] == {}
+
+    def test_broadcaster_queue_depth_gauge(self):
+        async def run():
+            broadcaster = StreamingBroadcaster()
+            metrics = RuntimeMetrics()
+            metrics.register_gauge('broadcaster_queue_depth', broadcaster.queue_depth)
+            for i in range(3):
+                await broadcaster.enqueue({'type': 'quote', 'i': i})
+            return metrics.snapshot()['gauges']['broadcaster_queue_depth']
+
+        assert asyncio.run(run())['current'] == 3
@@ -0,0 +1,198 @@
+"""
+Tests for concurrent stop-update batches: symbols update in parallel under a
+concurrency bound, broker stops move before tracked stops and are amended with
+replace_order, and the sequencer still serializes work per symbol.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trading.profit_protection.intelligent_stop_manager import IntelligentStopManager
+from trading.profit_protection.order_sequencer import OrderSequencer, SequenceResult
+from trading.profit_protection.position_state_tracker import PositionStateTracker
+from trading.profit_protection.profit_protection_manager import ProfitProtectionManager
+
+
+class SlowSequencer:
+    """Records concurrency of execute_stop_update calls, each taking `delay` seconds."""
+
+    def __init__(self, delay=0.1, success=True):
+        self.delay = delay
+        self.success = success
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def execute_stop_update(self, symbol, new_stop):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append((symbol, new_stop))
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return SequenceResult(success=self.success, message="ok" if self.success else "rejected",
+                              sequence_id="SEQ", operations_completed=[], conflicts_detected=[])
+
+
+def make_manager(sequencer, symbols=10) -> IntelligentStopManager:
+    manager = IntelligentStopManager(Mock(), sequencer=sequencer)
+    manager.tracker = PositionStateTracker()
+    for k in range(symbols):
+        symbol = f"SYM{k}"
+        manager.tracker.track_position(symbol, entry_price=100.0, stop_loss=98.0, quantity=10, side='long')
+        manager.tracker.update_current_price(symbol, 106.0)  # 3R -> trail at 1.5R
+    return manager
+
+
+def stop_order(order_id='stop1'):
+    return SimpleNamespace(id=order_id, order_type='stop', side='sell', status='new')
+
+
+class TestBatchUpdates:
+
+    def test_symbols_update_concurrently_within_bound(self):
+        sequencer = SlowSequencer(delay=0.1)
+        manager = make_manager(sequencer)
+
+        started = time.perf_counter()
+        results = manager.execute_batch_updates(max_concurrent=5)
+        elapsed = time.perf_counter() - started
+
+        assert len(results) == 10 and all(r.success for r in results.values())
+        assert sequencer.peak == 5
+        assert elapsed < 0.6  # serial would take >= 1.0s
+        assert sorted(sequencer.calls)[0] == ('SYM0', 103.0)
+        assert manager.tracker.get_position_state('SYM3').stop_loss == 103.0
+
+    def test_broker_failure_is_reported(self):
+        manager = make_manager(SlowSequencer(delay=0, success=False), symbols=2)
+
+        results = manager.execute_batch_updates()
+
+        assert not any(r.success for r in results.values())
+        assert all('rejected' in r.message for r in results.values())
+        assert manager.tracker.get_position_state('SYM0').stop_loss == 98.0
+
+    def test_failed_broker_update_is_retried_next_batch(self):
+        sequencer = SlowSequencer(delay=0, success=False)
+        manager = make_manager(sequencer, symbols=1)
+        manager.execute_batch_updates()
+
+        sequencer.success = True
+        results = manager.execute_batch_updates()
+
+        assert results['SYM0'].success
+        assert sequencer.calls == [('SYM0', 103.0)] * 2
+        assert manager.tracker.get_position_state('SYM0').stop_loss == 103.0
+
+    def test_max_concurrent_sizes_the_pool(self):
+        sequencer = SlowSequencer(delay=0.1)
+        manager = make_manager(sequencer, symbols=8)
+
+        manager.execute_batch_updates(max_concurrent=8)
+
+        assert sequencer.peak == 8
+
+    def test_no_updates_needed(self):
+        sequencer = SlowSequencer(delay=0)
+        manager = make_manager(sequencer, symbols=0)
+
+        assert manager.execute_batch_updates() == {}
+        assert sequencer.calls == []
+
+    def test_async_batch(self):
+        sequencer = SlowSequencer(delay=0.1)
+        manager = make_manager(sequencer, symbols=6)
+
+        results = asyncio.run(manager.execute_batch_updates_async(max_concurrent=3))
+
+        assert len(results) == 6
+        assert sequencer.peak <= 3
+
+
+class TestMonitoringLoop:
+
+    def test_monitor_moves_broker_stops_through_the_batch(self):
+        sequencer = SlowSequencer(delay=0)
+        protection = ProfitProtectionManager.__new__(ProfitProtectionManager)
+        protection.stop_manager = make_manager(sequencer, symbols=3)
+
+        protection._check_stop_updates()
+
+        assert sorted(sequencer.calls) == [(f'SYM{k}', 103.0) for k in range(3)]
+
+
+class TestSequencerReplace:
+
+    def make_alpaca(self):
+        alpaca = Mock()
+        alpaca.get_orders.return_value = [stop_order()]
+        alpaca.replace_order.return_value = SimpleNamespace(id='stop2', status='new')
+        alpaca.get_order.return_value = SimpleNamespace(id='stop2', status='new')
+        return alpaca
+
+    def test_existing_stop_is_replaced_in_place(self):
+        alpaca = self.make_alpaca()
+
+        result = OrderSequencer(alpaca).execute_stop_update('AAPL', 103.456)
+
+        assert result.success
+        assert 'replace_existing_stop' in result.operations_completed
+        alpaca.replace_order.assert_called_once_with('stop1', stop_price=103.46)
+        alpaca.cancel_order.assert_not_called()
+        alpaca.submit_order.assert_not_called()
+
+    def test_held_bracket_leg_counts_as_active(self):
+        alpaca = self.make_alpaca()
+        alpaca.get_order.return_value = SimpleNamespace(id='stop2', status='held')
+
+        assert OrderSequencer(alpaca).execute_stop_update('AAPL', 103.0).success
+
+    def test_rejected_replace_falls_back_to_cancel_and_recreate(self):
+        alpaca = self.make_alpaca()
+        alpaca.replace_order.return_value = None
+        alpaca.get_order.side_effect = [SimpleNamespace(status='canceled'), SimpleNamespace(status='new')]
+        alpaca.get_position.return_value = SimpleNamespace(qty='10')
+        alpaca.submit_order.return_value = SimpleNamespace(id='stop3')
+
+        result = OrderSequencer(alpaca).execute_stop_update('AAPL', 103.0)
+
+        assert result.success
+        assert result.operations_completed[:2] == ['query_orders', 'replace_existing_stop']
+        alpaca.cancel_order.assert_called_once_with('stop1')
+        alpaca.submit_order.assert_called_once()
+
+    def test_same_symbol_updates_are_serialized(self):
+        alpaca = self.make_alpaca()
+        active = {'now': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def slow_replace(order_id, stop_price):
+            with lock:
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+            time.sleep(0.05)
+            with lock:
+                active['now'] -= 1
+            return SimpleNamespace(id='stop2', status='new')
+
+        alpaca.replace_order.side_effect = slow_replace
+        sequencer = OrderSequencer(alpaca)
+        threads = [threading.Thread(target=sequencer.execute_stop_update, args=('AAPL', 100.0 + i)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert alpaca.replace_order.call_count == 4
+        assert active['peak'] == 1
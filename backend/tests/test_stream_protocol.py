@@ -0,0 +1,157 @@
+"""
+Tests for the streaming snapshot/delta protocol: version-gated diffs,
+sequenced deltas, cached snapshots and resuming clients.
+"""
+
+import asyncio
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.state import Position, TradingState
+from streaming.broadcaster import StreamingBroadcaster
+from streaming.state_sync import StateSync, diff_state
+from tests.test_broadcaster import FakeWebSocket
+
+
+def make_position(symbol, price):
+    return Position(symbol=symbol, qty=10, side='buy', avg_entry_price=100.0, current_price=price,
+                    unrealized_pl=(price - 100.0) * 10, unrealized_pl_pct=price - 100.0,
+                    market_value=price * 10, stop_loss=95.0, take_profit=110.0, entry_time=datetime(2025, 3, 3))
+
+
+def make_sync(state, **kwargs):
+    def build():
+        return {
+            'positions': [{'symbol': p.symbol, 'current_price': p.current_price} for p in state.get_all_positions()],
+            'orders': [],
+            'metrics': {'equity': state.get_metrics().equity},
+        }
+    return StateSync(state_builder=build, version=lambda: state.version, **kwargs)
+
+
+class TestDiff:
+
+    def test_upserts_removals_and_changed_metrics(self):
+        before = {'positions': [{'symbol': 'AAPL', 'p': 1}, {'symbol': 'MSFT', 'p': 2}], 'metrics': {'equity': 1, 'cash': 2}}
+        after = {'positions': [{'symbol': 'AAPL', 'p': 3}, {'symbol': 'NVDA', 'p': 4}], 'metrics': {'equity': 1, 'cash': 5}}
+
+        assert diff_state(before, after) == {
+            'positions': {'upsert': [{'symbol': 'AAPL', 'p': 3}, {'symbol': 'NVDA', 'p': 4}], 'remove': ['MSFT']},
+            'metrics': {'cash': 5},
+        }
+        assert diff_state(after, after) == {}
+
+
+class TestStateSync:
+
+    def test_deltas_follow_state_versions(self):
+        state = TradingState()
+        sync = make_sync(state)
+        calls = []
+        builder = sync.state_builder
+        sync.state_builder = lambda: calls.append(1) or builder()
+
+        assert sync.poll()['seq'] == 1  # Initial state
+        assert sync.poll() is None and len(calls) == 1  # Unchanged version: not re-serialized
+
+        state.update_position(make_position('AAPL', 101.0))
+        delta = sync.poll()
+        assert delta['seq'] == 2 and delta['positions']['upsert'] == [{'symbol': 'AAPL', 'current_price': 101.0}]
+
+        state.update_position(make_position('AAPL', 101.0))  # Version moves, content does not
+        assert sync.poll() is None and sync.seq == 2
+
+        state.remove_position('AAPL')
+        assert sync.poll()['positions'] == {'upsert': [], 'remove': ['AAPL']}
+
+    def test_resume_returns_missed_deltas(self):
+        state = TradingState()
+        sync = make_sync(state, history=3)
+        for price in (101.0, 102.0, 103.0, 104.0):
+            state.update_position(make_position('AAPL', price))
+            sync.poll()
+
+        assert [d['seq'] for d in sync.deltas_since(sync.epoch, 2)] == [3, 4]
+        assert sync.deltas_since(sync.epoch, 4) == []
+        assert [d["seq"] for d in sync.deltas_since(sync.epoch, 1)] == [2, 3, 4]
+        assert sync.deltas_since(sync.epoch, 0) is None  # Older than the history
+        assert sync.deltas_since('other-epoch', 3) is None
+        assert sync.deltas_since(sync.epoch, 9) is None
+
+    def test_snapshot_extras_built_once_for_concurrent_clients(self):
+        state = TradingState()
+        builds = []
+        sync = make_sync(state, extras_builder=lambda: builds.append(1) or {'logs': ['x']})
+
+        async def run():
+            sync.poll()  # The broadcaster's flush
+            return await asyncio.gather(*(sync.snapshot() for _ in range(10)))
+
+        snapshots = asyncio.run(run())
+
+        assert len(builds) == 1
+        assert snapshots[0] == {'logs': ['x'], 'positions': [], 'orders': [], 'metrics': {'equity': 0},
+                                'epoch': sync.epoch, 'seq': 1}
+
+
+class TestBroadcasterIntegration:
+
+    def test_clients_get_snapshot_then_deltas_and_resume(self):
+        state = TradingState()
+        sync = make_sync(state)
+
+        async def run():
+            broadcaster = StreamingBroadcaster(flush_interval=1)
+            await broadcaster.start(state_sync=sync)
+            broadcaster.flush()  # Initial state, seq 1
+            first = FakeWebSocket()
+            await broadcaster.connect(first)
+            state.update_position(make_position('AAPL', 101.0))
+            broadcaster.flush()
+            await asyncio.sleep(0)
+
+            resumed = FakeWebSocket()
+            await broadcaster.connect(resumed, epoch=sync.epoch, since=1)
+            fresh = FakeWebSocket()
+            await broadcaster.connect(fresh, epoch='stale', since=1)
+            await asyncio.sleep(0)
+            await broadcaster.stop()
+            return first, resumed, fresh
+
+        first, resumed, fresh = asyncio.run(run())
+
+        snapshot, delta = first.sent[0][0], first.sent[1][0]
+        assert snapshot['type'] == 'snapshot' and snapshot['payload']['seq'] == 1
+        assert delta['type'] == 'delta' and delta['seq'] == 2
+        assert resumed.sent == [[delta]]
+        assert fresh.sent[0][0]['payload']['seq'] == 2
+
+    def test_connecting_client_does_not_swallow_a_delta(self):
+        state = TradingState()
+        sync = make_sync(state)
+
+        async def run():
+            broadcaster = StreamingBroadcaster(flush_interval=1)
+            await broadcaster.start(state_sync=sync)
+            broadcaster.flush()
+            first = FakeWebSocket()
+            await broadcaster.connect(first)
+
+            state.update_position(make_position('AAPL', 101.0))  # Changes while the next client connects
+            second = FakeWebSocket()
+            await broadcaster.connect(second)
+            broadcaster.flush()
+            await asyncio.sleep(0)
+            await broadcaster.stop()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        for client in (first, second):
+            snapshot, delta = client.sent[0][0], client.sent[1][0]
+            assert snapshot['payload']['seq'] == 1
+            assert delta['seq'] == 2 and delta['positions']['upsert'][0]['symbol'] == 'AAPL'
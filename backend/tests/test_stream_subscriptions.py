@@ -0,0 +1,106 @@
+"""
+Tests for stream subscription diffing: only the symbols that changed are
+subscribed/unsubscribed, the set stays under the symbol cap, and pinned
+symbols (open positions) stay subscribed.
+"""
+
+import asyncio
+from unittest.mock import patch
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from streaming.stream_manager import StreamManager, cap_symbols
+
+
+class FakeStockStream:
+    def __init__(self):
+        self.calls = []
+
+    def subscribe(self, symbols, data_types=None):
+        self.calls.append(('subscribe', list(symbols)))
+
+    def unsubscribe(self, symbols, data_types=None):
+        self.calls.append(('unsubscribe', list(symbols)))
+
+
+def running_manager(symbols):
+    manager = StreamManager()
+    manager.stock_stream = FakeStockStream()
+    manager.is_running = True
+    manager._symbols = list(symbols)
+    return manager
+
+
+class TestUpdateSubscriptions:
+
+    def test_only_the_difference_is_sent(self):
+        manager = running_manager(['AAPL', 'MSFT', 'TSLA'])
+
+        changes = asyncio.run(manager.update_subscriptions(['AAPL', 'NVDA', 'AMD']))
+
+        assert changes == {'added': ['NVDA', 'AMD'], 'removed': ['MSFT', 'TSLA']}
+        assert manager.stock_stream.calls == [('subscribe', ['NVDA', 'AMD']), ('unsubscribe', ['MSFT', 'TSLA'])]
+        assert manager.get_symbols() == ['AAPL', 'NVDA', 'AMD']
+
+    def test_unchanged_watchlist_is_a_no_op(self):
+        manager = running_manager(['AAPL', 'MSFT'])
+
+        changes = asyncio.run(manager.update_subscriptions(['MSFT', 'AAPL']))
+
+        assert changes == {'added': [], 'removed': []}
+        assert manager.stock_stream.calls == []
+        assert manager.subscription_updates == 0
+
+    def test_open_positions_stay_subscribed(self):
+        manager = running_manager(['AAPL', 'MSFT'])
+
+        changes = asyncio.run(manager.update_subscriptions(['NVDA'], keep=['MSFT']))
+
+        assert changes == {'added': ['NVDA'], 'removed': ['AAPL']}
+        assert set(manager.get_symbols()) == {'NVDA', 'MSFT'}
+
+    def test_not_running_only_records_symbols(self):
+        manager = StreamManager()
+        manager.stock_stream = FakeStockStream()
+
+        asyncio.run(manager.update_subscriptions(['AAPL']))
+
+        # Subscribed on start/reconnect instead
+        assert manager.stock_stream.calls == []
+        assert manager.get_symbols() == ['AAPL']
+
+    def test_failed_subscribe_keeps_previous_symbols(self):
+        manager = running_manager(['AAPL'])
+
+        def fail(symbols, data_types=None):
+            raise RuntimeError("socket closed")
+        manager.stock_stream.subscribe = fail
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(manager.update_subscriptions(['AAPL', 'NVDA']))
+        assert manager.get_symbols() == ['AAPL']
+
+    def test_watchlist_is_capped_with_positions_pinned(self):
+        manager = running_manager(['AAPL', 'MSFT'])
+        watchlist = [f'W{i}' for i in range(50)]
+
+        with patch.object(settings, 'stream_max_symbols', 5):
+            changes = asyncio.run(manager.update_subscriptions(watchlist, keep=['MSFT', 'TSLA']))
+
+        assert manager.get_symbols() == ['MSFT', 'TSLA', 'W0', 'W1', 'W2']
+        assert changes == {'added': ['TSLA', 'W0', 'W1', 'W2'], 'removed': ['AAPL']}
+
+
+class TestCapSymbols:
+
+    def test_positions_survive_past_the_cap(self):
+        assert cap_symbols(['A', 'B', 'C'], keep=['X', 'Y', 'Z'], max_symbols=2) == ['X', 'Y', 'Z']
+
+    def test_duplicates_count_once(self):
+        assert cap_symbols(['A', 'B', 'A', 'C'], keep=['B'], max_symbols=3) == ['B', 'A', 'C']
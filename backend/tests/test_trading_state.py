@@ -0,0 +1,157 @@
+"""
+Tests for TradingState: copy-on-write snapshots, per-collection versions,
+atomic position marks and the bounded log ring.
+"""
+
+import sys
+import os
+import threading
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.state import Position, TradingState
+
+
+def make_position(symbol='AAPL', side='buy', price=100.0, qty=10):
+    return Position(symbol=symbol, qty=qty, side=side, avg_entry_price=100.0, current_price=price,
+                    unrealized_pl=0.0, unrealized_pl_pct=0.0, market_value=price * qty,
+                    stop_loss=95.0, take_profit=110.0, entry_time=datetime(2025, 3, 3))
+
+
+class TestSnapshots:
+
+    def test_reader_snapshot_is_unaffected_by_later_writes(self):
+        state = TradingState()
+        state.update_position(make_position('AAPL'))
+        snapshot = state.get_all_positions()
+
+        state.update_position(make_position('MSFT'))
+        state.update_position_price('AAPL', 105.0)
+
+        assert [p.symbol for p in snapshot] == ['AAPL']
+        assert snapshot[0].current_price == 100.0
+        assert {p.symbol for p in state.get_all_positions()} == {'AAPL', 'MSFT'}
+
+    def test_snapshot_is_not_copied_per_read(self):
+        state = TradingState()
+        state.update_position(make_position())
+
+        assert state.get_all_positions() is state.get_all_positions()
+        assert isinstance(state.get_all_positions(), tuple)
+
+    def test_metrics_are_replaced_not_mutated(self):
+        state = TradingState()
+        before = state.get_metrics()
+
+        state.update_metrics(equity=1000.0, not_a_metric=1)
+
+        assert before.equity == 0
+        assert state.get_metrics().equity == 1000.0
+
+    def test_frozen_slotted_records(self):
+        position = make_position()
+        with pytest.raises(FrozenInstanceError):
+            position.stop_loss = 90.0
+        assert not hasattr(position, '__dict__')
+
+
+class TestVersions:
+
+    def test_collections_version_independently(self):
+        state = TradingState()
+        state.update_position(make_position())  # Also moves open_positions
+        assert (state.positions_version, state.metrics_version, state.orders_version) == (1, 1, 0)
+
+        state.update_position_price('AAPL', 101.0)  # Same position count
+        assert (state.positions_version, state.metrics_version) == (2, 1)
+
+        state.add_log('INFO', 'hello')
+        assert state.logs_version == 1
+        assert state.version == 3  # Logs are not part of the live-state version
+
+        state.remove_position('AAPL')
+        assert state.get_metrics().open_positions == 0 and state.metrics_version == 2
+
+
+class TestPositionMarks:
+
+    def test_long_and_short_marks(self):
+        state = TradingState()
+        state.update_position(make_position('AAPL', side='buy'))
+        state.update_position(make_position('TSLA', side='sell'))
+
+        long_mark = state.update_position_price('AAPL', 102.0)
+        short_mark = state.update_position_price('TSLA', 102.0)
+
+        assert (long_mark.unrealized_pl, long_mark.unrealized_pl_pct, long_mark.market_value) == (20.0, 2.0, 1020.0)
+        assert (short_mark.unrealized_pl, short_mark.unrealized_pl_pct, short_mark.market_value) == (-20.0, -2.0, -1020.0)
+        assert state.get_position('AAPL') is long_mark
+
+    def test_field_update_keeps_marks_made_after_the_read(self):
+        state = TradingState()
+        state.update_position(make_position('AAPL'))
+
+        stale = state.get_position('AAPL')  # Writer reads, then waits on a broker round-trip
+        state.update_position_price('AAPL', 104.0)  # Quote lands meanwhile
+        updated = state.update_position_fields(stale.symbol, stop_loss=99.0, take_profit=112.0)
+
+        assert (updated.current_price, updated.unrealized_pl) == (104.0, 40.0)
+        assert (updated.stop_loss, updated.take_profit) == (99.0, 112.0)
+        assert state.get_position('AAPL') is updated
+        with pytest.raises(AttributeError):
+            stale.stop_loss = 90.0
+
+    def test_qty_change_re_marks(self):
+        state = TradingState()
+        state.update_position(make_position('AAPL'))
+        state.update_position_price('AAPL', 110.0)
+
+        updated = state.update_position_fields('AAPL', qty=4)
+
+        assert (updated.unrealized_pl, updated.market_value) == (40.0, 440.0)
+        assert state.update_position_fields('MSFT', stop_loss=1.0) is None
+
+    def test_mark_without_position_is_a_no_op(self):
+        state = TradingState()
+
+        assert state.update_position_price('AAPL', 101.0) is None
+        assert state.update_position_price('AAPL', 0) is None
+        assert state.positions_version == 0
+
+    def test_concurrent_marks_keep_every_position(self):
+        state = TradingState()
+        symbols = [f'S{i}' for i in range(20)]
+        for symbol in symbols:
+            state.update_position(make_position(symbol))
+
+        def mark(symbol):
+            for tick in range(200):
+                state.update_position_price(symbol, 100.0 + tick / 100)
+
+        threads = [threading.Thread(target=mark, args=(s,)) for s in symbols]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(state.get_all_positions()) == 20
+        assert all(p.current_price == pytest.approx(101.99) for p in state.get_all_positions())
+
+
+class TestLogRing:
+
+    def test_keeps_the_newest_entries(self):
+        state = TradingState()
+        for i in range(state.max_logs + 250):
+            state.add_log('INFO', f'line {i}')
+
+        assert len(state.get_logs(limit=0)) == state.max_logs
+        assert [log.message for log in state.get_logs(limit=2)] == [
+            f'line {state.max_logs + 248}', f'line {state.max_logs + 249}'
+        ]
+        assert state.get_logs(limit=5000)[0].message == 'line 250'
@@ -0,0 +1,88 @@
+"""
+Tests for rolling walk-forward optimization: fold boundaries, fold windows
+over one precomputed engine, parallel/serial agreement and persistence.
+"""
+
+import json
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from optimization import BacktestEngine, ResultsLogger, WalkForwardRunner, WalkForwardValidator
+from optimization.models import MOMENTUM_PARAMETERS
+from optimization.optimizer import ParameterOptimizer
+from tests.test_backtest import random_walk_bars
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return BacktestEngine(random_walk_bars(symbols=2, days=12))
+
+
+def runner(workers, **kwargs):
+    optimizer = ParameterOptimizer(algorithm="PSO", population_size=4, max_iterations=1, seed=3)
+    return WalkForwardRunner(optimizer=optimizer, n_folds=3, workers=workers, **kwargs)
+
+
+class TestRollingFolds:
+
+    def test_test_windows_tile_the_end(self):
+        folds = WalkForwardValidator(train_ratio=0.7).rolling_folds(20, 5)
+
+        assert len(folds) == 5 and folds[-1][2] == 20
+        for (train_start, test_start, test_end), following in zip(folds, folds[1:] + [None]):
+            assert train_start < test_start < test_end
+            if following:
+                assert following[1] == test_end
+
+    def test_short_data_reduces_folds(self):
+        validator = WalkForwardValidator()
+
+        assert len(validator.rolling_folds(3, 5)) == 2
+        assert validator.rolling_folds(1, 5) == []
+
+
+class TestWalkForwardRunner:
+
+    def test_folds_are_windows_of_one_engine(self, engine):
+        windows = runner(1).fold_windows(engine)
+        days = engine.sessions()
+
+        assert len(windows) == 3
+        assert windows[0][1] == days[0] and windows[-1][3] is None
+        result = runner(1).run(MOMENTUM_PARAMETERS, engine)
+        for fold, (_, _, test_start, test_end) in zip(result.folds, windows):
+            entries = [np.datetime64(t['entry_time'][:10]) for t in fold.out_sample_trades]
+            assert all(e >= np.datetime64(int(test_start), 'D') for e in entries)
+            if test_end is not None:
+                assert all(e < np.datetime64(int(test_end), 'D') for e in entries)
+
+    def test_parallel_folds_match_serial(self, engine):
+        serial = runner(1).run(MOMENTUM_PARAMETERS, engine)
+        parallel = runner(3).run(MOMENTUM_PARAMETERS, engine)
+
+        assert parallel.workers == 3 and serial.workers == 1
+        assert serial.robust_parameters == parallel.robust_parameters
+        assert serial.out_sample_metrics == parallel.out_sample_metrics
+        assert [f.to_dict()['validation'] for f in serial.folds] == [f.to_dict()['validation'] for f in parallel.folds]
+        for name, (low, high) in MOMENTUM_PARAMETERS.items():
+            assert low <= serial.robust_parameters[name] <= high
+
+    def test_results_are_saved(self, engine, tmp_path):
+        results_logger = ResultsLogger(results_dir=str(tmp_path))
+
+        result = runner(2, results_logger=results_logger).run(MOMENTUM_PARAMETERS, engine)
+
+        saved = json.loads(next(tmp_path.glob("walk_forward_*.json")).read_text())
+        assert len(saved['folds']) == 3 and saved['overfit_folds'] == result.overfit_folds
+        assert 'Robust Parameters' in results_logger.generate_walk_forward_summary(result)
+
+    def test_too_little_data(self):
+        short = BacktestEngine(random_walk_bars(symbols=1, days=1))
+
+        assert runner(1).run(MOMENTUM_PARAMETERS, short) is None
@@ -0,0 +1,136 @@
+"""
+Tests for the Supabase write-behind queue: upserts coalesce per key, inserts
+are sent in bulk, and buffered rows are bounded.
+"""
+
+import logging
+import time
+from unittest.mock import Mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.supabase_client import SupabaseClient, WriteBehindQueue
+from core.supabase_log_handler import SupabaseLogHandler
+from data.market_data import MarketDataManager
+
+
+def make_queue(**kwargs) -> WriteBehindQueue:
+    params = {'flush_interval': 60, 'batch_size': 100, 'max_pending': 1000}
+    params.update(kwargs)
+    return WriteBehindQueue(Mock(), **params)
+
+
+def requests_for(client, method: str):
+    """[(rows, kwargs)] for each upsert/insert request built."""
+    return [(call.args[0], call.kwargs) for call in getattr(client.table.return_value, method).call_args_list]
+
+
+class TestWriteBehindQueue:
+
+    def test_upserts_coalesce_to_latest_per_symbol(self):
+        queue = make_queue()
+        for price in (100.0, 101.0, 102.0):
+            queue.upsert('features', {'symbol': 'AAPL', 'price': price, 'rsi': 50.0})
+        queue.upsert('features', {'symbol': 'MSFT', 'price': 300.0, 'rsi': 40.0})
+
+        assert queue.pending() == 2
+        queue.flush()
+
+        upserts = requests_for(queue.client, 'upsert')
+        assert len(upserts) == 1
+        rows, kwargs = upserts[0]
+        assert {r['symbol']: r['price'] for r in rows} == {'AAPL': 102.0, 'MSFT': 300.0}
+        assert kwargs == {'on_conflict': 'symbol'}
+        assert queue.stats['coalesced_upserts'] == 2
+
+    def test_partial_upsert_merges_into_pending_row(self):
+        queue = make_queue()
+        queue.upsert('features', {'symbol': 'AAPL', 'price': 100.0, 'rsi': 55.0})
+        queue.upsert('features', {'symbol': 'AAPL', 'price': 101.0})
+        queue.flush()
+
+        rows, _ = requests_for(queue.client, 'upsert')[0]
+        assert rows == [{'symbol': 'AAPL', 'price': 101.0, 'rsi': 55.0}]
+
+    def test_rows_with_different_columns_are_not_mixed(self):
+        queue = make_queue()
+        queue.upsert('features', {'symbol': 'AAPL', 'price': 100.0, 'rsi': 55.0})
+        queue.upsert('features', {'symbol': 'TSLA', 'price': 250.0})
+        queue.flush()
+
+        assert len(requests_for(queue.client, 'upsert')) == 2
+
+    def test_inserts_are_batched(self):
+        queue = make_queue(batch_size=50)
+        for i in range(120):
+            queue.insert('market_data', {'symbol': 'AAPL', 'close': i})
+
+        assert queue.flush() == 120
+        sizes = [len(rows) for rows, _ in requests_for(queue.client, 'insert')]
+        assert sizes == [50, 50, 20]
+
+    def test_bounded_memory_drops_oldest(self):
+        queue = make_queue(max_pending=10)
+        queue.insert('logs', [{'n': i} for i in range(15)])
+
+        assert queue.pending() == 10
+        assert queue.stats['dropped_rows'] == 5
+        queue.flush()
+        rows, _ = requests_for(queue.client, 'insert')[0]
+        assert rows[0] == {'n': 5}
+
+    def test_failed_flush_is_counted_and_does_not_raise(self):
+        queue = make_queue()
+        queue.client.table.return_value.insert.return_value.execute.side_effect = RuntimeError("503")
+        queue.insert('logs', {'message': 'hi'})
+
+        assert queue.flush() == 0
+        assert queue.stats['failed_rows'] == 1
+        assert queue.pending() == 0
+
+    def test_background_thread_flushes_on_interval(self):
+        queue = make_queue(flush_interval=0.05)
+        queue.insert('logs', {'message': 'hi'})
+
+        deadline = time.time() + 2
+        while queue.stats['written_rows'] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert queue.stats['written_rows'] == 1
+        queue.close()
+
+    def test_close_flushes_pending(self):
+        queue = make_queue()
+        queue.upsert('features', {'symbol': 'AAPL', 'price': 1.0})
+        queue.close()
+        assert queue.stats['written_rows'] == 1
+
+
+class TestHotPathCallers:
+
+    def test_stream_updates_use_write_behind(self):
+        supabase = Mock(spec=SupabaseClient)
+        manager = MarketDataManager(Mock(), supabase)
+
+        for close in (100.0, 100.5):
+            manager.apply_stream_bar('AAPL', {'open': close, 'high': close, 'low': close,
+                                              'close': close, 'volume': 1000})
+
+        assert supabase.queue_features.call_count == 2
+        assert supabase.queue_bars.call_count == 2
+        supabase.upsert_features.assert_not_called()
+        supabase.insert_bars.assert_not_called()
+
+    def test_log_handler_queues_rows(self):
+        supabase = Mock(spec=SupabaseClient)
+        handler = SupabaseLogHandler(supabase)
+
+        handler.emit(logging.LogRecord('trading.engine', logging.INFO, __file__, 1, 'hello', None, None))
+        handler.emit(logging.LogRecord('core.supabase_client', logging.WARNING, __file__, 1, 'flush failed', None, None))
+
+        supabase.queue_log.assert_called_once()
+        assert supabase.queue_log.call_args.args[0]['component'] == 'trading'
+        supabase.insert_log.assert_not_called()
@@ -2,21 +2,62 @@
 Multi-Timeframe Data Manager.
 
 Manages fetching and caching of market data across multiple timeframes.
-Implements efficient caching with appropriate refresh intervals.
+All intraday timeframes come from one shared 1-minute store: the store is
+filled with multi-symbol requests (incrementally, from each symbol's last bar)
+and 5-min/15-min bars are resampled locally as new 1-minute bars arrive.
+Daily bars are fetched in one multi-symbol request per day.
 
 Requirements: 1.1, 1.2, 1.3, 1.4
 """
 
 import pandas as pd
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Set
 from dataclasses import dataclass, field
 import logging
 
 from alpaca.data.timeframe import TimeFrame
 
+from data.bulk_bars import split_bars_by_symbol
+
 logger = logging.getLogger(__name__)
 
+# Intraday timeframes and their width in minutes
+INTRADAY_MINUTES = {'1min': 1, '5min': 5, '15min': 15}
+
+# Known symbols whose last stored bars lie within this span share one request
+MINUTE_START_GROUP = timedelta(minutes=30)
+
+# OHLCV aggregation when resampling 1-minute bars
+RESAMPLE_AGG = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum',
+    'trade_count': 'sum',
+}
+
+
+def resample_bars(minute_bars: pd.DataFrame, minutes: int) -> pd.DataFrame:
+    """Aggregate 1-minute bars into N-minute bars labelled by bucket start (like Alpaca's own)."""
+    if minutes == 1 or minute_bars.empty:
+        return minute_bars
+
+    agg = {col: how for col, how in RESAMPLE_AGG.items() if col in minute_bars.columns}
+    resampler = minute_bars.resample(f'{minutes}min', label='left', closed='left')
+    bars = resampler.agg(agg)
+
+    if 'vwap' in minute_bars.columns and 'volume' in minute_bars.columns:
+        # Volume-weighted average of the minute VWAPs
+        dollar_volume = (minute_bars['vwap'] * minute_bars['volume']).resample(
+            f'{minutes}min', label='left', closed='left'
+        ).sum()
+        bars['vwap'] = dollar_volume / bars['volume'].where(bars['volume'] > 0)
+
+    return bars.dropna(subset=['close'])
+
 
 @dataclass
 class CacheEntry:
@@ -30,22 +71,29 @@ class CacheEntry:
 @dataclass
 class MTFDataManager:
     """Manages multi-timeframe market data fetching and caching.
-    
+
     Requirements:
     - 1.1: Fetch historical bars for 1-min, 5-min, 15-min, and daily timeframes
     - 1.2: Refresh 5-min every 5 min, 15-min every 15 min, daily once per day
     - 1.3: Cache data efficiently to minimize API calls
     - 1.4: Use cached data on fetch failures
     """
-    
+
     alpaca_client: object  # AlpacaClient instance
-    
-    # Cache storage: {symbol: {timeframe: CacheEntry}}
+
+    # Per-timeframe views served to callers: {symbol: {timeframe: CacheEntry}}
     cache: Dict[str, Dict[str, CacheEntry]] = field(default_factory=dict)
-    
-    # Last refresh timestamps per timeframe
-    last_refresh: Dict[str, datetime] = field(default_factory=dict)
-    
+
+    # Last refresh timestamps, keyed by (symbol, timeframe).
+    # A bare timeframe key is the batch refresh time from refresh_timeframe().
+    last_refresh: Dict[object, datetime] = field(default_factory=dict)
+
+    # Shared 1-minute store all intraday timeframes are built from: {symbol: bars}
+    minute_bars: Dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    # Broker requests issued (for status/debugging)
+    api_calls: int = 0
+
     # Refresh intervals in seconds
     REFRESH_INTERVALS: Dict[str, int] = field(default_factory=lambda: {
         '1min': 60,      # 1 minute
@@ -53,7 +101,7 @@ class MTFDataManager:
         '15min': 900,    # 15 minutes
         'daily': 86400,  # 24 hours (refresh once per day)
     })
-    
+
     # Lookback periods for each timeframe
     LOOKBACK_BARS: Dict[str, int] = field(default_factory=lambda: {
         '1min': 100,   # ~1.5 hours of 1-min bars
@@ -61,198 +109,353 @@ class MTFDataManager:
         '15min': 100,  # ~25 hours of 15-min bars
         'daily': 60,   # 60 days of daily bars
     })
-    
+
     # Alpaca TimeFrame mapping
-    # Note: For 5min and 15min, we use TimeFrame.Minute and fetch more bars
-    # then resample, as Alpaca SDK doesn't support custom minute intervals directly
+    # Note: 5min and 15min are not requested at all - they are resampled
+    # from the shared 1-minute store
     TIMEFRAME_MAP: Dict[str, TimeFrame] = field(default_factory=lambda: {
         '1min': TimeFrame.Minute,
-        '5min': TimeFrame.Minute,   # Fetch 1-min bars and resample
-        '15min': TimeFrame.Minute,  # Fetch 1-min bars and resample
+        '5min': TimeFrame.Minute,   # Resampled from the 1-min store
+        '15min': TimeFrame.Minute,  # Resampled from the 1-min store
         'daily': TimeFrame.Day,
     })
 
-    
-    def _needs_refresh(self, timeframe: str) -> bool:
-        """Check if a timeframe needs to be refreshed.
-        
+    _lock: RLock = field(default_factory=RLock, repr=False)
+
+    @property
+    def minute_history(self) -> int:
+        """1-minute bars kept per symbol: enough to build every intraday lookback."""
+        return max(self.LOOKBACK_BARS[tf] * minutes for tf, minutes in INTRADAY_MINUTES.items())
+
+    def _needs_refresh(self, timeframe: str, symbol: Optional[str] = None) -> bool:
+        """Check if a timeframe needs to be refreshed (for one symbol, or the batch key).
+
         Requirement 1.2: Refresh intervals per timeframe.
         """
-        if timeframe not in self.last_refresh:
+        key = (symbol, timeframe) if symbol else timeframe
+        if key not in self.last_refresh:
+            return True
+
+        now = datetime.now(timezone.utc)
+        last = self.last_refresh[key]
+        if timeframe == 'daily' and last.date() != now.date():
             return True
-        
-        elapsed = (datetime.now(timezone.utc) - self.last_refresh[timeframe]).total_seconds()
+        elapsed = (now - last).total_seconds()
         return elapsed >= self.REFRESH_INTERVALS.get(timeframe, 60)
-    
+
     def _get_cached_data(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
         """Get cached data for a symbol and timeframe.
-        
+
         Requirement 1.3: Efficient caching.
         """
         if symbol in self.cache and timeframe in self.cache[symbol]:
             entry = self.cache[symbol][timeframe]
             return entry.data
         return None
-    
+
     def _update_cache(self, symbol: str, timeframe: str, data: pd.DataFrame) -> None:
         """Update cache with new data."""
         if symbol not in self.cache:
             self.cache[symbol] = {}
-        
+
+        now = datetime.now(timezone.utc)
         self.cache[symbol][timeframe] = CacheEntry(
             data=data,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=now,
             symbol=symbol,
             timeframe=timeframe,
         )
-    
+        self.last_refresh[(symbol, timeframe)] = now
+
+    def _fetch_bars(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame,
+        start: datetime,
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch bars for many symbols: one multi-symbol request when the client
+        supports it (AlpacaClient.get_bars), otherwise one request per symbol.
+
+        Raises on API failure so callers can fall back to cached data.
+        """
+        if hasattr(self.alpaca_client, 'get_bars'):
+            self.api_calls += 1
+            bars = self.alpaca_client.get_bars(symbols=symbols, timeframe=timeframe, start=start)
+            if bars is None:  # AlpacaClient logs and returns None on failure
+                raise RuntimeError("bar request failed")
+            return split_bars_by_symbol(bars, symbols)
+
+        result = {}
+        for symbol in symbols:
+            self.api_calls += 1
+            bars = self.alpaca_client.get_bars_for_symbol(symbol=symbol, timeframe=timeframe, start=start)
+            if bars is not None and not bars.empty:
+                result[symbol] = bars
+        return result
+
+    def _refresh_minutes(self, symbols: Iterable[str]) -> Set[str]:
+        """Bring the 1-minute store up to date for symbols and update their
+        intraday views. Known symbols are fetched from their last stored bar
+        (re-reading it, in case it was still forming), grouped so symbols with
+        nearby last bars share a request; new symbols and symbols whose last
+        bar is older than the kept history (halted, stale) get the full
+        history window. One request per group, so a single lagging symbol
+        never widens the fetch for the others.
+
+        Returns:
+            Symbols whose store was refreshed (failures keep their old data)
+        """
+        with self._lock:
+            window_start = datetime.now(timezone.utc) - timedelta(minutes=self.minute_history)
+            last_bars = {s: self.minute_bars[s].index[-1] for s in symbols if s in self.minute_bars}
+            full = [s for s in symbols if s not in last_bars or last_bars[s] < window_start]
+
+            groups = []
+            for symbol in sorted((s for s in last_bars if s not in full), key=last_bars.get):
+                if groups and last_bars[symbol] - groups[-1][1] <= MINUTE_START_GROUP:
+                    groups[-1][0].append(symbol)
+                else:
+                    groups.append(([symbol], last_bars[symbol]))
+            if full:
+                groups.append((full, window_start))
+
+            refreshed = set()
+            for group, start in groups:
+                try:
+                    fetched = self._fetch_bars(group, TimeFrame.Minute, start)
+                except Exception as e:
+                    logger.error(f"Failed to fetch 1min data for {len(group)} symbols: {e}")
+                    continue
+
+                for symbol in group:
+                    bars = fetched.get(symbol)
+                    if bars is not None and not bars.empty:
+                        self._append_minutes(symbol, bars)
+                    elif symbol not in self.minute_bars:
+                        logger.warning(f"No data returned for {symbol} 1min")
+                        continue
+                    else:
+                        self._sync_views(symbol, since=None)
+                    refreshed.add(symbol)
+
+            return refreshed
+
+    def _append_minutes(self, symbol: str, bars: pd.DataFrame) -> None:
+        """Merge new 1-minute bars into the store and update derived views."""
+        bars = bars.sort_index()
+        first_new = bars.index[0]
+
+        existing = self.minute_bars.get(symbol)
+        if existing is not None:
+            bars = pd.concat([existing[existing.index < first_new], bars])
+        bars = bars[~bars.index.duplicated(keep='last')]
+
+        self.minute_bars[symbol] = bars.iloc[-self.minute_history:]
+        self._sync_views(symbol, since=first_new)
+
+    def _sync_views(self, symbol: str, since: Optional[pd.Timestamp]) -> None:
+        """Update the symbol's intraday views from the 1-minute store.
+
+        Only buckets at or after `since` are re-aggregated; views that do not
+        exist yet are built in full. since=None means no new bars arrived.
+        """
+        minute = self.minute_bars[symbol]
+        now = datetime.now(timezone.utc)
+
+        for timeframe, minutes in INTRADAY_MINUTES.items():
+            view = self._get_cached_data(symbol, timeframe)
+            if view is not None and since is None:
+                self.last_refresh[(symbol, timeframe)] = now
+                continue
+
+            if minutes == 1:
+                bars = minute
+            elif view is None:
+                bars = resample_bars(minute, minutes)
+            else:
+                bucket = since.floor(f'{minutes}min')
+                bars = pd.concat([
+                    view[view.index < bucket],
+                    resample_bars(minute[minute.index >= bucket], minutes),
+                ])
+            self._update_cache(symbol, timeframe, bars.iloc[-self.LOOKBACK_BARS[timeframe]:])
+
+    def _refresh_daily(self, symbols: Iterable[str]) -> Set[str]:
+        """Fetch daily bars for symbols in one request.
+
+        Returns:
+            Symbols whose daily bars were refreshed
+        """
+        with self._lock:
+            symbols = list(symbols)
+            start = datetime.now(timezone.utc) - timedelta(days=self.LOOKBACK_BARS['daily'])
+            try:
+                fetched = self._fetch_bars(symbols, TimeFrame.Day, start)
+            except Exception as e:
+                logger.error(f"Failed to fetch daily data for {len(symbols)} symbols: {e}")
+                return set()
+
+            for symbol in symbols:
+                if symbol not in fetched:
+                    logger.warning(f"No data returned for {symbol} daily")
+                    continue
+                self._update_cache(symbol, 'daily', fetched[symbol].iloc[-self.LOOKBACK_BARS['daily']:])
+            return set(fetched) & set(symbols)
+
     def _fetch_timeframe_data(
-        self, 
-        symbol: str, 
+        self,
+        symbol: str,
         timeframe: str,
         use_cache_on_failure: bool = True
     ) -> Optional[pd.DataFrame]:
         """Fetch data for a single timeframe.
-        
+
+        Intraday timeframes refresh the shared 1-minute store for the symbol.
+
         Requirement 1.4: Fallback to cached data on fetch failures.
         """
-        try:
-            tf = self.TIMEFRAME_MAP.get(timeframe)
-            if tf is None:
-                logger.error(f"Unknown timeframe: {timeframe}")
-                return self._get_cached_data(symbol, timeframe) if use_cache_on_failure else None
-            
-            lookback = self.LOOKBACK_BARS.get(timeframe, 100)
-            
-            # Calculate start time based on timeframe
-            if timeframe == 'daily':
-                start = datetime.now(timezone.utc) - timedelta(days=lookback)
-            elif timeframe == '15min':
-                start = datetime.now(timezone.utc) - timedelta(minutes=lookback * 15)
-            elif timeframe == '5min':
-                start = datetime.now(timezone.utc) - timedelta(minutes=lookback * 5)
-            else:  # 1min
-                start = datetime.now(timezone.utc) - timedelta(minutes=lookback)
-            
-            data = self.alpaca_client.get_bars_for_symbol(
-                symbol=symbol,
-                timeframe=tf,
-                start=start,
-                limit=lookback,
-            )
-            
-            if data is not None and not data.empty:
-                self._update_cache(symbol, timeframe, data)
-                return data
-            else:
-                logger.warning(f"No data returned for {symbol} {timeframe}")
-                if use_cache_on_failure:
-                    cached = self._get_cached_data(symbol, timeframe)
-                    if cached is not None:
-                        logger.info(f"Using cached data for {symbol} {timeframe}")
-                        return cached
-                return None
-                
-        except Exception as e:
-            logger.error(f"Failed to fetch {timeframe} data for {symbol}: {e}")
-            if use_cache_on_failure:
-                cached = self._get_cached_data(symbol, timeframe)
-                if cached is not None:
-                    logger.info(f"Using cached data for {symbol} {timeframe} after fetch failure")
-                    return cached
-            return None
-    
+        if timeframe not in self.TIMEFRAME_MAP:
+            logger.error(f"Unknown timeframe: {timeframe}")
+            return self._get_cached_data(symbol, timeframe) if use_cache_on_failure else None
+
+        if timeframe == 'daily':
+            refreshed = self._refresh_daily([symbol])
+        else:
+            refreshed = self._refresh_minutes([symbol])
+
+        if symbol in refreshed:
+            return self._get_cached_data(symbol, timeframe)
+
+        if use_cache_on_failure:
+            cached = self._get_cached_data(symbol, timeframe)
+            if cached is not None:
+                logger.info(f"Using cached data for {symbol} {timeframe}")
+                return cached
+        return None
+
+    def refresh_symbols(self, symbols: List[str], force_refresh: bool = False) -> None:
+        """Refresh every timeframe for many symbols in bulk.
+
+        Only stale (symbol, timeframe) pairs are fetched: one or two 1-minute
+        requests for all intraday views plus at most one daily request.
+        """
+        intraday = [
+            s for s in symbols
+            if force_refresh or any(self._needs_refresh(tf, s) for tf in INTRADAY_MINUTES)
+        ]
+        daily = [s for s in symbols if force_refresh or self._needs_refresh('daily', s)]
+
+        if intraday:
+            self._refresh_minutes(intraday)
+        if daily:
+            self._refresh_daily(daily)
+
     def fetch_all_timeframes(
-        self, 
+        self,
         symbol: str,
         force_refresh: bool = False
     ) -> Dict[str, pd.DataFrame]:
         """Fetch data for all timeframes for a symbol.
-        
+
+        Served from memory when the symbol was refreshed recently
+        (see refresh_symbols for batch warm-up).
+
         Requirement 1.1: Fetch historical bars for all timeframes.
-        
+
         Args:
             symbol: Stock symbol
             force_refresh: If True, bypass cache and fetch fresh data
-            
+
         Returns:
             Dict mapping timeframe to DataFrame
         """
+        self.refresh_symbols([symbol], force_refresh=force_refresh)
+
         result = {}
-        
         for timeframe in ['1min', '5min', '15min', 'daily']:
-            # Check if we need to refresh this timeframe
-            if not force_refresh and not self._needs_refresh(timeframe):
-                cached = self._get_cached_data(symbol, timeframe)
-                if cached is not None:
-                    result[timeframe] = cached
-                    continue
-            
-            # Fetch fresh data
-            data = self._fetch_timeframe_data(symbol, timeframe)
+            data = self._get_cached_data(symbol, timeframe)
             if data is not None:
                 result[timeframe] = data
-                self.last_refresh[timeframe] = datetime.now(timezone.utc)
-        
+
         return result
-    
+
     def refresh_timeframe(
-        self, 
-        timeframe: str, 
+        self,
+        timeframe: str,
         symbols: List[str]
     ) -> Dict[str, pd.DataFrame]:
         """Refresh data for a specific timeframe across multiple symbols.
-        
+
+        Any intraday timeframe refreshes the shared 1-minute store (and so
+        all intraday views) for the symbols.
+
         Requirement 1.2: Scheduled refresh per timeframe.
-        
+
         Args:
             timeframe: Timeframe to refresh ('1min', '5min', '15min', 'daily')
             symbols: List of symbols to refresh
-            
+
         Returns:
             Dict mapping symbol to DataFrame
         """
+        if timeframe == 'daily':
+            self._refresh_daily(symbols)
+        elif timeframe in INTRADAY_MINUTES:
+            self._refresh_minutes(symbols)
+        else:
+            logger.error(f"Unknown timeframe: {timeframe}")
+            return {}
+
         result = {}
-        
         for symbol in symbols:
-            data = self._fetch_timeframe_data(symbol, timeframe)
+            data = self._get_cached_data(symbol, timeframe)
             if data is not None:
                 result[symbol] = data
-        
+
         if result:
             self.last_refresh[timeframe] = datetime.now(timezone.utc)
             logger.info(f"Refreshed {timeframe} data for {len(result)} symbols")
-        
+
         return result
-    
+
     def get_cached_data(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
         """Public method to get cached data.
-        
+
         Requirement 1.3: Access cached data.
         """
         return self._get_cached_data(symbol, timeframe)
-    
+
     def clear_cache(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> None:
         """Clear cache entries.
-        
+
+        Clearing a symbol also drops its 1-minute store; clearing only a
+        timeframe drops the view, which is rebuilt from the store on next use.
+
         Args:
             symbol: If provided, clear only this symbol's cache
             timeframe: If provided, clear only this timeframe's cache
         """
-        if symbol and timeframe:
-            if symbol in self.cache and timeframe in self.cache[symbol]:
-                del self.cache[symbol][timeframe]
-        elif symbol:
-            if symbol in self.cache:
-                del self.cache[symbol]
-        elif timeframe:
-            for sym in list(self.cache.keys()):
-                if timeframe in self.cache[sym]:
-                    del self.cache[sym][timeframe]
-        else:
-            self.cache.clear()
-            self.last_refresh.clear()
-    
+        with self._lock:
+            if symbol and timeframe:
+                if symbol in self.cache and timeframe in self.cache[symbol]:
+                    del self.cache[symbol][timeframe]
+                self.last_refresh.pop((symbol, timeframe), None)
+            elif symbol:
+                if symbol in self.cache:
+                    del self.cache[symbol]
+                self.minute_bars.pop(symbol, None)
+                for key in [k for k in self.last_refresh if isinstance(k, tuple) and k[0] == symbol]:
+                    del self.last_refresh[key]
+            elif timeframe:
+                for sym in list(self.cache.keys()):
+                    if timeframe in self.cache[sym]:
+                        del self.cache[sym][timeframe]
+                    self.last_refresh.pop((sym, timeframe), None)
+            else:
+                self.cache.clear()
+                self.minute_bars.clear()
+                self.last_refresh.clear()
+
     def get_cache_status(self) -> Dict[str, Dict[str, str]]:
         """Get status of cached data for debugging."""
         status = {}
@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 from typing import Dict, Optional
 import logging
 
+from data.feature_cache import bar_stamp, get_feature_cache
+from indicators import kernels
 from trading.mtf.models import TimeframeFeatures, MTFFeatures
 
 logger = logging.getLogger(__name__)
@@ -32,7 +34,7 @@ class MTFFeatureEngine:
     
     def __init__(self):
         """Initialize the feature engine."""
-        pass
+        self.feature_cache = get_feature_cache()
     
     def calculate_mtf_features(
         self, 
@@ -50,10 +52,10 @@ class MTFFeatureEngine:
         """
         try:
             # Calculate features for each timeframe
-            tf_1min = self._calculate_or_default(data.get('1min'), '1min')
-            tf_5min = self._calculate_or_default(data.get('5min'), '5min')
-            tf_15min = self._calculate_or_default(data.get('15min'), '15min')
-            tf_daily = self._calculate_or_default(data.get('daily'), 'daily')
+            tf_1min = self._calculate_or_default(data.get('1min'), '1min', symbol)
+            tf_5min = self._calculate_or_default(data.get('5min'), '5min', symbol)
+            tf_15min = self._calculate_or_default(data.get('15min'), '15min', symbol)
+            tf_daily = self._calculate_or_default(data.get('daily'), 'daily', symbol)
             
             if tf_1min is None or tf_5min is None or tf_15min is None or tf_daily is None:
                 logger.warning(f"Insufficient data for {symbol} MTF features")
@@ -75,12 +77,23 @@ class MTFFeatureEngine:
     def _calculate_or_default(
         self, 
         df: Optional[pd.DataFrame], 
-        timeframe: str
+        timeframe: str,
+        symbol: Optional[str] = None
     ) -> Optional[TimeframeFeatures]:
-        """Calculate features or return None if data is insufficient."""
+        """Calculate features or return None if data is insufficient.
+        
+        With a symbol, features are reused from the feature cache while the
+        timeframe's last bar is unchanged (5min/15min/daily bars change far
+        less often than the 1-minute refresh).
+        """
         if df is None or df.empty:
             return None
-        return self.calculate_timeframe_features(df, timeframe)
+        if symbol is None:
+            return self.calculate_timeframe_features(df, timeframe)
+        return self.feature_cache.get_or_compute(
+            'mtf', symbol, timeframe, bar_stamp(df),
+            lambda: self.calculate_timeframe_features(df, timeframe)
+        )
     
     def calculate_timeframe_features(
         self, 
@@ -135,7 +148,7 @@ class MTFFeatureEngine:
             adx = self._calculate_adx(high, low, close, 14)
             
             # Calculate volume ratio
-            volume_avg = volume.rolling(window=20).mean()
+            volume_avg = pd.Series(kernels.rolling_mean(volume, 20), index=volume.index)
             current_volume = float(volume.iloc[-1])
             avg_volume = float(volume_avg.iloc[-1]) if not pd.isna(volume_avg.iloc[-1]) else current_volume
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1.0
@@ -174,7 +187,7 @@ class MTFFeatureEngine:
     
     def _calculate_ema(self, prices: pd.Series, period: int) -> pd.Series:
         """Calculate Exponential Moving Average."""
-        return prices.ewm(span=period, adjust=False).mean()
+        return pd.Series(kernels.ema(prices, period), index=prices.index)
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """Calculate Relative Strength Index (RSI).
@@ -182,17 +195,12 @@ class MTFFeatureEngine:
         RSI = 100 - (100 / (1 + RS))
         RS = Average Gain / Average Loss
         """
-        delta = prices.diff()
-        
-        gains = delta.where(delta > 0, 0)
-        losses = -delta.where(delta < 0, 0)
-        
-        avg_gains = gains.ewm(alpha=1/period, adjust=False).mean()
-        avg_losses = losses.ewm(alpha=1/period, adjust=False).mean()
+        avg_gains, avg_losses = kernels.rsi_components(prices, period)
         
         # Avoid division by zero
-        rs = avg_gains / avg_losses.replace(0, np.inf)
-        rsi = 100 - (100 / (1 + rs))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gains / np.where(avg_losses == 0, np.inf, avg_losses)
+        rsi = pd.Series(100 - (100 / (1 + rs)), index=prices.index)
         
         # Handle edge cases
         rsi = rsi.replace([np.inf, -np.inf], 50.0)
@@ -212,12 +220,10 @@ class MTFFeatureEngine:
         Returns:
             Tuple of (macd_line, signal_line, histogram)
         """
-        ema_fast = prices.ewm(span=fast, adjust=False).mean()
-        ema_slow = prices.ewm(span=slow, adjust=False).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-        histogram = macd_line - signal_line
+        macd_line, signal_line, histogram = (
+            pd.Series(values, index=prices.index)
+            for values in kernels.macd(prices, fast, slow, signal)
+        )
         
         return macd_line, signal_line, histogram
     
@@ -234,38 +240,24 @@ class MTFFeatureEngine:
         - ADX > 25: Strong trend
         - ADX < 20: Weak trend (ranging market)
         """
-        # Calculate True Range
-        prev_close = close.shift(1)
-        tr1 = high - low
-        tr2 = abs(high - prev_close)
-        tr3 = abs(low - prev_close)
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        # Calculate Directional Movement
-        high_diff = high.diff()
-        low_diff = -low.diff()
+        true_range = kernels.true_range(high, low, close)
+        plus_dm, minus_dm = kernels.directional_movement(high, low)
         
-        plus_dm = pd.Series(0.0, index=high.index)
-        minus_dm = pd.Series(0.0, index=high.index)
-        
-        plus_dm[(high_diff > low_diff) & (high_diff > 0)] = high_diff
-        minus_dm[(low_diff > high_diff) & (low_diff > 0)] = low_diff
-        
-        # Smooth using Wilder's method
-        atr = true_range.ewm(alpha=1/period, adjust=False).mean()
-        plus_di_raw = plus_dm.ewm(alpha=1/period, adjust=False).mean()
-        minus_di_raw = minus_dm.ewm(alpha=1/period, adjust=False).mean()
-        
-        # Calculate DI lines
-        plus_di = 100 * (plus_di_raw / atr.replace(0, np.inf))
-        minus_di = 100 * (minus_di_raw / atr.replace(0, np.inf))
-        
-        # Calculate DX
-        di_sum = plus_di + minus_di
-        dx = 100 * abs(plus_di - minus_di) / di_sum.replace(0, np.inf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Smooth using Wilder's method
+            atr = kernels.wilder(true_range, period)
+            atr = np.where(atr == 0, np.inf, atr)
+            
+            # Calculate DI lines
+            plus_di = 100 * kernels.wilder(plus_dm, period) / atr
+            minus_di = 100 * kernels.wilder(minus_dm, period) / atr
+            
+            # Calculate DX
+            di_sum = plus_di + minus_di
+            dx = 100 * np.abs(plus_di - minus_di) / np.where(di_sum == 0, np.inf, di_sum)
         
         # Calculate ADX (smoothed DX)
-        adx = dx.ewm(alpha=1/period, adjust=False).mean()
+        adx = pd.Series(kernels.wilder(dx, period), index=close.index)
         
         # Handle edge cases
         adx = adx.replace([np.inf, -np.inf], 0.0)
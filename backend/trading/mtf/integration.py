@@ -74,7 +74,7 @@ class MTFIntegration:
                 logger.debug(f"MTF bypassed for {symbol}")
                 return self._create_bypass_result(symbol, signal)
             
-            # Fetch multi-timeframe data
+            # Multi-timeframe data (in memory when prefetch() ran this cycle)
             data = self.data_manager.fetch_all_timeframes(symbol, force_refresh)
             
             if not data or len(data) < 4:
@@ -152,6 +152,20 @@ class MTFIntegration:
                 f"Reason: {result.rejection_reason}"
             )
     
+    def prefetch(self, symbols: list) -> None:
+        """Bring stale MTF data for all symbols up to date in bulk.
+        
+        Call once per strategy cycle so get_mtf_signal_result is served
+        from memory for every symbol.
+        
+        Args:
+            symbols: List of symbols to evaluate this cycle
+        """
+        try:
+            self.data_manager.refresh_symbols(symbols)
+        except Exception as e:
+            logger.error(f"MTF prefetch failed: {e}")
+    
     def refresh_data(self, symbols: list, timeframe: str = None) -> None:
         """Refresh MTF data for symbols.
         
@@ -162,8 +176,7 @@ class MTFIntegration:
         if timeframe:
             self.data_manager.refresh_timeframe(timeframe, symbols)
         else:
-            for symbol in symbols:
-                self.data_manager.fetch_all_timeframes(symbol, force_refresh=True)
+            self.data_manager.refresh_symbols(symbols, force_refresh=True)
     
     def get_cache_status(self) -> Dict:
         """Get status of cached MTF data."""
@@ -1,3 +1,4 @@
+from dataclasses import replace
 from typing import Optional
 from datetime import datetime
 from core.alpaca_client import AlpacaClient
@@ -354,8 +355,7 @@ class OrderManager:
                 # Update in state and DB
                 order = trading_state.get_order(order_id)
                 if order:
-                    order.status = 'canceled'
-                    trading_state.update_order(order)
+                    trading_state.update_order(replace(order, status='canceled'))
                 
                 self.supabase.update_order(order_id, {'status': 'canceled'})
                 logger.info(f"Order canceled: {order_id}")
@@ -368,12 +368,12 @@ class OrderManager:
         """Update order status (called by monitoring loop)."""
         order = trading_state.get_order(order_id)
         if order:
-            order.status = status
-            order.filled_qty = filled_qty
-            if filled_avg_price:
-                order.filled_avg_price = filled_avg_price
-            
-            trading_state.update_order(order)
+            trading_state.update_order(replace(
+                order,
+                status=status,
+                filled_qty=filled_qty,
+                filled_avg_price=filled_avg_price or order.filled_avg_price
+            ))
             
             # Update in DB
             updates = {
@@ -1,6 +1,8 @@
+import time
 from typing import List, Optional
 from datetime import datetime
 from core.alpaca_client import AlpacaClient
+from core.order_mirror import TERMINAL_STATUSES, wait_for_order_status
 from core.supabase_client import SupabaseClient
 from core.state import trading_state, Position
 from config import settings
@@ -228,10 +230,8 @@ class PositionManager:
                     
                     try:
                         # Cancel any existing orders first
-                        open_orders = self.alpaca.get_orders(status='open')
-                        for order in open_orders:
-                            if order.symbol == symbol:
-                                self.alpaca.cancel_order(order.id)
+                        for order in self.alpaca.get_open_orders_for(symbol):
+                            self.alpaca.cancel_order(order.id)
                         
                         # Close the position
                         self.alpaca.close_position(symbol)
@@ -255,11 +255,15 @@ class PositionManager:
             logger.error(f"Error cleaning up tiny positions: {e}")
             return 0
     
-    def update_position_prices(self):
+    def update_position_prices(self, evaluate_rules: bool = True):
         """
         Update current prices for all positions.
         Call this frequently (every few seconds).
         Also updates trailing stops if enabled.
+        
+        Args:
+            evaluate_rules: Also run partial-profit and trailing-stop checks.
+                The protection pipeline passes False and evaluates them itself.
         """
         try:
             positions = trading_state.get_all_positions()
@@ -277,21 +281,11 @@ class PositionManager:
                     bar = latest_bars[position.symbol]
                     current_price = float(bar.close)
                     
-                    # Calculate P/L
-                    if position.side == 'buy':
-                        unrealized_pl = (current_price - position.avg_entry_price) * position.qty
-                    else:
-                        unrealized_pl = (position.avg_entry_price - current_price) * position.qty
-                    
-                    unrealized_pl_pct = (unrealized_pl / (position.avg_entry_price * position.qty)) * 100
-                    
-                    # Update position
-                    position.current_price = current_price
-                    position.unrealized_pl = unrealized_pl
-                    position.unrealized_pl_pct = unrealized_pl_pct
-                    position.market_value = current_price * position.qty
+                    # Mark to market (P/L, market value) as one atomic state update
+                    position = trading_state.update_position_price(position.symbol, current_price)
                     
-                    trading_state.update_position(position)
+                    if position is None or not evaluate_rules:
+                        continue
                     
                     # Sprint 6: Check for partial profits
                     self._check_partial_profits_for_position(position)
@@ -340,31 +334,16 @@ class PositionManager:
                 new_stop = result['new_stop']
                 
                 # Update position stop loss
-                position.stop_loss = new_stop
-                trading_state.update_position(position)
+                position = trading_state.update_position_fields(position.symbol, stop_loss=new_stop) or position
                 
-                # Update database with full position data to avoid constraint violations
-                self.supabase.upsert_position({
-                    'symbol': position.symbol,
-                    'qty': position.qty,
-                    'side': position.side,
-                    'avg_entry_price': position.avg_entry_price,
-                    'current_price': position.current_price,
-                    'unrealized_pl': position.unrealized_pl,
-                    'unrealized_pl_pct': position.unrealized_pl_pct,
-                    'market_value': position.market_value,
-                    'stop_loss': new_stop,
-                    'take_profit': position.take_profit,
-                    'entry_time': position.entry_time.isoformat(),
-                    'updated_at': datetime.utcnow().isoformat()
-                })
+                self.persist_position(position)
                 
                 logger.info(f"✓ Position {position.symbol} stop loss updated to ${new_stop:.2f}")
                 
                 # CRITICAL FIX: Update the ACTUAL Alpaca order
                 try:
                     # Find the active stop order
-                    open_orders = self.alpaca.get_orders(status='open')
+                    open_orders = self.alpaca.get_orders(status='open', symbols=[position.symbol])
                     stop_order = None
                     
                     for order in open_orders:
@@ -389,6 +368,23 @@ class PositionManager:
         except Exception as e:
             logger.error(f"Error updating trailing stop for {position.symbol}: {e}")
     
+    def persist_position(self, position: Position):
+        """Write the full position row (partial rows violate table constraints)."""
+        self.supabase.upsert_position({
+            'symbol': position.symbol,
+            'qty': position.qty,
+            'side': position.side,
+            'avg_entry_price': position.avg_entry_price,
+            'current_price': position.current_price,
+            'unrealized_pl': position.unrealized_pl,
+            'unrealized_pl_pct': position.unrealized_pl_pct,
+            'market_value': position.market_value,
+            'stop_loss': position.stop_loss,
+            'take_profit': position.take_profit,
+            'entry_time': position.entry_time.isoformat(),
+            'updated_at': datetime.utcnow().isoformat()
+        })
+    
     def check_stops_and_targets(self) -> List[str]:
         """
         ONLY check stops/targets if NO bracket orders exist.
@@ -401,22 +397,9 @@ class PositionManager:
         try:
             positions = trading_state.get_all_positions()
             
-            # Get OPEN orders to detect active bracket legs
-            # FIXED: Use status='open' to get all active orders including bracket legs
-            open_orders = self.alpaca.get_orders(status='open')
-            
-            # Build comprehensive set of symbols with ANY active orders
-            symbols_with_orders = set()
-            for order in open_orders:
-                # Any open order means this symbol has protection
-                symbols_with_orders.add(order.symbol)
-                logger.debug(f"   Found active order for {order.symbol}: {order.id} ({order.order_type}, {order.status})")
-            
-            logger.debug(f"🛡️  Symbols with active orders (skipping manual checks): {symbols_with_orders}")
-            
             for position in positions:
-                # CRITICAL: Skip if ANY orders exist for this symbol
-                if position.symbol in symbols_with_orders:
+                # CRITICAL: Skip if ANY open orders (including bracket legs) exist for this symbol
+                if self.alpaca.get_open_orders_for(position.symbol):
                     logger.debug(f"✓ {position.symbol} has active orders - letting brackets handle exit")
                     continue
                 
@@ -452,7 +435,7 @@ class PositionManager:
         Check if a position has active bracket orders.
         """
         try:
-            open_orders = self.alpaca.get_orders(status='open')
+            open_orders = self.alpaca.get_orders(status='open', symbols=[symbol])
             for order in open_orders:
                 if order.symbol == symbol and hasattr(order, 'legs') and order.legs:
                     return True
@@ -485,8 +468,7 @@ class PositionManager:
             # CRITICAL: Check if position has active bracket orders before emergency stop
             # If brackets exist, they will handle the exit - don't interfere!
             if reason == 'emergency_stop':
-                open_orders = self.alpaca.get_orders(status='open')
-                symbol_orders = [o for o in open_orders if o.symbol == symbol]
+                symbol_orders = self.alpaca.get_orders(status='open', symbols=[symbol])
                 if symbol_orders:
                     logger.info(f"✓ {symbol} has {len(symbol_orders)} active orders - brackets will handle exit, skipping emergency stop")
                     return True
@@ -540,8 +522,8 @@ class PositionManager:
             preserve_brackets: If True, DON'T cancel bracket order legs (stop/limit orders)
         """
         try:
-            open_orders = self.alpaca.get_orders(status='open')
-            cancelled_count = 0
+            open_orders = self.alpaca.get_orders(status='open', symbols=[symbol])
+            cancelled_ids = []
             skipped_brackets = 0
             
             for order in open_orders:
@@ -560,20 +542,20 @@ class PositionManager:
                     
                     try:
                         self.alpaca.cancel_order(order.id)
-                        cancelled_count += 1
+                        cancelled_ids.append(order.id)
                         logger.info(f"Cancelled order {order.id} for {symbol}")
                     except Exception as e:
                         logger.warning(f"Could not cancel order {order.id}: {e}")
             
-            if cancelled_count > 0:
-                logger.info(f"✅ Cancelled {cancelled_count} orders for {symbol}")
+            if cancelled_ids:
+                logger.info(f"✅ Cancelled {len(cancelled_ids)} orders for {symbol}")
             if skipped_brackets > 0:
                 logger.info(f"✓ Preserved {skipped_brackets} bracket orders for {symbol}")
             
-            if cancelled_count > 0:
-                # Brief pause to let cancellations process
-                import time
-                time.sleep(0.5)
+            # Wait for the cancel events instead of a fixed pause (returns as soon as they land)
+            deadline = time.monotonic() + 2.0
+            for order_id in cancelled_ids:
+                wait_for_order_status(self.alpaca, order_id, TERMINAL_STATUSES, max(deadline - time.monotonic(), 0))
                 
         except Exception as e:
             logger.warning(f"Error cancelling orders for {symbol}: {e}")
@@ -596,9 +578,8 @@ class PositionManager:
                     if attempt < max_retries - 1:
                         # Cancel non-bracket orders and retry
                         # CRITICAL: Preserve brackets even during retries
+                        # Returns once the cancels are confirmed
                         self._cancel_all_symbol_orders(symbol, preserve_brackets=True)
-                        import time
-                        time.sleep(1)
                         continue
                     else:
                         logger.error(f"Failed to close {symbol} after {max_retries} attempts")
@@ -688,8 +669,7 @@ class PositionManager:
                 
                 if symbol in alpaca_symbols:
                     # Position still exists - check if it has bracket orders
-                    open_orders = self.alpaca.get_orders(status='open')
-                    symbol_orders = [o for o in open_orders if o.symbol == symbol]
+                    symbol_orders = self.alpaca.get_orders(status='open', symbols=[symbol])
                     
                     if symbol_orders:
                         # Has active orders - DON'T clean up, let brackets handle it
@@ -754,12 +734,12 @@ class PositionManager:
             # If should take partial profits (and not in shadow mode)
             if result.get('should_take') and not result.get('shadow_mode'):
                 logger.info(f"✅ Triggering partial profit execution for {position.symbol}")
-                self._execute_partial_profit_taking(position, result)
+                self.execute_partial_profit_taking(position, result)
             
         except Exception as e:
             logger.error(f"Error checking partial profits for {position.symbol}: {e}")
     
-    def _execute_partial_profit_taking(self, position: Position, result: dict):
+    def execute_partial_profit_taking(self, position: Position, result: dict):
         """
         Execute partial profit taking for a position
         
@@ -845,8 +825,7 @@ class PositionManager:
                         logger.info(f"✓ Full position closed for {symbol}: {shares_to_sell} shares sold (was too small to keep remainder)")
                     else:
                         # Partial close - update position
-                        position.qty = final_remaining_qty
-                        trading_state.update_position(position)
+                        position = trading_state.update_position_fields(symbol, qty=final_remaining_qty) or position
                         
                         # Update database with full position data to avoid constraint violations
                         self.supabase.upsert_position({
@@ -979,8 +958,7 @@ class PositionManager:
                             logger.info(f"✅ Created new stop loss for {symbol} at ${emergency_stop:.2f}")
                             
                             # Update position with new stop
-                            position.stop_loss = emergency_stop
-                            trading_state.update_position(position)
+                            trading_state.update_position_fields(symbol, stop_loss=emergency_stop)
                             
                         except Exception as e:
                             logger.error(f"Failed to create new stop loss for {symbol}: {e}")
@@ -1093,8 +1071,7 @@ class PositionManager:
                 logger.info(f"✅ Emergency stop loss created for {symbol}: ${emergency_stop:.2f}")
                 
                 # Update position with new stop
-                position.stop_loss = emergency_stop
-                trading_state.update_position(position)
+                trading_state.update_position_fields(symbol, stop_loss=emergency_stop)
                 
                 # Update database
                 self.supabase.upsert_position({
@@ -1165,15 +1142,13 @@ class PositionManager:
                     return
             
             # CRITICAL: Check if shares are held by existing orders
-            all_orders = self.alpaca.get_orders(status='open')
             has_existing_orders = False
             
             # Determine expected exit side for this position
             expected_exit_side = 'sell' if position.side == 'buy' else 'buy'
             
-            for order in all_orders:
-                if (order.symbol == symbol and 
-                    order.side.value == expected_exit_side and
+            for order in self.alpaca.get_open_orders_for(symbol):
+                if (order.side.value == expected_exit_side and
                     order.status.value in ['new', 'accepted', 'pending_new', 'held']):
                     has_existing_orders = True
                     break
@@ -1202,9 +1177,9 @@ class PositionManager:
             logger.info(f"✅ Created take-profit for {symbol}: ${take_profit_price:.2f}")
             
             # Update position with both prices
-            position.stop_loss = stop_loss_price
-            position.take_profit = take_profit_price
-            trading_state.update_position(position)
+            trading_state.update_position_fields(
+                symbol, stop_loss=stop_loss_price, take_profit=take_profit_price
+            )
             
         except Exception as e:
             logger.error(f"Failed to recreate bracket for {symbol}: {e}")
@@ -5,13 +5,18 @@ Dynamically adjusts stop losses based on position profitability and market condi
 Implements trailing stops, breakeven protection, and R-multiple based stop management.
 """
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 from datetime import datetime
+import asyncio
 import time
 
 from .models import PositionState, ProtectionStateEnum
+from .order_sequencer import OrderSequencer, get_order_sequencer
 from .position_state_tracker import get_position_tracker
+from config import settings
 from core.alpaca_client import AlpacaClient
+from core.async_io import run_blocking
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -33,11 +38,19 @@ class IntelligentStopManager:
     Manages dynamic stop losses with trailing logic and breakeven protection.
     """
     
-    def __init__(self, alpaca_client: AlpacaClient):
+    def __init__(self, alpaca_client: AlpacaClient, sequencer: Optional[OrderSequencer] = None):
         self.alpaca = alpaca_client
         self.tracker = get_position_tracker()
+        self._sequencer = sequencer
         logger.info("✅ Intelligent Stop Manager initialized")
     
+    @property
+    def sequencer(self) -> OrderSequencer:
+        """Order sequencer used to move broker stops (shared per-symbol locks)."""
+        if self._sequencer is None:
+            self._sequencer = get_order_sequencer(self.alpaca)
+        return self._sequencer
+    
     def calculate_trailing_stop(
         self,
         entry_price: float,
@@ -144,12 +157,17 @@ class IntelligentStopManager:
         
         return success
     
-    def update_stop_for_position(self, position_state: PositionState) -> StopUpdateResult:
+    def update_stop_for_position(self, position_state: PositionState, push_to_broker: bool = False) -> StopUpdateResult:
         """
         Update stop loss for a position based on current R-multiple and protection state.
         
+        With push_to_broker the broker stop is moved first (through the order
+        sequencer) and the tracked stop only follows once the broker accepted
+        it, so a failed broker update is retried on the next check.
+        
         Args:
             position_state: Current position state
+            push_to_broker: Also move the broker stop order
             
         Returns:
             StopUpdateResult with operation details
@@ -186,8 +204,13 @@ class IntelligentStopManager:
                     old_stop=position_state.stop_loss
                 )
             
-            # Update stop in tracker
             old_stop = position_state.stop_loss
+            if push_to_broker:
+                failure = self._push_broker_stop(position_state.symbol, old_stop, new_stop)
+                if failure:
+                    return failure
+            
+            # Update stop in tracker
             success = self.tracker.update_stop_loss(position_state.symbol, new_stop)
             
             if success:
@@ -300,12 +323,18 @@ class IntelligentStopManager:
         
         return updates_needed
     
-    def execute_batch_updates(self, max_concurrent: int = 5) -> dict:
+    def execute_batch_updates(self, max_concurrent: Optional[int] = None) -> dict:
         """
-        Execute stop updates for all positions that need them.
+        Execute stop updates for all positions that need them, moving the
+        broker stop orders as well as the tracked stops.
+        
+        Symbols are updated concurrently (at most max_concurrent broker
+        sequences in flight); updates for the same symbol stay serialized by
+        the sequencer's per-symbol lock.
         
         Args:
             max_concurrent: Maximum number of concurrent updates
+                (defaults to settings.stop_update_max_concurrency)
             
         Returns:
             Dict mapping symbol to update result
@@ -314,26 +343,75 @@ class IntelligentStopManager:
         results = {}
         
         if not updates_needed:
-            logger.info("No stop loss updates needed")
+            logger.debug("No stop loss updates needed")
             return results
         
         logger.info(f"Executing {len(updates_needed)} stop loss updates")
         
-        # Process updates
-        for symbol, reason in updates_needed.items():
-            position_state = self.tracker.get_position_state(symbol)
-            if position_state:
-                result = self.update_stop_for_position(position_state)
-                results[symbol] = result
-                
-                # Small delay to avoid overwhelming the system
-                time.sleep(0.1)
+        symbols = list(updates_needed)
+        workers = min(self._max_concurrent(max_concurrent), len(symbols))
+        if workers <= 1:
+            results = {symbol: self._update_symbol(symbol) for symbol in symbols}
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stop-update') as pool:
+                results = dict(zip(symbols, pool.map(self._update_symbol, symbols)))
         
-        # Log summary
-        successful = sum(1 for r in results.values() if r.success)
-        logger.info(f"Stop update batch complete: {successful}/{len(results)} successful")
+        results = {symbol: result for symbol, result in results.items() if result is not None}
+        self._log_batch_summary(results)
+        return results
+    
+    async def execute_batch_updates_async(self, max_concurrent: Optional[int] = None) -> dict:
+        """Awaitable execute_batch_updates: each symbol's update runs on the I/O pool."""
+        updates_needed = self.check_all_positions_for_updates()
+        if not updates_needed:
+            logger.debug("No stop loss updates needed")
+            return {}
         
+        slots = asyncio.Semaphore(self._max_concurrent(max_concurrent))
+        
+        async def bounded_update(symbol: str):
+            async with slots:
+                return symbol, await run_blocking(self._update_symbol, symbol)
+        
+        pairs = await asyncio.gather(*(bounded_update(symbol) for symbol in updates_needed))
+        results = {symbol: result for symbol, result in pairs if result is not None}
+        self._log_batch_summary(results)
         return results
+    
+    def _update_symbol(self, symbol: str) -> Optional[StopUpdateResult]:
+        """Move the broker and tracked stop for one symbol."""
+        position_state = self.tracker.get_position_state(symbol)
+        if not position_state:
+            return None
+        return self.update_stop_for_position(position_state, push_to_broker=True)
+    
+    def _push_broker_stop(self, symbol: str, old_stop: float, new_stop: float) -> Optional[StopUpdateResult]:
+        """Move the broker stop through the sequencer; returns a failure result, or None on success."""
+        try:
+            sequence = self.sequencer.execute_stop_update(symbol, new_stop)
+        except Exception as e:
+            sequence = None
+            logger.error(f"Broker stop update for {symbol} raised: {e}")
+        if sequence is not None and sequence.success:
+            return None
+        reason = sequence.message if sequence else "exception"
+        logger.warning(f"⚠️  {symbol}: broker stop update failed ({reason}) - tracked stop left at ${old_stop:.2f}")
+        return StopUpdateResult(
+            success=False,
+            message=f"Broker stop update failed: {reason}",
+            old_stop=old_stop,
+            new_stop=new_stop
+        )
+    
+    @staticmethod
+    def _max_concurrent(max_concurrent: Optional[int]) -> int:
+        if max_concurrent is None:
+            max_concurrent = settings.stop_update_max_concurrency
+        return max(1, max_concurrent)
+    
+    def _log_batch_summary(self, results: Dict[str, StopUpdateResult]):
+        successful = sum(1 for r in results.values() if r.success)
+        logger.info(f"Stop update batch complete: {successful}/{len(results)} successful")
 
 
 # Global instance
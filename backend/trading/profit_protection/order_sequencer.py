@@ -12,6 +12,7 @@ from enum import Enum
 import time
 import threading
 
+from core.order_mirror import wait_for_order_update
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -80,7 +81,8 @@ class OrderSequencer:
         
         Sequence:
         1. Query current orders for symbol
-        2. If stop loss exists, cancel it
+        2. If stop loss exists, replace its stop price in place (one broker call);
+           if the broker rejects the replace, cancel it
         3. Wait for cancellation confirmation
         4. Submit new stop loss order
         5. Verify new order is active
@@ -111,6 +113,26 @@ class OrderSequencer:
                         stop_order = order
                         break
                 
+                if stop_order and self._supports_replace():
+                    operations.append("replace_existing_stop")
+                    replaced = self.alpaca.replace_order(stop_order.id, stop_price=round(new_stop, 2))
+                    if replaced:
+                        operations.append("verify_new_order")
+                        if self._verify_order_active(replaced.id, timeout=2.0):
+                            return SequenceResult(
+                                success=True,
+                                message=f"Stop loss replaced at ${new_stop:.2f}",
+                                sequence_id=sequence_id,
+                                operations_completed=operations,
+                                conflicts_detected=conflicts,
+                                execution_time_ms=(time.perf_counter() - start_time) * 1000
+                            )
+                        return self._create_failure_result(
+                            sequence_id, operations, conflicts, start_time,
+                            "Replaced stop order not confirmed active"
+                        )
+                    logger.warning(f"Replace of stop {stop_order.id} for {symbol} failed - cancelling and recreating")
+                
                 if stop_order:
                     operations.append("cancel_existing_stop")
                     
@@ -458,9 +480,14 @@ class OrderSequencer:
     
     def _get_position_lock(self, symbol: str) -> threading.Lock:
         """Get or create position-specific lock"""
-        if symbol not in self._position_locks:
-            self._position_locks[symbol] = threading.Lock()
-        return self._position_locks[symbol]
+        with self._global_lock:
+            if symbol not in self._position_locks:
+                self._position_locks[symbol] = threading.Lock()
+            return self._position_locks[symbol]
+    
+    def _supports_replace(self) -> bool:
+        """Whether the broker client can amend an order in place (AlpacaClient.replace_order)"""
+        return self.alpaca is not None and callable(getattr(self.alpaca, 'replace_order', None))
     
     def _wait_for_cancellation(self, order_id: str, timeout: float) -> bool:
         """Wait for order cancellation confirmation"""
@@ -472,9 +499,9 @@ class OrderSequencer:
         while time.time() - start_time < timeout:
             try:
                 order = self.alpaca.get_order(order_id)
-                if order.status in ['cancelled', 'expired', 'rejected']:
+                if order.status in ['canceled', 'cancelled', 'expired', 'rejected']:
                     return True
-                time.sleep(0.1)
+                self._wait_for_update(order_id, order, start_time, timeout)
             except Exception:
                 # Order might be deleted, assume cancelled
                 return True
@@ -491,11 +518,11 @@ class OrderSequencer:
         while time.time() - start_time < timeout:
             try:
                 order = self.alpaca.get_order(order_id)
-                if order.status in ['new', 'accepted', 'pending_new']:
+                if order.status in ['new', 'accepted', 'pending_new', 'held']:
                     return True
-                elif order.status in ['rejected', 'cancelled']:
+                elif order.status in ['rejected', 'canceled', 'cancelled']:
                     return False
-                time.sleep(0.1)
+                self._wait_for_update(order_id, order, start_time, timeout)
             except Exception as e:
                 logger.error(f"Error verifying order {order_id}: {e}")
                 return False
@@ -520,7 +547,7 @@ class OrderSequencer:
                         'avg_fill_price': float(order.filled_avg_price or 0),
                         'status': order.status
                     }
-                elif order.status in ['cancelled', 'rejected', 'expired']:
+                elif order.status in ['canceled', 'cancelled', 'rejected', 'expired']:
                     return {
                         'filled': False,
                         'filled_qty': 0,
@@ -528,7 +555,7 @@ class OrderSequencer:
                         'status': order.status
                     }
                 
-                time.sleep(0.1)
+                self._wait_for_update(order_id, order, start_time, timeout)
                 
             except Exception as e:
                 logger.error(f"Error checking order {order_id}: {e}")
@@ -541,6 +568,11 @@ class OrderSequencer:
             'status': 'timeout'
         }
     
+    def _wait_for_update(self, order_id: str, order, start_time: float, timeout: float):
+        """Wait for the order's next trade-update event (0.1s poll without an order mirror)."""
+        remaining = timeout - (time.time() - start_time)
+        wait_for_order_update(self.alpaca, order_id, order, min(0.1, remaining) if remaining > 0 else 0)
+    
     def _capture_position_state(self, symbol: str) -> dict:
         """Capture current position state for rollback"""
         try:
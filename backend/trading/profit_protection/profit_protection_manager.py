@@ -14,6 +14,8 @@ from .position_state_tracker import get_position_tracker
 from .intelligent_stop_manager import get_stop_manager
 from .profit_taking_engine import get_profit_engine
 from core.alpaca_client import AlpacaClient
+from core.position_valuation import get_position_valuation
+from config import settings
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -30,6 +32,7 @@ class ProfitProtectionManager:
         self.tracker = get_position_tracker()
         self.stop_manager = get_stop_manager(alpaca_client)
         self.profit_engine = get_profit_engine(alpaca_client)
+        self.valuation = get_position_valuation()
         
         self.running = False
         self.monitor_thread: Optional[threading.Thread] = None
@@ -122,7 +125,7 @@ class ProfitProtectionManager:
                 self._update_position_prices(positions)
                 
                 # Check for stop updates needed
-                self._check_stop_updates(positions)
+                self._check_stop_updates()
                 
                 # Check for profit taking opportunities
                 self._check_profit_milestones(positions)
@@ -137,13 +140,14 @@ class ProfitProtectionManager:
     def _update_position_prices(self, positions: dict):
         """Update current prices for all positions"""
         try:
-            # Get current prices from Alpaca
             for symbol in positions.keys():
                 try:
-                    # Get latest trade price
-                    position = self.alpaca.get_position(symbol)
-                    if position:
-                        current_price = float(position.current_price)
+                    # Streamed mark when fresh; broker position price otherwise
+                    current_price = self.valuation.get_price(symbol, max_age=settings.position_mark_max_age_seconds)
+                    if current_price is None:
+                        position = self.alpaca.get_position(symbol)
+                        current_price = float(position.current_price) if position else None
+                    if current_price:
                         self.tracker.update_current_price(symbol, current_price)
                 except Exception as e:
                     logger.debug(f"Could not update price for {symbol}: {e}")
@@ -151,23 +155,16 @@ class ProfitProtectionManager:
         except Exception as e:
             logger.error(f"Error updating position prices: {e}")
     
-    def _check_stop_updates(self, positions: dict):
-        """Check if any positions need stop loss updates"""
+    def _check_stop_updates(self):
+        """Move tracked and broker stops for positions that need it, concurrently across symbols"""
         try:
-            updates_needed = self.stop_manager.check_all_positions_for_updates()
+            results = self.stop_manager.execute_batch_updates()
             
-            if updates_needed:
-                logger.info(f"Found {len(updates_needed)} positions needing stop updates")
-                
-                for symbol, reason in updates_needed.items():
-                    position_state = positions.get(symbol)
-                    if position_state:
-                        result = self.stop_manager.update_stop_for_position(position_state)
-                        
-                        if result.success:
-                            logger.info(f"✅ {symbol}: {result.message}")
-                        else:
-                            logger.warning(f"⚠️  {symbol}: {result.message}")
+            for symbol, result in results.items():
+                if result.success:
+                    logger.info(f"✅ {symbol}: {result.message}")
+                else:
+                    logger.warning(f"⚠️  {symbol}: {result.message}")
                         
         except Exception as e:
             logger.error(f"Error checking stop updates: {e}")
@@ -0,0 +1,374 @@
+"""
+Position Protection Pipeline
+
+One pass per position-monitor tick replaces the separate protection
+mechanisms that each read the broker and touched the same stop orders on
+their own cadence (stop-loss protection, trailing stops, partial profits,
+aggressive trailing, manual stop/target checks):
+
+    1. snapshot  - refresh prices once, read the positions' orders once
+                   (status='all', so held bracket legs count), collect ATR
+    2. evaluate  - run every rule against the snapshot, in priority order
+    3. resolve   - at most one action per symbol (the strongest one wins;
+                   competing stop moves collapse into a single replace)
+    4. execute   - apply the surviving actions
+
+Rules only propose OrderActions; they never call the broker.
+"""
+
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from core.order_mirror import TERMINAL_STATUSES, order_status
+from core.state import trading_state, Position
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Aggressive trailing (research-based day-trading settings, see OPTIMAL_TRADING_SETTINGS.md)
+TRAIL_PERCENT = 1.0  # Trail 1% behind price
+MIN_PROFIT_TO_TRAIL = 1.0  # Start trailing at 1% profit (1R equivalent)
+MIN_PROFIT_FOR_BREAKEVEN = 0.5  # Move to breakeven at 0.5% profit
+BREAKEVEN_BUFFER = 0.001  # 0.1% beyond entry for slippage
+
+MIN_STOP_STEP = 0.01  # Ignore stop moves smaller than a cent
+
+
+class ActionKind(str, Enum):
+    """Order actions, strongest first (resolution keeps the strongest per symbol)."""
+    CLOSE = "close"
+    CREATE_STOP = "create_stop"
+    PARTIAL_EXIT = "partial_exit"
+    REPLACE_STOP = "replace_stop"
+
+
+ACTION_PRIORITY = {kind: rank for rank, kind in enumerate(ActionKind)}
+
+
+@dataclass
+class OrderAction:
+    """A broker action proposed by a protection rule"""
+    symbol: str
+    kind: ActionKind
+    rule: str
+    reason: str
+    stop_price: Optional[float] = None
+    order_id: Optional[str] = None
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ProtectionSnapshot:
+    """Consistent view of positions, orders, prices and ATR for one pass"""
+    positions: Dict[str, Position]
+    open_orders: Dict[str, List[Any]]
+    stop_orders: Dict[str, Any]
+    atr: Dict[str, Optional[float]]
+    taken_at: float = field(default_factory=time.time)  # epoch seconds, like recently_created
+
+    def broker_stop(self, symbol: str) -> Optional[float]:
+        """Stop price of the symbol's active stop order, if any."""
+        order = self.stop_orders.get(symbol)
+        price = getattr(order, 'stop_price', None) if order is not None else None
+        return float(price) if price else None
+
+
+def is_long(position: Position) -> bool:
+    return position.side == 'buy'
+
+
+def is_tighter(position: Position, new_stop: float, current_stop: Optional[float]) -> bool:
+    """True if new_stop protects more than current_stop (higher for longs, lower for shorts)."""
+    if current_stop is None:
+        return True
+    if is_long(position):
+        return new_stop >= current_stop + MIN_STOP_STEP
+    return new_stop <= current_stop - MIN_STOP_STEP
+
+
+def aggressive_trail_stop(entry: float, current: float, pnl_pct: float, long: bool) -> Optional[float]:
+    """
+    Aggressive trailing stop for a profitable position, or None below the
+    breakeven threshold. Trails TRAIL_PERCENT behind price once profit reaches
+    MIN_PROFIT_TO_TRAIL, never worse than breakeven plus buffer.
+    """
+    if pnl_pct < MIN_PROFIT_FOR_BREAKEVEN:
+        return None
+    if long:
+        breakeven_stop = round(entry * (1 + BREAKEVEN_BUFFER), 2)
+        if pnl_pct >= MIN_PROFIT_TO_TRAIL:
+            return max(round(current * (1 - TRAIL_PERCENT / 100), 2), breakeven_stop)
+        return breakeven_stop
+    breakeven_stop = round(entry * (1 - BREAKEVEN_BUFFER), 2)
+    if pnl_pct >= MIN_PROFIT_TO_TRAIL:
+        return min(round(current * (1 + TRAIL_PERCENT / 100), 2), breakeven_stop)
+    return breakeven_stop
+
+
+class ProtectionPipeline:
+    """
+    Single-pass protection stage: snapshot, evaluate rules, resolve, execute.
+    """
+
+    def __init__(self, alpaca_client, position_manager, protection_manager):
+        self.alpaca = alpaca_client
+        self.position_manager = position_manager
+        self.protection_manager = protection_manager
+        # Evaluated in this order; resolution keeps the strongest action per symbol
+        self.rules: List[Callable[[Position, ProtectionSnapshot], Optional[OrderAction]]] = [
+            self._rule_exit_unprotected,
+            self._rule_missing_stop,
+            self._rule_partial_profit,
+            self._rule_stop_drift,
+            self._rule_trailing_stop,
+            self._rule_aggressive_trailing,
+        ]
+        self.last_actions: List[OrderAction] = []
+        logger.info("✅ Protection pipeline initialized")
+
+    def run(self) -> Dict[str, Any]:
+        """
+        One protection pass.
+
+        Returns:
+            Dict with the executed actions and the symbols that were closed
+        """
+        try:
+            snapshot = self.take_snapshot()
+            actions = self.resolve(self.evaluate(snapshot), snapshot)
+            self.last_actions = actions
+            executed = [a for a in actions if self.execute(a, snapshot)]
+            if executed:
+                logger.info(
+                    f"🛡️  Protection pass: {len(executed)}/{len(actions)} actions "
+                    f"({', '.join(f'{a.symbol}:{a.kind.value}' for a in executed)})"
+                )
+            return {
+                'actions': executed,
+                'closed': [a.symbol for a in executed if a.kind == ActionKind.CLOSE],
+            }
+        except Exception as e:
+            logger.error(f"Error in protection pipeline: {e}")
+            return {'actions': [], 'closed': []}
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def take_snapshot(self) -> ProtectionSnapshot:
+        """
+        Refresh prices and read orders once for all positions. Orders are read
+        with status='all' like StopLossProtectionManager.verify_all_positions,
+        so stop detection sees the same legs it did.
+        """
+        self.position_manager.update_position_prices(evaluate_rules=False)
+        positions = {p.symbol: p for p in trading_state.get_all_positions()}
+
+        orders = self.alpaca.get_orders(status='all', symbols=list(positions)) if positions else []
+        open_orders: Dict[str, List[Any]] = {}
+        for order in orders or []:
+            if order_status(order) not in TERMINAL_STATUSES:
+                open_orders.setdefault(order.symbol, []).append(order)
+
+        stop_orders = {}
+        atr = {}
+        for symbol in positions:
+            has_stop, _, stop_order = self.protection_manager.has_active_stop_loss(
+                symbol, open_orders.get(symbol, [])
+            )
+            if has_stop:
+                stop_orders[symbol] = stop_order
+            features = trading_state.get_features(symbol)
+            atr[symbol] = features.get('atr') if features else None
+
+        return ProtectionSnapshot(positions, open_orders, stop_orders, atr)
+
+    def evaluate(self, snapshot: ProtectionSnapshot) -> List[OrderAction]:
+        """Run every rule for every position; rules only propose actions."""
+        actions = []
+        for position in snapshot.positions.values():
+            for rule in self.rules:
+                try:
+                    action = rule(position, snapshot)
+                except Exception as e:
+                    logger.error(f"Protection rule {rule.__name__} failed for {position.symbol}: {e}")
+                    continue
+                if action is not None:
+                    actions.append(action)
+        return actions
+
+    def resolve(self, actions: List[OrderAction], snapshot: ProtectionSnapshot) -> List[OrderAction]:
+        """
+        Keep one action per symbol: the highest-priority kind wins, and
+        competing stop moves collapse into one replace at the tightest stop.
+        """
+        by_symbol: Dict[str, List[OrderAction]] = {}
+        for action in actions:
+            by_symbol.setdefault(action.symbol, []).append(action)
+
+        resolved = []
+        for symbol, candidates in by_symbol.items():
+            strongest = min(ACTION_PRIORITY[a.kind] for a in candidates)
+            top = [a for a in candidates if ACTION_PRIORITY[a.kind] == strongest]
+            if top[0].kind != ActionKind.REPLACE_STOP:
+                resolved.append(top[0])
+                continue
+
+            position = snapshot.positions[symbol]
+            best = max(top, key=lambda a: a.stop_price if is_long(position) else -a.stop_price)
+            if not is_tighter(position, best.stop_price, snapshot.broker_stop(symbol)):
+                continue
+            rules = sorted({a.rule for a in top if a.stop_price == best.stop_price})
+            resolved.append(OrderAction(
+                symbol=symbol,
+                kind=ActionKind.REPLACE_STOP,
+                rule='+'.join(rules),
+                reason=best.reason,
+                stop_price=best.stop_price,
+                order_id=best.order_id,
+            ))
+        return resolved
+
+    def execute(self, action: OrderAction, snapshot: ProtectionSnapshot) -> bool:
+        """Apply one resolved action; returns True on success."""
+        position = snapshot.positions[action.symbol]
+        try:
+            if action.kind == ActionKind.CLOSE:
+                logger.info(f"🎯 Closing {action.symbol}: {action.reason}")
+                return bool(self.position_manager.close_position(action.symbol, action.reason))
+
+            if action.kind == ActionKind.CREATE_STOP:
+                logger.warning(f"🚨 {action.symbol} has NO ACTIVE STOP LOSS - creating now...")
+                created = self.protection_manager.create_stop_loss(position)
+                if created:
+                    self.protection_manager.protected_positions.add(action.symbol)
+                    self.protection_manager.recently_created[action.symbol] = snapshot.taken_at
+                return bool(created)
+
+            if action.kind == ActionKind.PARTIAL_EXIT:
+                logger.info(f"✅ Triggering partial profit execution for {action.symbol}")
+                self.position_manager.execute_partial_profit_taking(position, action.payload)
+                return True
+
+            new_stop = round(action.stop_price, 2)
+            if action.rule == 'stop_drift':
+                # Broker stop caught up to the tracked stop (self-healing sync)
+                return self.protection_manager.sync_stop_loss(
+                    action.symbol, action.order_id, snapshot.broker_stop(action.symbol) or 0.0, new_stop
+                )
+            logger.info(
+                f"🔄 {action.symbol} stop ${snapshot.broker_stop(action.symbol) or 0:.2f} → "
+                f"${new_stop:.2f} ({action.rule}: {action.reason})"
+            )
+            if not self.alpaca.replace_order(order_id=action.order_id, stop_price=new_stop):
+                return False
+            # Compare against the latest stop; our copy predates the broker round-trip
+            current = trading_state.get_position(action.symbol) or position
+            if is_tighter(current, new_stop, current.stop_loss):
+                updated = trading_state.update_position_fields(action.symbol, stop_loss=new_stop)
+                if updated:
+                    self.position_manager.persist_position(updated)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to execute {action.kind.value} for {action.symbol}: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Rules (highest priority first)
+    # ------------------------------------------------------------------
+
+    def _rule_exit_unprotected(self, position: Position, snapshot: ProtectionSnapshot) -> Optional[OrderAction]:
+        """Safety net for positions with no open orders at all: exit through stop or target."""
+        if snapshot.open_orders.get(position.symbol):
+            return None
+        price = position.current_price
+        if is_long(position):
+            hit_stop, hit_target = price <= position.stop_loss, price >= position.take_profit
+        else:
+            hit_stop, hit_target = price >= position.stop_loss, price <= position.take_profit
+        if hit_stop:
+            return OrderAction(position.symbol, ActionKind.CLOSE, 'exit_unprotected', 'emergency_stop')
+        if hit_target:
+            return OrderAction(position.symbol, ActionKind.CLOSE, 'exit_unprotected', 'take_profit')
+        return None
+
+    def _rule_missing_stop(self, position: Position, snapshot: ProtectionSnapshot) -> Optional[OrderAction]:
+        """Every position needs an active stop (recreation is rate-limited per symbol)."""
+        if position.symbol in snapshot.stop_orders:
+            return None
+        last_created = self.protection_manager.recently_created.get(position.symbol, 0)
+        if snapshot.taken_at - last_created < self.protection_manager.creation_cooldown:
+            return None
+        return OrderAction(position.symbol, ActionKind.CREATE_STOP, 'missing_stop', 'no active stop loss')
+
+    def _rule_partial_profit(self, position: Position, snapshot: ProtectionSnapshot) -> Optional[OrderAction]:
+        profit_taker = self.position_manager.profit_taker
+        if not profit_taker:
+            return None
+        result = profit_taker.should_take_partial_profits(
+            symbol=position.symbol,
+            entry_price=position.avg_entry_price,
+            current_price=position.current_price,
+            stop_loss=position.stop_loss,
+            side='long' if is_long(position) else 'short',
+            regime_params=self._regime_params()
+        )
+        if result.get('should_take') and not result.get('shadow_mode'):
+            return OrderAction(position.symbol, ActionKind.PARTIAL_EXIT, 'partial_profit',
+                               result.get('reason', 'partial profit target'), payload=result)
+        return None
+
+    def _rule_stop_drift(self, position: Position, snapshot: ProtectionSnapshot) -> Optional[OrderAction]:
+        """Broker stop lags the position's tracked stop: move it up to match."""
+        stop_order = snapshot.stop_orders.get(position.symbol)
+        if stop_order is None or not position.stop_loss:
+            return None
+        return self._stop_move(position, snapshot, float(position.stop_loss), 'stop_drift', 'sync to tracked stop')
+
+    def _rule_trailing_stop(self, position: Position, snapshot: ProtectionSnapshot) -> Optional[OrderAction]:
+        """ATR/regime trailing stop (TrailingStopManager)."""
+        manager = self.position_manager.trailing_stop_manager
+        if not manager or position.symbol not in snapshot.stop_orders:
+            return None
+        result = manager.update_trailing_stop(
+            symbol=position.symbol,
+            entry_price=position.avg_entry_price,
+            current_price=position.current_price,
+            current_stop=position.stop_loss,
+            side='long' if is_long(position) else 'short',
+            atr=snapshot.atr.get(position.symbol),
+            regime_params=self._regime_params()
+        )
+        if result.get('updated') and not result.get('shadow_mode'):
+            return self._stop_move(position, snapshot, result['new_stop'], 'trailing_stop', 'ATR trailing stop')
+        return None
+
+    def _rule_aggressive_trailing(self, position: Position, snapshot: ProtectionSnapshot) -> Optional[OrderAction]:
+        """Percent trail / breakeven lock for profitable positions."""
+        if position.symbol not in snapshot.stop_orders:
+            return None
+        new_stop = aggressive_trail_stop(
+            position.avg_entry_price, position.current_price, position.unrealized_pl_pct, is_long(position)
+        )
+        if new_stop is None:
+            return None
+        return self._stop_move(position, snapshot, new_stop, 'aggressive_trailing',
+                               f"P/L {position.unrealized_pl_pct:+.1f}%")
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _stop_move(self, position, snapshot, new_stop: float, rule: str, reason: str) -> Optional[OrderAction]:
+        if not is_tighter(position, new_stop, snapshot.broker_stop(position.symbol)):
+            return None
+        return OrderAction(
+            position.symbol, ActionKind.REPLACE_STOP, rule, reason,
+            stop_price=new_stop, order_id=snapshot.stop_orders[position.symbol].id,
+        )
+
+    def _regime_params(self) -> Dict[str, Any]:
+        regime_manager = self.position_manager.regime_manager
+        return regime_manager.get_params() if regime_manager else {}
@@ -4,6 +4,7 @@ import asyncio
 from config import settings
 from core.state import trading_state, Position
 from core.alpaca_client import AlpacaClient
+from core.position_valuation import get_position_valuation
 from indicators.market_regime import get_regime_detector
 from utils.logger import setup_logger
 
@@ -36,6 +37,7 @@ class RiskManager:
         self.circuit_breaker_pct = settings.circuit_breaker_pct
         self.regime_detector = get_regime_detector(alpaca_client)
         self.sentiment_aggregator = sentiment_aggregator
+        self.valuation = get_position_valuation()
         self.current_regime = None
         
         # Consecutive loss tracking for momentum trades
@@ -91,10 +93,11 @@ class RiskManager:
             self.DAILY_LOSS_CIRCUIT_BREAKER_PCT * 100
         )
         
-        if metrics.daily_pl_pct < -daily_loss_threshold:
+        daily_pl_pct = self._daily_pl_pct(metrics)
+        if daily_pl_pct < -daily_loss_threshold:
             trading_state.update_metrics(circuit_breaker_triggered=True)
-            logger.error(f"CIRCUIT BREAKER TRIGGERED: Daily loss {metrics.daily_pl_pct:.2f}% exceeds {daily_loss_threshold:.1f}% limit")
-            return False, f"Circuit breaker triggered by daily loss ({metrics.daily_pl_pct:.2f}%)"
+            logger.error(f"CIRCUIT BREAKER TRIGGERED: Daily loss {daily_pl_pct:.2f}% exceeds {daily_loss_threshold:.1f}% limit")
+            return False, f"Circuit breaker triggered by daily loss ({daily_pl_pct:.2f}%)"
         
         # 3. Check market is open
         if not self.alpaca.is_market_open():
@@ -340,15 +343,23 @@ class RiskManager:
     def check_circuit_breaker(self):
         """Check and update circuit breaker status."""
         metrics = trading_state.get_metrics()
+        daily_pl_pct = self._daily_pl_pct(metrics)
         
-        if metrics.daily_pl_pct < -self.circuit_breaker_pct * 100:
+        if daily_pl_pct < -self.circuit_breaker_pct * 100:
             if not metrics.circuit_breaker_triggered:
                 trading_state.update_metrics(circuit_breaker_triggered=True)
-                logger.error(f"CIRCUIT BREAKER TRIGGERED: Daily loss {metrics.daily_pl_pct:.2f}%")
+                logger.error(f"CIRCUIT BREAKER TRIGGERED: Daily loss {daily_pl_pct:.2f}%")
                 return True
         
         return metrics.circuit_breaker_triggered
     
+    def _daily_pl_pct(self, metrics=None) -> float:
+        """Daily P&L % from live position marks, falling back to the last account sync."""
+        daily_pl_pct = self.valuation.portfolio().daily_pl_pct
+        if daily_pl_pct is not None:
+            return daily_pl_pct
+        return (metrics or trading_state.get_metrics()).daily_pl_pct
+    
     def reset_circuit_breaker(self):
         """Manually reset circuit breaker (use with caution)."""
         trading_state.update_metrics(circuit_breaker_triggered=False)
@@ -796,8 +807,7 @@ class RiskManager:
         Returns:
             Tuple of (is_reached, current_daily_pnl_pct)
         """
-        metrics = trading_state.get_metrics()
-        daily_pnl_pct = metrics.daily_pl_pct / 100  # Convert to decimal
+        daily_pnl_pct = self._daily_pl_pct() / 100  # Convert to decimal
         
         is_reached = daily_pnl_pct <= -self.DAILY_LOSS_CIRCUIT_BREAKER_PCT
         
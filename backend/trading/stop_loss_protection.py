@@ -19,6 +19,7 @@ from typing import Dict, List, Optional, Tuple
 from alpaca.trading.requests import StopOrderRequest, TrailingStopOrderRequest, MarketOrderRequest, TakeProfitRequest, StopLossRequest, LimitOrderRequest
 from alpaca.trading.enums import OrderSide, TimeInForce, OrderClass
 from core.alpaca_client import AlpacaClient
+from core.order_mirror import TERMINAL_STATUSES, get_order_mirror
 from core.state import trading_state
 from config import settings
 from utils.logger import setup_logger
@@ -65,7 +66,7 @@ class StopLossProtectionManager:
                 try:
                     # Check if position has active stop loss
                     # HOTFIX APPLIED: Fixed tuple unpacking
-                    result = self._has_active_stop_loss(symbol, all_orders)
+                    result = self.has_active_stop_loss(symbol, all_orders)
                     has_stop = result[0]
                     stop_price = result[1] if len(result) > 1 else None
                     stop_order = result[2] if len(result) > 2 else None
@@ -88,7 +89,7 @@ class StopLossProtectionManager:
                                     should_sync = True
                                     
                                 if should_sync:
-                                    self._sync_stop_loss(symbol, stop_order.id, stop_price, expected_stop)
+                                    self.sync_stop_loss(symbol, stop_order.id, stop_price, expected_stop)
                                     stop_price = expected_stop  # Update for logging
                         
                         results[symbol] = 'protected'
@@ -111,7 +112,7 @@ class StopLossProtectionManager:
                     logger.warning(f"🚨 {symbol} has NO ACTIVE STOP LOSS - creating now...")
                     
                     # Create stop loss (will handle bracket recreation if needed)
-                    success = self._create_stop_loss(position)
+                    success = self.create_stop_loss(position)
                     
                     if success:
                         results[symbol] = 'created'
@@ -141,7 +142,7 @@ class StopLossProtectionManager:
             logger.error(f"Error in verify_all_positions: {e}")
             return results
     
-    def _has_active_stop_loss(
+    def has_active_stop_loss(
         self, 
         symbol: str, 
         all_orders: List
@@ -179,7 +180,7 @@ class StopLossProtectionManager:
         
         return False, None, None
 
-    def _sync_stop_loss(self, symbol: str, order_id: str, current_stop_price: float, target_stop_price: float):
+    def sync_stop_loss(self, symbol: str, order_id: str, current_stop_price: float, target_stop_price: float):
         """
         Sync the actual Alpaca order to match the internal target stop price.
         This is the 'Self-Healing' mechanism.
@@ -193,10 +194,13 @@ class StopLossProtectionManager:
                 f"Alpaca ${current_stop_price:.2f} -> Target ${target_stop_price:.2f}"
             )
             
-            self.alpaca.replace_order(
+            replaced = self.alpaca.replace_order(
                 order_id=order_id,
                 stop_price=target_stop_price
             )
+            if not replaced:
+                logger.error(f"Failed to sync stop loss for {symbol}: replace rejected")
+                return False
             logger.info(f"✅ Successfully synced stop loss for {symbol}")
             return True
             
@@ -244,15 +248,25 @@ class StopLossProtectionManager:
             if cancelled_ids:
                 logger.info(f"✅ Cancelled {len(cancelled_ids)} exit orders for {symbol}")
                 # Wait for cancellations to propagate
-                import time
-                time.sleep(2.0)
+                self._wait_for_cancellations(cancelled_ids, timeout=2.0)
                 
         except Exception as e:
             logger.error(f"Error fetching/cancelling orders for {symbol}: {e}")
             
         return cancelled_ids
     
-    def _create_stop_loss(self, position) -> bool:
+    def _wait_for_cancellations(self, order_ids: List[str], timeout: float):
+        """Block until the canceled orders are confirmed terminal, or timeout."""
+        import time
+        mirror = get_order_mirror(self.alpaca)
+        if mirror is None:
+            time.sleep(timeout)
+            return
+        deadline = time.monotonic() + timeout
+        for order_id in order_ids:
+            mirror.wait_for_status(order_id, TERMINAL_STATUSES, max(deadline - time.monotonic(), 0))
+    
+    def create_stop_loss(self, position) -> bool:
         """
         Create stop loss protection.
         If take-profit exists, cancel it and recreate as complete bracket.
@@ -267,7 +281,7 @@ class StopLossProtectionManager:
             symbol = position.symbol
             
             # Get OPEN orders only (not cancelled/filled)
-            open_orders = self.alpaca.get_orders(status='open')
+            open_orders = self.alpaca.get_open_orders_for(symbol)
             
             # ALWAYS cancel existing exit orders first to ensure clean slate
             # This prevents "potential wash trade" or "insufficient qty" errors
@@ -276,9 +290,10 @@ class StopLossProtectionManager:
             if cancelled:
                 logger.info(f"Cancelled {len(cancelled)} orders for {symbol} before recreation")
             
-            # Wait for cancellations to process
-            import time
-            time.sleep(1.0)
+            # Wait for cancellations to process (already confirmed by the order mirror)
+            if get_order_mirror(self.alpaca) is None:
+                import time
+                time.sleep(1.0)
             
             # Try to create complete bracket
             try:
@@ -386,8 +401,7 @@ class StopLossProtectionManager:
             )
             
             # Update position with stop loss info
-            position.stop_loss = stop_price
-            trading_state.update_position(position)
+            trading_state.update_position_fields(symbol, stop_loss=stop_price)
             
             return True
             
@@ -488,9 +502,9 @@ class StopLossProtectionManager:
                 logger.info(f"✅ Position {symbol} is protected by SL ${stop_loss_price:.2f}")
             
             # Update position
-            position.stop_loss = stop_loss_price
-            position.take_profit = take_profit_price
-            trading_state.update_position(position)
+            trading_state.update_position_fields(
+                symbol, stop_loss=stop_loss_price, take_profit=take_profit_price
+            )
             
             return True
             
@@ -533,8 +547,9 @@ class StopLossProtectionManager:
             )
             
             # Update position with trailing stop info
-            position.stop_loss = current_price * (1 - trail_percent / 100)  # Approximate
-            trading_state.update_position(position)
+            trading_state.update_position_fields(
+                symbol, stop_loss=current_price * (1 - trail_percent / 100)  # Approximate
+            )
             
             return True
             
@@ -1,7 +1,11 @@
 import asyncio
+import time
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 from core.alpaca_client import AlpacaClient
+from core.async_io import AsyncClientProxy, run_blocking
+from core.position_valuation import get_position_valuation
+from core.runtime_metrics import get_runtime_metrics
 from core.supabase_client import SupabaseClient
 from core.state import trading_state
 from trading.risk_manager import RiskManager
@@ -10,7 +14,7 @@ from trading.position_manager import PositionManager
 from trading.strategy import EMAStrategy
 from trading.options_strategy import OptionsStrategy
 from data.market_data import MarketDataManager
-from streaming import StreamManager, StreamingBroadcaster
+from streaming import StreamManager, StreamingBroadcaster, TradeUpdateStreamManager, cap_symbols
 from options.options_client import OptionsClient
 from scanner.opportunity_scanner import OpportunityScanner
 from config import settings
@@ -58,13 +62,19 @@ class TradingEngine:
         self.position_manager = position_manager
         self.strategy = strategy
         self.market_data = market_data_manager
+        # Awaitable views of the blocking clients (calls run on the I/O thread pool)
+        self.alpaca_async = AsyncClientProxy(alpaca_client)
+        self.supabase_async = AsyncClientProxy(supabase_client)
         self.stream_manager = stream_manager
         self.streaming_broadcaster = streaming_broadcaster
         self.snapshot_builder = snapshot_builder
         self.streaming_enabled = settings.streaming_enabled
         self.stream_reconnect_delay = settings.stream_reconnect_delay
         self._streaming_active = False
+        self.order_stream: Optional[TradeUpdateStreamManager] = None
         self.ml_shadow_mode = ml_shadow_mode
+        # Quote-driven position marks and portfolio aggregates
+        self.position_valuation = get_position_valuation()
         
         # Initialize options strategy if enabled
         self.options_strategy = None
@@ -107,6 +117,14 @@ class TradingEngine:
         self.protection_manager = get_protection_manager(alpaca_client)
         logger.info("✅ Stop Loss Protection Manager initialized (5-second checks)")
         
+        # Single-pass protection: one snapshot, all stop/exit rules, one action per symbol
+        self.protection_pipeline = None
+        if settings.protection_pipeline_enabled:
+            from trading.protection_pipeline import ProtectionPipeline
+            self.protection_pipeline = ProtectionPipeline(
+                alpaca_client, self.position_manager, self.protection_manager
+            )
+        
         # Initialize Momentum Wave Exit System - DISABLED
         # DISABLED: Was causing premature exits on temporary momentum dips
         # self.wave_exit_system = None  # Disabled - let positions run to R-targets
@@ -193,18 +211,22 @@ class TradingEngine:
             logger.info("🤖 ML Shadow Mode: DISABLED")
         logger.info(f"Risk Per Trade: {settings.risk_per_trade_pct * 100}%")
         
+        # Order state arrives over the trade-updates stream; waits fall back to polling without it
+        if settings.order_stream_enabled:
+            await self._start_order_stream()
+        
         # Initial sync
         await self.sync_account()
         
         # CRITICAL: Verify and fix bracket orders immediately on startup
         logger.info("🔍 Verifying bracket orders for existing positions...")
-        self.position_manager.verify_position_protection()
+        await run_blocking(self.position_manager.verify_position_protection)
         logger.info("✅ Bracket order verification complete")
         
         # Start Intelligent Profit Protection System
         # Syncs existing positions and starts R-multiple tracking
         logger.info("🚀 Starting Intelligent Profit Protection...")
-        self.profit_protection.sync_existing_positions()
+        await run_blocking(self.profit_protection.sync_existing_positions)
         self.profit_protection.start()
         logger.info("✅ Profit protection active - R-multiple tracking, 2R/3R/4R profit taking enabled")
         
@@ -214,7 +236,7 @@ class TradingEngine:
         try:
             from data.daily_cache import get_daily_cache
             daily_cache = get_daily_cache()
-            daily_cache.refresh_cache(symbols=self.watchlist)
+            await run_blocking(daily_cache.refresh_cache, symbols=self.watchlist)
             logger.info("✅ Daily cache ready for Sprint 7 filters")
         except Exception as e:
             logger.warning(f"⚠️ Failed to refresh daily cache: {e}")
@@ -292,6 +314,8 @@ class TradingEngine:
         
         if self.streaming_enabled:
             await self._stop_streaming()
+        if self.order_stream:
+            await self.order_stream.stop()
         await asyncio.sleep(2)  # Allow loops to finish
         logger.info("Trading Engine stopped")
     
@@ -300,27 +324,40 @@ class TradingEngine:
         try:
             logger.info("Syncing account state...")
             
-            # Get account info
-            account = self.alpaca.get_account()
-            equity = float(account.equity)
-            cash = float(account.cash)
-            buying_power = float(account.buying_power)
-            
-            # Update metrics
-            trading_state.update_metrics(
-                equity=equity,
-                cash=cash,
-                buying_power=buying_power
-            )
-            
             # Sync positions
-            self.position_manager.sync_positions()
+            await run_blocking(self.position_manager.sync_positions)
+            
+            # Get account info (anchors live valuation to the synced positions)
+            equity = await self._refresh_account_anchor()
             
             logger.info(f"Account synced: ${equity:.2f} equity, {len(trading_state.get_all_positions())} positions")
             
         except Exception as e:
             logger.error(f"Failed to sync account: {e}")
     
+    async def _refresh_account_anchor(self) -> float:
+        """
+        Update account metrics from a broker read and re-anchor live valuation
+        (equity and daily P&L then follow streamed marks until the next read).
+        
+        Returns:
+            Account equity
+        """
+        account = await self.alpaca_async.get_account()
+        equity = float(account.equity)
+        last_equity = float(getattr(account, 'last_equity', 0) or 0)
+        daily_pl = equity - last_equity if last_equity else 0.0
+        
+        trading_state.update_metrics(
+            equity=equity,
+            cash=float(account.cash),
+            buying_power=float(account.buying_power),
+            daily_pl=daily_pl,
+            daily_pl_pct=(daily_pl / last_equity) * 100 if last_equity else 0.0
+        )
+        self.position_valuation.set_account(equity, last_equity)
+        return equity
+    
     async def market_data_loop(self):
         """
         Market data ingestion loop.
@@ -330,17 +367,19 @@ class TradingEngine:
         
         while self.is_running:
             try:
-                if not self.alpaca.is_market_open():
+                iteration_started = time.perf_counter()
+                if not await self.alpaca_async.is_market_open():
                     logger.debug("Market closed, skipping data update")
                     await asyncio.sleep(60)
                     continue
                 
                 # Update features for all watchlist symbols
-                self.market_data.update_all_features(self.watchlist)
+                await run_blocking(self.market_data.update_all_features, self.watchlist)
                 
                 # Update position prices
-                self.position_manager.update_position_prices()
+                await run_blocking(self.position_manager.update_position_prices)
                 
+                self._record_iteration('market_data', iteration_started)
                 await asyncio.sleep(60)  # Update every minute
                 
             except Exception as e:
@@ -356,12 +395,13 @@ class TradingEngine:
         
         while self.is_running:
             try:
+                iteration_started = time.perf_counter()
                 if not trading_state.is_trading_allowed():
                     logger.debug("Trading disabled, skipping strategy evaluation")
                     await asyncio.sleep(60)
                     continue
                 
-                if not self.alpaca.is_market_open():
+                if not await self.alpaca_async.is_market_open():
                     logger.debug("Market closed, skipping strategy evaluation")
                     await asyncio.sleep(60)
                     continue
@@ -381,9 +421,13 @@ class TradingEngine:
                 # Evaluate strategy for each symbol
                 logger.debug(f"🔍 Evaluating {len(self.watchlist)} symbols: {', '.join(self.watchlist)}")
                 
+                # Bulk-refresh multi-timeframe bars so MTF checks below stay in memory
+                if self.strategy.mtf_integration:
+                    await run_blocking(self.strategy.mtf_integration.prefetch, self.watchlist)
+                
                 for symbol in self.watchlist:
                     try:
-                        features = self.market_data.get_latest_features(symbol)
+                        features = await run_blocking(self.market_data.get_latest_features, symbol)
                         if not features:
                             logger.warning(f"⚠️  No features available for {symbol}")
                             continue
@@ -427,7 +471,8 @@ class TradingEngine:
                                 continue
                             
                             # Execute stock signal
-                            success = self.strategy.execute_signal(symbol, signal, features)
+                            # Runs on the I/O pool: order submission waits for the fill
+                            success = await run_blocking(self.strategy.execute_signal, symbol, signal, features)
                             
                             if success:
                                 # Increment trade counters after successful order
@@ -439,7 +484,7 @@ class TradingEngine:
                             # Check if we should also trade options
                             if self.options_strategy and settings.options_enabled:
                                 try:
-                                    account = self.alpaca.get_account()
+                                    account = await self.alpaca_async.get_account()
                                     equity = float(account.equity)
                                     current_price = features.get('close', 0)
                                     
@@ -466,7 +511,8 @@ class TradingEngine:
                                         )
                                         
                                         # Execute options order
-                                        options_order = self.order_manager.submit_options_order(
+                                        options_order = await run_blocking(
+                                            self.order_manager.submit_options_order,
                                             option_symbol=options_signal['option_symbol'],
                                             contracts=options_signal['contracts'],
                                             premium=options_signal['entry_premium'],
@@ -488,6 +534,7 @@ class TradingEngine:
                     except Exception as e:
                         logger.error(f"Error evaluating {symbol}: {e}")
                 
+                self._record_iteration('strategy', iteration_started)
                 await asyncio.sleep(60)  # Check every minute
                 
             except Exception as e:
@@ -519,9 +566,10 @@ class TradingEngine:
         
         while self.is_running:
             try:
+                iteration_started = time.perf_counter()
                 # Check for EOD Force Close - CRITICAL for day trading
                 if settings.force_eod_exit:
-                    clock = self.alpaca.get_clock()
+                    clock = await self.alpaca_async.get_clock()
                     now = clock.timestamp
                     
                     # Reset trigger if it's a new day
@@ -561,16 +609,17 @@ class TradingEngine:
                             self.eod_triggered = True
                             logger.info("🌙 EOD complete - winners held overnight, losers closed")
                         
-                if not self.alpaca.is_market_open():
+                if not await self.alpaca_async.is_market_open():
                     await asyncio.sleep(30)
                     continue
                 
                 # CRITICAL: Run stop loss protection manager every 5 seconds (every other iteration)
                 # This is the PRIMARY protection mechanism - runs independently of bracket orders
+                # (part of the protection pipeline pass below when that is enabled)
                 protection_counter += 1
-                if protection_counter >= 1:  # Every iteration (10 seconds, but fast enough)
+                if protection_counter >= 1 and not self.protection_pipeline:  # Every iteration (10 seconds, but fast enough)
                     try:
-                        results = self.protection_manager.verify_all_positions()
+                        results = await run_blocking(self.protection_manager.verify_all_positions)
                         # Log only if action was taken
                         created = sum(1 for s in results.values() if s == 'created')
                         if created > 0:
@@ -582,11 +631,11 @@ class TradingEngine:
                 # Sync positions every 60 seconds (6 iterations) to catch bracket order closes
                 sync_counter += 1
                 if sync_counter >= 6:
-                    self.position_manager.sync_positions()
+                    await run_blocking(self.position_manager.sync_positions)
                     sync_counter = 0
                     
                     # Check for HELD orders and fix them (every 60 seconds)
-                    self.position_manager.check_and_fix_held_orders()
+                    await run_blocking(self.position_manager.check_and_fix_held_orders)
                     
                     # Verify all positions have stop loss protection (legacy check)
                     # self.position_manager.verify_position_protection()
@@ -598,15 +647,25 @@ class TradingEngine:
                     try:
                         # Get remnant threshold from config (default 1% of equity)
                         remnant_threshold = getattr(settings, 'remnant_position_pct', 0.01)
-                        closed = self.position_manager.cleanup_tiny_positions(min_pct=remnant_threshold)
+                        closed = await run_blocking(self.position_manager.cleanup_tiny_positions, min_pct=remnant_threshold)
                         if closed > 0:
                             logger.info(f"🧹 Auto-cleaned {closed} remnant positions (< {remnant_threshold*100:.1f}% of equity)")
                     except Exception as e:
                         logger.error(f"Remnant cleanup error: {e}")
                     remnant_cleanup_counter = 0
                 
-                # Update position prices
-                self.position_manager.update_position_prices()
+                if self.protection_pipeline:
+                    # One pass: prices, stop protection, partials, trailing, manual exits
+                    results = await run_blocking(self.protection_pipeline.run)
+                    for symbol in results['closed']:
+                        # Clean up momentum tracking when position closes
+                        self.momentum_engine.remove_position_tracking(symbol)
+                else:
+                    # Update position prices
+                    await run_blocking(self.position_manager.update_position_prices)
+                
+                # Keep newly opened positions streaming (no-op when nothing changed)
+                await self._sync_stream_subscriptions()
                 
                 # Check momentum for bracket adjustment every 30 seconds (3 iterations)
                 momentum_counter += 1
@@ -614,29 +673,35 @@ class TradingEngine:
                     await self._check_momentum_adjustments()
                     momentum_counter = 0
                 
-                # PROFESSIONAL TRAILING STOPS - every 60 seconds (6 iterations)
-                # Trails stops at 2.5% below current price for profitable positions (2%+ profit)
-                trailing_stop_counter += 1
-                if trailing_stop_counter >= 6:
-                    await self._update_aggressive_trailing_stops()
-                    trailing_stop_counter = 0
-                
-                # Check stops and targets (only for positions without bracket orders)
-                symbols_to_close = self.position_manager.check_stops_and_targets()
-                
-                for symbol, reason in symbols_to_close:
-                    logger.info(f"🎯 Closing {symbol}: {reason}")
-                    self.position_manager.close_position(symbol, reason)
+                if not self.protection_pipeline:
+                    # PROFESSIONAL TRAILING STOPS - every 60 seconds (6 iterations)
+                    # Trails stops at 2.5% below current price for profitable positions (2%+ profit)
+                    trailing_stop_counter += 1
+                    if trailing_stop_counter >= 6:
+                        await self._update_aggressive_trailing_stops()
+                        trailing_stop_counter = 0
                     
-                    # Clean up momentum tracking when position closes
-                    self.momentum_engine.remove_position_tracking(symbol)
+                    # Check stops and targets (only for positions without bracket orders)
+                    symbols_to_close = await run_blocking(self.position_manager.check_stops_and_targets)
+                    
+                    for symbol, reason in symbols_to_close:
+                        logger.info(f"🎯 Closing {symbol}: {reason}")
+                        await run_blocking(self.position_manager.close_position, symbol, reason)
+                        
+                        # Clean up momentum tracking when position closes
+                        self.momentum_engine.remove_position_tracking(symbol)
                 
+                self._record_iteration('position_monitor', iteration_started)
                 await asyncio.sleep(10)  # Check every 10 seconds
                 
             except Exception as e:
                 logger.error(f"Error in position monitor loop: {e}")
                 await asyncio.sleep(10)
 
+    def _record_iteration(self, loop_name: str, started: float):
+        """Record one loop iteration's duration for /metrics/runtime."""
+        get_runtime_metrics().record_loop_iteration(loop_name, time.perf_counter() - started)
+
     async def _start_streaming(self):
         if not self.stream_manager:
             logger.warning("Stream manager not configured; skipping streaming start")
@@ -646,7 +711,7 @@ class TradingEngine:
             self.stream_manager.register_quote_handler(self._handle_quote)
             self.stream_manager.register_trade_handler(self._handle_trade)
             self.stream_manager.register_bar_handler(self._handle_bar)
-            await self.stream_manager.start(self.watchlist)
+            await self.stream_manager.start(self._stream_symbols())
             self._streaming_active = True
             logger.info("🔌 Streaming manager connected for watchlist symbols")
         except Exception as exc:
@@ -654,6 +719,36 @@ class TradingEngine:
             self.streaming_enabled = False
             logger.error("Streaming start failed (%s); reverting to polling", exc)
 
+    def _stream_symbols(self) -> List[str]:
+        """Symbols to stream: every open position plus the watchlist, up to the subscription cap."""
+        held = [position.symbol for position in trading_state.get_all_positions()]
+        return cap_symbols(self.watchlist, keep=held)
+
+    async def _sync_stream_subscriptions(self):
+        """
+        Follow watchlist and position changes with the stream subscriptions.
+        Cheap when nothing changed; newly added symbols get their bar history
+        seeded so streamed bars extend it right away.
+        """
+        if not self.stream_manager or not self._streaming_active:
+            return
+
+        try:
+            held = [position.symbol for position in trading_state.get_all_positions()]
+            changes = await self.stream_manager.update_subscriptions(self.watchlist, keep=held)
+            if changes['added']:
+                await run_blocking(self.market_data.seed_bar_store, changes['added'])
+        except Exception as exc:
+            logger.warning(f"Failed to update stream subscriptions: {exc}")
+
+    async def _start_order_stream(self):
+        try:
+            self.order_stream = TradeUpdateStreamManager(self.alpaca.order_mirror)
+            await self.order_stream.start()
+        except Exception as exc:
+            self.order_stream = None
+            logger.error("Trade update stream start failed (%s); order waits will poll", exc)
+
     async def _stop_streaming(self):
         if self.stream_manager and self._streaming_active:
             await self.stream_manager.stop()
@@ -722,8 +817,8 @@ class TradingEngine:
                 "timestamp": getattr(bar, "timestamp", None),
             }
             if payload["close"]:
-                self.market_data.apply_stream_price(symbol, payload["close"], payload["timestamp"])
-                self.market_data.apply_stream_bar(symbol, payload, payload["timestamp"])
+                # apply_stream_bar also refreshes the streamed price; both write to the database
+                await run_blocking(self.market_data.apply_stream_bar, symbol, payload, payload["timestamp"])
             await self._publish_stream_message(payload)
         except Exception as exc:
             logger.error("Bar handler error: %s", exc)
@@ -734,35 +829,9 @@ class TradingEngine:
         await self.streaming_broadcaster.enqueue(payload)
 
     def _update_position_price_from_stream(self, symbol: str, price: float):
-        if price <= 0:
-            return
-
-        position = trading_state.get_position(symbol)
-        if not position:
-            return
-
-        qty = position.qty or 0
-        if qty <= 0:
-            return
-
-        if position.side == "buy":
-            unrealized_pl = (price - position.avg_entry_price) * qty
-            market_value = price * qty
-        else:
-            unrealized_pl = (position.avg_entry_price - price) * qty
-            market_value = -price * qty
-
-        cost_basis = position.avg_entry_price * qty
-        if cost_basis:
-            unrealized_pct = (unrealized_pl / cost_basis) * 100
-        else:
-            unrealized_pct = position.unrealized_pl_pct
-
-        position.current_price = price
-        position.unrealized_pl = unrealized_pl
-        position.unrealized_pl_pct = unrealized_pct
-        position.market_value = market_value
-        trading_state.update_position(position)
+        # Atomic copy-on-write mark; no-op for symbols without an open position
+        if trading_state.update_position_price(symbol, price):
+            self.position_valuation.mark(symbol, price)
     
     async def metrics_loop(self):
         """
@@ -773,6 +842,13 @@ class TradingEngine:
         
         while self.is_running:
             try:
+                iteration_started = time.perf_counter()
+                # Re-anchor live equity/daily P&L to the broker (also picks up a new trading day)
+                try:
+                    await self._refresh_account_anchor()
+                except Exception as e:
+                    logger.warning(f"Account refresh failed, keeping streamed valuation: {e}")
+                
                 # Calculate metrics
                 metrics = trading_state.get_metrics()
                 
@@ -783,7 +859,7 @@ class TradingEngine:
                     trading_state.update_metrics(win_rate=win_rate)
                 
                 # Store metrics snapshot
-                self.supabase.insert_metrics({
+                await self.supabase_async.insert_metrics({
                     'equity': metrics.equity,
                     'cash': metrics.cash,
                     'buying_power': metrics.buying_power,
@@ -823,6 +899,7 @@ class TradingEngine:
                         }
                     )
                 
+                self._record_iteration('metrics', iteration_started)
                 await asyncio.sleep(300)  # Update every 5 minutes
                 
             except Exception as e:
@@ -870,7 +947,7 @@ class TradingEngine:
         while self.is_running:
             try:
                 # Check if market is open or about to open
-                clock = self.alpaca.get_clock()
+                clock = await self.alpaca_async.get_clock()
                 is_open = clock.is_open
                 
                 if is_open:
@@ -901,7 +978,9 @@ class TradingEngine:
                 
                 # Run scan
                 logger.info("🔍 Running scheduled opportunity scan...")
+                iteration_started = time.perf_counter()
                 await self._run_scanner_with_ai()
+                self._record_iteration('scanner', iteration_started)
                 
             except Exception as e:
                 logger.error(f"Error in scanner loop: {e}")
@@ -928,7 +1007,7 @@ class TradingEngine:
                     break
                 
                 # Only refresh during market hours
-                if not self.alpaca.is_market_open():
+                if not await self.alpaca_async.is_market_open():
                     logger.debug("Market closed, skipping watchlist refresh")
                     continue
                 
@@ -951,12 +1030,8 @@ class TradingEngine:
                     if removed:
                         logger.info(f"   ➖ Removed: {', '.join(sorted(removed)[:10])}{'...' if len(removed) > 10 else ''}")
                     
-                    # Update streaming subscriptions if needed
-                    if self.streaming_enabled and self.stream_manager:
-                        try:
-                            await self.stream_manager.update_subscriptions(new_watchlist[:20])
-                        except Exception as e:
-                            logger.warning(f"Failed to update stream subscriptions: {e}")
+                    # Update streaming subscriptions
+                    await self._sync_stream_subscriptions()
                 
             except Exception as e:
                 logger.error(f"Error in watchlist refresh loop: {e}")
@@ -978,7 +1053,7 @@ class TradingEngine:
         
         while self.is_running:
             try:
-                if not self.alpaca.is_market_open():
+                if not await self.alpaca_async.is_market_open():
                     logger.debug("Market closed, momentum scanner sleeping")
                     await asyncio.sleep(60)
                     continue
@@ -995,7 +1070,9 @@ class TradingEngine:
                     scan_interval = self.momentum_scan_interval
                 
                 # Run momentum scan
+                iteration_started = time.perf_counter()
                 await self._run_momentum_scan()
+                self._record_iteration('momentum_scanner', iteration_started)
                 
                 await asyncio.sleep(scan_interval)
                 
@@ -1079,6 +1156,7 @@ class TradingEngine:
                             logger.info(f"  ➕ Added: {', '.join(sorted(added))}")
                         if removed:
                             logger.info(f"  ➖ Removed: {', '.join(sorted(removed))}")
+                        await self._sync_stream_subscriptions()
             
         except Exception as e:
             logger.error(f"Error in momentum scan: {e}", exc_info=True)
@@ -1131,7 +1209,8 @@ class TradingEngine:
         """Run scanner with AI and process results."""
         try:
             opportunities = await self._run_scanner_async()
-            self._process_scan_results(opportunities)
+            await run_blocking(self._process_scan_results, opportunities)
+            await self._sync_stream_subscriptions()
         except Exception as e:
             logger.error(f"Error in AI scanner: {e}")
     
@@ -1164,10 +1243,7 @@ class TradingEngine:
                     old_watchlist = self.watchlist.copy()
                     self.watchlist = new_watchlist
                     
-                    # Update streaming if enabled
-                    # Note: Streaming update would need to be async, skip for now
-                    # if self.streaming_enabled and self.stream_manager:
-                    #     await self.stream_manager.update_subscriptions(new_watchlist)
+                    # Stream subscriptions follow in _run_scanner_with_ai (this runs off the loop)
                     
                     avg_score = sum(o['score'] for o in opportunities[:len(new_watchlist)]) / len(new_watchlist)
                     logger.info(f"✓ Watchlist updated: {len(new_watchlist)} AI-discovered symbols (avg score: {avg_score:.1f})")
@@ -1323,7 +1399,7 @@ class TradingEngine:
                 logger.info(f"📊 Evaluating momentum for {position.symbol} at +{profit_r:.2f}R")
                 
                 # Get market data
-                market_data = self._fetch_market_data_for_momentum(position.symbol)
+                market_data = await run_blocking(self._fetch_market_data_for_momentum, position.symbol)
                 if not market_data:
                     continue
                 
@@ -1337,7 +1413,8 @@ class TradingEngine:
                 # ==================== END WAVE EXIT (DISABLED) ====================
                 
                 # Evaluate and adjust if momentum is strong
-                signal = self.momentum_engine.evaluate_and_adjust(
+                signal = await run_blocking(
+                    self.momentum_engine.evaluate_and_adjust,
                     symbol=position.symbol,
                     entry_price=position.avg_entry_price,
                     current_price=position.current_price,
@@ -1374,26 +1451,18 @@ class TradingEngine:
         - Ensures we lock in gains as price moves in our favor
         """
         try:
-            from alpaca.trading.requests import GetOrdersRequest, ReplaceOrderRequest
-            from alpaca.trading.enums import QueryOrderStatus
+            from alpaca.trading.requests import ReplaceOrderRequest
             
-            # ============ OPTIMAL TRAILING STOP SETTINGS ============
-            # Based on research: Van Tharp, prop firms, quantitative analysis
-            # See: backend/OPTIMAL_TRADING_SETTINGS.md for full documentation
-            TRAIL_PERCENT = 1.0  # 1.0% trailing (research optimal for day trading)
-            MIN_PROFIT_TO_TRAIL = 1.0  # Start trailing at 1% profit (1R equivalent)
-            MIN_PROFIT_FOR_BREAKEVEN = 0.5  # Move to breakeven at 0.5% profit
-            BREAKEVEN_BUFFER = 0.001  # 0.1% buffer above entry for slippage
+            # Thresholds live in trading.protection_pipeline (see OPTIMAL_TRADING_SETTINGS.md)
+            from trading.protection_pipeline import aggressive_trail_stop
             
             # Get positions directly from Alpaca for accurate current prices
-            positions = self.alpaca.get_positions()
+            positions = await self.alpaca_async.get_positions()
             if not positions:
                 return
             
             # Get open stop orders
-            orders = self.alpaca.trading_client.get_orders(
-                filter=GetOrdersRequest(status=QueryOrderStatus.OPEN)
-            )
+            orders = await self.alpaca_async.get_orders(status='open')
             
             # Build stop order map by symbol (for BUY orders = short covers)
             stop_orders = {}
@@ -1411,10 +1480,6 @@ class TradingEngine:
                 qty = int(float(pos.qty))
                 pnl_pct = float(pos.unrealized_plpc) * 100
                 
-                # Skip if not profitable enough for any action
-                if pnl_pct < MIN_PROFIT_FOR_BREAKEVEN:
-                    continue
-                
                 stop_order = stop_orders.get(symbol)
                 if not stop_order:
                     continue
@@ -1423,42 +1488,20 @@ class TradingEngine:
                 is_long = qty > 0
                 abs_qty = abs(qty)
                 
+                # None below the breakeven threshold
+                new_stop = aggressive_trail_stop(entry, current, pnl_pct, is_long)
+                if new_stop is None:
+                    continue
+                
+                # Only tighten: higher for longs, lower for shorts
                 if is_long:
-                    # LONG position logic
-                    if pnl_pct >= MIN_PROFIT_TO_TRAIL:
-                        # Full trailing: 1% below current price (tighter to lock profits)
-                        new_stop = round(current * (1 - TRAIL_PERCENT / 100), 2)
-                        # Ensure stop is at least at breakeven + buffer
-                        breakeven_stop = round(entry * (1 + BREAKEVEN_BUFFER), 2)
-                        if new_stop < breakeven_stop:
-                            new_stop = breakeven_stop
-                    else:
-                        # Breakeven protection: move stop to entry + 0.1% buffer
-                        new_stop = round(entry * (1 + BREAKEVEN_BUFFER), 2)
-                    
-                    # Only update if new stop is HIGHER than current (tightening)
                     if new_stop <= current_stop:
                         continue
-                    
                     locked_pct = ((new_stop - entry) / entry) * 100
                     direction = "raised"
                 else:
-                    # SHORT position logic
-                    if pnl_pct >= MIN_PROFIT_TO_TRAIL:
-                        # Full trailing: 1% above current price
-                        new_stop = round(current * (1 + TRAIL_PERCENT / 100), 2)
-                        # Ensure stop is at least at breakeven - buffer
-                        breakeven_stop = round(entry * (1 - BREAKEVEN_BUFFER), 2)
-                        if new_stop > breakeven_stop:
-                            new_stop = breakeven_stop
-                    else:
-                        # Breakeven protection: move stop to entry - 0.1% buffer
-                        new_stop = round(entry * (1 - BREAKEVEN_BUFFER), 2)
-                    
-                    # Only update if new stop is LOWER than current (tightening for shorts)
                     if new_stop >= current_stop:
                         continue
-                    
                     locked_pct = ((entry - new_stop) / entry) * 100
                     direction = "lowered"
                 
@@ -1467,7 +1510,8 @@ class TradingEngine:
                         qty=abs_qty,
                         stop_price=new_stop
                     )
-                    self.alpaca.trading_client.replace_order_by_id(stop_order.id, replace_request)
+                    await run_blocking(self.alpaca.trading_client.replace_order_by_id, stop_order.id, replace_request)
+                    self.alpaca.invalidate_snapshot()
                     updated_count += 1
                     pos_type = "LONG" if is_long else "SHORT"
                     logger.info(
@@ -1489,6 +1533,8 @@ class TradingEngine:
             from alpaca.data.timeframe import TimeFrame
             from datetime import datetime, timedelta, timezone
             import pandas as pd
+            from data.bar_series import BarSeries, split_frame
+            from data.feature_cache import bar_stamp
             
             # Fetch bars from Alpaca
             barset = self.alpaca.get_bars(
@@ -1507,16 +1553,15 @@ class TradingEngine:
             if isinstance(barset, pd.DataFrame):
                 # Check if multi-indexed (symbol, timestamp)
                 if isinstance(barset.index, pd.MultiIndex):
-                    # Extract data for this symbol
-                    if symbol in barset.index.get_level_values(0):
-                        symbol_bars = barset.loc[symbol]
-                        logger.debug(f"Extracted {len(symbol_bars)} bars from multi-index for {symbol}")
-                    else:
+                    # Columnar view of this symbol's block (no per-bar conversion)
+                    symbol_bars = split_frame(barset).get(symbol)
+                    if symbol_bars is None:
                         logger.warning(f"Symbol {symbol} not found in bars response")
                         return None
+                    logger.debug(f"Extracted {len(symbol_bars)} bars from multi-index for {symbol}")
                 else:
                     # Single-indexed, use directly
-                    symbol_bars = barset
+                    symbol_bars = BarSeries.from_frame(barset)
                     logger.debug(f"Using {len(symbol_bars)} bars from single-index for {symbol}")
                 
                 # Check if we have enough data
@@ -1524,13 +1569,15 @@ class TradingEngine:
                     logger.warning(f"Insufficient bars for {symbol}: {len(symbol_bars)}/50 required")
                     return None
                 
-                # Extract OHLCV data
+                # OHLCV arrays are views into the response frame; the momentum
+                # indicators consume float64 arrays directly
                 market_data = {
-                    'high': symbol_bars['high'].tolist(),
-                    'low': symbol_bars['low'].tolist(),
-                    'close': symbol_bars['close'].tolist(),
-                    'volume': symbol_bars['volume'].tolist(),
-                    'timestamp': datetime.now()
+                    'high': symbol_bars.high,
+                    'low': symbol_bars.low,
+                    'close': symbol_bars.close,
+                    'volume': symbol_bars.volume,
+                    'timestamp': datetime.now(),
+                    'bar_stamp': bar_stamp(symbol_bars)  # Indicator cache key for the validator
                 }
                 
                 logger.info(f"✅ Fetched {len(symbol_bars)} bars for {symbol} momentum analysis")
@@ -1637,7 +1684,7 @@ class TradingEngine:
         Example: COIN dropped -$1,098 (-3.90%) overnight - no stop loss can protect against gaps!
         """
         try:
-            positions = self.alpaca.get_positions()
+            positions = await self.alpaca_async.get_positions()
             if not positions:
                 logger.info("🌙 No positions to close for EOD")
                 return
@@ -1665,32 +1712,31 @@ class TradingEngine:
                     # Cancel any existing orders first - CRITICAL for EOD close
                     try:
                         # Get ALL open orders and filter by symbol
-                        all_orders = self.alpaca.get_orders(status='open')
+                        all_orders = await self.alpaca_async.get_orders(status='open')
                         symbol_orders = [o for o in all_orders if o.symbol == symbol]
                         
                         for order in symbol_orders:
                             try:
-                                self.alpaca.cancel_order(order.id)
+                                await self.alpaca_async.cancel_order(order.id)
                                 logger.info(f"   ✅ Cancelled order {order.id} for {symbol}")
                             except Exception as cancel_err:
                                 logger.warning(f"   ⚠️  Could not cancel order {order.id}: {cancel_err}")
                         
                         # Wait for cancellations to process
                         if symbol_orders:
-                            import time
-                            time.sleep(0.5)
+                            await asyncio.sleep(0.5)
                             
                     except Exception as e:
                         logger.warning(f"   Could not cancel orders for {symbol}: {e}")
                     
                     # Close the position
                     try:
-                        self.alpaca.close_position(symbol)
+                        await self.alpaca_async.close_position(symbol)
                         closed_count += 1
                         
                         # Log to database
                         if self.supabase:
-                            self.supabase.insert_trade({
+                            await self.supabase_async.insert_trade({
                                 'symbol': symbol,
                                 'side': 'sell' if qty > 0 else 'buy',
                                 'qty': int(abs(qty)),  # FIXED: Convert to int for database
@@ -1734,7 +1780,7 @@ class TradingEngine:
             loss_threshold: Close positions with loss greater than this % (default 2%)
         """
         try:
-            positions = self.alpaca.get_positions()
+            positions = await self.alpaca_async.get_positions()
             if not positions:
                 logger.info("🌙 No positions to evaluate for EOD close")
                 return
@@ -1762,22 +1808,22 @@ class TradingEngine:
                         
                         # Cancel any existing orders first
                         try:
-                            orders = self.alpaca.get_orders(symbol=symbol, status='open')
+                            orders = await self.alpaca_async.get_orders(symbol=symbol, status='open')
                             for order in orders:
-                                self.alpaca.cancel_order(order.id)
+                                await self.alpaca_async.cancel_order(order.id)
                                 logger.info(f"   Cancelled order {order.id} for {symbol}")
                         except Exception as e:
                             logger.warning(f"   Could not cancel orders for {symbol}: {e}")
                         
                         # Close the position
                         try:
-                            self.alpaca.close_position(symbol)
+                            await self.alpaca_async.close_position(symbol)
                             logger.info(f"   ✅ Position closed: {symbol}")
                             closed_count += 1
                             
                             # Log to database
                             if self.supabase:
-                                self.supabase.insert_trade({
+                                await self.supabase_async.insert_trade({
                                     'symbol': symbol,
                                     'side': 'sell' if qty > 0 else 'buy',
                                     'qty': abs(qty),
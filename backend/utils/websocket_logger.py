@@ -25,19 +25,17 @@ class WebSocketLogHandler(logging.Handler):
                 }
             }
             
-            # We need to schedule the async enqueue on the event loop
-            # If we are in the loop, we can create a task.
-            # If we are in a thread, we need run_coroutine_threadsafe.
-            
+            # publish() only touches the pending batch, so call it directly
+            # on the loop, or hand it to the loop from other threads.
             try:
                 loop = asyncio.get_running_loop()
             except RuntimeError:
                 loop = None
                 
             if loop and loop.is_running():
-                loop.create_task(self.broadcaster.enqueue(log_entry))
+                self.broadcaster.publish(log_entry)
             elif self.loop and self.loop.is_running():
-                asyncio.run_coroutine_threadsafe(self.broadcaster.enqueue(log_entry), self.loop)
+                self.loop.call_soon_threadsafe(self.broadcaster.publish, log_entry)
                 
         except Exception:
             self.handleError(record)
@@ -44,8 +44,9 @@ export function useWebSocket({
 
             ws.current.onmessage = (event) => {
                 try {
+                    // The backend batches messages into one array frame per tick
                     const data = JSON.parse(event.data);
-                    onMessage?.(data);
+                    (Array.isArray(data) ? data : [data]).forEach((message) => onMessage?.(message));
                 } catch (e) {
                     console.error('Failed to parse WebSocket message:', e);
                 }
@@ -188,6 +188,25 @@ const buildWebSocketUrl = (baseUrl: string): string => {
   return url.toString();
 };
 
+const withResumeParams = (url: string, epoch?: string, seq?: number): string => {
+  if (!epoch || seq === undefined) {
+    return url;
+  }
+  const resumeUrl = new URL(url);
+  resumeUrl.searchParams.set("epoch", epoch);
+  resumeUrl.searchParams.set("since", String(seq));
+  return resumeUrl.toString();
+};
+
+const mergeById = <T extends { id: string }>(
+  items: T[],
+  upserts: T[],
+  removed: string[]
+): T[] => {
+  const replaced = new Set([...removed, ...upserts.map((item) => item.id)]);
+  return [...items.filter((item) => !replaced.has(item.id)), ...upserts];
+};
+
 const computeMidpoint = (bid?: number, ask?: number): number | undefined => {
   if (bid && ask) {
     return (bid + ask) / 2;
@@ -240,6 +259,10 @@ export const useBackendTrading = () => {
   const streamingStatusRef = useRef<StreamingStatus>("connecting");
   const websocketRef = useRef<WebSocket | null>(null);
   const reconnectTimerRef = useRef<number>();
+  // Last applied state-sync position, so a reconnect resumes from deltas
+  const syncRef = useRef<{ epoch?: string; seq?: number; metrics: any }>({
+    metrics: {},
+  });
 
   const setStreamingStatus = useCallback((status: StreamingStatus) => {
     streamingStatusRef.current = status;
@@ -266,6 +289,11 @@ export const useBackendTrading = () => {
       const logs = transformLogs(snapshot?.logs ?? []);
       const advisories = transformAdvisories(snapshot?.advisories ?? []);
       const flags = snapshot?.feature_flags ?? {};
+      syncRef.current = {
+        epoch: snapshot?.epoch,
+        seq: toNumber(snapshot?.seq),
+        metrics: snapshot?.metrics ?? {},
+      };
 
       if (flags.streaming === false) {
         setStreamingStatus("disabled");
@@ -285,6 +313,42 @@ export const useBackendTrading = () => {
     [setStreamingStatus]
   );
 
+  const applyDelta = useCallback((delta: any) => {
+    const sync = syncRef.current;
+    if (delta.epoch !== sync.epoch || sync.seq === undefined || delta.seq <= sync.seq) {
+      return;
+    }
+    if (delta.seq !== sync.seq + 1) {
+      // Missed deltas: reconnect and resume from the last applied seq
+      websocketRef.current?.close();
+      return;
+    }
+    sync.seq = delta.seq;
+    if (delta.metrics) {
+      sync.metrics = { ...sync.metrics, ...delta.metrics };
+    }
+    const metrics = transformMetrics(sync.metrics);
+
+    setData((prev) => ({
+      ...prev,
+      stats: delta.metrics ? metrics : prev.stats,
+      positions: delta.positions
+        ? mergeById(
+            prev.positions,
+            transformPositions(delta.positions.upsert ?? []),
+            delta.positions.remove ?? []
+          )
+        : prev.positions,
+      orders: delta.orders
+        ? mergeById(
+            prev.orders,
+            transformOrders(delta.orders.upsert ?? []),
+            delta.orders.remove ?? []
+          )
+        : prev.orders,
+    }));
+  }, []);
+
   const updatePositionFromStream = useCallback(
     (symbol: string, price?: number) => {
       if (!price) {
@@ -303,46 +367,53 @@ export const useBackendTrading = () => {
   const handleStreamMessage = useCallback(
     (event: MessageEvent<string>) => {
       try {
-        const message = JSON.parse(event.data);
-        switch (message.type) {
-          case "snapshot":
-            applySnapshot(message.payload ?? {});
-            break;
-          case "metrics":
-            setData((prev) => ({
-              ...prev,
-              stats: transformMetrics(message.payload ?? {}),
-              isConnected: true,
-              error: null,
-            }));
-            break;
-          case "quote": {
-            const price = computeMidpoint(
-              toNumber(message.bid),
-              toNumber(message.ask)
-            );
-            updatePositionFromStream(message.symbol, price);
-            break;
-          }
-          case "trade":
-            updatePositionFromStream(message.symbol, toNumber(message.price));
-            break;
-          case "bar":
-            updatePositionFromStream(message.symbol, toNumber(message.close));
-            break;
-          case "error":
-            if (message.message === "Streaming disabled") {
-              setStreamingStatus("disabled");
+        const parsed = JSON.parse(event.data);
+        // The backend batches messages into one array frame per tick
+        const messages = Array.isArray(parsed) ? parsed : [parsed];
+        for (const message of messages) {
+          switch (message.type) {
+            case "snapshot":
+              applySnapshot(message.payload ?? {});
+              break;
+            case "delta":
+              applyDelta(message);
+              break;
+            case "metrics":
+              setData((prev) => ({
+                ...prev,
+                stats: transformMetrics(message.payload ?? {}),
+                isConnected: true,
+                error: null,
+              }));
+              break;
+            case "quote": {
+              const price = computeMidpoint(
+                toNumber(message.bid),
+                toNumber(message.ask)
+              );
+              updatePositionFromStream(message.symbol, price);
+              break;
             }
-            break;
-          default:
-            break;
+            case "trade":
+              updatePositionFromStream(message.symbol, toNumber(message.price));
+              break;
+            case "bar":
+              updatePositionFromStream(message.symbol, toNumber(message.close));
+              break;
+            case "error":
+              if (message.message === "Streaming disabled") {
+                setStreamingStatus("disabled");
+              }
+              break;
+            default:
+              break;
+          }
         }
       } catch (error) {
         console.error("Streaming message parse error", error);
       }
     },
-    [applySnapshot, updatePositionFromStream, setStreamingStatus]
+    [applySnapshot, applyDelta, updatePositionFromStream, setStreamingStatus]
   );
 
   const fetchData = useCallback(async () => {
@@ -442,7 +513,8 @@ export const useBackendTrading = () => {
 
       setStreamingStatus("connecting");
 
-      const ws = new WebSocket(url);
+      const { epoch, seq } = syncRef.current;
+      const ws = new WebSocket(withResumeParams(url, epoch, seq));
       websocketRef.current = ws;
 
       ws.onopen = () => {
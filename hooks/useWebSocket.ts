@@ -83,8 +83,10 @@ export function useWebSocket({
       ws.onmessage = (event) => {
         if (!mountedRef.current) return;
         try {
-          const message: WebSocketMessage = JSON.parse(event.data);
-          onMessage?.(message);
+          // The backend batches messages into one array frame per tick
+          const parsed = JSON.parse(event.data);
+          const messages: WebSocketMessage[] = Array.isArray(parsed) ? parsed : [parsed];
+          messages.forEach((message) => onMessage?.(message));
         } catch (err) {
           console.error("[WebSocket] Failed to parse message:", err);
         }